@@ -48,26 +48,52 @@ class FakeFlags(object):
         purge_orphaned_data=True,
         reload_interval=60,
         samples_per_plugin=None,
+        bytes_per_plugin=None,
+        max_bytes_per_run=0,
+        max_total_bytes=0,
+        blobs_on_disk=False,
         max_reload_threads=1,
+        max_walk_threads=1,
         reload_task="auto",
         window_title="",
         path_prefix="",
         reload_multifile=False,
         reload_multifile_inactive_secs=4000,
+        reload_on_change=False,
+        max_reload_backoff=0,
         generic_data="auto",
+        reader_state_file="",
+        ingest_cache_dir="",
+        discovery_index_file="",
+        metadata_cache_secs=0,
+        load_plugins=None,
+        skip_plugins=None,
     ):
         self.logdir = logdir
         self.logdir_spec = logdir_spec
         self.purge_orphaned_data = purge_orphaned_data
         self.reload_interval = reload_interval
         self.samples_per_plugin = samples_per_plugin or {}
+        self.bytes_per_plugin = bytes_per_plugin or {}
+        self.max_bytes_per_run = max_bytes_per_run
+        self.max_total_bytes = max_total_bytes
+        self.blobs_on_disk = blobs_on_disk
         self.max_reload_threads = max_reload_threads
+        self.max_walk_threads = max_walk_threads
         self.reload_task = reload_task
         self.window_title = window_title
         self.path_prefix = path_prefix
         self.reload_multifile = reload_multifile
         self.reload_multifile_inactive_secs = reload_multifile_inactive_secs
+        self.reload_on_change = reload_on_change
+        self.max_reload_backoff = max_reload_backoff
         self.generic_data = generic_data
+        self.reader_state_file = reader_state_file
+        self.ingest_cache_dir = ingest_cache_dir
+        self.discovery_index_file = discovery_index_file
+        self.metadata_cache_secs = metadata_cache_secs
+        self.load_plugins = load_plugins or []
+        self.skip_plugins = skip_plugins or []
 
 
 class FakePlugin(base_plugin.TBPlugin):
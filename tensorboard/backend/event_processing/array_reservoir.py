@@ -0,0 +1,367 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A reservoir of stepped items stored in NumPy arrays."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import bisect
+import collections
+import random
+import threading
+
+import numpy as np
+
+from tensorboard.backend.event_processing import reservoir
+
+
+# The steps and wall times of the items kept under a key of an
+# `ArrayReservoir`, as parallel arrays, in no particular order.
+ItemKeys = collections.namedtuple("ItemKeys", ["step", "wall_time"])
+
+_INITIAL_CAPACITY = 16
+_GROWTH_FACTOR = 1.5
+
+
+class ArrayReservoir(object):
+    """A `reservoir.Reservoir` of items that have steps and wall times.
+
+    Items, such as `TensorEvent`s, must have `step` and `wall_time`
+    attributes. Under each key, the steps and wall times of the kept items
+    are stored in NumPy arrays, and the items themselves in an object
+    array, so that `FilterItems` selects the items to keep with vectorized
+    operations on the steps and wall times rather than by calling a
+    function per item.
+
+    Items are sampled exactly as a `reservoir.Reservoir` with the same
+    arguments would sample them, whether they are added one at a time by
+    `AddItem` or in batches by `AddItems`, which is cheaper per item.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, size, seed=0, always_keep_last=True):
+        """Creates a new reservoir.
+
+        Args:
+          size: The number of items to keep for each key. If 0, all items
+            will be kept.
+          seed: The seed of the random number generator to use when sampling.
+          always_keep_last: Whether to always keep the latest seen item in
+            the end of the reservoir. Defaults to True.
+
+        Raises:
+          ValueError: If size is negative or not an integer.
+        """
+        if size < 0 or size != round(size):
+            raise ValueError("size must be nonnegative integer, was %s" % size)
+        self._buckets = collections.defaultdict(
+            lambda: _ArrayBucket(size, random.Random(seed), always_keep_last)
+        )
+        # Guards the keys; the items are guarded by the buckets' mutexes.
+        self._mutex = threading.Lock()
+        self.size = size
+        self.always_keep_last = always_keep_last
+
+    def _GetBucket(self, key):
+        with self._mutex:
+            if key not in self._buckets:
+                raise KeyError("Key %s was not found in Reservoir" % key)
+            return self._buckets[key]
+
+    def Keys(self):
+        """Returns all the keys in the reservoir."""
+        with self._mutex:
+            return list(self._buckets.keys())
+
+    def Items(self, key):
+        """Returns the items associated with a key.
+
+        Raises:
+          KeyError: If the key is not found in the reservoir.
+        """
+        return self._GetBucket(key).Items()
+
+    def AddItem(self, key, item, f=lambda x: x):
+        """Adds an item; see `reservoir.Reservoir.AddItem`.
+
+        Args:
+          key: The key to store the item under.
+          item: The item to add to the reservoir.
+          f: An optional function to transform the item prior to addition.
+            The transformed item must have `step` and `wall_time`.
+        """
+        with self._mutex:
+            bucket = self._buckets[key]
+        bucket.AddItem(item, f)
+
+    def AddItems(self, key, items, f=lambda x: x):
+        """Adds items, as if by calling `AddItem` with each in turn.
+
+        The same items are kept as by `AddItem`, but `f` is applied only to
+        those still kept after the whole batch is sampled. If `f` raises,
+        the items under the key are left unchanged.
+
+        Args:
+          key: The key to store the items under.
+          items: A sequence of items to add to the reservoir.
+          f: An optional function to transform the items that are kept.
+        """
+        with self._mutex:
+            bucket = self._buckets[key]
+        bucket.AddItems(items, f)
+
+    def ItemsSince(self, key, cursor):
+        """Returns the items since a cursor; see `Reservoir.ItemsSince`.
+
+        Raises:
+          KeyError: If the key is not found in the reservoir.
+        """
+        return self._GetBucket(key).ItemsSince(cursor)
+
+    def FilterItems(self, filterFn, key=None):
+        """Filters items, using a vectorized filtering function.
+
+        Args:
+          filterFn: A function that takes an `ItemKeys` of arrays and
+            returns a boolean array of the same order, true for the items
+            to be kept. E.g., `lambda x: x.step < 10`.
+          key: An optional bucket key to filter. If not specified, will
+            filter all buckets.
+
+        Returns:
+          The number of items removed.
+        """
+        with self._mutex:
+            if key:
+                if key not in self._buckets:
+                    return 0
+                buckets = [self._buckets[key]]
+            else:
+                buckets = list(self._buckets.values())
+        return sum(bucket.FilterItems(filterFn) for bucket in buckets)
+
+
+class _ArrayBucket(object):
+    """The items under a key of an `ArrayReservoir`.
+
+    Samples like `reservoir._ReservoirBucket`, and always stores the most
+    recent item as its final item if `always_keep_last`.
+
+    Items and their steps and wall times stay in the slots of the arrays
+    where they were added; the `i`-th item in order of addition is in slot
+    `_item_slots[i]`. Removing an item shifts only `_item_slots`, and its
+    slot is reused by the item that replaces it, so that
+    `_item_slots[:_len]` is always a permutation of `range(_len)`.
+    """
+
+    __slots__ = (
+        "_max_size",
+        "_random",
+        "_always_keep_last",
+        "_mutex",
+        "_num_items_seen",
+        "_len",
+        "_keys",
+        "_items",
+        "_item_slots",
+        "_generation",
+    )
+
+    def __init__(self, max_size, random_, always_keep_last):
+        self._max_size = max_size
+        self._random = random_
+        self._always_keep_last = always_keep_last
+        self._mutex = threading.Lock()
+        self._num_items_seen = 0
+        self._len = 0
+        capacity = _INITIAL_CAPACITY
+        if max_size:
+            capacity = min(capacity, max_size)
+        self._keys = ItemKeys(
+            step=np.empty(capacity, dtype=np.int64),
+            wall_time=np.empty(capacity, dtype=np.float64),
+        )
+        self._items = np.empty(capacity, dtype=object)
+        self._item_slots = np.empty(capacity, dtype=np.int64)
+        self._generation = reservoir.NewGeneration()
+
+    def _Columns(self):
+        """Returns the arrays that are indexed by slot."""
+        return self._keys + (self._items,)
+
+    def _Reserve(self, length):
+        """Grows the arrays to hold at least `length` items."""
+        capacity = len(self._items)
+        if length <= capacity:
+            return
+        capacity = max(length, int(capacity * _GROWTH_FACTOR) + 1)
+        if self._max_size:
+            capacity = min(capacity, self._max_size)
+        grown = []
+        for column in self._Columns() + (self._item_slots,):
+            new_column = np.empty(capacity, dtype=column.dtype)
+            new_column[: self._len] = column[: self._len]
+            grown.append(new_column)
+        (step, wall_time, self._items, self._item_slots) = grown
+        self._keys = ItemKeys(step=step, wall_time=wall_time)
+
+    def _Set(self, slot, item):
+        self._keys.step[slot] = item.step
+        self._keys.wall_time[slot] = item.wall_time
+        self._items[slot] = item
+
+    def AddItem(self, item, f):
+        with self._mutex:
+            if self._len < self._max_size or self._max_size == 0:
+                self._Reserve(self._len + 1)
+                self._Set(self._len, f(item))
+                self._item_slots[self._len] = self._len
+                self._len += 1
+            else:
+                r = self._random.randint(0, self._num_items_seen)
+                if r < self._max_size:
+                    kept = f(item)
+                    last = self._len - 1
+                    slot = self._item_slots[r]
+                    if r < last:
+                        self._generation = reservoir.NewGeneration()
+                        self._item_slots[r:last] = self._item_slots[
+                            r + 1 : self._len
+                        ]
+                        self._item_slots[last] = slot
+                    self._Set(slot, kept)
+                elif self._always_keep_last:
+                    self._Set(self._item_slots[self._len - 1], f(item))
+            self._num_items_seen += 1
+
+    def AddItems(self, items, f):
+        with self._mutex:
+            start = self._len
+            num_seen = self._num_items_seen
+            # Items are appended until the bucket is full, and sampled from
+            # then on.
+            num_appended = len(items)
+            if self._max_size:
+                num_appended = max(0, min(num_appended, self._max_size - start))
+            random_state = None
+            if num_appended < len(items):
+                random_state = self._random.getstate()
+            # The bucket after sampling is the old items, but for those at
+            # the sorted positions `removed`, followed by the items of the
+            # batch at `added`.
+            removed = []
+            added = list(range(num_appended))
+            new_generation = False
+            num_seen += num_appended
+            for j in range(num_appended, len(items)):
+                num_old = start - len(removed)
+                r = self._random.randint(0, num_seen)
+                if r < self._max_size:
+                    if r < num_old + len(added) - 1:
+                        new_generation = True
+                    if r < num_old:
+                        bisect.insort(removed, _NthKept(r, removed))
+                    else:
+                        del added[r - num_old]
+                    added.append(j)
+                elif self._always_keep_last:
+                    if added:
+                        added[-1] = j
+                    else:
+                        bisect.insort(removed, _NthKept(num_old - 1, removed))
+                        added.append(j)
+                num_seen += 1
+            try:
+                kept = [f(items[j]) for j in added]
+            except Exception:
+                if random_state is not None:
+                    self._random.setstate(random_state)
+                raise
+            num_old = start - len(removed)
+            length = num_old + len(added)
+            # The added items take the slots of the removed ones, and then
+            # those past the old items.
+            free_slots = self._item_slots[removed].tolist()
+            free_slots.extend(range(start, length))
+            if removed:
+                self._item_slots[:num_old] = np.delete(
+                    self._item_slots[:start], removed
+                )
+            self._Reserve(length)
+            self._item_slots[num_old:length] = free_slots
+            for (slot, item) in zip(free_slots, kept):
+                self._Set(slot, item)
+            self._len = length
+            self._num_items_seen = num_seen
+            if new_generation:
+                self._generation = reservoir.NewGeneration()
+
+    def FilterItems(self, filterFn):
+        """Filters the kept items; see `ArrayReservoir.FilterItems`.
+
+        The number of items seen is rescaled like in
+        `reservoir._ReservoirBucket.FilterItems`.
+
+        Returns:
+          The number of items removed.
+        """
+        with self._mutex:
+            size_before = self._len
+            view = ItemKeys(*(column[:size_before] for column in self._keys))
+            keep = np.asarray(filterFn(view), dtype=bool)
+            if not keep.all():
+                self._generation = reservoir.NewGeneration()
+            order = self._item_slots[:size_before]
+            kept_slots = order[keep[order]]
+            self._len = len(kept_slots)
+            for column in self._Columns():
+                column[: self._len] = column[kept_slots]
+            self._item_slots[: self._len] = np.arange(self._len)
+            # Drop the references to the removed items.
+            self._items[self._len : size_before] = None
+            prop_remaining = (
+                self._len / float(size_before) if size_before > 0 else 0
+            )
+            self._num_items_seen = int(
+                round(self._num_items_seen * prop_remaining)
+            )
+            return size_before - self._len
+
+    def _ItemsFrom(self, start):
+        return self._items[self._item_slots[start : self._len]].tolist()
+
+    def Items(self):
+        with self._mutex:
+            return self._ItemsFrom(0)
+
+    def ItemsSince(self, cursor):
+        with self._mutex:
+            (start, cursor) = reservoir.ResolveCursor(
+                self._len, self._generation, cursor
+            )
+            if start is None:
+                return (self._ItemsFrom(0), cursor, False)
+            return (self._ItemsFrom(start), cursor, True)
+
+
+def _NthKept(n, removed):
+    """Returns the `n`-th position of `range(...)` not in sorted `removed`."""
+    for position in removed:
+        if position > n:
+            break
+        n += 1
+    return n
@@ -0,0 +1,216 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for array_reservoir."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import random
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import array_reservoir
+from tensorboard.backend.event_processing import reservoir
+
+
+_Item = collections.namedtuple("_Item", ["step", "wall_time", "value"])
+
+
+def _Items(steps):
+    return [_Item(step, step * 10.0, str(step)) for step in steps]
+
+
+def _AddInBatches(r, key, items, rng, f=lambda x: x):
+    """Adds items to an `ArrayReservoir` in batches of random sizes."""
+    i = 0
+    while i < len(items):
+        batch_size = rng.choice((0, 1, 2, 7, 50, 300))
+        r.AddItems(key, items[i : i + batch_size], f)
+        i += batch_size
+
+
+class ArrayReservoirTest(tb_test.TestCase):
+    def testEmpty(self):
+        r = array_reservoir.ArrayReservoir(10)
+        self.assertEqual(r.Keys(), [])
+        with self.assertRaises(KeyError):
+            r.Items("missing")
+        with self.assertRaises(KeyError):
+            r.ItemsSince("missing", None)
+        self.assertEqual(r.FilterItems(lambda x: x.step < 0, "missing"), 0)
+
+    def testExceptions(self):
+        with self.assertRaises(ValueError):
+            array_reservoir.ArrayReservoir(-1)
+        with self.assertRaises(ValueError):
+            array_reservoir.ArrayReservoir(13.3)
+
+    def testKeysAreIndependent(self):
+        r = array_reservoir.ArrayReservoir(10)
+        r.AddItems("a", _Items(range(100)))
+        for item in _Items(range(100)):
+            r.AddItem("b", item)
+        self.assertItemsEqual(r.Keys(), ["a", "b"])
+        self.assertEqual(r.Items("a"), r.Items("b"))
+
+    def testSamplesLikeReservoir(self):
+        rng = random.Random(0)
+        items = _Items(range(3000))
+        for (size, seed, always_keep_last) in (
+            (0, 0, True),
+            (1, 0, True),
+            (10, 0, True),
+            (10, 7, True),
+            (10, 0, False),
+            (1000, 3, True),
+        ):
+            expected = reservoir.Reservoir(
+                size, seed=seed, always_keep_last=always_keep_last
+            )
+            one_by_one = array_reservoir.ArrayReservoir(
+                size, seed=seed, always_keep_last=always_keep_last
+            )
+            batched = array_reservoir.ArrayReservoir(
+                size, seed=seed, always_keep_last=always_keep_last
+            )
+            for item in items:
+                expected.AddItem("key", item)
+                one_by_one.AddItem("key", item)
+            _AddInBatches(batched, "key", items, rng)
+            self.assertEqual(one_by_one.Items("key"), expected.Items("key"))
+            self.assertEqual(batched.Items("key"), expected.Items("key"))
+
+    def testAddItemsTransformsOnlyKeptItems(self):
+        r = array_reservoir.ArrayReservoir(10)
+        transformed = []
+
+        def f(item):
+            transformed.append(item.step)
+            return item._replace(value=item.value + "!")
+
+        r.AddItems("key", _Items(range(1000)), f)
+        self.assertEqual(sorted(transformed), [i.step for i in r.Items("key")])
+        self.assertTrue(all(i.value.endswith("!") for i in r.Items("key")))
+
+    def testAddItemsLeavesItemsOnError(self):
+        expected = reservoir.Reservoir(10)
+        r = array_reservoir.ArrayReservoir(10)
+        items = _Items(range(200))
+        for item in items[:100]:
+            expected.AddItem("key", item)
+        r.AddItems("key", items[:100])
+
+        def fail(item):
+            raise RuntimeError("oops")
+
+        with self.assertRaises(RuntimeError):
+            r.AddItems("key", items[100:], fail)
+        self.assertEqual(r.Items("key"), expected.Items("key"))
+        # Sampling continues as if the batch had not been added.
+        for item in items[100:]:
+            expected.AddItem("key", item)
+        r.AddItems("key", items[100:])
+        self.assertEqual(r.Items("key"), expected.Items("key"))
+
+    def testFilterItemsLikeReservoir(self):
+        rng = random.Random(0)
+        expected = reservoir.Reservoir(10)
+        r = array_reservoir.ArrayReservoir(10)
+        for item in _Items(range(100)):
+            expected.AddItem("key", item)
+        r.AddItems("key", _Items(range(100)))
+        # The same predicate works on items and on arrays of their keys.
+        not_expired = lambda x: x.step < 50
+        self.assertEqual(
+            r.FilterItems(not_expired), expected.FilterItems(not_expired),
+        )
+        self.assertEqual(r.Items("key"), expected.Items("key"))
+        for item in _Items(range(50, 250)):
+            expected.AddItem("key", item)
+        _AddInBatches(r, "key", _Items(range(50, 250)), rng)
+        self.assertEqual(r.Items("key"), expected.Items("key"))
+
+    def testInterleavedLikeReservoir(self):
+        rng = random.Random(0)
+        expected = reservoir.Reservoir(50)
+        r = array_reservoir.ArrayReservoir(50)
+        step = 0
+        for _ in range(200):
+            action = rng.choice(("add", "add_batch", "filter"))
+            if action == "filter":
+                cutoff = rng.randint(0, step)
+                not_expired = lambda x: x.step < cutoff
+                self.assertEqual(
+                    r.FilterItems(not_expired),
+                    expected.FilterItems(not_expired),
+                )
+                step = cutoff
+            else:
+                num_items = 1 if action == "add" else rng.randint(0, 100)
+                items = _Items(range(step, step + num_items))
+                step += num_items
+                for item in items:
+                    expected.AddItem("key", item)
+                if action == "add":
+                    r.AddItem("key", items[0])
+                else:
+                    r.AddItems("key", items)
+            self.assertEqual(r.Items("key"), expected.Items("key"))
+
+    def testFilterItemsByWallTime(self):
+        r = array_reservoir.ArrayReservoir(0)
+        r.AddItems("a", _Items(range(10)))
+        r.AddItems("b", _Items(range(5, 15)))
+        self.assertEqual(r.FilterItems(lambda x: x.wall_time >= 80.0), 11)
+        self.assertEqual([i.step for i in r.Items("a")], [8, 9])
+        self.assertEqual([i.step for i in r.Items("b")], list(range(8, 15)))
+
+    def testItemsSince(self):
+        r = array_reservoir.ArrayReservoir(10)
+        (client_steps, cursor) = ([], None)
+        num_incremental = 0
+        for item in _Items(range(300)):
+            r.AddItem("key", item)
+            (items, cursor, incremental) = r.ItemsSince("key", cursor)
+            steps = [i.step for i in items]
+            if incremental:
+                client_steps = client_steps[:-1] + steps
+                num_incremental += 1
+            else:
+                client_steps = steps
+            self.assertEqual(client_steps, [i.step for i in r.Items("key")])
+        self.assertGreater(num_incremental, 250)
+        r.FilterItems(lambda x: x.step % 2 == 0)
+        (_, _, incremental) = r.ItemsSince("key", cursor)
+        self.assertFalse(incremental)
+
+    def testItemsSinceAfterBatches(self):
+        rng = random.Random(0)
+        r = array_reservoir.ArrayReservoir(20)
+        (client_steps, cursor) = ([], None)
+        for start in range(0, 1000, 25):
+            _AddInBatches(r, "key", _Items(range(start, start + 25)), rng)
+            (items, cursor, incremental) = r.ItemsSince("key", cursor)
+            steps = [i.step for i in items]
+            if incremental:
+                client_steps = client_steps[:-1] + steps
+            else:
+                client_steps = steps
+            self.assertEqual(client_steps, [i.step for i in r.Items("key")])
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,193 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Nested limits on the number of bytes of data kept in memory."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import heapq
+import itertools
+import threading
+
+
+class ByteBudget(object):
+    """A count of bytes in use, with an optional limit.
+
+    Budgets nest: bytes charged to a budget are also charged to its parent,
+    so that, e.g., the budget of a tag counts towards the budget of its run,
+    which counts towards a global budget.
+
+    A budget that holds data directly, such as a reservoir bucket, has an
+    `evict_fn` that releases some of it. After charging, its user calls
+    `Reclaim`, which evicts data while a limit is exceeded, each time from
+    the budget with the most bytes under the exceeded one. This way a run
+    loaded late is not starved by runs that filled a shared budget first.
+    Each budget keeps its children in a heap by their bytes, updated as
+    they are charged, so that finding the largest takes logarithmic time
+    in the number of children.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_bytes=0, parent=None, evict_fn=None):
+        """Constructs a `ByteBudget`.
+
+        Args:
+          max_bytes: The number of bytes above which the budget is exceeded,
+            or 0 for no limit.
+          parent: Optional `ByteBudget` to which all bytes charged to this
+            budget are also charged.
+          evict_fn: Optional function that releases some of the bytes
+            charged to this budget, returning whether it released any.
+            It must not be called with locks held that `Reclaim` needs.
+        """
+        self.max_bytes = max_bytes
+        self._parent = parent
+        self._evict_fn = evict_fn
+        self._lock = threading.Lock()
+        self._used_bytes = 0
+        self._children = set()
+        # A max-heap of `[-used_bytes, sequence_number, child]` entries.
+        # Entries are replaced rather than updated, so only those in
+        # `_heap_entries` are current.
+        self._heap = []
+        # From child to its current heap entry, for the children that are
+        # not being evicted from.
+        self._heap_entries = {}
+        self._sequence_numbers = itertools.count()
+        if parent is not None:
+            parent._AddChild(self)
+
+    @property
+    def used_bytes(self):
+        """The number of bytes currently charged to this budget."""
+        with self._lock:
+            return self._used_bytes
+
+    def _AddChild(self, child):
+        with self._lock:
+            self._children.add(child)
+            self._Push(child)
+
+    def _RemoveChild(self, child):
+        with self._lock:
+            self._children.discard(child)
+            self._heap_entries.pop(child, None)
+
+    def _Push(self, child):
+        """Adds a current heap entry for `child`. Must hold `_lock`."""
+        entry = [-child.used_bytes, next(self._sequence_numbers), child]
+        self._heap_entries[child] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._heap_entries) + 16:
+            # Drop the replaced entries, so that they take amortized
+            # constant time.
+            self._heap = list(self._heap_entries.values())
+            heapq.heapify(self._heap)
+
+    def _PopLargest(self):
+        """Removes and returns the child with the most bytes, or `None`."""
+        with self._lock:
+            while self._heap:
+                (_, _, child) = entry = heapq.heappop(self._heap)
+                if self._heap_entries.get(child) is entry:
+                    del self._heap_entries[child]
+                    return child
+            return None
+
+    def Charge(self, num_bytes):
+        """Records that `num_bytes` more bytes are in use."""
+        self._Charge(num_bytes, None)
+
+    def _Charge(self, num_bytes, child):
+        """Like `Charge`, for bytes charged to `child`, if not `None`."""
+        with self._lock:
+            self._used_bytes += num_bytes
+            if child in self._heap_entries:
+                self._Push(child)
+        if self._parent is not None:
+            self._parent._Charge(num_bytes, self)
+
+    def Release(self, num_bytes):
+        """Records that `num_bytes` bytes are no longer in use."""
+        self.Charge(-num_bytes)
+
+    def Close(self):
+        """Releases all bytes charged to this budget from its parents.
+
+        The budget is then no longer evicted from by its parents.
+        """
+        with self._lock:
+            used_bytes = self._used_bytes
+            self._used_bytes = 0
+        if self._parent is not None:
+            self._parent._RemoveChild(self)
+            self._parent.Release(used_bytes)
+
+    def _OverLimit(self):
+        with self._lock:
+            return bool(self.max_bytes) and self._used_bytes > self.max_bytes
+
+    def Exceeded(self):
+        """Whether this budget or any of its parents is over its limit."""
+        if self._OverLimit():
+            return True
+        return self._parent is not None and self._parent.Exceeded()
+
+    def HasRoom(self, num_bytes):
+        """Whether `num_bytes` more bytes fit in this budget and its parents."""
+        with self._lock:
+            if self.max_bytes and self._used_bytes + num_bytes > self.max_bytes:
+                return False
+        return self._parent is None or self._parent.HasRoom(num_bytes)
+
+    def Reclaim(self):
+        """Evicts data until neither this budget nor its parents is exceeded.
+
+        Each eviction is from the budget with the most bytes among those
+        under the nearest exceeded budget that can evict anything. Gives up
+        on a budget once nothing under it can be evicted.
+        """
+        budget = self
+        while budget is not None:
+            if budget._OverLimit() and budget._EvictFromLargest():
+                continue
+            budget = budget._parent
+
+    def _EvictFromLargest(self):
+        """Evicts once from the largest budget under this one, if possible.
+
+        Returns:
+          Whether anything was evicted.
+        """
+        if self._evict_fn is not None:
+            return self._evict_fn()
+        # Children are taken off the heap while they are evicted from, so
+        # that their charges don't reorder it, and then put back.
+        tried = []
+        try:
+            while True:
+                child = self._PopLargest()
+                if child is None:
+                    return False
+                tried.append(child)
+                if child._EvictFromLargest():
+                    return True
+        finally:
+            with self._lock:
+                for child in tried:
+                    if child in self._children:
+                        self._Push(child)
@@ -0,0 +1,149 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for byte_budget."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    # python version >= 3.3
+    from unittest import mock
+except ImportError:
+    import mock  # pylint: disable=unused-import
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import byte_budget
+
+
+class ByteBudgetTest(tb_test.TestCase):
+    def testUnlimited(self):
+        budget = byte_budget.ByteBudget()
+        budget.Charge(10 ** 12)
+        self.assertEqual(budget.used_bytes, 10 ** 12)
+        self.assertFalse(budget.Exceeded())
+
+    def testLimit(self):
+        budget = byte_budget.ByteBudget(100)
+        budget.Charge(100)
+        self.assertFalse(budget.Exceeded())
+        budget.Charge(1)
+        self.assertTrue(budget.Exceeded())
+        budget.Release(1)
+        self.assertFalse(budget.Exceeded())
+
+    def testNesting(self):
+        parent = byte_budget.ByteBudget(100)
+        a = byte_budget.ByteBudget(parent=parent)
+        b = byte_budget.ByteBudget(60, parent=parent)
+        a.Charge(50)
+        b.Charge(40)
+        self.assertEqual(parent.used_bytes, 90)
+        self.assertFalse(a.Exceeded())
+        b.Charge(30)
+        # Exceeds both `b` and its parent, so also `a`.
+        self.assertTrue(b.Exceeded())
+        self.assertTrue(a.Exceeded())
+        b.Close()
+        self.assertEqual(parent.used_bytes, 50)
+        self.assertFalse(a.Exceeded())
+
+    def testHasRoom(self):
+        parent = byte_budget.ByteBudget(100)
+        child = byte_budget.ByteBudget(parent=parent)
+        child.Charge(60)
+        self.assertTrue(child.HasRoom(40))
+        self.assertFalse(child.HasRoom(41))
+        self.assertTrue(byte_budget.ByteBudget().HasRoom(10 ** 12))
+
+    def testReclaimEvictsFromLargest(self):
+        parent = byte_budget.ByteBudget(100)
+        evicted = []
+
+        def make_leaf(name):
+            def evict():
+                evicted.append(name)
+                leaf.Release(10)
+                return True
+
+            leaf = byte_budget.ByteBudget(parent=parent, evict_fn=evict)
+            return leaf
+
+        (a, b) = (make_leaf("a"), make_leaf("b"))
+        a.Charge(80)
+        b.Charge(40)
+        b.Reclaim()
+        self.assertEqual(evicted, ["a", "a"])
+        self.assertEqual(a.used_bytes, 60)
+        self.assertFalse(parent.Exceeded())
+        # A closed budget is no longer evicted from.
+        a.Close()
+        b.Charge(70)
+        b.Reclaim()
+        self.assertEqual(evicted, ["a", "a", "b"])
+
+    def testReclaimWithManyRuns(self):
+        num_runs = 1000
+        parent = byte_budget.ByteBudget(num_runs * (num_runs + 1) // 2)
+        used_bytes = byte_budget.ByteBudget.used_bytes.fget
+        evicted = []
+
+        def make_run(i):
+            def evict():
+                # Always evicts from the largest run.
+                self.assertEqual(
+                    used_bytes(run), max(used_bytes(r) for r in runs)
+                )
+                evicted.append(i)
+                run.Release(10)
+                return True
+
+            run = byte_budget.ByteBudget(parent=parent, evict_fn=evict)
+            run.Charge(i + 1)
+            return run
+
+        runs = [make_run(i) for i in range(num_runs)]
+        self.assertLessEqual(len(parent._heap), 2 * num_runs + 16)
+        reads = []
+
+        def read_used_bytes(budget):
+            reads.append(budget)
+            return used_bytes(budget)
+
+        with mock.patch.object(
+            byte_budget.ByteBudget, "used_bytes", property(read_used_bytes)
+        ):
+            runs[0].Charge(100)
+            runs[0].Reclaim()
+            self.assertEqual(evicted[:3], [999, 998, 997])
+            num_evicted = len(evicted)
+            runs[500].Charge(1000)
+            runs[500].Reclaim()
+            self.assertEqual(evicted[num_evicted], 500)
+        self.assertFalse(parent.Exceeded())
+        # Each charge or eviction reads the bytes of only the run charged or
+        # evicted from, rather than of every run.
+        self.assertEqual(len(reads), 2 + len(evicted))
+
+    def testReclaimGivesUp(self):
+        parent = byte_budget.ByteBudget(10)
+        child = byte_budget.ByteBudget(parent=parent, evict_fn=lambda: False)
+        child.Charge(20)
+        child.Reclaim()
+        self.assertTrue(child.Exceeded())
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,380 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Detection of changes to local directories, using Linux inotify.
+
+Loaders that are given a `ChangeNotifier` skip listing and reading their
+directory when nothing in it has changed since their last load, rather
+than polling it on every reload. A `TreeChanges` similarly tells when
+directories or event files may have been added anywhere under a logdir,
+so that it is walked only then. Directories that cannot be watched
+(remote paths, other platforms, or when the kernel's watch limit is
+reached) are polled as before.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+# Constants from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+# Events that may add a directory or event file to a watched directory.
+_ADD_MASK = _IN_MOVED_TO | _IN_CREATE
+
+# Events that may mean new data in a watched directory.
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+
+# Layout of the fixed-size part of `struct inotify_event`: watch
+# descriptor, mask, cookie, and length of the name that follows.
+_EVENT_HEADER = struct.Struct("iIII")
+
+_READ_SIZE = 64 * 1024
+
+
+def CreateNotifier():
+    """Returns a new `ChangeNotifier`, or `None` if inotify is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ChangeNotifier()
+    except (OSError, AttributeError) as e:
+        logger.info("Change notification is unavailable: %s", e)
+        return None
+
+
+class ChangeNotifier(object):
+    """Watches local directories for changes with a single inotify instance.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Constructs a `ChangeNotifier`.
+
+        Raises:
+          OSError: If an inotify instance cannot be created.
+          AttributeError: If the C library does not support inotify.
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._inotify_add_watch = libc.inotify_add_watch
+        self._inotify_rm_watch = libc.inotify_rm_watch
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self._fd = fd
+        self._lock = threading.Lock()
+        # From watch descriptor to the `DirectoryChanges` using it.
+        self._subscriptions = {}
+        # Whether any event has been seen since the last `Wait`.
+        self._notified = False
+        self._warned_watch_limit = False
+
+    def Watch(self, directory):
+        """Starts watching a directory for changes.
+
+        Args:
+          directory: Path of the directory to watch.
+
+        Returns:
+          A `DirectoryChanges` for the directory, or `None` if it cannot be
+          watched, in which case it should be polled.
+        """
+        if "://" in directory:
+            return None
+        path = os.fsencode(os.path.expanduser(directory))
+        with self._lock:
+            if self._fd is None:
+                return None
+            wd = self._inotify_add_watch(self._fd, path, _WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code == errno.ENOSPC and not self._warned_watch_limit:
+                    self._warned_watch_limit = True
+                    logger.warning(
+                        "Reached the limit of inotify watches; polling "
+                        "further directories. Raise the limit with sysctl "
+                        "fs.inotify.max_user_watches."
+                    )
+                else:
+                    logger.debug(
+                        "Cannot watch %s: %s", directory, os.strerror(code)
+                    )
+                return None
+            subscription = DirectoryChanges(self, wd)
+            self._subscriptions.setdefault(wd, []).append(subscription)
+            return subscription
+
+    def WatchTree(self, directory):
+        """Starts watching a directory and all its subdirectories.
+
+        Args:
+          directory: Path of the top directory to watch. It need not exist
+            yet.
+
+        Returns:
+          A `TreeChanges` for the directory.
+        """
+        return TreeChanges(self, directory)
+
+    def _Unsubscribe(self, subscription):
+        """Stops reporting changes to a `DirectoryChanges`."""
+        with self._lock:
+            subscription._watched = False
+            subscriptions = self._subscriptions.get(subscription._wd)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription._wd]
+                self._inotify_rm_watch(self._fd, subscription._wd)
+
+    def Wait(self, timeout):
+        """Waits until any watched directory changes.
+
+        Args:
+          timeout: Maximum number of seconds to wait.
+
+        Returns:
+          Whether any change was seen since the previous call.
+        """
+        self.Poll()
+        with self._lock:
+            fd = self._fd
+            notified = self._notified
+            self._notified = False
+        if notified:
+            return True
+        if fd is None:
+            time.sleep(timeout)
+            return False
+        (readable, _, _) = select.select([fd], [], [], timeout)
+        if not readable:
+            return False
+        self.Poll()
+        with self._lock:
+            self._notified = False
+        return True
+
+    def Poll(self):
+        """Processes all pending events, without blocking."""
+        with self._lock:
+            while self._fd is not None:
+                try:
+                    data = os.read(self._fd, _READ_SIZE)
+                except (OSError, IOError) as e:
+                    if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        return
+                    raise
+                if not data:
+                    return
+                self._notified = True
+                self._ProcessEvents(data)
+
+    def _ProcessEvents(self, data):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            (wd, mask, _, name_length) = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + name_length]
+            offset += name_length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped, so any directory may have changed.
+                for subscriptions in self._subscriptions.values():
+                    for subscription in subscriptions:
+                        subscription._changed = True
+                        subscription._added = True
+                continue
+            # Other files, such as checkpoints, are created often but
+            # can't add a run.
+            added = mask & _ADD_MASK and (
+                mask & _IN_ISDIR or b"tfevents" in name
+            )
+            for subscription in self._subscriptions.get(wd, ()):
+                subscription._changed = True
+                if added:
+                    subscription._added = True
+                if mask & _IN_IGNORED:
+                    # The directory was removed or moved; poll it from now
+                    # on, which also detects its deletion.
+                    subscription._watched = False
+            if mask & _IN_IGNORED:
+                self._subscriptions.pop(wd, None)
+
+    def Close(self):
+        """Stops watching all directories, which are then always polled."""
+        with self._lock:
+            if self._fd is None:
+                return
+            os.close(self._fd)
+            self._fd = None
+            for subscriptions in self._subscriptions.values():
+                for subscription in subscriptions:
+                    subscription._watched = False
+            self._subscriptions.clear()
+
+
+class DirectoryChanges(object):
+    """Tracks whether a watched directory changed since it was last loaded."""
+
+    def __init__(self, notifier, wd):
+        self._notifier = notifier
+        self._wd = wd
+        # Initially set, so that the directory is loaded at least once.
+        self._changed = True
+        # Whether a subdirectory or event file may have been created in or
+        # moved into the directory.
+        self._added = True
+        self._watched = True
+
+    def Changed(self):
+        """Returns whether the directory may have changed since the last call.
+
+        Callers should load the directory only after this returns True, so
+        that changes made while loading are reported by the next call.
+        """
+        if not self._watched:
+            return True
+        self._notifier.Poll()
+        with self._notifier._lock:
+            changed = self._changed or not self._watched
+            self._changed = False
+        return changed
+
+    def Added(self):
+        """Returns whether an entry may have been added since the last call.
+
+        Only subdirectories and event files count, when created in or moved
+        into the directory. Other changes are reported only by `Changed`.
+        """
+        if not self._watched:
+            return True
+        self._notifier.Poll()
+        with self._notifier._lock:
+            added = self._added or not self._watched
+            self._added = False
+        return added
+
+    def Close(self):
+        """Stops watching the directory."""
+        self._notifier._Unsubscribe(self)
+
+
+class TreeChanges(object):
+    """Tracks whether runs may have been added anywhere under a directory.
+
+    Every directory in the tree is watched, and directories added to it
+    are watched as they are found. Directories that cannot be watched are
+    listed on each call to `Changed` instead, and a remote tree is always
+    reported as changed.
+    """
+
+    def __init__(self, notifier, top):
+        self._notifier = notifier
+        self._top = top
+        self._remote = "://" in top
+        # From path to the `DirectoryChanges` watching it.
+        self._watched = {}
+        # Paths of directories to list on the next call, because they are
+        # not watched. Initially the top, so that the tree is watched then.
+        self._unwatched = set([top])
+
+    def Changed(self):
+        """Returns whether runs may have been added since the last call.
+
+        Initially True. Callers should walk the tree only after this returns
+        True, so that directories added while walking are reported by the
+        next call.
+        """
+        if self._remote:
+            return True
+        changed = bool(self._unwatched)
+        pending = self._unwatched
+        self._unwatched = set()
+        for (path, changes) in list(self._watched.items()):
+            if changes.Added():
+                changed = True
+                pending.add(path)
+        self._Sync(pending)
+        return changed
+
+    def _Sync(self, paths):
+        """Watches and lists `paths`, and any new subdirectories of them."""
+        stack = list(paths)
+        listed = set()
+        while stack:
+            path = stack.pop()
+            if path in listed:
+                continue
+            listed.add(path)
+            if path not in self._watched:
+                changes = self._notifier.Watch(path)
+                if changes is not None:
+                    # Listed next, so the changes so far are accounted for.
+                    changes.Added()
+                    self._watched[path] = changes
+                elif path == self._top or os.path.isdir(path):
+                    self._unwatched.add(path)
+            try:
+                names = os.listdir(path)
+            except OSError:
+                # Removed or moved away; a moved directory is found again
+                # when its new parent is listed.
+                changes = self._watched.pop(path, None)
+                if changes is not None:
+                    changes.Close()
+                if path == self._top:
+                    self._unwatched.add(path)
+                continue
+            for name in names:
+                child = os.path.join(path, name)
+                if child not in self._watched and os.path.isdir(child):
+                    stack.append(child)
@@ -0,0 +1,182 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for change_notifier."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import time
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import change_notifier
+
+
+class ChangeNotifierTest(tb_test.TestCase):
+    def setUp(self):
+        super(ChangeNotifierTest, self).setUp()
+        self.notifier = change_notifier.CreateNotifier()
+        if self.notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(self.notifier.Close)
+        self.directory = os.path.join(self.get_temp_dir(), "run")
+        os.mkdir(self.directory)
+
+    def _Append(self, name, data):
+        with open(os.path.join(self.directory, name), "a") as f:
+            f.write(data)
+
+    def testReportsChanges(self):
+        changes = self.notifier.Watch(self.directory)
+        # Initially changed, so that the directory is loaded once.
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+        self._Append("events.out.tfevents.1", "a")
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+        self._Append("events.out.tfevents.1", "b")
+        self.assertTrue(changes.Changed())
+
+    def testIgnoresOtherDirectories(self):
+        other = os.path.join(self.get_temp_dir(), "other")
+        os.mkdir(other)
+        changes = self.notifier.Watch(self.directory)
+        changes.Changed()
+        with open(os.path.join(other, "events.out.tfevents.1"), "w") as f:
+            f.write("a")
+        self.assertFalse(changes.Changed())
+
+    def testSharedDirectory(self):
+        first = self.notifier.Watch(self.directory)
+        second = self.notifier.Watch(self.directory)
+        first.Changed()
+        second.Changed()
+        self._Append("events.out.tfevents.1", "a")
+        self.assertTrue(first.Changed())
+        self.assertTrue(second.Changed())
+
+    def testPollsDeletedDirectory(self):
+        changes = self.notifier.Watch(self.directory)
+        changes.Changed()
+        shutil.rmtree(self.directory)
+        self.assertTrue(changes.Changed())
+        self.assertTrue(changes.Changed())
+
+    def testCannotWatch(self):
+        self.assertIsNone(self.notifier.Watch("s3://bucket/run"))
+        missing = os.path.join(self.get_temp_dir(), "missing")
+        self.assertIsNone(self.notifier.Watch(missing))
+
+    def testWait(self):
+        self.notifier.Watch(self.directory)
+        start = time.time()
+        self.assertFalse(self.notifier.Wait(0.05))
+        self.assertGreaterEqual(time.time() - start, 0.04)
+        self._Append("events.out.tfevents.1", "a")
+        self.assertTrue(self.notifier.Wait(10))
+        self.assertFalse(self.notifier.Wait(0))
+
+    def testClose(self):
+        changes = self.notifier.Watch(self.directory)
+        changes.Changed()
+        self.notifier.Close()
+        self.assertTrue(changes.Changed())
+        self.assertIsNone(self.notifier.Watch(self.directory))
+
+
+class TreeChangesTest(tb_test.TestCase):
+    def setUp(self):
+        super(TreeChangesTest, self).setUp()
+        self.notifier = change_notifier.CreateNotifier()
+        if self.notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(self.notifier.Close)
+        self.logdir = os.path.join(self.get_temp_dir(), "logdir")
+        os.makedirs(os.path.join(self.logdir, "a", "run"))
+
+    def _Write(self, *names):
+        with open(os.path.join(self.logdir, *names), "a") as f:
+            f.write("a")
+
+    def testReportsAddedDirectories(self):
+        changes = self.notifier.WatchTree(self.logdir)
+        # Initially changed, so that the tree is walked once.
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+        os.makedirs(os.path.join(self.logdir, "a", "new", "deeper"))
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+        # Directories added earlier are watched, too.
+        os.mkdir(os.path.join(self.logdir, "a", "new", "deeper", "run"))
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+
+    def testReportsAddedEventFilesOnly(self):
+        changes = self.notifier.WatchTree(self.logdir)
+        changes.Changed()
+        self._Write("a", "run", "model.ckpt")
+        self._Write("a", "model.ckpt")
+        self.assertFalse(changes.Changed())
+        self._Write("a", "events.out.tfevents.1")
+        self.assertTrue(changes.Changed())
+        # Appending to an event file does not add a run.
+        self._Write("a", "events.out.tfevents.1")
+        self.assertFalse(changes.Changed())
+
+    def testReportsMovedDirectories(self):
+        other = os.path.join(self.get_temp_dir(), "other")
+        os.mkdir(other)
+        changes = self.notifier.WatchTree(self.logdir)
+        changes.Changed()
+        os.rename(other, os.path.join(self.logdir, "moved"))
+        self.assertTrue(changes.Changed())
+        os.rename(
+            os.path.join(self.logdir, "moved"),
+            os.path.join(self.logdir, "a", "moved"),
+        )
+        self.assertTrue(changes.Changed())
+        os.mkdir(os.path.join(self.logdir, "a", "moved", "run"))
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+
+    def testForgetsRemovedDirectories(self):
+        changes = self.notifier.WatchTree(self.logdir)
+        changes.Changed()
+        shutil.rmtree(os.path.join(self.logdir, "a"))
+        changes.Changed()
+        self.assertFalse(changes.Changed())
+        self.assertEqual(list(changes._watched), [self.logdir])
+
+    def testMissingTop(self):
+        missing = os.path.join(self.get_temp_dir(), "missing")
+        changes = self.notifier.WatchTree(missing)
+        self.assertTrue(changes.Changed())
+        self.assertTrue(changes.Changed())
+        os.makedirs(os.path.join(missing, "run"))
+        self.assertTrue(changes.Changed())
+        self.assertFalse(changes.Changed())
+        os.mkdir(os.path.join(missing, "run", "nested"))
+        self.assertTrue(changes.Changed())
+
+    def testRemote(self):
+        changes = self.notifier.WatchTree("s3://bucket/logdir")
+        self.assertTrue(changes.Changed())
+        self.assertTrue(changes.Changed())
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -21,9 +21,17 @@ import time
 
 import six
 
+from tensorboard.backend.event_processing import change_notifier
 from tensorboard.backend.event_processing import data_provider
+from tensorboard.backend.event_processing import discovery_index
+from tensorboard.backend.event_processing import ingest_cache
+from tensorboard.backend.event_processing import ingestion_stats
 from tensorboard.backend.event_processing import plugin_event_multiplexer
+from tensorboard.backend.event_processing import plugin_filter
+from tensorboard.backend.event_processing import reader_state
+from tensorboard.backend.event_processing import reload_scheduler
 from tensorboard.backend.event_processing import tag_types
+from tensorboard.compat.tensorflow_stub.io import gfile as stub_gfile
 from tensorboard.plugins.audio import metadata as audio_metadata
 from tensorboard.plugins.histogram import metadata as histogram_metadata
 from tensorboard.plugins.image import metadata as image_metadata
@@ -45,6 +53,10 @@ DEFAULT_TENSOR_SIZE_GUIDANCE = {
     pr_curve_metadata.PLUGIN_NAME: 100,
 }
 
+# Seconds to wait after a change is detected before reloading the runs
+# that changed, so that further changes made meanwhile are loaded together.
+_CHANGE_RELOAD_DELAY_SECS = 1.0
+
 logger = tb_logging.get_logger()
 
 
@@ -62,12 +74,53 @@ class LocalDataIngester(object):
         """
         tensor_size_guidance = dict(DEFAULT_TENSOR_SIZE_GUIDANCE)
         tensor_size_guidance.update(flags.samples_per_plugin)
+        if flags.metadata_cache_secs > 0:
+            stub_gfile.enable_metadata_cache(flags.metadata_cache_secs)
+        self._change_notifier = None
+        if flags.reload_on_change:
+            self._change_notifier = change_notifier.CreateNotifier()
+        self._discovery_index = None
+        if flags.discovery_index_file or flags.max_walk_threads > 1:
+            discovery_index_file = None
+            if flags.discovery_index_file:
+                discovery_index_file = os.path.expanduser(
+                    flags.discovery_index_file
+                )
+            self._discovery_index = discovery_index.DiscoveryIndex(
+                discovery_index_file, max_workers=flags.max_walk_threads
+            )
+        self._reader_state = None
+        if flags.reader_state_file:
+            self._reader_state = reader_state.ReaderState(
+                os.path.expanduser(flags.reader_state_file)
+            )
+        self._ingest_cache = None
+        if flags.ingest_cache_dir:
+            self._ingest_cache = ingest_cache.IngestCache(
+                os.path.expanduser(flags.ingest_cache_dir)
+            )
+        scheduler = None
+        if flags.max_reload_backoff > 0:
+            scheduler = reload_scheduler.ReloadScheduler(
+                max_backoff_cycles=flags.max_reload_backoff
+            )
         self._multiplexer = plugin_event_multiplexer.EventMultiplexer(
             size_guidance=DEFAULT_SIZE_GUIDANCE,
             tensor_size_guidance=tensor_size_guidance,
             purge_orphaned_data=flags.purge_orphaned_data,
             max_reload_threads=flags.max_reload_threads,
             event_file_active_filter=_get_event_file_active_filter(flags),
+            reader_state=self._reader_state,
+            plugin_filter=_get_plugin_filter(flags),
+            change_notifier=self._change_notifier,
+            discovery_index=self._discovery_index,
+            reload_scheduler=scheduler,
+            ingestion_stats=ingestion_stats.IngestionStats(),
+            tensor_byte_guidance=flags.bytes_per_plugin,
+            max_tensor_bytes_per_run=flags.max_bytes_per_run,
+            max_tensor_bytes=flags.max_total_bytes,
+            blob_references=flags.blobs_on_disk,
+            ingest_cache=self._ingest_cache,
         )
         self._data_provider = data_provider.MultiplexerDataProvider(
             self._multiplexer, flags.logdir or flags.logdir_spec
@@ -78,6 +131,12 @@ class LocalDataIngester(object):
             self._path_to_run = {os.path.expanduser(flags.logdir): None}
         else:
             self._path_to_run = _parse_event_files_spec(flags.logdir_spec)
+        # From logdir path to the `TreeChanges` telling when to walk it,
+        # if there is a change notifier.
+        self._tree_changes = {}
+        if self._change_notifier is not None:
+            for path in self._path_to_run:
+                self._tree_changes[path] = self._change_notifier.WatchTree(path)
 
     @property
     def data_provider(self):
@@ -96,12 +155,7 @@ class LocalDataIngester(object):
             while True:
                 start = time.time()
                 logger.info("TensorBoard reload process beginning")
-                for path, name in six.iteritems(self._path_to_run):
-                    self._multiplexer.AddRunsFromDirectory(path, name)
-                logger.info(
-                    "TensorBoard reload process: Reload the whole Multiplexer"
-                )
-                self._multiplexer.Reload()
+                self._reload_once()
                 duration = time.time() - start
                 logger.info(
                     "TensorBoard done reloading. Load took %0.3f secs", duration
@@ -109,7 +163,7 @@ class LocalDataIngester(object):
                 if self._reload_interval == 0:
                     # Only load the multiplexer once. Do not continuously reload.
                     break
-                time.sleep(self._reload_interval)
+                self._wait_for_reload(start + self._reload_interval)
 
         if self._reload_task == "process":
             logger.info("Launching reload in a child process")
@@ -135,6 +189,45 @@ class LocalDataIngester(object):
         else:
             raise ValueError("unrecognized reload_task: %s" % self._reload_task)
 
+    def _reload_once(self, changed_only=False):
+        """Adds new runs, reloads runs, and saves the state of ingestion.
+
+        Args:
+          changed_only: If true, only the runs whose directories are watched
+            and changed are reloaded. See `EventMultiplexer.Reload`.
+        """
+        for path, name in six.iteritems(self._path_to_run):
+            tree_changes = self._tree_changes.get(path)
+            if tree_changes is None or tree_changes.Changed():
+                self._multiplexer.AddRunsFromDirectory(path, name)
+        logger.info("TensorBoard reload process: Reload the Multiplexer")
+        self._multiplexer.Reload(changed_only=changed_only)
+        if self._discovery_index is not None:
+            self._discovery_index.Save()
+        if self._reader_state is not None:
+            self._reader_state.Save()
+        if self._ingest_cache is not None:
+            self._multiplexer.SaveIngestCache()
+
+    def _wait_for_reload(self, deadline):
+        """Waits until `deadline`, the time of the next reload.
+
+        Meanwhile, runs whose watched directories change are reloaded as the
+        changes are seen, without reloading the other runs.
+        """
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            if self._change_notifier is None:
+                time.sleep(remaining)
+                return
+            if not self._change_notifier.Wait(remaining):
+                continue
+            time.sleep(min(_CHANGE_RELOAD_DELAY_SECS, remaining))
+            if time.time() < deadline:
+                self._reload_once(changed_only=True)
+
 
 def _get_event_file_active_filter(flags):
     """Returns a predicate for whether an event file load timestamp is active.
@@ -153,6 +246,20 @@ def _get_event_file_active_filter(flags):
     return lambda timestamp: timestamp + inactive_secs >= time.time()
 
 
+def _get_plugin_filter(flags):
+    """Returns a `PluginFilter` for the plugin selection flags.
+
+    Returns:
+      A `plugin_filter.PluginFilter`, or None if data for all plugins is
+      to be loaded.
+    """
+    if not (flags.load_plugins or flags.skip_plugins):
+        return None
+    return plugin_filter.PluginFilter(
+        load_plugins=flags.load_plugins, skip_plugins=flags.skip_plugins
+    )
+
+
 def _parse_event_files_spec(logdir_spec):
     """Parses `logdir_spec` into a map from paths to run group names.
 
@@ -37,26 +37,128 @@ class FakeFlags(object):
         purge_orphaned_data=True,
         reload_interval=60,
         samples_per_plugin=None,
+        bytes_per_plugin=None,
+        max_bytes_per_run=0,
+        max_total_bytes=0,
+        blobs_on_disk=False,
         max_reload_threads=1,
+        max_walk_threads=1,
         reload_task="auto",
         window_title="",
         path_prefix="",
         reload_multifile=False,
         reload_multifile_inactive_secs=4000,
+        reload_on_change=False,
+        max_reload_backoff=0,
         generic_data="auto",
+        reader_state_file="",
+        ingest_cache_dir="",
+        discovery_index_file="",
+        metadata_cache_secs=0,
+        load_plugins=None,
+        skip_plugins=None,
     ):
         self.logdir = logdir
         self.logdir_spec = logdir_spec
         self.purge_orphaned_data = purge_orphaned_data
         self.reload_interval = reload_interval
         self.samples_per_plugin = samples_per_plugin or {}
+        self.bytes_per_plugin = bytes_per_plugin or {}
+        self.max_bytes_per_run = max_bytes_per_run
+        self.max_total_bytes = max_total_bytes
+        self.blobs_on_disk = blobs_on_disk
         self.max_reload_threads = max_reload_threads
+        self.max_walk_threads = max_walk_threads
         self.reload_task = reload_task
         self.window_title = window_title
         self.path_prefix = path_prefix
         self.reload_multifile = reload_multifile
         self.reload_multifile_inactive_secs = reload_multifile_inactive_secs
+        self.reload_on_change = reload_on_change
+        self.max_reload_backoff = max_reload_backoff
         self.generic_data = generic_data
+        self.reader_state_file = reader_state_file
+        self.ingest_cache_dir = ingest_cache_dir
+        self.discovery_index_file = discovery_index_file
+        self.metadata_cache_secs = metadata_cache_secs
+        self.load_plugins = load_plugins or []
+        self.skip_plugins = skip_plugins or []
+
+
+class LocalDataIngesterTest(tb_test.TestCase):
+    def testNoDiscoveryIndexByDefault(self):
+        ingester = data_ingester.LocalDataIngester(
+            FakeFlags(self.get_temp_dir())
+        )
+        self.assertIsNone(ingester._discovery_index)
+
+    def testDiscoveryIndexWhenRequested(self):
+        ingester = data_ingester.LocalDataIngester(
+            FakeFlags(self.get_temp_dir(), max_walk_threads=4)
+        )
+        self.assertIsNotNone(ingester._discovery_index)
+        index_file = os.path.join(self.get_temp_dir(), "index.json")
+        ingester = data_ingester.LocalDataIngester(
+            FakeFlags(self.get_temp_dir(), discovery_index_file=index_file)
+        )
+        self.assertIsNotNone(ingester._discovery_index)
+
+    def testReloadOnChangeWalksLogdirOnlyWhenRunsAdded(self):
+        logdir = self.get_temp_dir()
+        ingester = data_ingester.LocalDataIngester(
+            FakeFlags(logdir, reload_on_change=True)
+        )
+        if ingester._change_notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(ingester._change_notifier.Close)
+        multiplexer = ingester.deprecated_multiplexer
+        with mock.patch.object(
+            multiplexer,
+            "AddRunsFromDirectory",
+            wraps=multiplexer.AddRunsFromDirectory,
+        ) as add_runs:
+            ingester._reload_once()
+            self.assertEqual(add_runs.call_count, 1)
+            ingester._reload_once(changed_only=True)
+            ingester._reload_once()
+            self.assertEqual(add_runs.call_count, 1)
+            os.makedirs(os.path.join(logdir, "new", "run"))
+            ingester._reload_once(changed_only=True)
+            self.assertEqual(add_runs.call_count, 2)
+
+    def testWaitForReloadKeepsInterval(self):
+        ingester = data_ingester.LocalDataIngester(
+            FakeFlags(self.get_temp_dir(), reload_interval=5)
+        )
+        now = [100.0]
+
+        def sleep(secs):
+            now[0] += secs
+
+        # Changes are seen right away, after 2 seconds, and not again.
+        waits = [True, True, False]
+
+        def wait(timeout):
+            if len(waits) == 2:
+                sleep(min(timeout, 2))
+            elif len(waits) == 1:
+                sleep(timeout)
+            return waits.pop(0)
+
+        ingester._change_notifier = mock.Mock()
+        ingester._change_notifier.Wait.side_effect = wait
+        with mock.patch.object(
+            data_ingester.time, "time", lambda: now[0]
+        ), mock.patch.object(
+            data_ingester.time, "sleep", sleep
+        ), mock.patch.object(
+            ingester, "_reload_once"
+        ) as reload_once:
+            ingester._wait_for_reload(105.0)
+        self.assertEqual(now[0], 105.0)
+        self.assertEqual(
+            reload_once.call_args_list, [mock.call(changed_only=True)] * 2,
+        )
 
 
 class GetEventFileActiveFilterTest(tb_test.TestCase):
@@ -19,12 +19,15 @@ from __future__ import division
 from __future__ import print_function
 
 import base64
+import collections
 import json
 import random
+import threading
 
 import six
 
 from tensorboard import errors
+from tensorboard.backend.event_processing import event_file_loader
 from tensorboard.compat.proto import summary_pb2
 from tensorboard.data import provider
 from tensorboard.util import tb_logging
@@ -32,9 +35,22 @@ from tensorboard.util import tensor_util
 
 logger = tb_logging.get_logger()
 
+# Number of blob sequences read back from event files to keep in memory,
+# so that reading each blob of a sequence reads its record only once.
+_BLOB_SEQUENCE_CACHE_SIZE = 64
+
+# Default number of bytes of decoded tensors to keep in memory, so that
+# repeated reads of the same tensors skip decoding their protos.
+_DEFAULT_NDARRAY_CACHE_BYTES = 64 * 1024 * 1024
+
 
 class MultiplexerDataProvider(provider.DataProvider):
-    def __init__(self, multiplexer, logdir):
+    def __init__(
+        self,
+        multiplexer,
+        logdir,
+        ndarray_cache_bytes=_DEFAULT_NDARRAY_CACHE_BYTES,
+    ):
         """Trivial initializer.
 
         Args:
@@ -42,9 +58,25 @@ class MultiplexerDataProvider(provider.DataProvider):
             not a boring old `event_multiplexer.EventMultiplexer`).
           logdir: The log directory from which data is being read. Only used
             cosmetically. Should be a `str`.
+          ndarray_cache_bytes: Maximum number of bytes of decoded tensors
+            to keep in memory between reads. If 0, tensors are decoded on
+            every read.
         """
         self._multiplexer = multiplexer
         self._logdir = logdir
+        # LRU cache of blob sequences read back from event files, from
+        # `(file_path, offset, tag)` to an array of blobs.
+        self._blob_sequences = collections.OrderedDict()
+        self._blob_sequences_lock = threading.Lock()
+        # LRU cache of decoded tensors, from `(run, tag, generation, step,
+        # wall_time)` to a `(read-only ndarray, num_bytes)` pair, where
+        # `generation` is that of the reservoir of the tensor. The
+        # generation changes whenever tensors of the reservoir other than
+        # its last are replaced, so entries are never stale.
+        self._ndarrays = collections.OrderedDict()
+        self._ndarrays_bytes = 0
+        self._ndarray_cache_bytes = ndarray_cache_bytes
+        self._ndarrays_lock = threading.Lock()
 
     def _validate_context(self, ctx):
         if type(ctx).__name__ != "RequestContext":
@@ -70,6 +102,16 @@ class MultiplexerDataProvider(provider.DataProvider):
             % (type(downsample), downsample)
         )
 
+    def _validate_range(self, name, value):
+        if value is None:
+            return  # OK
+        if isinstance(value, (tuple, list)) and len(value) == 2:
+            return  # OK
+        raise TypeError(
+            "`%s` must be a pair of bounds, but got %r: %r"
+            % (name, type(value), value)
+        )
+
     def _test_run_tag(self, run_tag_filter, run, tag):
         runs = run_tag_filter.runs
         if runs is not None and run not in runs:
@@ -129,15 +171,86 @@ class MultiplexerDataProvider(provider.DataProvider):
         experiment_id,
         plugin_name,
         downsample=None,
-        run_tag_filter=None
+        run_tag_filter=None,
+        step_range=None,
+        wall_time_range=None
     ):
         self._validate_context(ctx)
         self._validate_experiment_id(experiment_id)
         self._validate_downsample(downsample)
+        self._validate_range("step_range", step_range)
+        self._validate_range("wall_time_range", wall_time_range)
         index = self._index(
             plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_SCALAR
         )
-        return self._read(_convert_scalar_event, index, downsample)
+        result = {}
+        for (run, tags_for_run) in six.iteritems(index):
+            result_for_run = {}
+            result[run] = result_for_run
+            for tag in tags_for_run:
+                columns = self._multiplexer.ScalarColumns(
+                    run,
+                    tag,
+                    downsample=downsample,
+                    step_range=step_range,
+                    wall_time_range=wall_time_range,
+                )
+                if columns is None:
+                    events = _filter_events(
+                        self._multiplexer.Tensors(run, tag),
+                        step_range,
+                        wall_time_range,
+                    )
+                    events = _downsample(events, downsample)
+                    result_for_run[tag] = [
+                        _convert_scalar_event(e) for e in events
+                    ]
+                else:
+                    result_for_run[tag] = _convert_scalar_columns(columns)
+        return result
+
+    def read_scalars_since(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        cursors=None
+    ):
+        self._validate_context(ctx)
+        self._validate_experiment_id(experiment_id)
+        self._validate_downsample(downsample)
+        index = self._index(
+            plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_SCALAR
+        )
+        result = {}
+        for (run, tags_for_run) in six.iteritems(index):
+            result_for_run = {}
+            result[run] = result_for_run
+            for tag in tags_for_run:
+                cursor = _decode_cursor(cursors, run, tag)
+                since = self._multiplexer.ScalarColumnsSince(
+                    run, tag, cursor, downsample=downsample
+                )
+                if since is None:
+                    (
+                        events,
+                        cursor,
+                        incremental,
+                    ) = self._multiplexer.TensorsSince(run, tag, cursor)
+                    events = _downsample(events, downsample)
+                    data = [_convert_scalar_event(e) for e in events]
+                else:
+                    (columns, cursor, incremental) = since
+                    data = _convert_scalar_columns(columns)
+                result_for_run[tag] = provider.TimeSeriesUpdate(
+                    data=data,
+                    cursor=_encode_cursor(cursor),
+                    incremental=incremental,
+                )
+        return result
 
     def list_tensors(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
@@ -156,7 +269,34 @@ class MultiplexerDataProvider(provider.DataProvider):
         experiment_id,
         plugin_name,
         downsample=None,
-        run_tag_filter=None
+        run_tag_filter=None,
+        step_range=None,
+        wall_time_range=None
+    ):
+        self._validate_context(ctx)
+        self._validate_experiment_id(experiment_id)
+        self._validate_downsample(downsample)
+        self._validate_range("step_range", step_range)
+        self._validate_range("wall_time_range", wall_time_range)
+        index = self._index(
+            plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_TENSOR
+        )
+        return self._read(
+            index,
+            downsample,
+            step_range=step_range,
+            wall_time_range=wall_time_range,
+        )
+
+    def read_tensors_since(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        cursors=None
     ):
         self._validate_context(ctx)
         self._validate_experiment_id(experiment_id)
@@ -164,7 +304,25 @@ class MultiplexerDataProvider(provider.DataProvider):
         index = self._index(
             plugin_name, run_tag_filter, summary_pb2.DATA_CLASS_TENSOR
         )
-        return self._read(_convert_tensor_event, index, downsample)
+        result = {}
+        for (run, tags_for_run) in six.iteritems(index):
+            result_for_run = {}
+            result[run] = result_for_run
+            for tag in tags_for_run:
+                (events, cursor, incremental) = self._multiplexer.TensorsSince(
+                    run, tag, _decode_cursor(cursors, run, tag)
+                )
+                events = _downsample(events, downsample)
+                (generation, _) = cursor
+                result_for_run[tag] = provider.TimeSeriesUpdate(
+                    data=[
+                        self._convert_tensor_event(run, tag, generation, e)
+                        for e in events
+                    ],
+                    cursor=_encode_cursor(cursor),
+                    incremental=incremental,
+                )
+        return result
 
     def _index(self, plugin_name, run_tag_filter, data_class_filter):
         """List time series and metadata matching the given filters.
@@ -233,11 +391,24 @@ class MultiplexerDataProvider(provider.DataProvider):
             for (tag, summary_metadata) in tag_to_metadata.items():
                 max_step = None
                 max_wall_time = None
-                for event in self._multiplexer.Tensors(run, tag):
-                    if max_step is None or max_step < event.step:
-                        max_step = event.step
-                    if max_wall_time is None or max_wall_time < event.wall_time:
-                        max_wall_time = event.wall_time
+                # Read through the accumulator: listing tags is not a query
+                # of the run's data for the reload scheduler.
+                accumulator = self._multiplexer.GetAccumulator(run)
+                # Scalars stored as columns are read without building their
+                # tensor events.
+                columns = accumulator.ScalarColumns(tag)
+                if columns is None:
+                    for event in accumulator.Tensors(tag):
+                        if max_step is None or max_step < event.step:
+                            max_step = event.step
+                        if (
+                            max_wall_time is None
+                            or max_wall_time < event.wall_time
+                        ):
+                            max_wall_time = event.wall_time
+                elif len(columns.step):
+                    max_step = int(columns.step.max())
+                    max_wall_time = float(columns.wall_time.max())
                 summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
                 result_for_run[tag] = construct_time_series(
                     max_step=max_step,
@@ -248,30 +419,79 @@ class MultiplexerDataProvider(provider.DataProvider):
                 )
         return result
 
-    def _read(self, convert_event, index, downsample):
-        """Helper to read scalar or tensor data from the multiplexer.
+    def _read(
+        self, index, downsample, step_range=None, wall_time_range=None,
+    ):
+        """Helper to read tensor data from the multiplexer.
 
         Args:
-          convert_event: Takes `plugin_event_accumulator.TensorEvent` to
-            either `provider.ScalarDatum` or `provider.TensorDatum`.
           index: The result of `self._index(...)`.
           downsample: Non-negative `int`; how many samples to return per
             time series.
+          step_range: Optional inclusive `(min_step, max_step)` pair, as
+            passed to `read_tensors`.
+          wall_time_range: Likewise, for wall times.
 
         Returns:
-          A dict of dicts of values returned by `convert_event` calls,
-          suitable to be returned from `read_scalars` or `read_tensors`.
+          A dict of dicts of `provider.TensorDatum` values, suitable to be
+          returned from `read_tensors`.
         """
         result = {}
         for (run, tags_for_run) in six.iteritems(index):
             result_for_run = {}
             result[run] = result_for_run
             for (tag, metadata) in six.iteritems(tags_for_run):
-                events = self._multiplexer.Tensors(run, tag)
-                data = [convert_event(e) for e in events]
-                result_for_run[tag] = _downsample(data, downsample)
+                # Read without a cursor, for the generation of the tensors.
+                (events, (generation, _), _) = self._multiplexer.TensorsSince(
+                    run, tag, None
+                )
+                events = _filter_events(events, step_range, wall_time_range)
+                # Downsample before converting, which is the costly part.
+                events = _downsample(events, downsample)
+                result_for_run[tag] = [
+                    self._convert_tensor_event(run, tag, generation, e)
+                    for e in events
+                ]
         return result
 
+    def _convert_tensor_event(self, run, tag, generation, event):
+        """Converts a tensor event, decoding it through an LRU cache.
+
+        Args:
+          run: The run of the event.
+          tag: The tag of the event.
+          generation: The generation of the reservoir of the event, as in
+            the cursors of `EventMultiplexer.TensorsSince`.
+          event: A `plugin_event_accumulator.TensorEvent`.
+
+        Returns:
+          A `provider.TensorDatum`, whose array is read-only.
+        """
+        key = (run, tag, generation, event.step, event.wall_time)
+        with self._ndarrays_lock:
+            entry = self._ndarrays.get(key)
+            if entry is not None:
+                self._ndarrays.move_to_end(key)
+        if entry is not None:
+            (array, _) = entry
+        else:
+            array = tensor_util.make_ndarray(event.tensor_proto)
+            array.flags.writeable = False
+            num_bytes = _ndarray_bytes(array)
+            if num_bytes <= self._ndarray_cache_bytes:
+                with self._ndarrays_lock:
+                    if key not in self._ndarrays:
+                        self._ndarrays[key] = (array, num_bytes)
+                        self._ndarrays_bytes += num_bytes
+                    while self._ndarrays_bytes > self._ndarray_cache_bytes:
+                        (_, (_, evicted_bytes)) = self._ndarrays.popitem(
+                            last=False
+                        )
+                        self._ndarrays_bytes -= evicted_bytes
+        return provider.TensorDatum(
+            step=event.step, wall_time=event.wall_time, numpy=array
+        )
+
     def list_blob_sequences(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
     ):
@@ -288,7 +508,8 @@ class MultiplexerDataProvider(provider.DataProvider):
                 max_step = None
                 max_wall_time = None
                 max_length = None
-                for event in self._multiplexer.Tensors(run, tag):
+                accumulator = self._multiplexer.GetAccumulator(run)
+                for event in accumulator.TensorReferences(tag):
                     if max_step is None or max_step < event.step:
                         max_step = event.step
                     if max_wall_time is None or max_wall_time < event.wall_time:
@@ -326,7 +547,7 @@ class MultiplexerDataProvider(provider.DataProvider):
             result_for_run = {}
             result[run] = result_for_run
             for tag in tags:
-                events = self._multiplexer.Tensors(run, tag)
+                events = self._multiplexer.TensorReferences(run, tag)
                 data_by_step = {}
                 for event in events:
                     if event.step in data_by_step:
@@ -352,14 +573,43 @@ class MultiplexerDataProvider(provider.DataProvider):
         summary_metadata = self._multiplexer.SummaryMetadata(run, tag)
         if summary_metadata.data_class != summary_pb2.DATA_CLASS_BLOB_SEQUENCE:
             raise errors.NotFoundError(blob_key)
-        tensor_events = self._multiplexer.Tensors(run, tag)
+        tensor_events = self._multiplexer.TensorReferences(run, tag)
         # In case of multiple events at this step, take first (arbitrary).
         matching_step = next((e for e in tensor_events if e.step == step), None)
         if not matching_step:
             raise errors.NotFoundError("%s: no such step %r" % (blob_key, step))
-        tensor = tensor_util.make_ndarray(matching_step.tensor_proto)
+        if matching_step.blob_reference is not None:
+            try:
+                tensor = self._read_blob_sequence(
+                    matching_step.blob_reference, tag
+                )
+            except IOError as e:
+                raise errors.NotFoundError("%s: %s" % (blob_key, e))
+        else:
+            tensor = tensor_util.make_ndarray(matching_step.tensor_proto)
         return tensor[index]
 
+    def _read_blob_sequence(self, blob_reference, tag):
+        """Reads back a blob sequence left on disk, through an LRU cache.
+
+        Raises:
+          IOError: If the blob sequence can't be read.
+        """
+        key = (blob_reference.file_path, blob_reference.offset, tag)
+        with self._blob_sequences_lock:
+            tensor = self._blob_sequences.get(key)
+            if tensor is not None:
+                self._blob_sequences.move_to_end(key)
+                return tensor
+        tensor = tensor_util.make_ndarray(
+            event_file_loader.read_blob_sequence(blob_reference, tag)
+        )
+        with self._blob_sequences_lock:
+            self._blob_sequences[key] = tensor
+            while len(self._blob_sequences) > _BLOB_SEQUENCE_CACHE_SIZE:
+                self._blob_sequences.popitem(last=False)
+        return tensor
+
 
 # TODO(davidsoergel): deduplicate with other implementations
 def _encode_blob_key(experiment_id, plugin_name, run, tag, step, index):
@@ -421,6 +671,60 @@ def _decode_blob_key(key):
     return (experiment_id, plugin_name, run, tag, step, index)
 
 
+def _encode_cursor(cursor):
+    """Encodes a `(generation, length)` cursor of the multiplexer as text."""
+    return "%d.%d" % cursor
+
+
+def _decode_cursor(cursors, run, tag):
+    """Decodes the cursor of a time series, if any, for the multiplexer.
+
+    Args:
+      cursors: `None`, or a nested map of cursors, as passed to
+        `read_scalars_since`.
+      run: The run of the time series.
+      tag: The tag of the time series.
+
+    Returns:
+      A `(generation, length)` pair, or `None` if there is no cursor for
+      the time series or it is malformed, so that the time series is read
+      in full.
+    """
+    text = (cursors or {}).get(run, {}).get(tag)
+    if not isinstance(text, six.string_types):
+        return None
+    parts = text.split(".")
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        return None
+    return (int(parts[0]), int(parts[1]))
+
+
+def _filter_events(events, step_range, wall_time_range):
+    """Selects the events within inclusive step and wall time ranges.
+
+    Args:
+      events: A list of `plugin_event_accumulator.TensorEvent`s.
+      step_range: `None`, or a `(min_step, max_step)` pair, where either
+        bound may be `None`.
+      wall_time_range: Likewise, for wall times.
+
+    Returns:
+      The events within both ranges, in order.
+    """
+    if step_range is None and wall_time_range is None:
+        return events
+    (min_step, max_step) = step_range or (None, None)
+    (min_wall_time, max_wall_time) = wall_time_range or (None, None)
+    return [
+        e
+        for e in events
+        if (min_step is None or e.step >= min_step)
+        and (max_step is None or e.step <= max_step)
+        and (min_wall_time is None or e.wall_time >= min_wall_time)
+        and (max_wall_time is None or e.wall_time <= max_wall_time)
+    ]
+
+
 def _convert_scalar_event(event):
     """Helper for `read_scalars`."""
     return provider.ScalarDatum(
@@ -430,13 +734,25 @@ def _convert_scalar_event(event):
     )
 
 
-def _convert_tensor_event(event):
-    """Helper for `read_tensors`."""
-    return provider.TensorDatum(
-        step=event.step,
-        wall_time=event.wall_time,
-        numpy=tensor_util.make_ndarray(event.tensor_proto),
-    )
+def _convert_scalar_columns(columns):
+    """Helper for `read_scalars`, given downsampled `ScalarColumns`."""
+    return [
+        provider.ScalarDatum(step=step, wall_time=wall_time, value=value)
+        for (step, wall_time, value) in zip(
+            columns.step.tolist(),
+            columns.wall_time.tolist(),
+            columns.value.tolist(),
+        )
+    ]
+
+
+def _ndarray_bytes(array):
+    """Estimates the number of bytes of memory held by an array."""
+    num_bytes = array.nbytes
+    if array.dtype == object:
+        # The elements of string tensors are `bytes` objects.
+        num_bytes += sum(len(x) for x in array.flat)
+    return num_bytes
 
 
 def _convert_blob_sequence_event(experiment_id, plugin_name, run, tag, event):
@@ -20,6 +20,12 @@ from __future__ import print_function
 
 import os
 
+try:
+    # python version >= 3.3
+    from unittest import mock
+except ImportError:
+    import mock  # pylint: disable=unused-import
+
 import six
 from six.moves import xrange  # pylint: disable=redefined-builtin
 import numpy as np
@@ -29,6 +35,7 @@ from tensorboard.backend.event_processing import data_provider
 from tensorboard.backend.event_processing import (
     plugin_event_multiplexer as event_multiplexer,
 )
+from tensorboard.backend.event_processing import reload_scheduler
 from tensorboard.compat.proto import summary_pb2
 from tensorboard.data import provider as base_provider
 from tensorboard.plugins.graph import metadata as graph_metadata
@@ -228,6 +235,29 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
         )  # not written by V2 summary ops
         self.assertEqual(sample.description, "boxen")
 
+    def test_list_scalars_reads_columns(self):
+        multiplexer = self.create_multiplexer()
+        provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir
+        )
+        accumulator = multiplexer.GetAccumulator("polynomials")
+        self.assertIsNotNone(accumulator.ScalarColumns("square"))
+        wall_times = [e.wall_time for e in accumulator.Tensors("square")]
+        # Building tensor events for every kept scalar is the costly part.
+        with mock.patch.object(
+            accumulator, "_ScalarTensorEvents"
+        ) as scalar_tensor_events:
+            result = provider.list_scalars(
+                self.ctx,
+                experiment_id="unused",
+                plugin_name=scalar_metadata.PLUGIN_NAME,
+            )
+        scalar_tensor_events.assert_not_called()
+        sample = result["polynomials"]["square"]
+        self.assertEqual(sample.max_step, 18)
+        self.assertIsInstance(sample.max_step, int)
+        self.assertEqual(sample.max_wall_time, max(wall_times))
+
     def test_list_scalars_filters(self):
         provider = self.create_provider()
 
@@ -269,6 +299,48 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
         )
         self.assertEqual(result, {})
 
+    def test_listing_does_not_record_queries(self):
+        scheduler = reload_scheduler.ReloadScheduler()
+        multiplexer = event_multiplexer.EventMultiplexer(
+            reload_scheduler=scheduler
+        )
+        multiplexer.AddRunsFromDirectory(self.logdir)
+        multiplexer.Reload()
+        provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir
+        )
+        with mock.patch.object(scheduler, "RecordQuery") as record_query:
+            provider.list_plugins(self.ctx, experiment_id="unused")
+            provider.list_runs(self.ctx, experiment_id="unused")
+            for plugin_name in (
+                scalar_metadata.PLUGIN_NAME,
+                histogram_metadata.PLUGIN_NAME,
+            ):
+                provider.list_scalars(
+                    self.ctx, experiment_id="unused", plugin_name=plugin_name
+                )
+                provider.list_tensors(
+                    self.ctx, experiment_id="unused", plugin_name=plugin_name
+                )
+            provider.list_blob_sequences(
+                self.ctx,
+                experiment_id="unused",
+                plugin_name=image_metadata.PLUGIN_NAME,
+            )
+            self.assertEqual(record_query.call_count, 0)
+
+            provider.read_scalars(
+                self.ctx,
+                experiment_id="unused",
+                plugin_name=scalar_metadata.PLUGIN_NAME,
+                run_tag_filter=base_provider.RunTagFilter(runs=["waves"]),
+                downsample=100,
+            )
+            record_query.assert_any_call("waves")
+            self.assertNotIn(
+                mock.call("polynomials"), record_query.call_args_list
+            )
+
     def test_read_scalars(self):
         multiplexer = self.create_multiplexer()
         provider = data_provider.MultiplexerDataProvider(
@@ -317,6 +389,110 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
         )
         self.assertLen(result["waves"]["sine"], 3)
 
+    def test_read_scalars_with_ranges(self):
+        provider = self.create_provider()
+        result = provider.read_scalars(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=scalar_metadata.PLUGIN_NAME,
+            downsample=100,
+            step_range=(3, None),
+        )
+        self.assertEqual(
+            [d.step for d in result["waves"]["sine"]], list(range(3, 10))
+        )
+        self.assertEqual(
+            [d.step for d in result["polynomials"]["cube"]],
+            list(range(3, 30, 3)),
+        )
+        wall_times = [d.wall_time for d in result["waves"]["sine"]]
+        result = provider.read_scalars(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=scalar_metadata.PLUGIN_NAME,
+            downsample=100,
+            step_range=(None, 8),
+            wall_time_range=(wall_times[0], wall_times[-1]),
+        )
+        self.assertEqual(
+            [d.step for d in result["waves"]["sine"]], list(range(3, 9))
+        )
+        with self.assertRaises(TypeError):
+            provider.read_scalars(
+                self.ctx,
+                experiment_id="unused",
+                plugin_name=scalar_metadata.PLUGIN_NAME,
+                downsample=100,
+                step_range=3,
+            )
+
+    def test_read_scalars_since(self):
+        writer = tf.summary.create_file_writer(
+            os.path.join(self.logdir, "live")
+        )
+        with writer.as_default():
+            for i in xrange(5):
+                scalar_summary.scalar("loss", 1.0 / (i + 1), step=i)
+        writer.flush()
+        multiplexer = self.create_multiplexer()
+        provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir
+        )
+        run_tag_filter = base_provider.RunTagFilter(["live"], ["loss"])
+
+        def read(cursors):
+            result = provider.read_scalars_since(
+                self.ctx,
+                experiment_id="unused",
+                plugin_name=scalar_metadata.PLUGIN_NAME,
+                downsample=100,
+                run_tag_filter=run_tag_filter,
+                cursors=cursors,
+            )
+            return result["live"]["loss"]
+
+        update = read(None)
+        self.assertFalse(update.incremental)
+        self.assertEqual([d.step for d in update.data], list(range(5)))
+        with writer.as_default():
+            for i in xrange(5, 8):
+                scalar_summary.scalar("loss", 1.0 / (i + 1), step=i)
+        writer.flush()
+        multiplexer.Reload()
+        cursors = {"live": {"loss": update.cursor}}
+        update = read(cursors)
+        self.assertTrue(update.incremental)
+        # The last datum read before is read again.
+        self.assertEqual([d.step for d in update.data], [4, 5, 6, 7])
+        # Malformed cursors read the whole time series.
+        update = read({"live": {"loss": "bogus"}})
+        self.assertFalse(update.incremental)
+        self.assertLen(update.data, 8)
+
+    def test_read_tensors_since(self):
+        provider = self.create_provider()
+        result = provider.read_tensors_since(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=histogram_metadata.PLUGIN_NAME,
+            downsample=100,
+        )
+        update = result["lebesgue"]["uniform"]
+        self.assertFalse(update.incremental)
+        self.assertLen(update.data, 10)
+        result = provider.read_tensors_since(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=histogram_metadata.PLUGIN_NAME,
+            downsample=100,
+            cursors={"lebesgue": {"uniform": update.cursor}},
+        )
+        self.assertTrue(result["lebesgue"]["uniform"].incremental)
+        self.assertEqual(
+            [d.step for d in result["lebesgue"]["uniform"].data], [10]
+        )
+        self.assertFalse(result["lebesgue"]["bimodal"].incremental)
+
     def test_read_scalars_but_not_rank_0(self):
         provider = self.create_provider()
         run_tag_filter = base_provider.RunTagFilter(["waves"], ["bad"])
@@ -401,6 +577,43 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
                         tensor_util.make_ndarray(event.tensor_proto),
                     )
 
+    def test_read_tensors_caches_decoded_tensors(self):
+        multiplexer = self.create_multiplexer()
+        provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir
+        )
+        kwargs = {
+            "experiment_id": "unused",
+            "plugin_name": histogram_metadata.PLUGIN_NAME,
+            "downsample": 100,
+        }
+        result = provider.read_tensors(self.ctx, **kwargs)
+        with mock.patch.object(
+            tensor_util, "make_ndarray", side_effect=AssertionError
+        ):
+            self.assertEqual(provider.read_tensors(self.ctx, **kwargs), result)
+        datum = result["lebesgue"]["uniform"][0]
+        with self.assertRaises(ValueError):
+            datum.numpy[0, 0] = 1.0
+
+    def test_read_tensors_cache_is_bounded(self):
+        multiplexer = self.create_multiplexer()
+        # Room for exactly one decoded histogram.
+        event = multiplexer.Tensors("lebesgue", "uniform")[0]
+        num_bytes = tensor_util.make_ndarray(event.tensor_proto).nbytes
+        provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir, ndarray_cache_bytes=num_bytes
+        )
+        result = provider.read_tensors(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=histogram_metadata.PLUGIN_NAME,
+            downsample=100,
+        )
+        self.assertLen(result["lebesgue"]["uniform"], 10)
+        self.assertLen(provider._ndarrays, 1)
+        self.assertEqual(provider._ndarrays_bytes, num_bytes)
+
     def test_read_tensors_downsamples(self):
         multiplexer = self.create_multiplexer()
         provider = data_provider.MultiplexerDataProvider(
@@ -414,6 +627,20 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
         )
         self.assertLen(result["lebesgue"]["uniform"], 3)
 
+    def test_read_tensors_with_step_range(self):
+        provider = self.create_provider()
+        result = provider.read_tensors(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=histogram_metadata.PLUGIN_NAME,
+            downsample=3,
+            step_range=(2, 5),
+        )
+        steps = [d.step for d in result["lebesgue"]["uniform"]]
+        self.assertLen(steps, 3)
+        self.assertEqual(steps[-1], 5)
+        self.assertGreaterEqual(steps[0], 2)
+
     def test_list_blob_sequences(self):
         provider = self.create_provider()
 
@@ -507,6 +734,37 @@ class MultiplexerDataProviderTest(tf.test.TestCase):
                 base_provider.BlobSequenceDatum,
             )
 
+    def test_read_blob_with_blob_references(self):
+        provider = self.create_provider()
+        multiplexer = event_multiplexer.EventMultiplexer(blob_references=True)
+        multiplexer.AddRunsFromDirectory(self.logdir)
+        multiplexer.Reload()
+        disk_provider = data_provider.MultiplexerDataProvider(
+            multiplexer, self.logdir
+        )
+        for event in multiplexer.TensorReferences("mondrian", "blue"):
+            self.assertEmpty(event.tensor_proto.string_val)
+
+        result = provider.read_blob_sequences(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=image_metadata.PLUGIN_NAME,
+            downsample=100,
+        )
+        disk_result = disk_provider.read_blob_sequences(
+            self.ctx,
+            experiment_id="unused",
+            plugin_name=image_metadata.PLUGIN_NAME,
+            downsample=100,
+        )
+        self.assertEqual(disk_result, result)
+        for datum in result["mondrian"]["red"]:
+            for value in datum.values:
+                self.assertEqual(
+                    disk_provider.read_blob(self.ctx, blob_key=value.blob_key),
+                    provider.read_blob(self.ctx, blob_key=value.blob_key),
+                )
+
 
 class DownsampleTest(tf.test.TestCase):
     """Tests for the `_downsample` private helper function."""
@@ -53,6 +53,8 @@ class DirectoryLoader(object):
         loader_factory,
         path_filter=lambda x: True,
         active_filter=lambda timestamp: True,
+        change_notifier=None,
+        reader_state=None,
     ):
         """Constructs a new MultiFileDirectoryLoader.
 
@@ -64,6 +66,12 @@ class DirectoryLoader(object):
           path_filter: If specified, only paths matching this filter are loaded.
           active_filter: If specified, any loader whose maximum load timestamp does
             not pass this filter will be marked as inactive and no longer read.
+          change_notifier: Optional `change_notifier.ChangeNotifier`. If given
+            and the directory can be watched, `Load` skips the directory
+            while nothing in it has changed.
+          reader_state: Optional `reader_state.ReaderState` used by the
+            loaders. The entries of files that are no longer in the
+            directory are forgotten, so that it does not grow without bound.
 
         Raises:
           ValueError: If directory or loader_factory are None.
@@ -78,6 +86,12 @@ class DirectoryLoader(object):
         self._active_filter = active_filter
         self._loaders = {}
         self._max_timestamps = {}
+        self._changes = None
+        if change_notifier is not None:
+            self._changes = change_notifier.Watch(directory)
+        self._reader_state = reader_state
+        # The paths found by the last listing of the directory, if any.
+        self._listed_paths = None
 
     def Load(self):
         """Loads new values from all active files.
@@ -89,9 +103,12 @@ class DirectoryLoader(object):
           DirectoryDeletedError: If the directory has been permanently deleted
             (as opposed to being temporarily unavailable).
         """
+        if self._changes is not None and not self._changes.Changed():
+            return
         try:
             all_paths = io_wrapper.ListDirectoryAbsolute(self._directory)
             paths = sorted(p for p in all_paths if self._path_filter(p))
+            self._ForgetRemovedPaths(paths)
             for path in paths:
                 for value in self._LoadPath(path):
                     yield value
@@ -104,6 +121,18 @@ class DirectoryLoader(object):
             else:
                 logger.info("Ignoring error during file loading: %s" % e)
 
+    def _ForgetRemovedPaths(self, paths):
+        """Drops the loaders and reader state of files no longer listed."""
+        if self._listed_paths is not None:
+            for path in self._listed_paths.difference(paths):
+                self._loaders.pop(path, None)
+                self._max_timestamps.pop(path, None)
+        if self._reader_state is not None:
+            self._reader_state.ForgetUnlisted(
+                self._directory, paths, self._listed_paths
+            )
+        self._listed_paths = frozenset(paths)
+
     def _LoadPath(self, path):
         """Generator for values from a single path's loader.
 
@@ -32,10 +32,12 @@ except ImportError:
 
 import tensorflow as tf
 
+from tensorboard.backend.event_processing import change_notifier
 from tensorboard.backend.event_processing import directory_loader
 from tensorboard.backend.event_processing import directory_watcher
 from tensorboard.backend.event_processing import event_file_loader
 from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.backend.event_processing import reader_state
 from tensorboard.util import test_util
 
 
@@ -127,6 +129,26 @@ class DirectoryLoaderTest(tf.test.TestCase):
         self._WriteToFile("tf.event", "c")
         self.assertLoaderYields(["b"])
 
+    def testSkipsUnchangedDirectoryWithChangeNotifier(self):
+        notifier = change_notifier.CreateNotifier()
+        if notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(notifier.Close)
+        self._loader = directory_loader.DirectoryLoader(
+            self._directory, _TimestampedByteLoader, change_notifier=notifier
+        )
+        self._WriteToFile("a", "a")
+        self._WriteToFile("b", "b")
+        self.assertLoaderYields(["a", "b"])
+        with mock.patch.object(
+            io_wrapper, "ListDirectoryAbsolute"
+        ) as mock_listdir:
+            # Nothing changed, so the directory is not listed.
+            self.assertLoaderYields([])
+            self.assertFalse(mock_listdir.called)
+        self._WriteToFile("a", "A")
+        self.assertLoaderYields(["A"])
+
     def testActiveFilter_staticFilterBehavior(self):
         """Tests behavior of a static active_filter."""
         loader_registry = []
@@ -231,6 +253,28 @@ class DirectoryLoaderTest(tf.test.TestCase):
         self.assertEqual(1, len(events))
         self.assertEqual("b", events[0].summary.value[0].tag)
 
+    def testForgetsReaderStateOfDeletedFiles(self):
+        state = reader_state.ReaderState(None)
+        state.SetOffset(os.path.join(self._directory, "gone"), 10)
+        self._loader = directory_loader.DirectoryLoader(
+            self._directory, _TimestampedByteLoader, reader_state=state
+        )
+        self._WriteToFile("a", "a")
+        self._WriteToFile("b", "b")
+        state.SetOffset(os.path.join(self._directory, "a"), 1)
+        state.SetOffset(os.path.join(self._directory, "b"), 1)
+        self.assertLoaderYields(["a", "b"])
+        # Deleted before the directory was first listed.
+        self.assertEqual(
+            sorted(state.Snapshot()),
+            [os.path.join(self._directory, name) for name in ("a", "b")],
+        )
+        os.remove(os.path.join(self._directory, "a"))
+        self.assertLoaderYields([])
+        self.assertEqual(
+            list(state.Snapshot()), [os.path.join(self._directory, "b")]
+        )
+
     def testDoesntCrashWhenUpcomingFileIsDeleted(self):
         # Use actual file loader so it emits the real error.
         self._loader = directory_loader.DirectoryLoader(
@@ -43,7 +43,14 @@ class DirectoryWatcher(object):
     false negatives. However, it should have no false positives.
     """
 
-    def __init__(self, directory, loader_factory, path_filter=lambda x: True):
+    def __init__(
+        self,
+        directory,
+        loader_factory,
+        path_filter=lambda x: True,
+        change_notifier=None,
+        reader_state=None,
+    ):
         """Constructs a new DirectoryWatcher.
 
         Args:
@@ -52,6 +59,12 @@ class DirectoryWatcher(object):
             path and return an object that has a Load method returning an
             iterator that will yield all events that have not been yielded yet.
           path_filter: If specified, only paths matching this filter are loaded.
+          change_notifier: Optional `change_notifier.ChangeNotifier`. If given
+            and the directory can be watched, `Load` skips the directory
+            while nothing in it has changed.
+          reader_state: Optional `reader_state.ReaderState` used by the
+            loaders. The entries of files that are no longer in the
+            directory are forgotten, so that it does not grow without bound.
 
         Raises:
           ValueError: If path_provider or loader_factory are None.
@@ -68,6 +81,12 @@ class DirectoryWatcher(object):
         self._ooo_writes_detected = False
         # The file size for each file at the time it was finalized.
         self._finalized_sizes = {}
+        self._changes = None
+        if change_notifier is not None:
+            self._changes = change_notifier.Watch(directory)
+        self._reader_state = reader_state
+        # The paths found by the last listing of the directory, if any.
+        self._listed_paths = None
 
     def Load(self):
         """Loads new values.
@@ -107,6 +126,9 @@ class DirectoryWatcher(object):
           All values that have not been yielded yet.
         """
 
+        if self._changes is not None and not self._changes.Changed():
+            return
+
         # If the loader exists, check it for a value.
         if not self._loader:
             self._InitializeLoader()
@@ -212,6 +234,11 @@ class DirectoryWatcher(object):
             for path in io_wrapper.ListDirectoryAbsolute(self._directory)
             if self._path_filter(path)
         )
+        if self._reader_state is not None:
+            self._reader_state.ForgetUnlisted(
+                self._directory, paths, self._listed_paths
+            )
+        self._listed_paths = frozenset(paths)
         if not paths:
             return None
 
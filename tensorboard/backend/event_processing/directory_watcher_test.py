@@ -24,8 +24,10 @@ import shutil
 
 import tensorflow as tf
 
+from tensorboard.backend.event_processing import change_notifier
 from tensorboard.backend.event_processing import directory_watcher
 from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.backend.event_processing import reader_state
 
 
 class _ByteLoader(object):
@@ -170,6 +172,22 @@ class DirectoryWatcherTest(tf.test.TestCase):
         self._WriteToFile("b", "b")
         self.assertWatcherYields(["b"])
 
+    def testForgetsReaderStateOfDeletedFiles(self):
+        state = reader_state.ReaderState(None)
+        path_a = os.path.join(self._directory, "a")
+        state.SetOffset(os.path.join(self._directory, "gone"), 10)
+        self._watcher = directory_watcher.DirectoryWatcher(
+            self._directory, _ByteLoader, reader_state=state
+        )
+        self._WriteToFile("a", "a")
+        state.SetOffset(path_a, 1)
+        self._LoadAllEvents()
+        self.assertEqual(list(state.Snapshot()), [path_a])
+        os.remove(path_a)
+        self._WriteToFile("b", "b")
+        self.assertWatcherYields(["b"])
+        self.assertEqual(list(state.Snapshot()), [])
+
     def testRaisesRightErrorWhenDirectoryIsDeleted(self):
         self._WriteToFile("a", "a")
         self._LoadAllEvents()
@@ -177,6 +195,24 @@ class DirectoryWatcherTest(tf.test.TestCase):
         with self.assertRaises(directory_watcher.DirectoryDeletedError):
             self._LoadAllEvents()
 
+    def testSkipsUnchangedDirectoryWithChangeNotifier(self):
+        notifier = change_notifier.CreateNotifier()
+        if notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(notifier.Close)
+        self._watcher = directory_watcher.DirectoryWatcher(
+            self._directory, _ByteLoader, change_notifier=notifier
+        )
+        self._WriteToFile("a", "a")
+        self.assertWatcherYields(["a"])
+        self.stubs.Set(io_wrapper, "ListDirectoryAbsolute", None)
+        # Nothing changed, so the directory is not listed.
+        self.assertWatcherYields([])
+        self.stubs.CleanUp()
+        self._WriteToFile("a", "b")
+        self._WriteToFile("b", "c")
+        self.assertWatcherYields(["b", "c"])
+
     def testDoesntRaiseDirectoryDeletedErrorIfOutageIsTransient(self):
         self._WriteToFile("a", "a")
         self._LoadAllEvents()
@@ -0,0 +1,262 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Incremental discovery of the run directories in a logdir."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import json
+import os
+import threading
+import time
+
+import six
+
+from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.compat import tf
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+_VERSION = 1
+
+# A directory modified this recently before it was listed may have been
+# modified again within the resolution of its mtime, so its mtime is not
+# trusted to detect further changes.
+_MTIME_SLACK_NS = 2 * 10 ** 9
+
+# `os.replace` is atomic on all platforms, but only exists in Python 3.
+_replace = getattr(os, "replace", os.rename)
+
+
+class DiscoveryIndex(object):
+    """Remembers the listings of logdir directories between walks.
+
+    A walk of a logdir lists every directory and checks which of its
+    entries are subdirectories. This index records, for each directory,
+    its entries and which of them are subdirectories, so that later walks
+    do less work:
+
+      - A local directory whose mtime has not changed is not listed again.
+      - Entries seen before are not checked again; only new entries are.
+
+    Directories are listed by up to `max_workers` threads at once. Logdirs
+    that `io_wrapper` traverses by globbing (e.g., on GCS or S3) are not
+    indexed, and are walked by `io_wrapper` with the same number of
+    threads. The index can be saved to a local JSON file by `Save`, so
+    that a later process can start from it.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, path=None, max_workers=1):
+        """Constructs a `DiscoveryIndex`, loading any index saved at `path`.
+
+        Args:
+          path: Optional local path of the JSON index file. It need not
+            exist yet. If it exists but cannot be parsed, it is ignored and
+            will be overwritten on the next `Save`. If `None`, the index is
+            only kept in memory.
+          max_workers: The maximum number of directories to list
+            concurrently.
+        """
+        self._path = path
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        # From directory path to a dict with keys "mtime" (`st_mtime_ns`,
+        # or `None` if it is not trusted or the directory is not local),
+        # "entries" (sorted list of entry names) and "subdirs" (sorted
+        # list of those entry names that are directories).
+        self._directories = self._Load() if path else {}
+        self._dirty = False
+
+    def _Load(self):
+        try:
+            with io.open(self._path, "r", encoding="utf-8") as f:
+                contents = json.load(f)
+        except (IOError, OSError):
+            return {}
+        except ValueError as e:
+            logger.warning(
+                "Ignoring malformed discovery index %s: %s", self._path, e
+            )
+            return {}
+        if (
+            not isinstance(contents, dict)
+            or contents.get("version") != _VERSION
+        ):
+            logger.warning(
+                "Ignoring discovery index %s with unknown format", self._path
+            )
+            return {}
+        return dict(contents.get("directories", {}))
+
+    def GetLogdirSubdirectories(self, path):
+        """Obtains all subdirectories with events files.
+
+        Like `io_wrapper.GetLogdirSubdirectories`, and interchangeable
+        with it. Subdirectories are yielded as they are found; the index is
+        locked until the result has been fully iterated or closed.
+
+        Args:
+          path: The path to a directory under which to find subdirectories.
+
+        Returns:
+          An iterable of absolute paths of all subdirectories each with at
+          least 1 events file directly within the subdirectory.
+
+        Raises:
+          ValueError: If the path passed to the method exists and is not a
+            directory.
+        """
+        if io_wrapper.IsCloudPath(path):
+            return io_wrapper.GetLogdirSubdirectories(
+                path, max_workers=self._max_workers
+            )
+        if not tf.io.gfile.exists(path):
+            # No directory to traverse.
+            return ()
+        if not tf.io.gfile.isdir(path):
+            raise ValueError(
+                "GetLogdirSubdirectories: path exists and is not a "
+                "directory, %s" % path
+            )
+        return self._GetSubdirectories(path)
+
+    def _GetSubdirectories(self, path):
+        with self._lock:
+            for (dir_path, file_names) in io_wrapper.ParallelWalk(
+                path, self._ListDirectory, self._max_workers
+            ):
+                if any(
+                    io_wrapper.IsTensorFlowEventsFile(name)
+                    for name in file_names
+                ):
+                    yield dir_path
+
+    def _ListDirectory(self, dir_path):
+        """Lists a directory for `io_wrapper.ParallelWalk`, from the index.
+
+        Only new entries of the directory are returned to be checked, and
+        the directory is not listed at all if its mtime is unchanged.
+
+        Called from the walk's worker threads while the walking thread
+        holds `_lock`. Each directory is listed by one worker, and entries
+        are only dropped for directories that are no longer walked, so the
+        workers touch disjoint entries.
+        """
+        old_entry = self._directories.get(dir_path)
+        mtime = _GetMtime(dir_path)
+        if (
+            old_entry is not None
+            and mtime is not None
+            and old_entry.get("mtime") == mtime
+        ):
+            return ([], lambda is_dir: self._Result(dir_path, old_entry))
+        scan_time_ns = int(time.time() * 1e9)
+        try:
+            names = sorted(
+                _Basename(name) for name in tf.io.gfile.listdir(dir_path)
+            )
+        except tf.errors.OpError:
+            # Removed, or replaced by a file.
+            self._Drop(dir_path)
+            return None
+        if mtime is not None and mtime > scan_time_ns - _MTIME_SLACK_NS:
+            mtime = None
+        known = {}
+        if old_entry is not None:
+            known = dict.fromkeys(old_entry["entries"], False)
+            known.update(dict.fromkeys(old_entry["subdirs"], True))
+        new_paths = [
+            os.path.join(dir_path, name) for name in names if name not in known
+        ]
+
+        def Finish(is_dir):
+            subdirs = [
+                name
+                for name in names
+                if known.get(name) or is_dir.get(os.path.join(dir_path, name))
+            ]
+            if old_entry is not None:
+                for name in set(old_entry["subdirs"]) - set(subdirs):
+                    self._Drop(os.path.join(dir_path, name))
+            entry = {"mtime": mtime, "entries": names, "subdirs": subdirs}
+            if entry != old_entry:
+                self._directories[dir_path] = entry
+                self._dirty = True
+            return self._Result(dir_path, entry)
+
+        return (new_paths, Finish)
+
+    def _Result(self, dir_path, entry):
+        """Returns the `(subdir_paths, file_names)` of an index entry."""
+        subdirs = entry["subdirs"]
+        subdir_set = set(subdirs)
+        return (
+            [os.path.join(dir_path, name) for name in subdirs],
+            [name for name in entry["entries"] if name not in subdir_set],
+        )
+
+    def _Drop(self, dir_path):
+        """Drops the entries of a directory and its subdirectories."""
+        entry = self._directories.pop(dir_path, None)
+        if entry is None:
+            return
+        self._dirty = True
+        for name in entry["subdirs"]:
+            self._Drop(os.path.join(dir_path, name))
+
+    def Save(self):
+        """Writes the index to disk, if it has a path and has changed.
+
+        The file is replaced atomically, so a crash mid-write leaves the
+        previous index intact. Failures are logged rather than raised.
+        """
+        if not self._path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            contents = {"version": _VERSION, "directories": self._directories}
+            temp_path = "%s.tmp.%d" % (self._path, os.getpid())
+            try:
+                with io.open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(six.text_type(json.dumps(contents, sort_keys=True)))
+                _replace(temp_path, self._path)
+            except (IOError, OSError) as e:
+                logger.warning(
+                    "Failed to save discovery index %s: %s", self._path, e
+                )
+                return
+            self._dirty = False
+
+
+def _GetMtime(dir_path):
+    """Returns the mtime of a local directory in ns, or `None`."""
+    if "://" in dir_path:
+        return None
+    try:
+        return os.stat(dir_path).st_mtime_ns
+    except (OSError, AttributeError):
+        return None
+
+
+def _Basename(name):
+    # Some filesystems list subdirectories with a trailing slash.
+    return name.rstrip("/")
@@ -0,0 +1,167 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for discovery_index."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import time
+
+try:
+    # python version >= 3.3
+    from unittest import mock
+except ImportError:
+    import mock  # pylint: disable=unused-import
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import discovery_index
+from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.compat import tf
+
+
+class DiscoveryIndexTest(tb_test.TestCase):
+    def setUp(self):
+        super(DiscoveryIndexTest, self).setUp()
+        self.logdir = os.path.join(self.get_temp_dir(), "logdir")
+        for run in ("a", "b/b1", "b/b2", "c/not_a_run"):
+            os.makedirs(os.path.join(self.logdir, run))
+        for name in (
+            "a/events.out.tfevents.1",
+            "b/b1/events.out.tfevents.1",
+            "b/b2/events.out.tfevents.1",
+            "c/not_a_run/checkpoint",
+        ):
+            self._Touch(name)
+        self._Age()
+
+    def _Touch(self, name):
+        open(os.path.join(self.logdir, name), "w").close()
+
+    def _Age(self):
+        """Moves the mtime of all directories well into the past."""
+        past = time.time() - 60
+        for (dir_path, _, _) in os.walk(self.logdir):
+            os.utime(dir_path, (past, past))
+
+    def _Runs(self, index):
+        return sorted(
+            os.path.relpath(subdir, self.logdir)
+            for subdir in index.GetLogdirSubdirectories(self.logdir)
+        )
+
+    def _CountingListdir(self):
+        return mock.patch.object(
+            tf.io.gfile, "listdir", side_effect=tf.io.gfile.listdir
+        )
+
+    def testMatchesIoWrapper(self):
+        index = discovery_index.DiscoveryIndex()
+        expected = sorted(
+            os.path.relpath(subdir, self.logdir)
+            for subdir in io_wrapper.GetLogdirSubdirectories(self.logdir)
+        )
+        self.assertEqual(self._Runs(index), expected)
+        self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2"])
+
+    def testParallelWalk(self):
+        index = discovery_index.DiscoveryIndex(max_workers=4)
+        self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2"])
+        os.makedirs(os.path.join(self.logdir, "b", "b3"))
+        self._Touch("b/b3/events.out.tfevents.1")
+        self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2", "b/b3"])
+
+    def testMissingLogdir(self):
+        index = discovery_index.DiscoveryIndex()
+        missing = os.path.join(self.get_temp_dir(), "missing")
+        self.assertEqual(list(index.GetLogdirSubdirectories(missing)), [])
+
+    def testSkipsUnchangedDirectories(self):
+        index = discovery_index.DiscoveryIndex()
+        self._Runs(index)
+        with self._CountingListdir() as listdir:
+            self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2"])
+        self.assertEqual(listdir.call_count, 0)
+
+    def testFindsNewRuns(self):
+        index = discovery_index.DiscoveryIndex()
+        self._Runs(index)
+        os.makedirs(os.path.join(self.logdir, "b", "b3"))
+        self._Touch("b/b3/events.out.tfevents.1")
+        self._Touch("c/not_a_run/events.out.tfevents.1")
+        with self._CountingListdir() as listdir:
+            self.assertEqual(
+                self._Runs(index), ["a", "b/b1", "b/b2", "b/b3", "c/not_a_run"]
+            )
+        # Only the changed directories and the new one are listed.
+        self.assertEqual(listdir.call_count, 3)
+
+    def testForgetsRemovedRuns(self):
+        index = discovery_index.DiscoveryIndex()
+        self._Runs(index)
+        shutil.rmtree(os.path.join(self.logdir, "b"))
+        self.assertEqual(self._Runs(index), ["a"])
+        os.makedirs(os.path.join(self.logdir, "b"))
+        self.assertEqual(self._Runs(index), ["a"])
+
+    def testRelistsRecentlyModifiedDirectories(self):
+        index = discovery_index.DiscoveryIndex()
+        self._Touch("a/events.out.tfevents.2")
+        self._Runs(index)
+        # The mtime of "a" is too recent to be trusted.
+        with self._CountingListdir() as listdir:
+            self._Runs(index)
+        self.assertEqual(
+            [call[0][0] for call in listdir.call_args_list],
+            [os.path.join(self.logdir, "a")],
+        )
+
+    def testPersists(self):
+        path = os.path.join(self.get_temp_dir(), "index.json")
+        index = discovery_index.DiscoveryIndex(path)
+        self._Runs(index)
+        index.Save()
+        index = discovery_index.DiscoveryIndex(path)
+        with self._CountingListdir() as listdir:
+            self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2"])
+        self.assertEqual(listdir.call_count, 0)
+
+    def testIgnoresMalformedFile(self):
+        path = os.path.join(self.get_temp_dir(), "index.json")
+        with open(path, "w") as f:
+            f.write("{not json")
+        index = discovery_index.DiscoveryIndex(path)
+        self.assertEqual(self._Runs(index), ["a", "b/b1", "b/b2"])
+        index.Save()
+        self.assertEqual(
+            self._Runs(discovery_index.DiscoveryIndex(path)),
+            ["a", "b/b1", "b/b2"],
+        )
+
+    def testCloudPathsUseIoWrapper(self):
+        index = discovery_index.DiscoveryIndex()
+        with mock.patch.object(
+            io_wrapper, "GetLogdirSubdirectories", return_value=["gs://b/r"]
+        ) as get_subdirs:
+            self.assertEqual(
+                index.GetLogdirSubdirectories("gs://b"), ["gs://b/r"]
+            )
+        get_subdirs.assert_called_once_with("gs://b", max_workers=1)
+
+
+if __name__ == "__main__":
+    tb_test.main()
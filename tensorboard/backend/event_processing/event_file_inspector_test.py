@@ -17,6 +17,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import gzip
 import os
 import shutil
 
@@ -115,6 +116,26 @@ class EventFileInspectorTest(tf.test.TestCase):
             printable["scalars"]["outoforder_steps"], [(20, 15), (15, 3)]
         )
 
+    def testInspectCompressedEventFile(self):
+        data = [
+            {"tag": "b", "simple_value": 2, "step": 20},
+            {"tag": "b", "simple_value": 2, "step": 15},
+            {"tag": "a", "simple_value": 2, "step": 3},
+        ]
+        self._WriteScalarSummaries(data)
+        [event_file] = [
+            os.path.join(self.logdir, f) for f in os.listdir(self.logdir)
+        ]
+        with open(event_file, "rb") as f:
+            contents = f.read()
+        os.remove(event_file)
+        with gzip.open(event_file + ".gz", "wb") as f:
+            f.write(contents)
+        units = efi.get_inspection_units(event_file=event_file + ".gz")
+        printable = efi.get_dict_to_print(units[0].field_to_obs)
+        self.assertEqual(printable["scalars"]["num_steps"], 3)
+        self.assertEqual(printable["scalars"]["max_step"], 20)
+
     def testInspectTag(self):
         data = [
             {"tag": "c", "histo": 2, "step": 10},
@@ -18,12 +18,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import contextlib
+import functools
+import itertools
+import struct
+import time
+
+import six
 
 from tensorboard import data_compat
 from tensorboard import dataclass_compat
 from tensorboard.compat import tf
 from tensorboard.compat.proto import event_pb2
+from tensorboard.compat.proto import summary_pb2
+from tensorboard.compat.tensorflow_stub.pywrap_tensorflow import masked_crc32c
 from tensorboard.util import platform_util
 from tensorboard.util import tb_logging
 
@@ -31,6 +40,25 @@ from tensorboard.util import tb_logging
 logger = tb_logging.get_logger()
 
 
+# Where to read back the values of a blob sequence tensor that an
+# `EventFileLoader` with `blob_references` did not keep in memory: the
+# path of the event file, and the offset and data length of the record
+# containing the tensor. The `initial_metadata` is the `SummaryMetadata`
+# of the first value of the tensor's tag, as read from the file, which
+# is needed to migrate the value again on reading it back.
+BlobReference = collections.namedtuple(
+    "BlobReference", ["file_path", "offset", "length", "initial_metadata"]
+)
+
+# An event yielded by an `EventFileLoader` with `blob_references`, along
+# with a dict from tag to `BlobReference` for each of its values whose
+# blob sequence tensor was replaced by one with the same shape and dtype
+# but no values.
+EventWithBlobReferences = collections.namedtuple(
+    "EventWithBlobReferences", ["event", "blob_references"]
+)
+
+
 @contextlib.contextmanager
 def _nullcontext():
     """Pre-Python-3.7-compatible standin for contextlib.nullcontext."""
@@ -52,16 +80,36 @@ def _silence_deprecation_warnings():
         return _NULLCONTEXT
 
 
-def _make_tf_record_iterator(file_path):
-    """Returns an iterator over TF records for the given tfrecord file."""
+def _make_tf_record_iterator(
+    file_path, start_offset=0, allow_views=False, compression_type=""
+):
+    """Returns an iterator over TF records for the given tfrecord file.
+
+    Args:
+      file_path: Path to the tfrecord file.
+      start_offset: Byte offset of the first record to read. For compressed
+        files, this is an offset into the decompressed stream.
+      allow_views: If true, the iterator may yield records as `memoryview`s
+        rather than `bytes` where the underlying reader supports it.
+      compression_type: One of `""`, `"ZLIB"` or `"GZIP"`.
+
+    Returns:
+      A tuple `(iterator, start_offset)`, where `start_offset` is the offset
+      actually used; this is 0 if the requested offset is not supported.
+    """
     # If we don't have TF at all, use the stub implementation.
     if tf.__version__ == "stub":
         # TODO(#1711): Reshape stub implementation to fit tf_record_iterator API
         # rather than needlessly emulating the old PyRecordReader_New API.
         logger.debug("Opening a stub record reader pointing at %s", file_path)
-        return _PyRecordReaderIterator(
-            tf.pywrap_tensorflow.PyRecordReader_New, file_path
+        iterator = _PyRecordReaderIterator(
+            tf.pywrap_tensorflow.PyRecordReader_New,
+            file_path,
+            start_offset=start_offset,
+            allow_views=allow_views,
+            compression_type=compression_type,
         )
+        return (iterator, start_offset)
     # If PyRecordReader exists, use it, otherwise use tf_record_iterator().
     # Check old first, then new, since tf_record_iterator existed previously but
     # only gained the semantics we need at the time PyRecordReader was removed.
@@ -77,32 +125,140 @@ def _make_tf_record_iterator(file_path):
         py_record_reader_new = None
     if py_record_reader_new:
         logger.debug("Opening a PyRecordReader pointing at %s", file_path)
-        return _PyRecordReaderIterator(py_record_reader_new, file_path)
-    else:
-        logger.debug("Opening a tf_record_iterator pointing at %s", file_path)
-        # TODO(#1711): Find non-deprecated replacement for tf_record_iterator.
-        with _silence_deprecation_warnings():
-            return tf.compat.v1.io.tf_record_iterator(file_path)
+        iterator = _PyRecordReaderIterator(
+            py_record_reader_new,
+            file_path,
+            start_offset=start_offset,
+            compression_type=compression_type,
+        )
+        return (iterator, start_offset)
+    if start_offset or compression_type:
+        # tf_record_iterator can't seek, and gives no guarantees about
+        # recovering from truncated compressed data, but our stub reader
+        # does both, as long as the path is on a filesystem it supports.
+        from tensorboard.compat import tensorflow_stub
+
+        try:
+            tensorflow_stub.io.gfile.get_filesystem(file_path)
+        except ValueError:
+            if start_offset:
+                logger.warning(
+                    "Cannot resume reading %s at offset %d; reading from start",
+                    file_path,
+                    start_offset,
+                )
+        else:
+            logger.debug(
+                "Opening a stub record reader pointing at %s", file_path
+            )
+            iterator = _PyRecordReaderIterator(
+                tensorflow_stub.pywrap_tensorflow.PyRecordReader_New,
+                file_path,
+                start_offset=start_offset,
+                allow_views=allow_views,
+                compression_type=compression_type,
+                reader_errors=tensorflow_stub.errors,
+            )
+            return (iterator, start_offset)
+    logger.debug("Opening a tf_record_iterator pointing at %s", file_path)
+    options = None
+    if compression_type:
+        options = tf.io.TFRecordOptions(compression_type)
+    # TODO(#1711): Find non-deprecated replacement for tf_record_iterator.
+    with _silence_deprecation_warnings():
+        iterator = tf.compat.v1.io.tf_record_iterator(file_path, options)
+        return (iterator, 0)
+
+
+def _is_record_header(data):
+    """Whether `data` starts with a valid TFRecord length and length crc."""
+    if len(data) < 12:
+        return False
+    (length_crc,) = struct.unpack("<I", data[8:12])
+    return masked_crc32c(data[:8]) == length_crc
+
+
+def _detect_compression_type(file_path):
+    """Guesses whether a TFRecord file is compressed, and how.
+
+    Files named `*.gz` are taken to be GZIP-compressed, and `*.zz` or
+    `*.zlib` ZLIB-compressed. Otherwise, the start of the file is checked
+    for a record header or a gzip or zlib header. Files shorter than a
+    record header can't be told apart (e.g., the first bytes of a record
+    of length 248 also form a zlib header), so their type is unknown until
+    more has been written.
+
+    Args:
+      file_path: Path to the tfrecord file.
+
+    Returns:
+      One of `""`, `"ZLIB"` or `"GZIP"`, or `None` if the file is too short
+      to tell or can't be read.
+    """
+    lowered = file_path.lower()
+    if lowered.endswith(".gz"):
+        return "GZIP"
+    if lowered.endswith((".zz", ".zlib")):
+        return "ZLIB"
+    try:
+        with tf.io.gfile.GFile(file_path, "rb") as f:
+            head = bytearray(f.read(12))
+    except tf.errors.OpError:
+        return None
+    if len(head) < 12:
+        return None
+    if _is_record_header(bytes(head)):
+        return ""
+    if head[:2] == b"\x1f\x8b":
+        return "GZIP"
+    # A zlib header is a deflate method byte and a flag byte making the
+    # pair a multiple of 31, per RFC 1950.
+    if head[0] & 0x0F == 8 and (head[0] << 8 | head[1]) % 31 == 0:
+        return "ZLIB"
+    return ""
 
 
 class _PyRecordReaderIterator(object):
     """Python iterator for TF Records based on PyRecordReader."""
 
-    def __init__(self, py_record_reader_new, file_path):
+    def __init__(
+        self,
+        py_record_reader_new,
+        file_path,
+        start_offset=0,
+        allow_views=False,
+        compression_type="",
+        reader_errors=None,
+    ):
         """Constructs a _PyRecordReaderIterator for the given file path.
 
         Args:
           py_record_reader_new: pywrap_tensorflow.PyRecordReader_New
           file_path: file path of the tfrecord file to read
+          start_offset: byte offset of the first record to read
+          allow_views: if true, yield zero-copy `memoryview`s of records
+            when the reader offers them via `record_view()`
+          compression_type: one of "", "ZLIB" or "GZIP"
+          reader_errors: module defining the error classes raised by the
+            reader, if not `tf.errors`; its data loss errors are re-raised
+            as `tf.errors.DataLossError`
         """
         with tf.compat.v1.errors.raise_exception_on_not_ok_status() as status:
             self._reader = py_record_reader_new(
-                tf.compat.as_bytes(file_path), 0, tf.compat.as_bytes(""), status
+                tf.compat.as_bytes(file_path),
+                start_offset,
+                tf.compat.as_bytes(compression_type),
+                status,
             )
         if not self._reader:
             raise IOError(
                 "Failed to open a record reader pointing to %s" % file_path
             )
+        self._record = self._reader.record
+        if allow_views:
+            self._record = getattr(self._reader, "record_view", self._record)
+        self._allow_views = allow_views
+        self._errors = reader_errors or tf.errors
 
     def __iter__(self):
         return self
@@ -110,61 +266,264 @@ class _PyRecordReaderIterator(object):
     def __next__(self):
         try:
             self._reader.GetNext()
-        except tf.errors.OutOfRangeError as e:
+        except self._errors.OutOfRangeError:
             raise StopIteration
-        return self._reader.record()
+        except self._errors.DataLossError as e:
+            if self._errors is tf.errors:
+                raise
+            raise tf.errors.DataLossError(None, None, e.message)
+        return self._record()
 
     next = __next__  # for python2 compatibility
 
+    def next_batch(self, max_records, max_bytes):
+        """Returns a list of up to `max_records` records; see `_next_batch`."""
+        get_next_batch = getattr(self._reader, "GetNextBatch", None)
+        if get_next_batch is None:
+            return _next_batch(self, max_records, max_bytes)
+        try:
+            return get_next_batch(
+                max_records, max_bytes, views=self._allow_views
+            )
+        except self._errors.DataLossError as e:
+            if self._errors is tf.errors:
+                raise
+            raise tf.errors.DataLossError(None, None, e.message)
+
+
+def _next_batch(iterator, max_records, max_bytes):
+    """Reads a batch of records from a TF record iterator, one at a time.
+
+    Args:
+      iterator: An iterator over TF records that raises
+        `tf.errors.DataLossError` on truncated or corrupt records.
+      max_records: Maximum number of records to read.
+      max_bytes: Stop once the records read total at least this many bytes.
+
+    Returns:
+      A list of records, which is empty at the end of the file.
+
+    Raises:
+      tf.errors.DataLossError: If the next record is truncated or corrupt.
+        If some records were read before it, they are returned instead,
+        and the error is raised again on the next call.
+    """
+    records = []
+    num_bytes = 0
+    try:
+        for record in iterator:
+            records.append(record)
+            num_bytes += len(record)
+            if len(records) >= max_records or num_bytes >= max_bytes:
+                break
+    except tf.errors.DataLossError:
+        if not records:
+            raise
+    return records
+
+
+def _is_truncated_record(error):
+    """Whether a `DataLossError` is for a record cut off by the end of file.
+
+    Both TensorFlow's record readers and the stub reader report such
+    records as "truncated record", and corruption, e.g., a CRC mismatch,
+    otherwise.
+    """
+    return "truncated record" in (error.message or "")
+
+
+# Bytes of framing around the data of each TFRecord: a uint64 length, and
+# uint32 checksums of the length and of the data.
+_RECORD_OVERHEAD_BYTES = 16
+
 
 class RawEventFileLoader(object):
     """An iterator that yields Event protos as serialized bytestrings."""
 
-    def __init__(self, file_path):
+    # Whether `Load` may yield records as `memoryview`s (e.g., into a memory
+    # mapped file) instead of `bytes`. Subclasses that only parse records
+    # and then drop them can enable this to avoid a copy per record.
+    _allow_record_views = False
+
+    # Limits on the size of each batch read by `LoadBatches`.
+    _BATCH_MAX_RECORDS = 1024
+    _BATCH_MAX_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, file_path, reader_state=None, stats=None):
+        """Constructs a loader for the given event file.
+
+        Args:
+          file_path: Path to the event file.
+          reader_state: Optional `reader_state.ReaderState`. If given, reading
+            starts at the offset recorded there for `file_path`, and the
+            offset is updated as records are loaded.
+          stats: Optional `ingestion_stats.RunStats` into which reads are
+            recorded.
+
+        GZIP- and ZLIB-compressed event files are detected and decompressed
+        as they are read; see `_detect_compression_type`. While a file is
+        too short to tell, it is not opened, and detection is retried on
+        each load.
+        """
         if file_path is None:
             raise ValueError("A file path is required")
         self._file_path = platform_util.readahead_file_path(file_path)
-        self._iterator = _make_tf_record_iterator(self._file_path)
+        self._state_key = file_path
+        self._reader_state = reader_state
+        self._stats = stats
+        self._compression_type = None
+        self._iterator = None
+        self._offset = 0
+        # Events read by `Load` but not yet yielded.
+        self._pending = None
+        # Offset of the first record of the last batch read.
+        self._batch_offset = 0
+        self._OpenIterator()
+
+    def _OpenIterator(self):
+        """Opens the file for reading, once its compression is known.
+
+        Returns:
+          Whether the file is open.
+        """
+        compression_type = _detect_compression_type(self._file_path)
+        if compression_type is None:
+            logger.debug("Compression of %s not yet known", self._file_path)
+            return False
+        self._compression_type = compression_type
+        start_offset = 0
+        if self._reader_state is not None:
+            start_offset = self._ValidatedOffset(
+                self._reader_state.GetOffset(self._state_key)
+            )
+        (self._iterator, self._offset) = _make_tf_record_iterator(
+            self._file_path,
+            start_offset=start_offset,
+            allow_views=self._allow_record_views,
+            compression_type=self._compression_type,
+        )
+        self._next_batch = getattr(self._iterator, "next_batch", None)
+        if self._next_batch is None:
+            self._next_batch = functools.partial(_next_batch, self._iterator)
+        self._batch_offset = self._offset
+        return True
+
+    def _ValidatedOffset(self, offset):
+        """Returns `offset`, or 0 if the file is now shorter than that."""
+        if not offset or self._compression_type:
+            # Offsets into compressed files are into the decompressed
+            # stream, so they can't be checked against the file size.
+            return offset
+        try:
+            size = tf.io.gfile.stat(self._file_path).length
+        except tf.errors.OpError:
+            return 0
+        if offset > size:
+            logger.warning(
+                "Recorded offset %d is past the end of %s; reading from start",
+                offset,
+                self._file_path,
+            )
+            return 0
+        return offset
 
     def Load(self):
-        """Loads all new events from disk as raw serialized proto bytestrings.
+        """Loads all new events from disk.
 
         Calling Load multiple times in a row will not 'drop' events as long as the
         return value is not iterated over.
 
         Yields:
-          All event proto bytestrings in the file that have not been yielded yet.
+          All events in the file that have not been yielded yet. For this
+          class, these are raw serialized proto bytestrings; subclasses may
+          yield other types.
+        """
+        while True:
+            if not self._pending:
+                batch = self._LoadBatch()
+                if not batch:
+                    break
+                self._pending = collections.deque(batch)
+            yield self._pending.popleft()
+
+    def LoadBatches(self):
+        """Loads all new events from disk in batches.
+
+        This yields the same events as `Load`, but reads and processes them a
+        batch at a time, which has less overhead per event. Each batch is
+        fully read before it is yielded.
+
+        Yields:
+          Non-empty lists of events, in order, covering all events in the
+          file that have not been yielded yet.
         """
-        logger.debug("Loading events from %s", self._file_path)
+        if self._pending:
+            (batch, self._pending) = (list(self._pending), None)
+            yield batch
         while True:
-            try:
-                yield next(self._iterator)
-            except StopIteration:
-                logger.debug("End of file in %s", self._file_path)
+            batch = self._LoadBatch()
+            if not batch:
                 break
-            except tf.errors.DataLossError as e:
-                # We swallow partial read exceptions; if the record was truncated
-                # and a later update completes it, retrying can then resume from
-                # the same point in the file since the iterator holds the offset.
+            yield batch
+
+    def _LoadBatch(self):
+        """Reads the next batch of raw serialized proto bytestrings.
+
+        Returns:
+          A list of records, which is empty if there are no new complete
+          records in the file.
+        """
+        if self._iterator is None and not self._OpenIterator():
+            return []
+        stats = self._stats
+        start = time.time() if stats is not None else None
+        try:
+            records = self._next_batch(
+                self._BATCH_MAX_RECORDS, self._BATCH_MAX_BYTES
+            )
+        except tf.errors.DataLossError as e:
+            # We swallow partial read exceptions; if the record was truncated
+            # and a later update completes it, retrying can then resume from
+            # the same point in the file since the iterator holds the offset.
+            # A truncated record is the normal end of a file that is still
+            # being written, so only other errors count as data loss.
+            records = []
+            if _is_truncated_record(e):
                 logger.debug("Truncated record in %s (%s)", self._file_path, e)
-                break
-        logger.debug("No more events in %s", self._file_path)
+                if stats is not None:
+                    stats.RecordTruncatedRead()
+            else:
+                logger.debug("Corrupt record in %s (%s)", self._file_path, e)
+                if stats is not None:
+                    stats.RecordDataLoss()
+        if not records:
+            logger.debug("No more events in %s", self._file_path)
+        self._batch_offset = self._offset
+        num_bytes = sum(len(r) for r in records) + (
+            _RECORD_OVERHEAD_BYTES * len(records)
+        )
+        self._offset += num_bytes
+        if stats is not None:
+            stats.RecordRead(len(records), num_bytes, time.time() - start)
+        if self._reader_state is not None:
+            self._reader_state.SetOffset(self._state_key, self._offset)
+        return records
 
 
 class LegacyEventFileLoader(RawEventFileLoader):
     """An iterator that yields parsed Event protos."""
 
-    def Load(self):
-        """Loads all new events from disk.
+    _allow_record_views = True
 
-        Calling Load multiple times in a row will not 'drop' events as long as the
-        return value is not iterated over.
+    def _LoadBatch(self):
+        return self._ParseRecords(
+            super(LegacyEventFileLoader, self)._LoadBatch()
+        )
 
-        Yields:
-          All events in the file that have not been yielded yet.
-        """
-        for record in super(LegacyEventFileLoader, self).Load():
-            yield event_pb2.Event.FromString(record)
+    def _ParseRecords(self, records):
+        """Parses a batch of serialized events into a list of `Event`s."""
+        from_string = event_pb2.Event.FromString
+        return [from_string(record) for record in records]
 
 
 class EventFileLoader(LegacyEventFileLoader):
@@ -173,8 +532,48 @@ class EventFileLoader(LegacyEventFileLoader):
     Specifically, this includes `data_compat` and `dataclass_compat`.
     """
 
-    def __init__(self, file_path):
-        super(EventFileLoader, self).__init__(file_path)
+    # Records at least this large are checked against the plugin filter
+    # before being parsed; smaller ones are parsed and filtered after, since
+    # the C++ parser is faster than decoding their metadata in Python.
+    _MIN_PREFILTER_BYTES = 1024
+
+    def __init__(
+        self,
+        file_path,
+        reader_state=None,
+        plugin_filter=None,
+        stats=None,
+        blob_references=False,
+    ):
+        """Constructs a loader for the given event file.
+
+        Args:
+          file_path: Path to the event file.
+          reader_state: Optional `reader_state.ReaderState`; see
+            `RawEventFileLoader`.
+          plugin_filter: Optional `plugin_filter.PluginFilter`. If given,
+            summary data for unwanted plugins is dropped, and events
+            left with no data of interest are not yielded.
+          stats: Optional `ingestion_stats.RunStats`; see
+            `RawEventFileLoader`.
+          blob_references: If true, the values of blob sequence tensors
+            are dropped after reading, and events are yielded as
+            `EventWithBlobReferences` locating the dropped values; use
+            `read_blob_sequence` to read them back. Values in compressed
+            files, which can't be read back cheaply, are kept.
+        """
+        super(EventFileLoader, self).__init__(
+            file_path, reader_state=reader_state, stats=stats
+        )
+        self._plugin_filter = plugin_filter
+        self._blob_references = blob_references
+        # Tags whose data class is `DATA_CLASS_BLOB_SEQUENCE`, if
+        # `blob_references`.
+        self._blob_sequence_tags = set()
+        # Record locations of the events of the last batch parsed, as
+        # `(offset, length)` pairs, if `blob_references`.
+        self._batch_locations = []
+        self._tag_plugins = {}  # from tag name to plugin name
         # Track initial metadata for each tag, for `dataclass_compat`.
         # This is meant to be tracked per run, not per event file, so
         # there is a potential failure case when the second event file
@@ -187,29 +586,184 @@ class EventFileLoader(LegacyEventFileLoader):
         # file but does not clear the tag cache. This is considered
         # sufficiently improbable that we don't take extra mitigations.
         self._initial_metadata = {}  # from tag name to `SummaryMetadata`
-
-    def Load(self):
-        for event in super(EventFileLoader, self).Load():
+        # When resuming partway through the file, the values carrying each
+        # tag's metadata have been skipped, so restore it from the reader
+        # state onto the first value seen for each such tag.
+        self._resumed_metadata = {}  # from tag name to `SummaryMetadata`
+        if reader_state is not None and self._offset:
+            for (tag, serialized) in six.iteritems(
+                reader_state.GetMetadata(file_path)
+            ):
+                metadata = summary_pb2.SummaryMetadata.FromString(serialized)
+                self._resumed_metadata[tag] = metadata
+                if metadata.plugin_data.plugin_name:
+                    self._tag_plugins[tag] = metadata.plugin_data.plugin_name
+
+    def _ParseRecords(self, records):
+        plugin_filter = self._plugin_filter
+        locate = self._blob_references
+        if plugin_filter is None and not locate:
+            return super(EventFileLoader, self)._ParseRecords(records)
+        from_string = event_pb2.Event.FromString
+        tag_plugins = self._tag_plugins
+        min_prefilter_bytes = self._MIN_PREFILTER_BYTES
+        events = []
+        locations = []
+        offset = self._batch_offset
+        for record in records:
+            length = len(record)
+            record_offset = offset
+            offset += length + _RECORD_OVERHEAD_BYTES
+            if plugin_filter is None:
+                event = from_string(record)
+            else:
+                if length >= min_prefilter_bytes:
+                    if not plugin_filter.WantsRecord(record, tag_plugins):
+                        continue
+                event = from_string(record)
+                if not plugin_filter.FilterEvent(event, tag_plugins):
+                    continue
+            events.append(event)
+            if locate:
+                locations.append((record_offset, length))
+        self._batch_locations = locations
+        return events
+
+    def _LoadBatch(self):
+        result = []
+        events = super(EventFileLoader, self)._LoadBatch()
+        if self._blob_references:
+            locations = self._batch_locations
+        else:
+            locations = itertools.repeat(None)
+        for (event, location) in zip(events, locations):
             event = data_compat.migrate_event(event)
-            events = dataclass_compat.migrate_event(
+            if self._resumed_metadata and event.HasField("summary"):
+                self._RestoreMetadata(event)
+            num_tags = len(self._initial_metadata)
+            migrated = dataclass_compat.migrate_event(
                 event, self._initial_metadata
             )
-            for event in events:
-                yield event
+            if location is None:
+                result.extend(migrated)
+            else:
+                result.extend(
+                    EventWithBlobReferences(e, self._DropBlobs(e, location))
+                    for e in migrated
+                )
+            if (
+                self._reader_state is not None
+                and len(self._initial_metadata) != num_tags
+            ):
+                self._RecordMetadata(event)
+        return result
+
+    def _DropBlobs(self, event, location):
+        """Drops the values of blob sequences in a migrated event.
+
+        Returns:
+          A dict from tag to `BlobReference` for each dropped tensor.
+        """
+        if not event.HasField("summary") or self._compression_type:
+            return _NO_BLOB_REFERENCES
+        (offset, length) = location
+        blob_references = {}
+        for value in event.summary.value:
+            tag = value.tag or value.node_name
+            if (
+                value.metadata.data_class
+                == summary_pb2.DATA_CLASS_BLOB_SEQUENCE
+            ):
+                self._blob_sequence_tags.add(tag)
+            elif tag not in self._blob_sequence_tags:
+                continue
+            if not value.tensor.string_val:
+                continue
+            del value.tensor.string_val[:]
+            blob_references[tag] = BlobReference(
+                self._state_key,
+                offset,
+                length,
+                self._initial_metadata.get(value.tag),
+            )
+        return blob_references or _NO_BLOB_REFERENCES
+
+    def _RestoreMetadata(self, event):
+        for value in event.summary.value:
+            metadata = self._resumed_metadata.pop(value.tag, None)
+            if metadata is not None and not value.HasField("metadata"):
+                value.metadata.CopyFrom(metadata)
+
+    def _RecordMetadata(self, event):
+        for value in event.summary.value:
+            metadata = self._initial_metadata.get(value.tag)
+            if metadata is not None:
+                self._reader_state.SetMetadata(
+                    self._state_key, value.tag, metadata.SerializeToString()
+                )
 
 
 class TimestampedEventFileLoader(EventFileLoader):
-    """An iterator that yields (UNIX timestamp float, Event proto) pairs."""
+    """An iterator that yields (UNIX timestamp float, Event proto) pairs.
 
-    def Load(self):
-        """Loads all new events and their wall time values from disk.
+    With `blob_references`, the second element of each pair is an
+    `EventWithBlobReferences` instead.
+    """
 
-        Calling Load multiple times in a row will not 'drop' events as long as the
-        return value is not iterated over.
+    def _LoadBatch(self):
+        events = super(TimestampedEventFileLoader, self)._LoadBatch()
+        if self._blob_references:
+            return [(item.event.wall_time, item) for item in events]
+        return [(event.wall_time, event) for event in events]
 
-        Yields:
-          Pairs of (UNIX timestamp float, Event proto) for all events in the file
-          that have not been yielded yet.
-        """
-        for event in super(TimestampedEventFileLoader, self).Load():
-            yield (event.wall_time, event)
+
+_NO_BLOB_REFERENCES = {}
+
+
+def read_blob_sequence(blob_reference, tag):
+    """Reads back a blob sequence tensor dropped by an `EventFileLoader`.
+
+    Args:
+      blob_reference: The `BlobReference` for the tensor.
+      tag: The tag of the tensor.
+
+    Returns:
+      The `TensorProto`, as the loader would have yielded it without
+      `blob_references`.
+
+    Raises:
+      IOError: If the record can't be read, or no longer contains the
+        tensor, e.g. because the file was rewritten.
+    """
+    (file_path, offset, length, initial_metadata) = blob_reference
+    try:
+        with tf.io.gfile.GFile(file_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length + _RECORD_OVERHEAD_BYTES)
+    except tf.errors.OpError as e:
+        raise IOError("Failed to read %s: %s" % (file_path, e))
+    data = bytes(data)
+    if len(data) != length + _RECORD_OVERHEAD_BYTES:
+        raise IOError("Truncated record at %d in %s" % (offset, file_path))
+    (record_length, length_crc) = struct.unpack("<QI", data[:12])
+    record = data[12:-4]
+    (record_crc,) = struct.unpack("<I", data[-4:])
+    if (
+        record_length != length
+        or masked_crc32c(data[:8]) != length_crc
+        or masked_crc32c(record) != record_crc
+    ):
+        raise IOError("Corrupt record at %d in %s" % (offset, file_path))
+    event = data_compat.migrate_event(event_pb2.Event.FromString(record))
+    metadata = {}
+    if initial_metadata is not None:
+        metadata[tag] = initial_metadata
+    for migrated in dataclass_compat.migrate_event(event, metadata):
+        for value in migrated.summary.value:
+            if (value.tag or value.node_name) == tag and value.HasField(
+                "tensor"
+            ):
+                return value.tensor
+    raise IOError(
+        "No tensor for tag %r in record at %d in %s" % (tag, offset, file_path)
+    )
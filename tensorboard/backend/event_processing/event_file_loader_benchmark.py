@@ -0,0 +1,193 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for batched event loading.
+
+Reads an event file (or a synthetic file of scalar events) with each of
+the event file loaders, and reports throughput in events per second for:
+
+    iterator  one record at a time from the TF record iterator, parsing
+              and migrating each event as it is read (the former
+              behavior of `Load`)
+    Load      the loader's `Load` generator
+    batches   the loader's `LoadBatches`
+
+Usage:
+
+    bazel run //tensorboard/backend/event_processing:event_file_loader_benchmark -- \\
+        --event_file=/path/to/events.out.tfevents.123
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+
+from tensorboard import data_compat
+from tensorboard import dataclass_compat
+from tensorboard.backend.event_processing import event_file_loader
+from tensorboard.compat.proto import event_pb2
+from tensorboard.summary.writer import record_writer
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_string(
+    "event_file",
+    None,
+    "Event file to read. If unset, a synthetic file of scalar events is "
+    "generated in a temporary directory.",
+)
+flags.DEFINE_integer(
+    "num_events", 200000, "Number of events in the synthetic file."
+)
+flags.DEFINE_integer(
+    "num_tags", 10, "Number of scalar tags in the synthetic file."
+)
+flags.DEFINE_integer(
+    "repeats", 3, "Number of times to run each case; the fastest is reported."
+)
+
+
+def _write_synthetic_file(path):
+    """Writes `--num_events` scalar summary events to `path`."""
+    with open(path, "wb") as f:
+        writer = record_writer.RecordWriter(f)
+        writer.write(
+            event_pb2.Event(file_version="brain.Event:2").SerializeToString()
+        )
+        for step in range(FLAGS.num_events):
+            event = event_pb2.Event(step=step, wall_time=1e9 + step)
+            event.summary.value.add(
+                tag="tag_%d" % (step % FLAGS.num_tags), simple_value=step * 0.5,
+            )
+            writer.write(event.SerializeToString())
+
+
+def _iterate_raw(path):
+    (iterator, _) = event_file_loader._make_tf_record_iterator(path)
+    return sum(1 for _ in iterator)
+
+
+def _iterate_parsed(path):
+    (iterator, _) = event_file_loader._make_tf_record_iterator(path)
+    initial_metadata = {}
+    count = 0
+    for record in iterator:
+        event = data_compat.migrate_event(event_pb2.Event.FromString(record))
+        count += len(dataclass_compat.migrate_event(event, initial_metadata))
+    return count
+
+
+def _load(loader_class):
+    return lambda path: sum(1 for _ in loader_class(path).Load())
+
+
+def _load_batches(loader_class):
+    return lambda path: sum(
+        len(batch) for batch in loader_class(path).LoadBatches()
+    )
+
+
+def _cases():
+    """Returns a list of `(loader, method, count_events)` tuples."""
+    raw = event_file_loader.RawEventFileLoader
+    parsed = event_file_loader.EventFileLoader
+    return [
+        ("raw", "iterator", _iterate_raw),
+        ("raw", "Load", _load(raw)),
+        ("raw", "batches", _load_batches(raw)),
+        ("event", "iterator", _iterate_parsed),
+        ("event", "Load", _load(parsed)),
+        ("event", "batches", _load_batches(parsed)),
+    ]
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+
+    temp_dir = None
+    if FLAGS.event_file:
+        path = FLAGS.event_file
+    else:
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "events.out.tfevents.synthetic")
+        logger.info("Writing %d synthetic events...", FLAGS.num_events)
+        _write_synthetic_file(path)
+
+    try:
+        headers = (
+            "LOADER",
+            "METHOD",
+            "EVENTS",
+            "SECONDS",
+            "EVENTS_PER_SEC",
+            "SPEEDUP",
+        )
+        logger.info(_format_line(headers, headers))
+        # Warm up, so that lazy initialization (e.g., of TensorFlow) isn't
+        # attributed to the first case.
+        _iterate_raw(path)
+        baselines = {}
+        for (loader, method, count_events) in _cases():
+            seconds = float("inf")
+            for _ in range(FLAGS.repeats):
+                start = time.time()
+                count = count_events(path)
+                seconds = min(seconds, time.time() - start)
+            rate = count / max(seconds, 1e-9)
+            baseline = baselines.setdefault(loader, rate)
+            fields = (loader, method, count, seconds, rate, rate / baseline)
+            logger.info(_format_line(headers, fields))
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    app.run(main)
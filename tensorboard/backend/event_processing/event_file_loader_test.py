@@ -20,15 +20,25 @@ from __future__ import division
 from __future__ import print_function
 
 import abc
+import gzip
 import io
 import os
+import zlib
 
 import six
 import tensorflow as tf
 
 
 from tensorboard.backend.event_processing import event_file_loader
+from tensorboard.backend.event_processing import ingestion_stats
+from tensorboard.backend.event_processing import plugin_filter
+from tensorboard.backend.event_processing import (
+    reader_state as reader_state_lib,
+)
 from tensorboard.compat.proto import event_pb2
+from tensorboard.compat.proto import summary_pb2
+from tensorboard.compat.proto import tensor_pb2
+from tensorboard.compat.proto import types_pb2
 from tensorboard.summary.writer import record_writer
 
 
@@ -41,8 +51,17 @@ class EventFileLoaderTestBase(object):
         with open(os.path.join(self.get_temp_dir(), FILENAME), "ab") as f:
             record_writer.RecordWriter(f).write(data)
 
-    def _make_loader(self):
-        return self._loader_class(os.path.join(self.get_temp_dir(), FILENAME))
+    def _make_loader(self, reader_state=None, stats=None):
+        return self._loader_class(
+            os.path.join(self.get_temp_dir(), FILENAME),
+            reader_state=reader_state,
+            stats=stats,
+        )
+
+    def _make_reader_state(self):
+        return reader_state_lib.ReaderState(
+            os.path.join(self.get_temp_dir(), "reader_state.json")
+        )
 
     @abc.abstractproperty
     def _loader_class(self):
@@ -102,6 +121,139 @@ class EventFileLoaderTestBase(object):
         loader.Load()
         self.assertEventWallTimes(loader.Load(), [1.0])
 
+    def testLoadBatches(self):
+        for wall_time in range(1, 6):
+            self._append_record(_make_event(wall_time=float(wall_time)))
+        loader = self._make_loader()
+        loader._BATCH_MAX_RECORDS = 2
+        batches = list(loader.LoadBatches())
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEventWallTimes(
+            [x for batch in batches for x in batch], [1.0, 2.0, 3.0, 4.0, 5.0],
+        )
+        self.assertEmpty(list(loader.LoadBatches()))
+        self._append_record(_make_event(wall_time=6.0))
+        self.assertEventWallTimes(next(loader.LoadBatches()), [6.0])
+
+    def testLoad_partialIterationKeepsRestOfBatch(self):
+        for wall_time in range(1, 5):
+            self._append_record(_make_event(wall_time=float(wall_time)))
+        loader = self._make_loader()
+        loader._BATCH_MAX_RECORDS = 3
+        self.assertEventWallTimes([next(loader.Load())], [1.0])
+        self.assertEventWallTimes(next(loader.LoadBatches()), [2.0, 3.0])
+        self.assertEventWallTimes(loader.Load(), [4.0])
+
+    def testLoadBatches_stopsBeforeTruncatedRecord(self):
+        self._append_record(_make_event(wall_time=1.0))
+        with io.BytesIO() as mem_f:
+            record_writer.RecordWriter(mem_f).write(_make_event(wall_time=2.0))
+            record = mem_f.getvalue()
+        filepath = os.path.join(self.get_temp_dir(), FILENAME)
+        with open(filepath, "ab", buffering=0) as f:
+            f.write(record[:-1])
+            loader = self._make_loader()
+            self.assertEventWallTimes(
+                [x for batch in loader.LoadBatches() for x in batch], [1.0]
+            )
+            self.assertEmpty(list(loader.LoadBatches()))
+            f.write(record[-1:])
+            self.assertEventWallTimes(next(loader.LoadBatches()), [2.0])
+
+    def testLoad_truncatedRecordIsNotDataLoss(self):
+        self._append_record(_make_event(wall_time=1.0))
+        with io.BytesIO() as mem_f:
+            record_writer.RecordWriter(mem_f).write(_make_event(wall_time=2.0))
+            record = mem_f.getvalue()
+        filepath = os.path.join(self.get_temp_dir(), FILENAME)
+        stats = ingestion_stats.IngestionStats()
+        loader = self._make_loader(stats=stats.ForRun("run"))
+        with open(filepath, "ab", buffering=0) as f:
+            f.write(record[:-1])
+            self.assertEventWallTimes(loader.Load(), [1.0])
+            self.assertEmpty(list(loader.Load()))
+        run_stats = stats.AsDict()["runs"]["run"]
+        self.assertEqual(run_stats["data_loss_errors"], 0)
+        self.assertGreater(run_stats["truncated_reads"], 0)
+
+    def testLoad_corruptRecordIsDataLoss(self):
+        self._append_record(_make_event(wall_time=1.0))
+        with io.BytesIO() as mem_f:
+            record_writer.RecordWriter(mem_f).write(_make_event(wall_time=2.0))
+            record = bytearray(mem_f.getvalue())
+        # Flip a bit of the data, so that its CRC no longer matches.
+        record[12] ^= 1
+        with open(os.path.join(self.get_temp_dir(), FILENAME), "ab") as f:
+            f.write(record)
+        stats = ingestion_stats.IngestionStats()
+        loader = self._make_loader(stats=stats.ForRun("run"))
+        self.assertEventWallTimes(loader.Load(), [1.0])
+        run_stats = stats.AsDict()["runs"]["run"]
+        self.assertEqual(run_stats["data_loss_errors"], 1)
+        self.assertEqual(run_stats["truncated_reads"], 0)
+
+    def _test_compressed_event_file(self, wbits, open_empty=False):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, wbits)
+        filepath = os.path.join(self.get_temp_dir(), FILENAME)
+
+        def append(wall_time):
+            with io.BytesIO() as mem_f:
+                record_writer.RecordWriter(mem_f).write(
+                    _make_event(wall_time=wall_time)
+                )
+                record = mem_f.getvalue()
+            with open(filepath, "ab") as f:
+                f.write(compressor.compress(record))
+                f.write(compressor.flush(zlib.Z_SYNC_FLUSH))
+
+        if open_empty:
+            # Too short to tell its compression until data is written.
+            open(filepath, "ab").close()
+            loader = self._make_loader()
+            self.assertEmpty(list(loader.Load()))
+        append(1.0)
+        append(2.0)
+        if not open_empty:
+            loader = self._make_loader()
+        self.assertEventWallTimes(loader.Load(), [1.0, 2.0])
+        append(3.0)
+        self.assertEventWallTimes(loader.Load(), [3.0])
+        self.assertEmpty(list(loader.Load()))
+
+    def testLoad_gzipEventFile(self):
+        self._test_compressed_event_file(16 + zlib.MAX_WBITS)
+
+    def testLoad_zlibEventFile(self):
+        self._test_compressed_event_file(zlib.MAX_WBITS)
+
+    def testLoad_gzipEventFileOpenedEmpty(self):
+        self._test_compressed_event_file(16 + zlib.MAX_WBITS, open_empty=True)
+
+    def testLoad_zlibEventFileOpenedEmpty(self):
+        self._test_compressed_event_file(zlib.MAX_WBITS, open_empty=True)
+
+    def testLoad_resumesFromReaderState(self):
+        self._append_record(_make_event(wall_time=1.0))
+        self._append_record(_make_event(wall_time=2.0))
+        state = self._make_reader_state()
+        self.assertEventWallTimes(self._make_loader(state).Load(), [1.0, 2.0])
+        state.Save()
+        self._append_record(_make_event(wall_time=3.0))
+        state = self._make_reader_state()
+        loader = self._make_loader(state)
+        self.assertEventWallTimes(loader.Load(), [3.0])
+        self._append_record(_make_event(wall_time=4.0))
+        self.assertEventWallTimes(loader.Load(), [4.0])
+        filepath = os.path.join(self.get_temp_dir(), FILENAME)
+        self.assertEqual(state.GetOffset(filepath), os.path.getsize(filepath))
+
+    def testLoad_readerStateOffsetPastEndOfFile(self):
+        self._append_record(_make_event(wall_time=1.0))
+        state = self._make_reader_state()
+        filepath = os.path.join(self.get_temp_dir(), FILENAME)
+        state.SetOffset(filepath, os.path.getsize(filepath) + 1)
+        self.assertEventWallTimes(self._make_loader(state).Load(), [1.0])
+
 
 class RawEventFileLoaderTest(EventFileLoaderTestBase, tf.test.TestCase):
     @property
@@ -129,6 +281,146 @@ class EventFileLoaderTest(EventFileLoaderTestBase, tf.test.TestCase):
             event_wall_times_in_order,
         )
 
+    def testLoad_resumeRestoresSummaryMetadata(self):
+        metadata = summary_pb2.SummaryMetadata()
+        metadata.plugin_data.plugin_name = "scalars"
+        first = event_pb2.Event(step=1)
+        first.summary.value.add(
+            tag="loss", metadata=metadata, tensor=_scalar_tensor(1.0)
+        )
+        self._append_record(first.SerializeToString())
+        state = self._make_reader_state()
+        list(self._make_loader(state).Load())
+        second = event_pb2.Event(step=2)
+        second.summary.value.add(tag="loss", tensor=_scalar_tensor(2.0))
+        self._append_record(second.SerializeToString())
+        events = list(self._make_loader(state).Load())
+        self.assertEqual([e.step for e in events], [2])
+        value = events[0].summary.value[0]
+        self.assertEqual(value.metadata.plugin_data.plugin_name, "scalars")
+        self.assertEqual(
+            value.metadata.data_class, summary_pb2.DATA_CLASS_SCALAR
+        )
+
+    def testLoad_pluginFilter(self):
+        image_metadata = summary_pb2.SummaryMetadata()
+        image_metadata.plugin_data.plugin_name = "images"
+        scalar_metadata = summary_pb2.SummaryMetadata()
+        scalar_metadata.plugin_data.plugin_name = "scalars"
+        image = tensor_pb2.TensorProto(dtype=types_pb2.DT_STRING)
+        image.string_val.append(b"\x89PNG" + b"\x00" * 2000)
+        for step in range(3):
+            # Images are large enough to be dropped before being parsed.
+            event = event_pb2.Event(step=step)
+            event.summary.value.add(
+                tag="image",
+                metadata=image_metadata if step == 0 else None,
+                tensor=image,
+            )
+            self._append_record(event.SerializeToString())
+            event = event_pb2.Event(step=step)
+            event.summary.value.add(
+                tag="loss",
+                metadata=scalar_metadata if step == 0 else None,
+                tensor=_scalar_tensor(step),
+            )
+            event.summary.value.add(
+                tag="small_image",
+                metadata=image_metadata if step == 0 else None,
+                tensor=_scalar_tensor(step),
+            )
+            self._append_record(event.SerializeToString())
+        loader = event_file_loader.EventFileLoader(
+            os.path.join(self.get_temp_dir(), FILENAME),
+            plugin_filter=plugin_filter.PluginFilter(skip_plugins=["images"]),
+        )
+        events = list(loader.Load())
+        self.assertEqual([e.step for e in events], [0, 1, 2])
+        for event in events:
+            self.assertEqual([v.tag for v in event.summary.value], ["loss"])
+
+    def _append_image_events(self):
+        """Appends events with an image tag and a scalar tag.
+
+        Returns:
+          A list of the image tensors, in order.
+        """
+        image_metadata = summary_pb2.SummaryMetadata()
+        image_metadata.plugin_data.plugin_name = "images"
+        scalar_metadata = summary_pb2.SummaryMetadata()
+        scalar_metadata.plugin_data.plugin_name = "scalars"
+        images = []
+        for step in range(3):
+            image = tensor_pb2.TensorProto(dtype=types_pb2.DT_STRING)
+            image.tensor_shape.dim.add(size=3)
+            image.string_val.extend([b"1", b"1", b"\x89PNG%d" % step])
+            images.append(image)
+            event = event_pb2.Event(step=step)
+            event.summary.value.add(
+                tag="image",
+                metadata=image_metadata if step == 0 else None,
+                tensor=image,
+            )
+            event.summary.value.add(
+                tag="loss",
+                metadata=scalar_metadata if step == 0 else None,
+                tensor=_scalar_tensor(step),
+            )
+            self._append_record(event.SerializeToString())
+        return images
+
+    def testLoad_blobReferences(self):
+        images = self._append_image_events()
+        loader = event_file_loader.EventFileLoader(
+            os.path.join(self.get_temp_dir(), FILENAME), blob_references=True
+        )
+        items = list(loader.Load())
+        self.assertEqual([item.event.step for item in items], [0, 1, 2])
+        for (item, image) in zip(items, images):
+            self.assertItemsEqual(item.blob_references.keys(), ["image"])
+            (image_value, loss_value) = item.event.summary.value
+            self.assertEmpty(image_value.tensor.string_val)
+            self.assertEqual(
+                image_value.tensor.tensor_shape, image.tensor_shape
+            )
+            self.assertLen(loss_value.tensor.float_val, 1)
+            self.assertEqual(
+                event_file_loader.read_blob_sequence(
+                    item.blob_references["image"], "image"
+                ),
+                image,
+            )
+
+    def testLoad_blobReferencesInCompressedFile(self):
+        images = self._append_image_events()
+        path = os.path.join(self.get_temp_dir(), FILENAME)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path + ".gz", "wb") as f:
+            f.write(_gzip(data))
+        loader = event_file_loader.EventFileLoader(
+            path + ".gz", blob_references=True
+        )
+        items = list(loader.Load())
+        self.assertEqual(
+            [item.event.summary.value[0].tensor for item in items], images
+        )
+        for item in items:
+            self.assertEmpty(item.blob_references)
+
+    def testReadBlobSequence_fileRewritten(self):
+        self._append_image_events()
+        path = os.path.join(self.get_temp_dir(), FILENAME)
+        loader = event_file_loader.EventFileLoader(path, blob_references=True)
+        blob_reference = list(loader.Load())[1].blob_references["image"]
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 1000)
+        with self.assertRaises(IOError):
+            event_file_loader.read_blob_sequence(blob_reference, "image")
+        os.remove(path)
+        with self.assertRaises(IOError):
+            event_file_loader.read_blob_sequence(blob_reference, "image")
+
 
 class TimestampedEventFileLoaderTest(EventFileLoaderTestBase, tf.test.TestCase):
     @property
@@ -146,9 +438,51 @@ class TimestampedEventFileLoaderTest(EventFileLoaderTestBase, tf.test.TestCase):
         )
 
 
+class DetectCompressionTypeTest(tf.test.TestCase):
+    def _write(self, name, contents):
+        path = os.path.join(self.get_temp_dir(), name)
+        with open(path, "wb") as f:
+            f.write(contents)
+        return path
+
+    def testDetect(self):
+        with io.BytesIO() as mem_f:
+            record_writer.RecordWriter(mem_f).write(_make_event(step=1))
+            record = mem_f.getvalue()
+        cases = [
+            ("plain", record, ""),
+            ("empty", b"", None),
+            ("short", record[:11], None),
+            # Also a zlib header, until the rest of the record is written.
+            ("short_record_of_length_248", b"\xf8\x00", None),
+            ("zlib", zlib.compress(record), "ZLIB"),
+            ("gzip", _gzip(record), "GZIP"),
+            ("empty.gz", b"", "GZIP"),
+            ("empty.zz", b"", "ZLIB"),
+        ]
+        for (name, contents, expected) in cases:
+            path = self._write(name, contents)
+            self.assertEqual(
+                event_file_loader._detect_compression_type(path),
+                expected,
+                name,
+            )
+
+
+def _gzip(data):
+    with io.BytesIO() as mem_f:
+        with gzip.GzipFile(fileobj=mem_f, mode="wb") as f:
+            f.write(data)
+        return mem_f.getvalue()
+
+
 def _make_event(**kwargs):
     return event_pb2.Event(**kwargs).SerializeToString()
 
 
+def _scalar_tensor(value):
+    return tensor_pb2.TensorProto(dtype=types_pb2.DT_FLOAT, float_val=[value])
+
+
 if __name__ == "__main__":
     tf.test.main()
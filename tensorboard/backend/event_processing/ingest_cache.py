@@ -0,0 +1,281 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""On-disk snapshots of the data of runs, for fast restarts."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+
+import numpy as np
+import six
+
+from tensorboard.compat import tf
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+_VERSION = 1
+
+_DEFAULT_MIN_SAVE_INTERVAL_SECS = 300
+
+# `os.replace` is atomic on all platforms, but only exists in Python 3.
+_replace = getattr(os, "replace", os.rename)
+
+
+class IngestCache(object):
+    """A directory of snapshots of the data loaded for each run.
+
+    Each snapshot is a state as returned by `EventAccumulator.GetState`,
+    including the reader state, so that a restarted server can restore
+    the data of a run and only read the events appended since. A
+    snapshot is only loaded if all event files it was read from still
+    exist and are at least as long as when they were read, and those not
+    appended to since have the same size and mtime; otherwise, the run is
+    read from scratch.
+
+    Snapshots are NumPy `.npz` files, holding a JSON header and arrays,
+    and are read without unpickling. Each is replaced atomically.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self, cache_dir, min_save_interval_secs=_DEFAULT_MIN_SAVE_INTERVAL_SECS
+    ):
+        """Constructs an `IngestCache`.
+
+        Args:
+          cache_dir: Local directory of the snapshots. It is created if it
+            does not exist.
+          min_save_interval_secs: Minimum number of seconds between saves
+            of the snapshot of a run, since each save writes all its data.
+        """
+        self._cache_dir = cache_dir
+        self._min_save_interval_secs = min_save_interval_secs
+        self._lock = threading.Lock()
+        # From run path to `(time, version)` of its last save or load.
+        self._saved = {}
+
+    def _SnapshotPath(self, run_path):
+        digest = hashlib.sha256(run_path.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, digest + ".npz")
+
+    def Load(self, run_path):
+        """Loads the snapshot of a run, if there is a fresh one.
+
+        Args:
+          run_path: The path of the run, as passed to `Save`.
+
+        Returns:
+          The state passed to `Save`, or `None` if there is no snapshot for
+          the run, or it can't be read, or its event files have changed.
+        """
+        snapshot_path = self._SnapshotPath(run_path)
+        try:
+            with np.load(snapshot_path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+            header = json.loads(arrays.pop("header").tobytes().decode("utf-8"))
+        except (IOError, OSError):
+            return None
+        except (ValueError, KeyError, zipfile.BadZipfile) as e:
+            logger.warning(
+                "Ignoring malformed snapshot %s: %s", snapshot_path, e
+            )
+            return None
+        if header.get("version") != _VERSION or header.get("path") != run_path:
+            logger.warning(
+                "Ignoring snapshot %s with unknown format", snapshot_path
+            )
+            return None
+        for (file_path, (size, mtime)) in six.iteritems(header["files"]):
+            if not _IsFresh(file_path, size, mtime):
+                logger.info(
+                    "Not restoring %s from cache: %s has changed",
+                    run_path,
+                    file_path,
+                )
+                return None
+        blob_data = arrays.pop("blobs").tobytes()
+        blob_offsets = arrays.pop("blob_offsets").tolist()
+        blobs = [
+            blob_data[start:end]
+            for (start, end) in zip(blob_offsets, blob_offsets[1:])
+        ]
+        state = _Decode(header["state"], blobs, arrays)
+        with self._lock:
+            self._saved[run_path] = (
+                time.time(),
+                state.get("num_loaded_events"),
+            )
+        logger.info("Restored %s from cache", run_path)
+        return state
+
+    def IsSaveDue(self, run_path, version):
+        """Whether to save a new snapshot of a run.
+
+        Args:
+          run_path: The path of the run.
+          version: A value that changes whenever the data of the run does,
+            e.g. its number of loaded events.
+
+        Returns:
+          True if `version` differs from that of the last snapshot saved or
+          loaded, and the snapshot is at least `min_save_interval_secs` old.
+        """
+        with self._lock:
+            saved = self._saved.get(run_path)
+        if saved is None:
+            return True
+        (saved_time, saved_version) = saved
+        return (
+            version != saved_version
+            and time.time() - saved_time >= self._min_save_interval_secs
+        )
+
+    def Save(self, run_path, state, version):
+        """Saves a snapshot of a run, replacing any previous one.
+
+        Failures are logged rather than raised.
+
+        Args:
+          run_path: The path of the run.
+          state: A state returned by `EventAccumulator.GetState`, with a
+            reader state.
+          version: The version of the state; see `IsSaveDue`.
+        """
+        blobs = []
+        arrays = {}
+        encoded = _Encode(state, blobs, arrays)
+        files = {}
+        for file_path in state.get("reader_state") or {}:
+            stamp = _FileStamp(file_path)
+            if stamp is not None:
+                files[file_path] = stamp
+        header = {
+            "version": _VERSION,
+            "path": run_path,
+            "files": files,
+            "state": encoded,
+        }
+        arrays["header"] = np.frombuffer(
+            json.dumps(header).encode("utf-8"), dtype=np.uint8
+        )
+        arrays["blobs"] = np.frombuffer(b"".join(blobs), dtype=np.uint8)
+        arrays["blob_offsets"] = np.cumsum(
+            [0] + [len(blob) for blob in blobs], dtype=np.int64
+        )
+        snapshot_path = self._SnapshotPath(run_path)
+        temp_path = "%s.tmp.%d.npz" % (
+            snapshot_path[: -len(".npz")],
+            os.getpid(),
+        )
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir)
+            with open(temp_path, "wb") as f:
+                np.savez(f, **arrays)
+            _replace(temp_path, snapshot_path)
+        except (IOError, OSError) as e:
+            logger.warning("Failed to save snapshot of %s: %s", run_path, e)
+            return
+        with self._lock:
+            self._saved[run_path] = (time.time(), version)
+
+
+def _FileStamp(file_path):
+    """Returns `[size, mtime]` of a file, or `None` if it can't be read.
+
+    The mtime is in ns, and is `None` for non-local files.
+    """
+    if "://" not in file_path:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_size, getattr(stat, "st_mtime_ns", None)]
+    try:
+        stat = tf.io.gfile.stat(file_path)
+    except tf.errors.OpError:
+        return None
+    return [stat.length, getattr(stat, "mtime_nsec", None)]
+
+
+def _IsFresh(file_path, size, mtime):
+    """Whether a file read into a snapshot can be resumed from it.
+
+    Event files are only appended to, so a file is taken to be unchanged
+    if it has grown, or has the same size and mtime.
+    """
+    stamp = _FileStamp(file_path)
+    if stamp is None:
+        return False
+    (current_size, current_mtime) = stamp
+    if current_size == size:
+        return current_mtime == mtime
+    return current_size > size
+
+
+def _Encode(value, blobs, arrays):
+    """Encodes a state as JSON, with its `bytes` and arrays set aside.
+
+    Args:
+      value: The value to encode.
+      blobs: List to which `bytes` values are appended.
+      arrays: Dict to which NumPy arrays are added, by generated name.
+
+    Returns:
+      A JSON-serializable value, for `_Decode`.
+    """
+    if isinstance(value, bytes):
+        blobs.append(value)
+        return {"b": len(blobs) - 1}
+    if isinstance(value, np.ndarray):
+        name = "a%d" % len(arrays)
+        arrays[name] = value
+        return {"a": name}
+    if isinstance(value, dict):
+        return {
+            "d": {
+                key: _Encode(item, blobs, arrays)
+                for (key, item) in six.iteritems(value)
+            }
+        }
+    if isinstance(value, (list, tuple)):
+        return {"l": [_Encode(item, blobs, arrays) for item in value]}
+    return value
+
+
+def _Decode(value, blobs, arrays):
+    """Inverse of `_Encode`; tuples are decoded as lists."""
+    if not isinstance(value, dict):
+        return value
+    if "l" in value:
+        return [_Decode(item, blobs, arrays) for item in value["l"]]
+    if "d" in value:
+        return {
+            key: _Decode(item, blobs, arrays)
+            for (key, item) in six.iteritems(value["d"])
+        }
+    if "b" in value:
+        return blobs[value["b"]]
+    return arrays[value["a"]]
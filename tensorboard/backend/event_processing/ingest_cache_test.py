@@ -0,0 +1,163 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for ingest_cache."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from tensorboard.backend.event_processing import ingest_cache
+from tensorboard.backend.event_processing import (
+    plugin_event_multiplexer as event_multiplexer,
+)
+from tensorboard.plugins.image import summary as image_summary
+from tensorboard.plugins.scalar import summary as scalar_summary
+from tensorboard.util import test_util
+
+
+class IngestCacheTest(tf.test.TestCase):
+    def setUp(self):
+        super(IngestCacheTest, self).setUp()
+        self.logdir = os.path.join(self.get_temp_dir(), "logs")
+        self.cache_dir = os.path.join(self.get_temp_dir(), "cache")
+        self.writer = test_util.FileWriter(os.path.join(self.logdir, "run"))
+
+    def tearDown(self):
+        self.writer.close()
+        super(IngestCacheTest, self).tearDown()
+
+    def _WriteSteps(self, steps):
+        for step in steps:
+            self.writer.add_summary(
+                scalar_summary.pb("loss", step / 10.0), global_step=step
+            )
+            images = np.full([1, 2, 2, 3], step, dtype=np.uint8)
+            self.writer.add_summary(
+                image_summary.pb("images", images), global_step=step
+            )
+        self.writer.flush()
+
+    def _Multiplexer(self, **kwargs):
+        multiplexer = event_multiplexer.EventMultiplexer(
+            ingest_cache=ingest_cache.IngestCache(
+                self.cache_dir, min_save_interval_secs=0
+            ),
+            **kwargs
+        )
+        multiplexer.AddRunsFromDirectory(self.logdir)
+        return multiplexer
+
+    def _Steps(self, multiplexer, tag):
+        return [t.step for t in multiplexer.Tensors("run", tag)]
+
+    def testRestoresAndResumes(self):
+        self._WriteSteps(range(5))
+        multiplexer = self._Multiplexer()
+        multiplexer.Reload()
+        multiplexer.SaveIngestCache()
+        expected = multiplexer.Tensors("run", "images/image_summary")
+
+        restarted = self._Multiplexer()
+        # Served before any reload.
+        self.assertEqual(
+            self._Steps(restarted, "loss/scalar_summary"), [0, 1, 2, 3, 4]
+        )
+        self.assertEqual(
+            restarted.Tensors("run", "images/image_summary"), expected
+        )
+        self.assertEqual(
+            restarted.SummaryMetadata("run", "loss/scalar_summary"),
+            multiplexer.SummaryMetadata("run", "loss/scalar_summary"),
+        )
+
+        self._WriteSteps(range(5, 8))
+        num_loaded_events = restarted.GetAccumulator("run").num_loaded_events
+        restarted.Reload()
+        self.assertEqual(
+            self._Steps(restarted, "loss/scalar_summary"), list(range(8))
+        )
+        # Only the six new events were read.
+        self.assertEqual(
+            restarted.GetAccumulator("run").num_loaded_events,
+            num_loaded_events + 6,
+        )
+
+    def testBlobReferences(self):
+        self._WriteSteps(range(3))
+        multiplexer = self._Multiplexer(blob_references=True)
+        multiplexer.Reload()
+        multiplexer.SaveIngestCache()
+        restarted = self._Multiplexer(blob_references=True)
+        self.assertEqual(
+            restarted.Tensors("run", "images/image_summary"),
+            multiplexer.Tensors("run", "images/image_summary"),
+        )
+
+    def testChangedSettingsIgnoreSnapshot(self):
+        self._WriteSteps(range(3))
+        multiplexer = self._Multiplexer()
+        multiplexer.Reload()
+        multiplexer.SaveIngestCache()
+        restarted = self._Multiplexer(tensor_size_guidance={"scalars": 2})
+        with self.assertRaises(KeyError):
+            restarted.Tensors("run", "loss/scalar_summary")
+        restarted.Reload()
+        self.assertLen(self._Steps(restarted, "loss/scalar_summary"), 2)
+
+    def testRewrittenFileIgnoresSnapshot(self):
+        self._WriteSteps(range(3))
+        multiplexer = self._Multiplexer()
+        multiplexer.Reload()
+        multiplexer.SaveIngestCache()
+        (path,) = multiplexer.RunPaths().values()
+        cache = ingest_cache.IngestCache(self.cache_dir)
+        self.assertIsNotNone(cache.Load(path))
+        (event_file,) = tf.io.gfile.glob(os.path.join(path, "events.*"))
+        with open(event_file, "rb") as f:
+            contents = f.read()
+        with open(event_file, "wb") as f:
+            f.write(contents[: len(contents) // 2])
+        self.assertIsNone(cache.Load(path))
+
+    def testSaveIsThrottled(self):
+        cache = ingest_cache.IngestCache(self.cache_dir)
+        self.assertTrue(cache.IsSaveDue("/logs/run", 1))
+        cache.Save("/logs/run", {"reader_state": {}}, 1)
+        self.assertFalse(cache.IsSaveDue("/logs/run", 2))
+        self.assertEqual(cache.Load("/logs/run"), {"reader_state": {}})
+        self.assertIsNone(cache.Load("/logs/other_run"))
+
+    def testEncodeDecode(self):
+        value = {
+            "a": [1, 2.5, None, u"text", b"\x00\xff"],
+            "b": (np.arange(3, dtype=np.int32), {"c": b""}),
+        }
+        blobs = []
+        arrays = {}
+        encoded = ingest_cache._Encode(value, blobs, arrays)
+        decoded = ingest_cache._Decode(encoded, blobs, arrays)
+        self.assertEqual(decoded["a"], [1, 2.5, None, u"text", b"\x00\xff"])
+        self.assertEqual(decoded["b"][0].tolist(), [0, 1, 2])
+        self.assertEqual(decoded["b"][0].dtype, np.int32)
+        self.assertEqual(decoded["b"][1], {"c": b""})
+
+
+if __name__ == "__main__":
+    tf.test.main()
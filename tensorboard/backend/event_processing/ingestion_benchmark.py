@@ -0,0 +1,177 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for ingesting a logdir at simulated storage latencies.
+
+Writes a synthetic logdir of scalar event files to the in-memory "mem://"
+filesystem of the TensorFlow stub, which delays each call to simulate
+remote storage, and reports for each of `--latencies_ms`:
+
+    discover `AddRunsFromDirectory` of a
+             `plugin_event_multiplexer.EventMultiplexer`, which lists
+             the logdir with up to `--max_walk_threads` threads
+    initial  the first `Reload`, which reads all events
+    idle     a further `Reload`, with no new data to read
+
+along with the number of filesystem calls made by each. Always uses the
+TensorFlow stub, whose gfile provides the "mem://" filesystem.
+
+Usage:
+
+    bazel run //tensorboard/backend/event_processing:ingestion_benchmark -- \\
+        --num_runs=20 --latencies_ms=0,1,10 --max_walk_threads=8
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+
+from tensorboard.backend.event_processing import discovery_index
+from tensorboard.backend.event_processing import plugin_event_multiplexer
+from tensorboard.compat import tf
+from tensorboard.compat.proto import event_pb2
+from tensorboard.compat.tensorflow_stub.io import gfile
+from tensorboard.summary.writer import record_writer
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_integer("num_runs", 20, "Number of runs in the logdir.")
+flags.DEFINE_integer("num_events", 2000, "Number of scalar events in each run.")
+flags.DEFINE_integer("num_tags", 5, "Number of scalar tags in each run.")
+flags.DEFINE_list(
+    "latencies_ms",
+    ["0", "1", "10"],
+    "Simulated latencies of filesystem calls, in ms, to benchmark.",
+)
+flags.DEFINE_float(
+    "bandwidth_mbps",
+    100.0,
+    "Simulated bandwidth of filesystem calls, in MiB per second.",
+)
+
+flags.DEFINE_integer(
+    "max_walk_threads",
+    8,
+    "Maximum number of directories to list at once when discovering runs.",
+)
+
+_LOGDIR = "mem://logdir"
+
+
+def _event_file_contents():
+    """Returns the serialized records of a synthetic event file."""
+    f = io.BytesIO()
+    writer = record_writer.RecordWriter(f)
+    writer.write(
+        event_pb2.Event(file_version="brain.Event:2").SerializeToString()
+    )
+    for step in range(FLAGS.num_events):
+        event = event_pb2.Event(step=step, wall_time=1e9 + step)
+        event.summary.value.add(
+            tag="tag_%d" % (step % FLAGS.num_tags), simple_value=step * 0.5,
+        )
+        writer.write(event.SerializeToString())
+    return f.getvalue()
+
+
+def _create_logdir(fs):
+    contents = _event_file_contents()
+    for run in range(FLAGS.num_runs):
+        path = "%s/run_%03d/events.out.tfevents.%d.benchmark" % (
+            _LOGDIR,
+            run,
+            1e9 + run,
+        )
+        fs.write(path, contents, binary_mode=True)
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+    if tf.io.gfile is not gfile:
+        raise app.UsageError(
+            "This benchmark requires the TensorFlow stub; depend on "
+            "//tensorboard/compat:no_tensorflow."
+        )
+
+    headers = ("LATENCY_MS", "PHASE", "EVENTS", "CALLS", "SECONDS")
+    logger.info(_format_line(headers, headers))
+    for latency_ms in FLAGS.latencies_ms:
+        latency_ms = float(latency_ms)
+        fs = gfile.MemoryFileSystem()
+        gfile.register_filesystem("mem", fs)
+        _create_logdir(fs)
+        fs.latency_secs = latency_ms / 1000.0
+        fs.bandwidth_bytes_per_sec = FLAGS.bandwidth_mbps * 1024 * 1024
+
+        multiplexer = plugin_event_multiplexer.EventMultiplexer(
+            discovery_index=discovery_index.DiscoveryIndex(
+                max_workers=FLAGS.max_walk_threads
+            )
+        )
+
+        for (phase, run_phase) in [
+            ("discover", lambda: multiplexer.AddRunsFromDirectory(_LOGDIR)),
+            ("initial", multiplexer.Reload),
+            ("idle", multiplexer.Reload),
+        ]:
+            fs.call_counts.clear()
+            start = time.time()
+            run_phase()
+            seconds = time.time() - start
+            events = sum(
+                len(multiplexer.Tensors(run, tag))
+                for (run, tags) in multiplexer.Runs().items()
+                for tag in tags["tensors"]
+            )
+            calls = sum(fs.call_counts.values())
+            fields = (latency_ms, phase, events, calls, seconds)
+            logger.info(_format_line(headers, fields))
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,334 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Counters describing the ingestion of event files, per run and cycle."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import time
+
+import six
+
+
+# Per-run counters, in the order that they are reported: key in `AsDict`,
+# Prometheus metric name and type, and help text.
+_RUN_METRICS = (
+    ("bytes_read", "bytes_read_total", "counter", "Bytes of records read."),
+    ("records_read", "records_read_total", "counter", "Records read."),
+    ("events_loaded", "events_loaded_total", "counter", "Events loaded."),
+    (
+        "data_loss_errors",
+        "data_loss_errors_total",
+        "counter",
+        "Corrupt records (e.g., CRC mismatches) encountered.",
+    ),
+    (
+        "truncated_reads",
+        "truncated_reads_total",
+        "counter",
+        "Reads stopped by an incomplete record at the end of a file.",
+    ),
+    ("reloads", "reloads_total", "counter", "Reloads of the run."),
+    (
+        "read_secs",
+        "read_seconds_total",
+        "counter",
+        "Time spent reading records.",
+    ),
+    (
+        "process_secs",
+        "process_seconds_total",
+        "counter",
+        "Time spent parsing and processing events.",
+    ),
+    (
+        "last_reload_events_per_sec",
+        "last_reload_events_per_second",
+        "gauge",
+        "Events loaded per second by the most recent reload.",
+    ),
+    (
+        "secs_since_last_event",
+        "seconds_since_last_event",
+        "gauge",
+        "Time between the wall time of the last loaded event and now.",
+    ),
+    (
+        "tensor_bytes",
+        "tensor_bytes",
+        "gauge",
+        "Bytes of tensor protos kept in memory, if byte limits are set.",
+    ),
+)
+
+# Counters of all reload cycles, reported like `_RUN_METRICS`.
+_CYCLE_METRICS = (
+    ("count", "total", "counter", "Reload cycles completed."),
+    ("total_secs", "seconds_total", "counter", "Time spent in reload cycles."),
+    (
+        "last_secs",
+        "last_seconds",
+        "gauge",
+        "Duration of the most recent reload cycle.",
+    ),
+    ("last_runs", "last_runs", "gauge", "Runs known in the last cycle."),
+    (
+        "last_runs_reloaded",
+        "last_runs_reloaded",
+        "gauge",
+        "Runs reloaded in the most recent cycle.",
+    ),
+    (
+        "last_events_loaded",
+        "last_events_loaded",
+        "gauge",
+        "Events loaded in the most recent cycle.",
+    ),
+    (
+        "last_bytes_read",
+        "last_bytes_read",
+        "gauge",
+        "Bytes read in the most recent cycle.",
+    ),
+)
+
+_PROMETHEUS_PREFIX = "tensorboard_ingestion_"
+
+
+class IngestionStats(object):
+    """Counters describing the ingestion of all runs of a multiplexer.
+
+    Each run records its reads and reloads into the `RunStats` returned by
+    `ForRun`, and each reload cycle is recorded with `RecordCycle`. The
+    counters are reported by `AsDict` and `AsPrometheusText`.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, clock=time.time):
+        """Constructs an empty `IngestionStats`.
+
+        Args:
+          clock: Function returning the current time in seconds.
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._runs = {}  # from run name to `RunStats`
+        self._cycles = 0
+        self._total_cycle_secs = 0.0
+        self._last_cycle = None
+        # Events loaded and bytes read since the last `RecordCycle`.
+        self._cycle_events = 0
+        self._cycle_bytes = 0
+
+    def ForRun(self, run):
+        """Returns the `RunStats` of a run, creating it if needed."""
+        with self._lock:
+            stats = self._runs.get(run)
+            if stats is None:
+                stats = RunStats(self)
+                self._runs[run] = stats
+            return stats
+
+    def Forget(self, run):
+        """Drops the counters of a run that is no longer loaded."""
+        with self._lock:
+            self._runs.pop(run, None)
+
+    def RecordCycle(self, secs, num_runs, num_runs_reloaded):
+        """Records a completed reload cycle.
+
+        Args:
+          secs: Duration of the cycle, in seconds.
+          num_runs: Number of runs known to the multiplexer.
+          num_runs_reloaded: Number of those runs reloaded in the cycle.
+        """
+        with self._lock:
+            self._cycles += 1
+            self._total_cycle_secs += secs
+            self._last_cycle = {
+                "end_time": self._clock(),
+                "secs": secs,
+                "runs": num_runs,
+                "runs_reloaded": num_runs_reloaded,
+                "events_loaded": self._cycle_events,
+                "bytes_read": self._cycle_bytes,
+            }
+            self._cycle_events = 0
+            self._cycle_bytes = 0
+
+    def _AddToCycle(self, num_events, num_bytes):
+        with self._lock:
+            self._cycle_events += num_events
+            self._cycle_bytes += num_bytes
+
+    def AsDict(self):
+        """Returns all counters as a JSON-serializable dict.
+
+        The dict has keys "runs", mapping each run name to its counters,
+        and "cycles", with counters of all reload cycles and a "last" dict
+        describing the most recent cycle (or `None`).
+        """
+        now = self._clock()
+        with self._lock:
+            runs = dict(self._runs)
+            cycles = {
+                "count": self._cycles,
+                "total_secs": self._total_cycle_secs,
+                "last": dict(self._last_cycle) if self._last_cycle else None,
+            }
+        return {
+            "runs": {run: stats.AsDict(now) for (run, stats) in runs.items()},
+            "cycles": cycles,
+        }
+
+    def AsPrometheusText(self):
+        """Returns all counters in the Prometheus text exposition format."""
+        contents = self.AsDict()
+        lines = []
+        runs = sorted(six.iteritems(contents["runs"]))
+        for (key, name, metric_type, help_text) in _RUN_METRICS:
+            metric = "%srun_%s" % (_PROMETHEUS_PREFIX, name)
+            lines.append("# HELP %s %s" % (metric, help_text))
+            lines.append("# TYPE %s %s" % (metric, metric_type))
+            for (run, stats) in runs:
+                value = stats.get(key)
+                if value is not None:
+                    lines.append(
+                        '%s{run="%s"} %s'
+                        % (metric, _EscapeLabelValue(run), _FormatValue(value))
+                    )
+        cycles = dict(contents["cycles"])
+        for (key, value) in six.iteritems(cycles.pop("last") or {}):
+            cycles["last_" + key] = value
+        for (key, name, metric_type, help_text) in _CYCLE_METRICS:
+            value = cycles.get(key)
+            if value is None:
+                continue
+            metric = "%scycles_%s" % (_PROMETHEUS_PREFIX, name)
+            lines.append("# HELP %s %s" % (metric, help_text))
+            lines.append("# TYPE %s %s" % (metric, metric_type))
+            lines.append("%s %s" % (metric, _FormatValue(value)))
+        return "".join(line + "\n" for line in lines)
+
+
+class RunStats(object):
+    """Counters describing the ingestion of one run.
+
+    Loaders call `RecordRead`, `RecordDataLoss` and `RecordTruncatedRead`,
+    and the accumulator of
+    the run calls `RecordReload` and `RecordTensorBytes`. This class is
+    thread-safe.
+    """
+
+    def __init__(self, parent):
+        self._parent = parent
+        self._lock = threading.Lock()
+        self._bytes_read = 0
+        self._records_read = 0
+        self._read_secs = 0.0
+        self._data_loss_errors = 0
+        self._truncated_reads = 0
+        self._events_loaded = 0
+        self._reloads = 0
+        self._reload_secs = 0.0
+        self._last_reload_events_per_sec = None
+        self._last_event_wall_time = None
+        self._tensor_bytes = None
+
+    def RecordRead(self, num_records, num_bytes, secs):
+        """Records a batch of records read from an event file.
+
+        Args:
+          num_records: Number of records read.
+          num_bytes: Number of bytes read, including record framing.
+          secs: Seconds spent reading.
+        """
+        with self._lock:
+            self._records_read += num_records
+            self._bytes_read += num_bytes
+            self._read_secs += secs
+        self._parent._AddToCycle(0, num_bytes)
+
+    def RecordDataLoss(self):
+        """Records a corrupt record."""
+        with self._lock:
+            self._data_loss_errors += 1
+
+    def RecordTruncatedRead(self):
+        """Records a read that stopped at an incomplete last record.
+
+        This is expected while a file is still being written, and is
+        counted apart from data loss.
+        """
+        with self._lock:
+            self._truncated_reads += 1
+
+    def RecordReload(self, num_events, secs, last_event_wall_time=None):
+        """Records a reload of the run.
+
+        Args:
+          num_events: Number of events loaded.
+          secs: Duration of the reload, in seconds, including reading.
+          last_event_wall_time: Wall time of the last event loaded, if any.
+        """
+        with self._lock:
+            self._events_loaded += num_events
+            self._reloads += 1
+            self._reload_secs += secs
+            self._last_reload_events_per_sec = num_events / secs if secs else 0
+            if last_event_wall_time is not None:
+                self._last_event_wall_time = last_event_wall_time
+        self._parent._AddToCycle(num_events, 0)
+
+    def RecordTensorBytes(self, num_bytes):
+        """Records the number of bytes of tensor protos kept for the run."""
+        with self._lock:
+            self._tensor_bytes = num_bytes
+
+    def AsDict(self, now):
+        """Returns the counters as a dict, given the current time."""
+        with self._lock:
+            secs_since_last_event = None
+            if self._last_event_wall_time is not None:
+                secs_since_last_event = now - self._last_event_wall_time
+            return {
+                "bytes_read": self._bytes_read,
+                "records_read": self._records_read,
+                "events_loaded": self._events_loaded,
+                "data_loss_errors": self._data_loss_errors,
+                "truncated_reads": self._truncated_reads,
+                "reloads": self._reloads,
+                "read_secs": self._read_secs,
+                # Reads happen within reloads, so the rest of the reload
+                # time is spent parsing and processing.
+                "process_secs": max(0.0, self._reload_secs - self._read_secs),
+                "last_reload_events_per_sec": self._last_reload_events_per_sec,
+                "last_event_wall_time": self._last_event_wall_time,
+                "secs_since_last_event": secs_since_last_event,
+                "tensor_bytes": self._tensor_bytes,
+            }
+
+
+def _EscapeLabelValue(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _FormatValue(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
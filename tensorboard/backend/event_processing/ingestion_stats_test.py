@@ -0,0 +1,149 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for ingestion_stats."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import ingestion_stats
+
+
+class IngestionStatsTest(tb_test.TestCase):
+    def setUp(self):
+        super(IngestionStatsTest, self).setUp()
+        self.now = 1000.0
+        self.stats = ingestion_stats.IngestionStats(clock=lambda: self.now)
+
+    def testEmpty(self):
+        self.assertEqual(
+            self.stats.AsDict(),
+            {
+                "runs": {},
+                "cycles": {"count": 0, "total_secs": 0.0, "last": None},
+            },
+        )
+
+    def testRunCounters(self):
+        run = self.stats.ForRun("train")
+        self.assertIs(self.stats.ForRun("train"), run)
+        run.RecordRead(10, 1000, 0.25)
+        run.RecordRead(0, 0, 0.25)
+        run.RecordDataLoss()
+        run.RecordTruncatedRead()
+        run.RecordTruncatedRead()
+        run.RecordReload(10, 2.0, last_event_wall_time=990.0)
+        self.assertEqual(
+            self.stats.AsDict()["runs"]["train"],
+            {
+                "bytes_read": 1000,
+                "records_read": 10,
+                "events_loaded": 10,
+                "data_loss_errors": 1,
+                "truncated_reads": 2,
+                "reloads": 1,
+                "read_secs": 0.5,
+                "process_secs": 1.5,
+                "last_reload_events_per_sec": 5.0,
+                "last_event_wall_time": 990.0,
+                "secs_since_last_event": 10.0,
+                "tensor_bytes": None,
+            },
+        )
+        # A reload with no events keeps the last event time.
+        run.RecordReload(0, 0.5)
+        self.now = 1005.0
+        run_stats = self.stats.AsDict()["runs"]["train"]
+        self.assertEqual(run_stats["reloads"], 2)
+        self.assertEqual(run_stats["last_reload_events_per_sec"], 0)
+        self.assertEqual(run_stats["secs_since_last_event"], 15.0)
+        run.RecordTensorBytes(1234)
+        self.assertEqual(
+            self.stats.AsDict()["runs"]["train"]["tensor_bytes"], 1234
+        )
+
+    def testCycles(self):
+        self.stats.ForRun("a").RecordRead(2, 200, 0.1)
+        self.stats.ForRun("a").RecordReload(2, 0.2)
+        self.stats.ForRun("b").RecordRead(1, 50, 0.1)
+        self.stats.RecordCycle(0.5, num_runs=3, num_runs_reloaded=2)
+        self.stats.RecordCycle(0.25, num_runs=3, num_runs_reloaded=0)
+        self.assertEqual(
+            self.stats.AsDict()["cycles"],
+            {
+                "count": 2,
+                "total_secs": 0.75,
+                "last": {
+                    "end_time": 1000.0,
+                    "secs": 0.25,
+                    "runs": 3,
+                    "runs_reloaded": 0,
+                    "events_loaded": 0,
+                    "bytes_read": 0,
+                },
+            },
+        )
+
+    def testCycleTotals(self):
+        self.stats.ForRun("a").RecordRead(2, 200, 0.1)
+        self.stats.ForRun("a").RecordReload(2, 0.2)
+        self.stats.ForRun("b").RecordRead(1, 50, 0.1)
+        self.stats.RecordCycle(0.5, num_runs=3, num_runs_reloaded=2)
+        last = self.stats.AsDict()["cycles"]["last"]
+        self.assertEqual(last["events_loaded"], 2)
+        self.assertEqual(last["bytes_read"], 250)
+
+    def testForget(self):
+        self.stats.ForRun("a").RecordRead(2, 200, 0.1)
+        self.stats.Forget("a")
+        self.assertEqual(self.stats.AsDict()["runs"], {})
+        self.assertEqual(
+            self.stats.ForRun("a").AsDict(self.now)["bytes_read"], 0
+        )
+
+    def testPrometheusText(self):
+        run = self.stats.ForRun('a "quoted"\\run')
+        run.RecordRead(3, 100, 0.5)
+        run.RecordReload(3, 1.0)
+        self.stats.RecordCycle(1.5, num_runs=1, num_runs_reloaded=1)
+        lines = self.stats.AsPrometheusText().splitlines()
+        self.assertIn(
+            "# TYPE tensorboard_ingestion_run_bytes_read_total counter", lines
+        )
+        self.assertIn(
+            'tensorboard_ingestion_run_bytes_read_total{run="a \\"quoted\\"\\\\run"} 100',
+            lines,
+        )
+        self.assertIn(
+            'tensorboard_ingestion_run_read_seconds_total{run="a \\"quoted\\"\\\\run"} 0.5',
+            lines,
+        )
+        self.assertIn("tensorboard_ingestion_cycles_total 1", lines)
+        self.assertIn("tensorboard_ingestion_cycles_last_bytes_read 100", lines)
+        # No event has a wall time, so there is no sample for the gauge.
+        self.assertFalse(
+            [
+                line
+                for line in lines
+                if line.startswith(
+                    "tensorboard_ingestion_run_seconds_since_last_event{"
+                )
+            ]
+        )
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -18,10 +18,13 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import functools
 import os
 import re
+import threading
 
 import six
+from six.moves import queue
 
 from tensorboard.compat import tf
 from tensorboard.util import tb_logging
@@ -187,7 +190,141 @@ def ListRecursivelyViaWalking(top):
         )
 
 
-def GetLogdirSubdirectories(path):
+def ParallelWalk(top, list_directory, max_workers):
+    """Walks a directory tree, making up to `max_workers` calls at once.
+
+    A pool of worker threads takes tasks from a shared queue: listing a
+    directory found so far, or checking whether one of its entries is a
+    directory. The entries of a wide directory are thus checked
+    concurrently too. Each directory is yielded as soon as all of its
+    entries have been checked, in an unspecified order. If the generator
+    is closed early, the workers stop after their current task.
+
+    Args:
+      top: A path to a directory.
+      list_directory: A function that lists a directory. Given a directory
+        path, it returns `None` if the directory cannot be listed, or else a
+        `(paths, finish)` tuple. `paths` are the paths of the entries that
+        must be checked with `tf.io.gfile.isdir`, and `finish` is then
+        called with a dict from each of those paths to whether it is a
+        directory. `finish` returns a `(subdir_paths, value)` tuple where
+        `subdir_paths` are the paths of the subdirectories to walk next and
+        `value` is yielded with the directory. Both functions are called
+        from the worker threads; any exception that they raise is re-raised
+        by this generator.
+      max_workers: The maximum number of concurrent filesystem calls.
+
+    Yields:
+      A `(dir_path, value)` tuple for each directory that could be listed.
+    """
+    tasks = queue.Queue()
+    results = queue.Queue()
+    stopped = threading.Event()
+
+    def List(dir_path):
+        listing = list_directory(dir_path)
+        if listing is None:
+            results.put((dir_path, None, None))
+            return
+        (paths, finish) = listing
+        if not paths:
+            results.put((dir_path, finish({}), None))
+            return
+        state = {"remaining": len(paths), "is_dir": {}}
+        lock = threading.Lock()
+
+        def Check(path):
+            is_dir = tf.io.gfile.isdir(path)
+            with lock:
+                state["is_dir"][path] = is_dir
+                state["remaining"] -= 1
+                if state["remaining"]:
+                    return
+            results.put((dir_path, finish(state["is_dir"]), None))
+
+        for path in paths:
+            tasks.put((Check, path))
+
+    def Worker():
+        while True:
+            task = tasks.get()
+            if task is None or stopped.is_set():
+                return
+            (function, path) = task
+            try:
+                function(path)
+            except Exception as e:  # pylint: disable=broad-except
+                results.put((path, None, e))
+
+    num_workers = max(1, max_workers)
+    for i in range(num_workers):
+        thread = threading.Thread(
+            target=Worker, name="ParallelWalk worker %d" % i
+        )
+        thread.daemon = True
+        thread.start()
+    tasks.put((List, top))
+    # The number of directories queued but not yet reported.
+    outstanding = 1
+    try:
+        while outstanding:
+            (dir_path, result, error) = results.get()
+            outstanding -= 1
+            if error is not None:
+                raise error
+            if result is None:
+                continue
+            (subdir_paths, value) = result
+            for subdir_path in subdir_paths:
+                tasks.put((List, subdir_path))
+                outstanding += 1
+            yield (dir_path, value)
+    finally:
+        stopped.set()
+        for _ in range(num_workers):
+            tasks.put(None)
+
+
+def _ListDirectory(dir_path):
+    """Lists a directory for `ListRecursivelyInParallel`."""
+    try:
+        names = tf.io.gfile.listdir(dir_path)
+    except tf.errors.NotFoundError:
+        # Removed since its parent was listed.
+        return None
+    # Some filesystems list subdirectories with a trailing slash.
+    paths = [
+        os.path.join(dir_path, tf.compat.as_str_any(name).rstrip("/"))
+        for name in names
+    ]
+
+    def Finish(is_dir):
+        subdir_paths = [path for path in paths if is_dir[path]]
+        file_paths = [path for path in paths if not is_dir[path]]
+        return (subdir_paths, file_paths)
+
+    return (paths, Finish)
+
+
+def ListRecursivelyInParallel(top, max_workers):
+    """Walks a directory tree, listing several directories at once.
+
+    Like `ListRecursivelyViaWalking`, but up to `max_workers` directories
+    are listed (or entries checked) concurrently, which hides the latency
+    of each call on network filesystems. Directories are yielded as soon as
+    they have been listed, in an unspecified order.
+
+    Args:
+      top: A path to a directory.
+      max_workers: The maximum number of concurrent filesystem calls.
+
+    Yields:
+      A (dir_path, file_paths) tuple for each directory/subdirectory.
+    """
+    return ParallelWalk(top, _ListDirectory, max_workers)
+
+
+def GetLogdirSubdirectories(path, max_workers=1):
     """Obtains all subdirectories with events files.
 
     The order of the subdirectories returned is unspecified. The internal logic
@@ -195,6 +332,10 @@ def GetLogdirSubdirectories(path):
 
     Args:
       path: The path to a directory under which to find subdirectories.
+      max_workers: The maximum number of directories to list concurrently.
+        If greater than 1, the directory tree is walked in parallel with
+        `ListRecursivelyInParallel`, and subdirectories are yielded as they
+        are found.
 
     Returns:
       A tuple of absolute paths of all subdirectories each with at least 1 events
@@ -213,7 +354,16 @@ def GetLogdirSubdirectories(path):
             "directory, %s" % path
         )
 
-    if IsCloudPath(path):
+    if max_workers > 1:
+        logger.info(
+            "GetLogdirSubdirectories: Starting to list directories via "
+            "walking with %d threads.",
+            max_workers,
+        )
+        traversal_method = functools.partial(
+            ListRecursivelyInParallel, max_workers=max_workers
+        )
+    elif IsCloudPath(path):
         # Glob-ing for files can be significantly faster than recursively
         # walking through directories for some file systems.
         logger.info(
@@ -212,6 +212,38 @@ class IoWrapperTest(tf.test.TestCase):
             expected, io_wrapper.ListRecursivelyViaWalking(temp_dir)
         )
 
+    def testListRecursivelyInParallel(self):
+        temp_dir = tempfile.mkdtemp(prefix=self.get_temp_dir())
+        self._CreateDeepDirectoryStructure(temp_dir)
+        self._CompareFilesPerSubdirectory(
+            io_wrapper.ListRecursivelyViaWalking(temp_dir),
+            io_wrapper.ListRecursivelyInParallel(temp_dir, max_workers=4),
+        )
+
+    def testParallelWalkReraisesErrors(self):
+        def ListDirectory(dir_path):
+            if dir_path == "top/b":
+                raise RuntimeError("oops")
+
+            def Finish(is_dir):
+                del is_dir  # unused
+                if dir_path == "top":
+                    return (["top/a", "top/b"], None)
+                return ([], None)
+
+            return ([], Finish)
+
+        with six.assertRaisesRegex(self, RuntimeError, "oops"):
+            list(io_wrapper.ParallelWalk("top", ListDirectory, max_workers=2))
+
+    def testGetLogdirSubdirectoriesInParallel(self):
+        temp_dir = tempfile.mkdtemp(prefix=self.get_temp_dir())
+        self._CreateDeepDirectoryStructure(temp_dir)
+        self.assertItemsEqual(
+            io_wrapper.GetLogdirSubdirectories(temp_dir),
+            io_wrapper.GetLogdirSubdirectories(temp_dir, max_workers=4),
+        )
+
     def testGetLogdirSubdirectories(self):
         temp_dir = tempfile.mkdtemp(prefix=self.get_temp_dir())
         self._CreateDeepDirectoryStructure(temp_dir)
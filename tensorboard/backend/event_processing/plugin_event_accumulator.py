@@ -18,29 +18,43 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import functools
 import threading
+import time
 
+import numpy as np
 import six
 
+from tensorboard.backend.event_processing import byte_budget
 from tensorboard.backend.event_processing import directory_loader
 from tensorboard.backend.event_processing import directory_watcher
 from tensorboard.backend.event_processing import event_file_loader
 from tensorboard.backend.event_processing import io_wrapper
 from tensorboard.backend.event_processing import plugin_asset_util
 from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_reservoir
 from tensorboard.backend.event_processing import tag_types
 from tensorboard.compat.proto import config_pb2
 from tensorboard.compat.proto import event_pb2
 from tensorboard.compat.proto import graph_pb2
 from tensorboard.compat.proto import meta_graph_pb2
+from tensorboard.compat.proto import summary_pb2
+from tensorboard.compat.proto import tensor_pb2
+from tensorboard.compat.tensorflow_stub import dtypes
 from tensorboard.util import tb_logging
+from tensorboard.util import tensor_util
 
 
 logger = tb_logging.get_logger()
 
 namedtuple = collections.namedtuple
 
-TensorEvent = namedtuple("TensorEvent", ["wall_time", "step", "tensor_proto"])
+# The `blob_reference` of a `TensorEvent` is `None` unless its tensor is a
+# blob sequence whose values were left on disk; see `blob_references`.
+TensorEvent = namedtuple(
+    "TensorEvent", ["wall_time", "step", "tensor_proto", "blob_reference"]
+)
+TensorEvent.__new__.__defaults__ = (None,)
 
 # Legacy aliases
 TENSORS = tag_types.TENSORS
@@ -87,11 +101,16 @@ class EventAccumulator(object):
           a float containing seconds from the UNIX epoch, or -1 if
           nothing has been loaded yet. This should only be accessed from
           the thread that calls Reload.
+      num_loaded_events: Number of Event protos loaded by `Reload` so far.
+          This should only be accessed from the thread that calls Reload.
       path: A file path to a directory containing tf events files, or a single
           tf events file. The accumulator will load events from this path.
       tensors_by_tag: A dictionary mapping each tag name to a
         reservoir.Reservoir of tensor summaries. Each such reservoir will
-        only use a single key, given by `_TENSOR_RESERVOIR_KEY`.
+        only use a single key, given by `_TENSOR_RESERVOIR_KEY`. Tags whose
+        summary metadata has `DATA_CLASS_SCALAR` instead map to a
+        scalar_reservoir.ScalarReservoir, which stores only the step, wall
+        time and value of each summary.
 
     @@Tensors
     """
@@ -103,6 +122,14 @@ class EventAccumulator(object):
         tensor_size_guidance=None,
         purge_orphaned_data=True,
         event_file_active_filter=None,
+        reader_state=None,
+        plugin_filter=None,
+        change_notifier=None,
+        stats=None,
+        tensor_byte_guidance=None,
+        max_tensor_bytes=0,
+        parent_byte_budget=None,
+        blob_references=False,
     ):
         """Construct the `EventAccumulator`.
 
@@ -126,6 +153,35 @@ class EventAccumulator(object):
           event_file_active_filter: Optional predicate for determining whether an
             event file latest load timestamp should be considered active. If passed,
             this will enable multifile directory loading.
+          reader_state: Optional `reader_state.ReaderState` recording how far
+            each event file has been read. If passed, event files are read
+            starting from the recorded offsets, and the offsets are updated
+            as events are loaded.
+          plugin_filter: Optional `plugin_filter.PluginFilter` selecting the
+            plugins whose data is loaded. Data for other plugins is dropped
+            as event files are read.
+          change_notifier: Optional `change_notifier.ChangeNotifier`. If
+            passed and `path` is a local directory, reloads skip it while
+            nothing in it has changed.
+          stats: Optional `ingestion_stats.RunStats` into which reads and
+            reloads of this run are recorded.
+          tensor_byte_guidance: Like `tensor_size_guidance`, but limiting
+            the number of bytes of tensor protos kept per tag rather than
+            their number. Tags of plugins with no entry have no byte limit.
+            Scalar data, which is stored compactly, is not limited.
+          max_tensor_bytes: The number of bytes of tensor protos above which
+            this run evicts tensors, or 0 for no limit.
+          parent_byte_budget: Optional `byte_budget.ByteBudget` to which the
+            bytes of this run's tensor protos are charged, e.g. to limit the
+            bytes of all runs.
+          blob_references: If true, the values of blob sequence tensors
+            (e.g., images, audio and graphs) are not kept in memory, only
+            the locations of their records in the event files. `Tensors`
+            reads them back from disk; `TensorReferences` does not.
+
+        While a byte limit is exceeded, the tags with the most bytes under
+        it evict random older tensors, and keep fewer tensors until there
+        is room for more again.
         """
         size_guidance = dict(size_guidance or DEFAULT_SIZE_GUIDANCE)
         sizes = {}
@@ -136,6 +192,16 @@ class EventAccumulator(object):
                 sizes[key] = DEFAULT_SIZE_GUIDANCE[key]
         self._size_guidance = size_guidance
         self._tensor_size_guidance = dict(tensor_size_guidance or {})
+        self._tensor_byte_guidance = dict(tensor_byte_guidance or {})
+        self._byte_budget = None
+        if (
+            self._tensor_byte_guidance
+            or max_tensor_bytes
+            or parent_byte_budget is not None
+        ):
+            self._byte_budget = byte_budget.ByteBudget(
+                max_tensor_bytes, parent=parent_byte_budget
+            )
 
         self._first_event_timestamp = None
 
@@ -145,6 +211,9 @@ class EventAccumulator(object):
         self._tagged_metadata = {}
         self.summary_metadata = {}
         self.tensors_by_tag = {}
+        # From tag to the `DataType` enum value of the tensors of tags whose
+        # reservoir is a `ScalarReservoir`.
+        self._scalar_dtype_by_tag = {}
         self._tensors_by_tag_lock = threading.Lock()
 
         # Keep a mapping from plugin name to a dict mapping from tag to plugin data
@@ -159,13 +228,24 @@ class EventAccumulator(object):
         self._plugin_tag_lock = threading.Lock()
 
         self.path = path
-        self._generator = _GeneratorFromPath(path, event_file_active_filter)
+        self._generator = _GeneratorFromPath(
+            path,
+            event_file_active_filter,
+            reader_state,
+            plugin_filter,
+            change_notifier,
+            stats,
+            blob_references,
+        )
         self._generator_mutex = threading.Lock()
+        self._reader_state = reader_state
+        self._stats = stats
 
         self.purge_orphaned_data = purge_orphaned_data
 
         self.most_recent_step = -1
         self.most_recent_wall_time = -1
+        self.num_loaded_events = 0
         self.file_version = None
 
     def Reload(self):
@@ -176,11 +256,196 @@ class EventAccumulator(object):
         Returns:
           The `EventAccumulator`.
         """
+        start = time.time()
+        num_loaded_events = self.num_loaded_events
+        event = None
         with self._generator_mutex:
             for event in self._generator.Load():
-                self._ProcessEvent(event)
+                self.num_loaded_events += 1
+                event = self._ProcessEvent(event)
+        if self._stats is not None:
+            self._stats.RecordReload(
+                self.num_loaded_events - num_loaded_events,
+                time.time() - start,
+                None if event is None else event.wall_time,
+            )
+            if self._byte_budget is not None:
+                self._stats.RecordTensorBytes(self._byte_budget.used_bytes)
         return self
 
+    def TensorBytes(self):
+        """Returns the bytes of tensor protos kept, if byte limits are set.
+
+        Returns:
+          The total `ByteSize()` of the tensor protos kept for all tags, or
+          `None` if this accumulator has no byte limits and does not count
+          them.
+        """
+        if self._byte_budget is None:
+            return None
+        return self._byte_budget.used_bytes
+
+    def ReleaseByteBudget(self):
+        """Releases the bytes of this run from its parent byte budget.
+
+        Call this when the accumulator is discarded.
+        """
+        if self._byte_budget is not None:
+            self._byte_budget.Close()
+
+    def GetState(self):
+        """Returns the data of this accumulator, for `SetState`.
+
+        The state is taken between reloads, so that it holds exactly the
+        events before the offsets of the reader state, if any.
+
+        Returns:
+          A dict of Python scalars, strings, `bytes`, NumPy arrays, lists
+          and dicts. If the accumulator has a reader state, its `Snapshot`
+          is under "reader_state"; `SetState` does not restore it.
+        """
+        with self._generator_mutex:
+            tensors = {}
+            with self._tensors_by_tag_lock:
+                tags_and_reservoirs = list(six.iteritems(self.tensors_by_tag))
+            for (tag, tag_reservoir) in tags_and_reservoirs:
+                if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+                    state = tag_reservoir.GetState()
+                    tensors[tag] = {
+                        "kind": "scalars",
+                        "dtype": self._scalar_dtype_by_tag[tag],
+                        "columns": list(state.columns),
+                        "num_items_seen": state.num_items_seen,
+                        "random_state": state.random_state,
+                    }
+                    continue
+                state = tag_reservoir.GetState(_TENSOR_RESERVOIR_KEY)
+                tensors[tag] = {
+                    "kind": "tensors",
+                    "items": [
+                        [
+                            tv.wall_time,
+                            tv.step,
+                            tv.tensor_proto.SerializeToString(),
+                            _BlobReferenceState(tv.blob_reference),
+                        ]
+                        for tv in state.items
+                    ],
+                    "num_items_seen": state.num_items_seen,
+                    "max_size": state.max_size,
+                    "random_state": state.random_state,
+                }
+            return {
+                "reader_state": (
+                    None
+                    if self._reader_state is None
+                    else self._reader_state.Snapshot()
+                ),
+                "first_event_timestamp": self._first_event_timestamp,
+                "file_version": self.file_version,
+                "most_recent_step": self.most_recent_step,
+                "most_recent_wall_time": self.most_recent_wall_time,
+                "num_loaded_events": self.num_loaded_events,
+                "graph": self._graph,
+                "graph_from_metagraph": self._graph_from_metagraph,
+                "meta_graph": self._meta_graph,
+                "tagged_metadata": dict(self._tagged_metadata),
+                "summary_metadata": {
+                    tag: metadata.SerializeToString()
+                    for (tag, metadata) in six.iteritems(self.summary_metadata)
+                },
+                "tensors": tensors,
+            }
+
+    def SetState(self, state):
+        """Replaces the data of this accumulator with that of `GetState`.
+
+        Call this before the first `Reload`, on an accumulator constructed
+        like the one whose state was taken, and whose reader state, if
+        any, was restored from the same state. Events loaded afterwards
+        are then sampled as if that accumulator had loaded them.
+
+        Args:
+          state: A dict returned by `GetState`, or decoded from one.
+        """
+        with self._generator_mutex:
+            self._first_event_timestamp = state["first_event_timestamp"]
+            self.file_version = state["file_version"]
+            self.most_recent_step = state["most_recent_step"]
+            self.most_recent_wall_time = state["most_recent_wall_time"]
+            self.num_loaded_events = state["num_loaded_events"]
+            self._graph = state["graph"]
+            self._graph_from_metagraph = state["graph_from_metagraph"]
+            self._meta_graph = state["meta_graph"]
+            self._tagged_metadata = dict(state["tagged_metadata"])
+            self.summary_metadata = {
+                tag: summary_pb2.SummaryMetadata.FromString(serialized)
+                for (tag, serialized) in six.iteritems(
+                    state["summary_metadata"]
+                )
+            }
+            with self._plugin_tag_lock:
+                self._plugin_to_tag_to_content.clear()
+                for (tag, metadata) in six.iteritems(self.summary_metadata):
+                    plugin_data = metadata.plugin_data
+                    if plugin_data.plugin_name:
+                        self._plugin_to_tag_to_content[plugin_data.plugin_name][
+                            tag
+                        ] = plugin_data.content
+            with self._tensors_by_tag_lock:
+                self.tensors_by_tag = {}
+                self._scalar_dtype_by_tag = {}
+                for (tag, tensors) in six.iteritems(state["tensors"]):
+                    self.tensors_by_tag[tag] = self._RestoreReservoir(
+                        tag, tensors
+                    )
+                    if tensors["kind"] == "scalars":
+                        self._scalar_dtype_by_tag[tag] = tensors["dtype"]
+
+    def _RestoreReservoir(self, tag, tensors):
+        """Returns a reservoir restored from the state of a tag."""
+        size = self._GetTensorReservoirSize(tag)
+        random_state = _RandomState(tensors["random_state"])
+        if tensors["kind"] == "scalars":
+            columns = scalar_reservoir.ScalarColumns(*tensors["columns"])
+            tag_reservoir = scalar_reservoir.ScalarReservoir(
+                size, columns.value.dtype
+            )
+            tag_reservoir.SetState(
+                scalar_reservoir.ScalarReservoirState(
+                    columns=columns,
+                    num_items_seen=tensors["num_items_seen"],
+                    random_state=random_state,
+                )
+            )
+            return tag_reservoir
+        tag_reservoir = self._NewTensorReservoir(tag, size)
+        # Blob references of a tag share their initial metadata.
+        metadata_by_serialized = {}
+        items = [
+            TensorEvent(
+                wall_time=wall_time,
+                step=step,
+                tensor_proto=tensor_pb2.TensorProto.FromString(serialized),
+                blob_reference=_BlobReferenceFromState(
+                    blob_reference, metadata_by_serialized
+                ),
+            )
+            for (wall_time, step, serialized, blob_reference) in tensors[
+                "items"
+            ]
+        ]
+        tag_reservoir.SetState(
+            _TENSOR_RESERVOIR_KEY,
+            reservoir.ReservoirState(
+                items=items,
+                num_items_seen=tensors["num_items_seen"],
+                max_size=tensors["max_size"],
+                random_state=random_state,
+            ),
+        )
+        return tag_reservoir
+
     def PluginAssets(self, plugin_name):
         """Return a list of all plugin assets for the given plugin.
 
@@ -290,7 +555,17 @@ class EventAccumulator(object):
         return dict(self.summary_metadata)
 
     def _ProcessEvent(self, event):
-        """Called whenever an event is loaded."""
+        """Called whenever an event is loaded.
+
+        Args:
+          event: An `Event`, or an `event_file_loader.EventWithBlobReferences`.
+
+        Returns:
+          The `Event`.
+        """
+        blob_references = _NO_BLOB_REFERENCES
+        if isinstance(event, event_file_loader.EventWithBlobReferences):
+            (event, blob_references) = event
         if self._first_event_timestamp is None:
             self._first_event_timestamp = event.wall_time
 
@@ -395,7 +670,14 @@ class EventAccumulator(object):
                         # This tensor summary was created using the old method that used
                         # plugin assets. We must still continue to support it.
                         tag = value.node_name
-                    self._ProcessTensor(tag, event.wall_time, event.step, datum)
+                    self._ProcessTensor(
+                        tag,
+                        event.wall_time,
+                        event.step,
+                        datum,
+                        blob_references.get(tag),
+                    )
+        return event
 
     def Tags(self):
         """Return all tags found in the value stream.
@@ -471,6 +753,63 @@ class EventAccumulator(object):
     def Tensors(self, tag):
         """Given a summary tag, return all associated tensors.
 
+        The tensors of tags stored as columns of scalars (see
+        `ScalarColumns`) are not kept as `TensorEvent`s, so each call builds
+        a `TensorProto` for every kept scalar. Use `ScalarColumns` to read
+        them, or just their steps and wall times, without this cost.
+
+        Args:
+          tag: A string tag associated with the events.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          An array of `TensorEvent`s.
+        """
+        return _ReadBlobs(tag, self.TensorReferences(tag))
+
+    def TensorsSince(self, tag, cursor):
+        """Given a summary tag, return the tensors added since a cursor.
+
+        Each tag keeps an append counter and a generation, which changes
+        when its tensors change other than by appending or replacing the
+        last one; see `reservoir.Reservoir.ItemsSince`.
+
+        Args:
+          tag: A string tag associated with the events.
+          cursor: `None`, or a cursor returned by a previous call for the
+            tag.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          A `(tensor_events, cursor, incremental)` tuple. If `incremental`,
+          `tensor_events` are the `TensorEvent`s from the last one covered by
+          the given cursor (which they replace) on; otherwise, all of them.
+          The returned cursor covers all of them.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            (columns, cursor, incremental) = tag_reservoir.Since(cursor)
+            tensor_events = self._ScalarTensorEvents(tag, columns)
+        else:
+            (tensor_events, cursor, incremental) = tag_reservoir.ItemsSince(
+                _TENSOR_RESERVOIR_KEY, cursor
+            )
+            tensor_events = _ReadBlobs(tag, tensor_events)
+        return (tensor_events, cursor, incremental)
+
+    def TensorReferences(self, tag):
+        """Like `Tensors`, but without reading back blob sequences.
+
+        Tensors whose `blob_reference` is set have their shape and dtype,
+        but not their values, which can be read with
+        `event_file_loader.read_blob_sequence`. Without `blob_references`,
+        this is the same as `Tensors`, and likewise builds the tensors of
+        tags stored as columns of scalars on each call.
+
         Args:
           tag: A string tag associated with the events.
 
@@ -480,7 +819,89 @@ class EventAccumulator(object):
         Returns:
           An array of `TensorEvent`s.
         """
-        return self.tensors_by_tag[tag].Items(_TENSOR_RESERVOIR_KEY)
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            return self._ScalarTensorEvents(tag, tag_reservoir.Columns())
+        return tag_reservoir.Items(_TENSOR_RESERVOIR_KEY)
+
+    def _ScalarTensorEvents(self, tag, columns):
+        """Returns the `TensorEvent`s of columns of scalars of a tag."""
+        numpy_dtype = dtypes.as_dtype(
+            self._scalar_dtype_by_tag[tag]
+        ).as_numpy_dtype
+        return [
+            TensorEvent(
+                wall_time=wall_time,
+                step=step,
+                tensor_proto=tensor_util.make_tensor_proto(numpy_dtype(value)),
+            )
+            for (step, wall_time, value) in zip(
+                columns.step.tolist(),
+                columns.wall_time.tolist(),
+                columns.value.tolist(),
+            )
+        ]
+
+    def ScalarColumns(
+        self, tag, downsample=None, step_range=None, wall_time_range=None
+    ):
+        """Given a summary tag of scalar data, return its scalars as columns.
+
+        This is cheaper than `Tensors` for tags of `DATA_CLASS_SCALAR`,
+        whose tensors are stored as columns.
+
+        Args:
+          tag: A string tag associated with the events.
+          downsample: Optional number of scalars to return, selected as in
+            `scalar_reservoir.ScalarReservoir.Downsample`. By default, all
+            scalars are returned.
+          step_range: Optional inclusive `(min_step, max_step)` pair, either
+            bound of which may be `None`. If given, only scalars with steps
+            in this range are returned, before downsampling.
+          wall_time_range: Likewise, for wall times.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          A `scalar_reservoir.ScalarColumns` of arrays, or `None` if the
+          tag's summaries are not stored as columns.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            if downsample is not None:
+                return tag_reservoir.Downsample(
+                    downsample,
+                    step_range=step_range,
+                    wall_time_range=wall_time_range,
+                )
+            return tag_reservoir.Columns(
+                step_range=step_range, wall_time_range=wall_time_range
+            )
+        return None
+
+    def ScalarColumnsSince(self, tag, cursor, downsample=None):
+        """Like `ScalarColumns`, for the scalars added since a cursor.
+
+        Args:
+          tag: A string tag associated with the events.
+          cursor: `None`, or a cursor returned by a previous call for the
+            tag.
+          downsample: Optional number of scalars to return, selected among
+            those added since the cursor; see `ScalarColumns`.
+
+        Raises:
+          KeyError: If the tag is not found.
+
+        Returns:
+          A `(columns, cursor, incremental)` tuple, as returned by
+          `scalar_reservoir.ScalarReservoir.Since`, or `None` if the tag's
+          summaries are not stored as columns.
+        """
+        tag_reservoir = self.tensors_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            return tag_reservoir.Since(cursor, downsample=downsample)
+        return None
 
     def _MaybePurgeOrphanedData(self, event):
         """Maybe purge orphaned data due to a TensorFlow crash.
@@ -547,13 +968,74 @@ class EventAccumulator(object):
         if event.step < self.most_recent_step and event.HasField("summary"):
             self._Purge(event, by_tags=True)
 
-    def _ProcessTensor(self, tag, wall_time, step, tensor):
-        tv = TensorEvent(wall_time=wall_time, step=step, tensor_proto=tensor)
+    def _ProcessTensor(self, tag, wall_time, step, tensor, blob_reference=None):
         with self._tensors_by_tag_lock:
             if tag not in self.tensors_by_tag:
                 reservoir_size = self._GetTensorReservoirSize(tag)
-                self.tensors_by_tag[tag] = reservoir.Reservoir(reservoir_size)
-        self.tensors_by_tag[tag].AddItem(_TENSOR_RESERVOIR_KEY, tv)
+                value_dtype = _ScalarValueDtype(tensor)
+                if self._IsScalarTag(tag) and value_dtype is not None:
+                    self.tensors_by_tag[tag] = scalar_reservoir.ScalarReservoir(
+                        reservoir_size, value_dtype
+                    )
+                    self._scalar_dtype_by_tag[tag] = tensor.dtype
+                else:
+                    self.tensors_by_tag[tag] = self._NewTensorReservoir(
+                        tag, reservoir_size
+                    )
+            tag_reservoir = self.tensors_by_tag[tag]
+            if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir) and (
+                tensor.dtype != self._scalar_dtype_by_tag[tag]
+                or _ScalarValueDtype(tensor) is None
+            ):
+                # Scalar data of another shape or dtype: keep the tensors of
+                # the tag as protos from now on.
+                logger.warning(
+                    "Tag %r has scalar data class but tensors of varying "
+                    "shape or dtype; storing them as protos.",
+                    tag,
+                )
+                tag_reservoir = self._NewTensorReservoir(
+                    tag, tag_reservoir.size
+                )
+                for tv in self.Tensors(tag):
+                    tag_reservoir.AddItem(_TENSOR_RESERVOIR_KEY, tv)
+                self.tensors_by_tag[tag] = tag_reservoir
+                del self._scalar_dtype_by_tag[tag]
+        if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+            tag_reservoir.AddScalar(step, wall_time, _ScalarValue(tensor))
+        else:
+            tv = TensorEvent(
+                wall_time=wall_time,
+                step=step,
+                tensor_proto=tensor,
+                blob_reference=blob_reference,
+            )
+            tag_reservoir.AddItem(_TENSOR_RESERVOIR_KEY, tv)
+
+    def _IsScalarTag(self, tag):
+        summary_metadata = self.summary_metadata.get(tag)
+        return (
+            summary_metadata is not None
+            and summary_metadata.data_class == summary_pb2.DATA_CLASS_SCALAR
+        )
+
+    def _NewTensorReservoir(self, tag, size):
+        """Returns a reservoir for the tensor protos of a tag."""
+        if self._byte_budget is None:
+            return reservoir.Reservoir(size)
+        max_bytes = 0
+        summary_metadata = self.summary_metadata.get(tag)
+        if summary_metadata is not None:
+            max_bytes = self._tensor_byte_guidance.get(
+                summary_metadata.plugin_data.plugin_name, 0
+            )
+        return reservoir.Reservoir(
+            size,
+            byte_budget=byte_budget.ByteBudget(
+                max_bytes, parent=self._byte_budget
+            ),
+            byte_size_fn=_TensorEventBytes,
+        )
 
     def _GetTensorReservoirSize(self, tag):
         default = self._size_guidance[TENSORS]
@@ -589,19 +1071,22 @@ class EventAccumulator(object):
         ## Keep data in reservoirs that has a step less than event.step
         _NotExpired = lambda x: x.step < event.step
 
+        def _FilterReservoir(tag_reservoir):
+            # `_NotExpired` also works on the arrays of a `ScalarReservoir`,
+            # for which it returns a boolean array.
+            if isinstance(tag_reservoir, scalar_reservoir.ScalarReservoir):
+                return tag_reservoir.FilterItems(_NotExpired)
+            return tag_reservoir.FilterItems(_NotExpired, _TENSOR_RESERVOIR_KEY)
+
         num_expired = 0
         if by_tags:
             for value in event.summary.value:
                 if value.tag in self.tensors_by_tag:
                     tag_reservoir = self.tensors_by_tag[value.tag]
-                    num_expired += tag_reservoir.FilterItems(
-                        _NotExpired, _TENSOR_RESERVOIR_KEY
-                    )
+                    num_expired += _FilterReservoir(tag_reservoir)
         else:
             for tag_reservoir in six.itervalues(self.tensors_by_tag):
-                num_expired += tag_reservoir.FilterItems(
-                    _NotExpired, _TENSOR_RESERVOIR_KEY
-                )
+                num_expired += _FilterReservoir(tag_reservoir)
         if num_expired > 0:
             purge_msg = _GetPurgeMessage(
                 self.most_recent_step,
@@ -613,6 +1098,101 @@ class EventAccumulator(object):
             logger.warning(purge_msg)
 
 
+_NO_BLOB_REFERENCES = {}
+
+
+def _ReadBlobs(tag, tensor_events):
+    """Reads back the blob sequences of tensors stored by reference."""
+    if all(tv.blob_reference is None for tv in tensor_events):
+        return tensor_events
+    return [
+        tv
+        if tv.blob_reference is None
+        else tv._replace(
+            tensor_proto=event_file_loader.read_blob_sequence(
+                tv.blob_reference, tag
+            )
+        )
+        for tv in tensor_events
+    ]
+
+
+def _BlobReferenceState(blob_reference):
+    """Encodes a `BlobReference` or `None` for `GetState`."""
+    if blob_reference is None:
+        return None
+    (file_path, offset, length, initial_metadata) = blob_reference
+    if initial_metadata is not None:
+        initial_metadata = initial_metadata.SerializeToString()
+    return [file_path, offset, length, initial_metadata]
+
+
+def _BlobReferenceFromState(state, metadata_by_serialized):
+    """Inverse of `_BlobReferenceState`.
+
+    Args:
+      state: The encoded `BlobReference`, or `None`.
+      metadata_by_serialized: Dict from serialized to parsed metadata, to
+        share the metadata of decoded references; updated in place.
+    """
+    if state is None:
+        return None
+    (file_path, offset, length, initial_metadata) = state
+    if initial_metadata is not None:
+        serialized = initial_metadata
+        initial_metadata = metadata_by_serialized.get(serialized)
+        if initial_metadata is None:
+            initial_metadata = summary_pb2.SummaryMetadata.FromString(
+                serialized
+            )
+            metadata_by_serialized[serialized] = initial_metadata
+    return event_file_loader.BlobReference(
+        file_path, offset, length, initial_metadata
+    )
+
+
+def _RandomState(state):
+    """Converts a `random.Random` state decoded as lists back to tuples."""
+    (version, internal_state, gauss_next) = state
+    return (version, tuple(internal_state), gauss_next)
+
+
+def _TensorEventBytes(tv):
+    return tv.tensor_proto.ByteSize()
+
+
+def _ScalarValueDtype(tensor):
+    """Returns the NumPy dtype in which to store the value of a `TensorProto`.
+
+    Values are stored in the smallest floating-point dtype that represents
+    all values of the tensor's dtype exactly, or nearly so for 64-bit
+    integers.
+
+    Returns:
+      A NumPy dtype, or `None` if the tensor is not a rank-0 tensor of a
+      real number type.
+    """
+    if tensor.tensor_shape.dim:
+        return None
+    try:
+        dtype = dtypes.as_dtype(tensor.dtype)
+        if not (dtype.is_floating or dtype.is_integer or dtype.is_bool):
+            return None
+        return np.promote_types(dtype.as_numpy_dtype, np.float32)
+    except TypeError:
+        return None
+
+
+def _ScalarValue(tensor):
+    """Returns the value of a scalar `TensorProto` as a Python number."""
+    # Fast paths for the common encodings of scalar summaries.
+    if len(tensor.float_val) == 1 and not tensor.tensor_content:
+        return tensor.float_val[0]
+    if len(tensor.double_val) == 1 and not tensor.tensor_content:
+        return tensor.double_val[0]
+    return tensor_util.make_ndarray(tensor).item()
+
+
 def _GetPurgeMessage(
     most_recent_step,
     most_recent_wall_time,
@@ -635,24 +1215,47 @@ def _GetPurgeMessage(
     )
 
 
-def _GeneratorFromPath(path, event_file_active_filter=None):
+def _GeneratorFromPath(
+    path,
+    event_file_active_filter=None,
+    reader_state=None,
+    plugin_filter=None,
+    change_notifier=None,
+    stats=None,
+    blob_references=False,
+):
     """Create an event generator for file or directory at given path string."""
     if not path:
         raise ValueError("path must be a valid string")
+    loader_kwargs = {
+        "reader_state": reader_state,
+        "plugin_filter": plugin_filter,
+        "stats": stats,
+    }
+    if blob_references:
+        loader_kwargs["blob_references"] = True
     if io_wrapper.IsSummaryEventsFile(path):
-        return event_file_loader.EventFileLoader(path)
+        return event_file_loader.EventFileLoader(path, **loader_kwargs)
     elif event_file_active_filter:
         return directory_loader.DirectoryLoader(
             path,
-            event_file_loader.TimestampedEventFileLoader,
+            functools.partial(
+                event_file_loader.TimestampedEventFileLoader, **loader_kwargs
+            ),
             path_filter=io_wrapper.IsSummaryEventsFile,
             active_filter=event_file_active_filter,
+            change_notifier=change_notifier,
+            reader_state=reader_state,
         )
     else:
         return directory_watcher.DirectoryWatcher(
             path,
-            event_file_loader.EventFileLoader,
+            functools.partial(
+                event_file_loader.EventFileLoader, **loader_kwargs
+            ),
             io_wrapper.IsSummaryEventsFile,
+            change_notifier=change_notifier,
+            reader_state=reader_state,
         )
 
 
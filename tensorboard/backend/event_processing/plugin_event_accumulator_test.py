@@ -26,6 +26,7 @@ import tensorflow as tf
 
 from tensorboard import data_compat
 from tensorboard import dataclass_compat
+from tensorboard.backend.event_processing import byte_budget
 from tensorboard.backend.event_processing import plugin_event_accumulator as ea
 from tensorboard.compat.proto import config_pb2
 from tensorboard.compat.proto import event_pb2
@@ -144,7 +145,15 @@ class MockingEventAccumulatorTest(EventAccumulatorTest):
         self._real_generator = ea._GeneratorFromPath
 
         def _FakeAccumulatorConstructor(generator, *args, **kwargs):
-            def _FakeGeneratorFromPath(path, event_file_active_filter=None):
+            def _FakeGeneratorFromPath(
+                path,
+                event_file_active_filter=None,
+                reader_state=None,
+                plugin_filter=None,
+                change_notifier=None,
+                stats=None,
+                blob_references=False,
+            ):
                 return generator
 
             ea._GeneratorFromPath = _FakeGeneratorFromPath
@@ -195,6 +204,149 @@ class MockingEventAccumulatorTest(EventAccumulatorTest):
         acc.Reload()
         self.assertTagsEqual(acc.Tags(), {ea.TENSORS: ["s1", "s3"],})
 
+    def testScalarDataClassStoredAsColumns(self):
+        gen = _EventGenerator(self)
+        acc = ea.EventAccumulator(gen)
+        for step in range(5):
+            gen.AddEvent(
+                event_pb2.Event(
+                    wall_time=step * 10.0,
+                    step=step,
+                    summary=summary_pb2.Summary(
+                        value=[
+                            summary_pb2.Summary.Value(
+                                tag="loss", simple_value=step / 2.0
+                            )
+                        ]
+                    ),
+                )
+            )
+        gen.AddScalarTensor("s1", wall_time=1, step=10, value=50)
+        acc.Reload()
+        columns = acc.ScalarColumns("loss")
+        self.assertEqual(columns.step.tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            columns.wall_time.tolist(), [0.0, 10.0, 20.0, 30.0, 40.0]
+        )
+        self.assertEqual(columns.value.tolist(), [0.0, 0.5, 1.0, 1.5, 2.0])
+        tensor_events = acc.Tensors("loss")
+        self.assertEqual([e.step for e in tensor_events], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [tensor_util.make_ndarray(e.tensor_proto) for e in tensor_events],
+            [np.float32(v) for v in (0.0, 0.5, 1.0, 1.5, 2.0)],
+        )
+        self.assertEqual(tensor_events[0].tensor_proto.dtype, tf.float32)
+        # Tensors without scalar metadata are kept as protos.
+        self.assertIsNone(acc.ScalarColumns("s1"))
+
+    def testScalarDataClassWithNonScalarData(self):
+        gen = _EventGenerator(self)
+        acc = ea.EventAccumulator(gen)
+        metadata = summary_pb2.SummaryMetadata(
+            data_class=summary_pb2.DATA_CLASS_SCALAR
+        )
+        metadata.plugin_data.plugin_name = "greetings"
+        for (step, value) in enumerate((1.0, [2.0, 3.0], 4.0)):
+            gen.AddEvent(
+                event_pb2.Event(
+                    step=step,
+                    summary=summary_pb2.Summary(
+                        value=[
+                            summary_pb2.Summary.Value(
+                                tag="bad",
+                                metadata=metadata,
+                                tensor=tensor_util.make_tensor_proto(value),
+                            )
+                        ]
+                    ),
+                )
+            )
+        acc.Reload()
+        self.assertIsNone(acc.ScalarColumns("bad"))
+        self.assertEqual(
+            [
+                tensor_util.make_ndarray(e.tensor_proto).tolist()
+                for e in acc.Tensors("bad")
+            ],
+            [1.0, [2.0, 3.0], 4.0],
+        )
+
+    def _AddBlobs(self, gen, tag, plugin_name, num_steps, blob_size):
+        metadata = summary_pb2.SummaryMetadata()
+        metadata.plugin_data.plugin_name = plugin_name
+        for step in range(num_steps):
+            tensor = tensor_util.make_tensor_proto([b"x" * blob_size])
+            gen.AddEvent(
+                event_pb2.Event(
+                    step=step,
+                    summary=summary_pb2.Summary(
+                        value=[
+                            summary_pb2.Summary.Value(
+                                tag=tag, metadata=metadata, tensor=tensor
+                            )
+                        ]
+                    ),
+                )
+            )
+
+    def testTensorByteGuidance(self):
+        gen = _EventGenerator(self)
+        acc = ea.EventAccumulator(
+            gen, tensor_byte_guidance={"images": 10000}, max_tensor_bytes=25000,
+        )
+        self.assertEqual(acc.TensorBytes(), 0)
+        self._AddBlobs(gen, "big", "images", 20, 1000)
+        self._AddBlobs(gen, "small", "text", 20, 10)
+        acc.Reload()
+        big = acc.Tensors("big")
+        self.assertLess(len(big), 10)
+        self.assertEqual(big[-1].step, 19)
+        self.assertLessEqual(sum(e.tensor_proto.ByteSize() for e in big), 10000)
+        self.assertLen(acc.Tensors("small"), 20)
+        self.assertEqual(
+            acc.TensorBytes(),
+            sum(
+                e.tensor_proto.ByteSize()
+                for tag in ("big", "small")
+                for e in acc.Tensors(tag)
+            ),
+        )
+        # The run's limit applies across tags.
+        self._AddBlobs(gen, "other", "audio", 20, 1000)
+        acc.Reload()
+        self.assertLessEqual(acc.TensorBytes(), 25000)
+
+    def testSharedByteBudget(self):
+        parent = byte_budget.ByteBudget(40000)
+        (gen1, gen2) = (_EventGenerator(self), _EventGenerator(self))
+        acc1 = ea.EventAccumulator(gen1, parent_byte_budget=parent)
+        acc2 = ea.EventAccumulator(gen2, parent_byte_budget=parent)
+        self._AddBlobs(gen1, "big", "images", 100, 1000)
+        acc1.Reload()
+        self.assertGreater(acc1.TensorBytes(), 38000)
+        # The run loaded later is not starved: evictions are taken from the
+        # run with the most bytes until both hold about as many.
+        self._AddBlobs(gen2, "big", "images", 100, 1000)
+        acc2.Reload()
+        self.assertLessEqual(parent.used_bytes, 40000)
+        self.assertAlmostEqual(
+            acc1.TensorBytes(), acc2.TensorBytes(), delta=2000
+        )
+        self.assertEqual(acc2.Tensors("big")[-1].step, 99)
+        # Once the first run is discarded, the second grows again.
+        acc1.ReleaseByteBudget()
+        self._AddBlobs(gen2, "other", "images", 100, 1000)
+        acc2.Reload()
+        self.assertGreater(acc2.TensorBytes(), 30000)
+
+    def testNoByteGuidance(self):
+        gen = _EventGenerator(self)
+        acc = ea.EventAccumulator(gen)
+        self._AddBlobs(gen, "big", "images", 5, 1000)
+        acc.Reload()
+        self.assertIsNone(acc.TensorBytes())
+        self.assertLen(acc.Tensors("big"), 5)
+
     def testExpiredDataDiscardedAfterRestartForFileVersionLessThan2(self):
         """Tests that events are discarded after a restart is detected.
 
@@ -758,6 +910,52 @@ class RealisticEventAccumulatorTest(EventAccumulatorTest):
         )
         self.assertProtoEquals(expected_meta_graph, acc.MetaGraph())
 
+    def testBlobReferences(self):
+        """Test reading back blobs left on disk with `blob_references`."""
+        directory = os.path.join(self.get_temp_dir(), "blob_references_dir")
+        writer = test_util.FileWriter(directory)
+        with tf.compat.v1.Graph().as_default():
+            with self.test_session() as sess:
+                audio_summary.op(
+                    "audio",
+                    tf.random.normal(shape=[3, 441, 2]),
+                    sample_rate=44100,
+                    max_outputs=2,
+                )
+                image_summary.op(
+                    "images", tf.ones([2, 4, 4, 3], tf.uint8), max_outputs=2
+                )
+                tf.compat.v1.summary.scalar("loss", tf.constant(1.0))
+                merged = tf.compat.v1.summary.merge_all()
+                writer.add_graph(sess.graph)
+                for i in xrange(3):
+                    writer.add_summary(sess.run(merged), global_step=i)
+        writer.close()
+
+        expected = ea.EventAccumulator(directory)
+        expected.Reload()
+        acc = ea.EventAccumulator(directory, blob_references=True)
+        acc.Reload()
+        tags = acc.Tags()[ea.TENSORS]
+        self.assertItemsEqual(tags, expected.Tags()[ea.TENSORS])
+        for tag in tags:
+            self.assertEqual(
+                [tv[:3] for tv in acc.Tensors(tag)],
+                [tv[:3] for tv in expected.Tensors(tag)],
+            )
+            references = acc.TensorReferences(tag)
+            metadata = acc.SummaryMetadata(tag)
+            if metadata.data_class == summary_pb2.DATA_CLASS_BLOB_SEQUENCE:
+                for (tv, expected_tv) in zip(references, expected.Tensors(tag)):
+                    self.assertIsNotNone(tv.blob_reference)
+                    self.assertEmpty(tv.tensor_proto.string_val)
+                    self.assertEqual(
+                        tv.tensor_proto.tensor_shape,
+                        expected_tv.tensor_proto.tensor_shape,
+                    )
+            else:
+                self.assertEqual(references, expected.Tensors(tag))
+
     def _writeMetadata(self, logdir, summary_metadata, nonce=""):
         """Write to disk a summary with the given metadata.
 
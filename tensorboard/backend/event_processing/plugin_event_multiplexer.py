@@ -20,15 +20,20 @@ from __future__ import print_function
 
 import os
 import threading
+import time
 
 import six
 from six.moves import queue, xrange  # pylint: disable=redefined-builtin
 
+from tensorboard.backend.event_processing import byte_budget
 from tensorboard.backend.event_processing import directory_watcher
 from tensorboard.backend.event_processing import (
     plugin_event_accumulator as event_accumulator,
 )
 from tensorboard.backend.event_processing import io_wrapper
+from tensorboard.backend.event_processing import (
+    reader_state as reader_state_lib,
+)
 from tensorboard.util import tb_logging
 
 
@@ -81,6 +86,17 @@ class EventMultiplexer(object):
         purge_orphaned_data=True,
         max_reload_threads=None,
         event_file_active_filter=None,
+        reader_state=None,
+        plugin_filter=None,
+        change_notifier=None,
+        discovery_index=None,
+        reload_scheduler=None,
+        ingestion_stats=None,
+        tensor_byte_guidance=None,
+        max_tensor_bytes_per_run=0,
+        max_tensor_bytes=0,
+        blob_references=False,
+        ingest_cache=None,
     ):
         """Constructor for the `EventMultiplexer`.
 
@@ -102,6 +118,42 @@ class EventMultiplexer(object):
           event_file_active_filter: Optional predicate for determining whether an
             event file latest load timestamp should be considered active. If passed,
             this will enable multifile directory loading.
+          reader_state: Optional `reader_state.ReaderState` shared by all runs,
+            recording how far each event file has been read. See
+            `event_accumulator.EventAccumulator` for details.
+          plugin_filter: Optional `plugin_filter.PluginFilter` selecting the
+            plugins whose data is loaded. See
+            `event_accumulator.EventAccumulator` for details.
+          change_notifier: Optional `change_notifier.ChangeNotifier` shared
+            by all runs, so that runs whose directories have not changed are
+            not reloaded. See `event_accumulator.EventAccumulator` for
+            details.
+          discovery_index: Optional `discovery_index.DiscoveryIndex` used by
+            `AddRunsFromDirectory` to find runs, so that directories that
+            have not changed since a previous call are not listed again.
+          reload_scheduler: Optional `reload_scheduler.ReloadScheduler`
+            choosing which runs `Reload` reloads, so that runs that are
+            idle and whose data is not being read are reloaded less often.
+          ingestion_stats: Optional `ingestion_stats.IngestionStats` into
+            which the reads and reloads of all runs, and each call to
+            `Reload`, are recorded.
+          tensor_byte_guidance: A dictionary mapping from `plugin_name` to
+            the number of bytes of tensor protos to keep for each tag of
+            that plugin. See `event_accumulator.EventAccumulator` for
+            details.
+          max_tensor_bytes_per_run: The number of bytes of tensor protos to
+            keep for each run, or 0 for no limit.
+          max_tensor_bytes: The number of bytes of tensor protos to keep for
+            all runs together, or 0 for no limit.
+          blob_references: If true, keep only the locations of the values
+            of blob sequence tensors in memory, and read the values back
+            from the event files when needed. See
+            `event_accumulator.EventAccumulator` for details.
+          ingest_cache: Optional `ingest_cache.IngestCache`. If passed, the
+            data of each run is restored from its snapshot, if fresh, as
+            the run is added, so that only events appended since are read;
+            and `SaveIngestCache` saves new snapshots. Each run then has
+            its own reader state, and `reader_state` is not used.
         """
         logger.info("Event Multiplexer initializing.")
         self._accumulators_mutex = threading.Lock()
@@ -115,6 +167,22 @@ class EventMultiplexer(object):
         self.purge_orphaned_data = purge_orphaned_data
         self._max_reload_threads = max_reload_threads or 1
         self._event_file_active_filter = event_file_active_filter
+        self._reader_state = reader_state
+        self._plugin_filter = plugin_filter
+        self._change_notifier = change_notifier
+        # From run name to the `DirectoryChanges` of its directory, or
+        # `None` if it is not watched, if there is a change notifier.
+        self._run_changes = {}
+        self._discovery_index = discovery_index
+        self._reload_scheduler = reload_scheduler
+        self._ingestion_stats = ingestion_stats
+        self._tensor_byte_guidance = tensor_byte_guidance
+        self._max_tensor_bytes_per_run = max_tensor_bytes_per_run
+        self._byte_budget = None
+        if max_tensor_bytes:
+            self._byte_budget = byte_budget.ByteBudget(max_tensor_bytes)
+        self._blob_references = blob_references
+        self._ingest_cache = ingest_cache
         if run_path_map is not None:
             logger.info(
                 "Event Multplexer doing initialization load for %s",
@@ -157,15 +225,50 @@ class EventMultiplexer(object):
                         path,
                     )
                 logger.info("Constructing EventAccumulator for %s", path)
+                stats = None
+                if self._ingestion_stats is not None:
+                    stats = self._ingestion_stats.ForRun(name)
+                run_reader_state = self._reader_state
+                state = None
+                if self._ingest_cache is not None:
+                    run_reader_state = reader_state_lib.ReaderState(None)
+                    state = self._ingest_cache.Load(path)
+                    if state is not None and (
+                        state.get("config") != self._IngestConfig()
+                    ):
+                        logger.info(
+                            "Not restoring %s from cache: settings changed",
+                            path,
+                        )
+                        state = None
+                    if state is not None:
+                        run_reader_state.Restore(state["reader_state"])
                 accumulator = event_accumulator.EventAccumulator(
                     path,
                     size_guidance=self._size_guidance,
                     tensor_size_guidance=self._tensor_size_guidance,
                     purge_orphaned_data=self.purge_orphaned_data,
                     event_file_active_filter=self._event_file_active_filter,
+                    reader_state=run_reader_state,
+                    plugin_filter=self._plugin_filter,
+                    change_notifier=self._change_notifier,
+                    stats=stats,
+                    tensor_byte_guidance=self._tensor_byte_guidance,
+                    max_tensor_bytes=self._max_tensor_bytes_per_run,
+                    parent_byte_budget=self._byte_budget,
+                    blob_references=self._blob_references,
                 )
+                if state is not None:
+                    accumulator.SetState(state)
+                if self._byte_budget is not None and name in self._accumulators:
+                    self._accumulators[name].ReleaseByteBudget()
                 self._accumulators[name] = accumulator
                 self._paths[name] = path
+                if self._change_notifier is not None:
+                    changes = self._run_changes.pop(name, None)
+                    if changes is not None:
+                        changes.Close()
+                    self._run_changes[name] = self._change_notifier.Watch(path)
         if accumulator:
             if self._reload_called:
                 accumulator.Reload()
@@ -199,7 +302,11 @@ class EventMultiplexer(object):
           The `EventMultiplexer`.
         """
         logger.info("Starting AddRunsFromDirectory: %s", path)
-        for subdir in io_wrapper.GetLogdirSubdirectories(path):
+        if self._discovery_index is not None:
+            subdirs = self._discovery_index.GetLogdirSubdirectories(path)
+        else:
+            subdirs = io_wrapper.GetLogdirSubdirectories(path)
+        for subdir in subdirs:
             logger.info("Adding run from directory %s", subdir)
             rpath = os.path.relpath(subdir, path)
             subname = os.path.join(name, rpath) if name else rpath
@@ -207,14 +314,89 @@ class EventMultiplexer(object):
         logger.info("Done with AddRunsFromDirectory: %s", path)
         return self
 
-    def Reload(self):
-        """Call `Reload` on every `EventAccumulator`."""
+    def _IngestConfig(self):
+        """Returns the settings that snapshots of runs must match.
+
+        These are the settings that affect which data of the events read
+        is kept, other than byte limits, which are enforced as restored
+        data is added to reservoirs.
+        """
+        # Lists rather than tuples, to compare equal after a JSON round trip.
+        return {
+            "size_guidance": sorted(
+                [k, v] for (k, v) in six.iteritems(self._size_guidance)
+            ),
+            "tensor_size_guidance": sorted(
+                [k, v]
+                for (k, v) in six.iteritems(self._tensor_size_guidance or {})
+            ),
+            "purge_orphaned_data": bool(self.purge_orphaned_data),
+            "plugin_filter": repr(self._plugin_filter),
+            "blob_references": bool(self._blob_references),
+        }
+
+    def SaveIngestCache(self):
+        """Saves snapshots of the runs whose data changed, if due.
+
+        Does nothing unless the multiplexer has an ingest cache. See
+        `ingest_cache.IngestCache.IsSaveDue` for when saves are due.
+        """
+        if self._ingest_cache is None:
+            return
+        with self._accumulators_mutex:
+            items = [
+                (self._paths[name], accumulator)
+                for (name, accumulator) in six.iteritems(self._accumulators)
+            ]
+        config = self._IngestConfig()
+        for (path, accumulator) in items:
+            version = accumulator.num_loaded_events
+            if not self._ingest_cache.IsSaveDue(path, version):
+                continue
+            state = accumulator.GetState()
+            state["config"] = config
+            self._ingest_cache.Save(path, state, state["num_loaded_events"])
+
+    def Reload(self, changed_only=False):
+        """Call `Reload` on every `EventAccumulator`.
+
+        If the multiplexer has a reload scheduler, only the accumulators of
+        the runs that it chooses are reloaded.
+
+        Args:
+          changed_only: If true, only the runs whose directories are watched
+            by the change notifier and have changed since they were last
+            reloaded are reloaded, regardless of any reload scheduler.
+        """
         logger.info("Beginning EventMultiplexer.Reload()")
+        start = time.time()
         self._reload_called = True
         # Build a list so we're safe even if the list of accumulators is modified
         # even while we're reloading.
         with self._accumulators_mutex:
             items = list(self._accumulators.items())
+        num_runs = len(items)
+        scheduler = self._reload_scheduler
+        if changed_only:
+            items = [
+                (name, acc) for (name, acc) in items if self._Changed(name)
+            ]
+            logger.info(
+                "Reloading %d of %d runs, which changed", len(items), num_runs
+            )
+        elif scheduler is not None:
+            accumulators = dict(items)
+            items = [
+                (name, accumulators[name])
+                for name in scheduler.Schedule(list(accumulators))
+            ]
+            logger.info(
+                "Reloading %d of %d runs", len(items), len(accumulators)
+            )
+        if not changed_only:
+            # The reloads below load any changes seen so far.
+            for (name, _) in items:
+                self._Changed(name)
         items_queue = queue.Queue()
         for item in items:
             items_queue.put(item)
@@ -234,7 +416,15 @@ class EventMultiplexer(object):
                     break
 
                 try:
-                    accumulator.Reload()
+                    if scheduler is None:
+                        accumulator.Reload()
+                    else:
+                        num_loaded_events = accumulator.num_loaded_events
+                        accumulator.Reload()
+                        scheduler.RecordReload(
+                            name,
+                            accumulator.num_loaded_events > num_loaded_events,
+                        )
                 except (OSError, IOError) as e:
                     logger.error("Unable to reload accumulator %r: %s", name, e)
                 except directory_watcher.DirectoryDeletedError:
@@ -261,10 +451,36 @@ class EventMultiplexer(object):
         with self._accumulators_mutex:
             for name in names_to_delete:
                 logger.warning("Deleting accumulator %r", name)
+                if self._byte_budget is not None:
+                    self._accumulators[name].ReleaseByteBudget()
                 del self._accumulators[name]
+                changes = self._run_changes.pop(name, None)
+                if changes is not None:
+                    changes.Close()
+                if scheduler is not None:
+                    scheduler.Forget(name)
+                if self._ingestion_stats is not None:
+                    self._ingestion_stats.Forget(name)
+                path = self._paths.get(name)
+                if self._reader_state is not None and path is not None:
+                    # The run's path is an event file or a directory of them.
+                    self._reader_state.Forget(path)
+                    self._reader_state.ForgetDirectory(path)
+        if self._ingestion_stats is not None:
+            self._ingestion_stats.RecordCycle(
+                time.time() - start, num_runs, len(items)
+            )
         logger.info("Finished with EventMultiplexer.Reload()")
         return self
 
+    def _Changed(self, name):
+        """Returns whether a run's directory changed since the last call.
+
+        Runs whose directories are not watched are reported as unchanged.
+        """
+        changes = self._run_changes.get(name)
+        return changes is not None and changes.Changed()
+
     def PluginAssets(self, plugin_name):
         """Get index of runs and assets for a given plugin.
 
@@ -295,7 +511,7 @@ class EventMultiplexer(object):
         Raises:
           KeyError: If the asset is not available.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.RetrievePluginAsset(plugin_name, asset_name)
 
     def FirstEventTimestamp(self, run):
@@ -331,7 +547,7 @@ class EventMultiplexer(object):
         Returns:
           The `GraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.Graph()
 
     def SerializedGraph(self, run):
@@ -347,7 +563,7 @@ class EventMultiplexer(object):
         Returns:
           The serialized form of the `GraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.SerializedGraph()
 
     def MetaGraph(self, run):
@@ -363,7 +579,7 @@ class EventMultiplexer(object):
         Returns:
           The `MetaGraphDef` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.MetaGraph()
 
     def RunMetadata(self, run, tag):
@@ -381,12 +597,17 @@ class EventMultiplexer(object):
         Returns:
           The metadata in the form of `RunMetadata` protobuf data structure.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.RunMetadata(tag)
 
     def Tensors(self, run, tag):
         """Retrieve the tensor events associated with a run and tag.
 
+        For tags stored as columns of scalars, the tensor events are built
+        on each call, at a cost linear in the number of kept scalars; see
+        `event_accumulator.EventAccumulator.Tensors`. Prefer `ScalarColumns`
+        for such tags.
+
         Args:
           run: A string name of the run for which values are retrieved.
           tag: A string name of the tag for which values are retrieved.
@@ -398,9 +619,106 @@ class EventMultiplexer(object):
         Returns:
           An array of `event_accumulator.TensorEvent`s.
         """
-        accumulator = self.GetAccumulator(run)
+        accumulator = self._GetAccumulatorForRead(run)
         return accumulator.Tensors(tag)
 
+    def TensorsSince(self, run, tag, cursor):
+        """Retrieve the tensor events of a run and tag added since a cursor.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+          cursor: `None`, or a cursor returned by a previous call for the
+            run and tag; see `EventAccumulator.TensorsSince`.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          A `(tensor_events, cursor, incremental)` tuple; see
+          `EventAccumulator.TensorsSince`.
+        """
+        accumulator = self._GetAccumulatorForRead(run)
+        return accumulator.TensorsSince(tag, cursor)
+
+    def TensorReferences(self, run, tag):
+        """Retrieve the tensor events of a run and tag, without blob values.
+
+        Like `Tensors`, but the values of blob sequences stored by
+        reference are not read back from disk. See
+        `event_accumulator.EventAccumulator.TensorReferences`.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          An array of `event_accumulator.TensorEvent`s.
+        """
+        accumulator = self._GetAccumulatorForRead(run)
+        return accumulator.TensorReferences(tag)
+
+    def ScalarColumns(
+        self, run, tag, downsample=None, step_range=None, wall_time_range=None
+    ):
+        """Retrieve the scalars of a run and tag as columns, if so stored.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+          downsample: Optional number of scalars to retrieve; see
+            `EventAccumulator.ScalarColumns`.
+          step_range: Optional range of steps to retrieve; see
+            `EventAccumulator.ScalarColumns`.
+          wall_time_range: Optional range of wall times to retrieve.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          A `scalar_reservoir.ScalarColumns` of arrays, or `None` if the
+          tag's summaries are not stored as columns, in which case they
+          are available from `Tensors`.
+        """
+        accumulator = self._GetAccumulatorForRead(run)
+        return accumulator.ScalarColumns(
+            tag,
+            downsample=downsample,
+            step_range=step_range,
+            wall_time_range=wall_time_range,
+        )
+
+    def ScalarColumnsSince(self, run, tag, cursor, downsample=None):
+        """Retrieve the scalars of a run and tag added since a cursor.
+
+        Args:
+          run: A string name of the run for which values are retrieved.
+          tag: A string name of the tag for which values are retrieved.
+          cursor: `None`, or a cursor returned by a previous call for the
+            run and tag.
+          downsample: Optional number of scalars to retrieve; see
+            `EventAccumulator.ScalarColumnsSince`.
+
+        Raises:
+          KeyError: If the run is not found, or the tag is not available for
+            the given run.
+
+        Returns:
+          A `(columns, cursor, incremental)` tuple, or `None` if the tag's
+          summaries are not stored as columns; see
+          `EventAccumulator.ScalarColumnsSince`.
+        """
+        accumulator = self._GetAccumulatorForRead(run)
+        return accumulator.ScalarColumnsSince(
+            tag, cursor, downsample=downsample
+        )
+
     def PluginRunToTagToContent(self, plugin_name):
         """Returns a 2-layer dictionary of the form {run: {tag: content}}.
 
@@ -489,6 +807,10 @@ class EventMultiplexer(object):
         """Returns a dict mapping run names to event file paths."""
         return self._paths
 
+    def IngestionStats(self):
+        """Returns the `ingestion_stats.IngestionStats`, or `None`."""
+        return self._ingestion_stats
+
     def GetAccumulator(self, run):
         """Returns EventAccumulator for a given run.
 
@@ -503,3 +825,15 @@ class EventMultiplexer(object):
         """
         with self._accumulators_mutex:
             return self._accumulators[run]
+
+    def _GetAccumulatorForRead(self, run):
+        """Like `GetAccumulator`, but records a read of the run's data.
+
+        Only reads of a run's data count as queries for the reload
+        scheduler: listing runs, tags or metadata does not keep a run
+        from backing off.
+        """
+        accumulator = self.GetAccumulator(run)
+        if self._reload_scheduler is not None:
+            self._reload_scheduler.RecordQuery(run)
+        return accumulator
@@ -23,12 +23,15 @@ import shutil
 
 import tensorflow as tf
 
+from tensorboard.backend.event_processing import change_notifier
 from tensorboard.backend.event_processing import (
     plugin_event_accumulator as event_accumulator,
 )
 from tensorboard.backend.event_processing import (
     plugin_event_multiplexer as event_multiplexer,
 )
+from tensorboard.backend.event_processing import reader_state
+from tensorboard.backend.event_processing import reload_scheduler
 from tensorboard.util import test_util
 
 
@@ -56,12 +59,16 @@ class _FakeAccumulator(object):
         """
         self._path = path
         self.reload_called = False
+        self.reload_count = 0
+        self.num_loaded_events = 0
+        # Number of events that the next `Reload` loads.
+        self.pending_events = 0
         self._plugin_to_tag_to_content = {
             "baz_plugin": {"foo": "foo_content", "bar": "bar_content",}
         }
 
     def Tags(self):
-        return {}
+        return {event_accumulator.TENSORS: ["tensor"]}
 
     def FirstEventTimestamp(self):
         return 0
@@ -89,6 +96,9 @@ class _FakeAccumulator(object):
 
     def Reload(self):
         self.reload_called = True
+        self.reload_count += 1
+        self.num_loaded_events += self.pending_events
+        self.pending_events = 0
 
 
 def _GetFakeAccumulator(
@@ -97,9 +107,19 @@ def _GetFakeAccumulator(
     tensor_size_guidance=None,
     purge_orphaned_data=None,
     event_file_active_filter=None,
+    reader_state=None,
+    plugin_filter=None,
+    change_notifier=None,
+    stats=None,
+    tensor_byte_guidance=None,
+    max_tensor_bytes=0,
+    parent_byte_budget=None,
+    blob_references=False,
 ):
     del size_guidance, tensor_size_guidance, purge_orphaned_data  # Unused.
-    del event_file_active_filter  # unused
+    del event_file_active_filter, reader_state, plugin_filter  # unused
+    del change_notifier, stats, tensor_byte_guidance  # unused
+    del max_tensor_bytes, parent_byte_budget, blob_references  # unused
     return _FakeAccumulator(path)
 
 
@@ -412,6 +432,79 @@ class EventMultiplexerTest(tf.test.TestCase):
         self.assertEqual(0, start_mock.call_count)
         self.assertEqual(0, join_mock.call_count)
 
+    def testReloadScheduler(self):
+        now = [0.0]
+        scheduler = reload_scheduler.ReloadScheduler(
+            max_backoff_cycles=4, query_window_secs=10, clock=lambda: now[0]
+        )
+        x = event_multiplexer.EventMultiplexer(
+            {"active": "active_path", "idle": "idle_path"},
+            reload_scheduler=scheduler,
+        )
+        active = x.GetAccumulator("active")
+        idle = x.GetAccumulator("idle")
+        for _ in range(20):
+            active.pending_events = 1
+            x.Reload()
+        self.assertEqual(active.reload_count, 20)
+        # Reloaded on cycles 1, 3, 6, 11 and 16 (after backoffs of 1, 2, 4
+        # and 4 cycles).
+        self.assertEqual(idle.reload_count, 5)
+
+        x.Tensors("idle", "tensor")
+        x.Reload()
+        x.Reload()
+        self.assertEqual(idle.reload_count, 7)
+
+    def testReloadSchedulerIgnoresListing(self):
+        scheduler = reload_scheduler.ReloadScheduler(max_backoff_cycles=4)
+        x = event_multiplexer.EventMultiplexer(
+            {"run1": "path1"}, reload_scheduler=scheduler
+        )
+        run1 = x.GetAccumulator("run1")
+        # Reloaded on cycles 1 and 3, then due again on cycle 6.
+        for _ in range(3):
+            x.Reload()
+        self.assertEqual(run1.reload_count, 2)
+        # Listing runs, tags and metadata is not a query of the run's data,
+        # so the idle run still backs off.
+        x.Runs()
+        x.FirstEventTimestamp("run1")
+        x.PluginRunToTagToContent("baz_plugin")
+        x.ActivePlugins()
+        x.Reload()
+        self.assertEqual(run1.reload_count, 2)
+        x.Tensors("run1", "tensor")
+        x.Reload()
+        self.assertEqual(run1.reload_count, 3)
+
+    def testReloadChangedOnly(self):
+        notifier = change_notifier.CreateNotifier()
+        if notifier is None:
+            self.skipTest("inotify is unavailable")
+        self.addCleanup(notifier.Close)
+        tmpdir = self.get_temp_dir()
+        for run in ("changed", "unchanged"):
+            os.mkdir(os.path.join(tmpdir, run))
+        x = event_multiplexer.EventMultiplexer(
+            {
+                "changed": os.path.join(tmpdir, "changed"),
+                "unchanged": os.path.join(tmpdir, "unchanged"),
+                "remote": "s3://bucket/remote",
+            },
+            change_notifier=notifier,
+        )
+        x.Reload()
+        with open(os.path.join(tmpdir, "changed", "events.out"), "w") as f:
+            f.write("a")
+        x.Reload(changed_only=True)
+        # Unwatched runs are reloaded only by full reloads.
+        self.assertEqual(x.GetAccumulator("changed").reload_count, 2)
+        self.assertEqual(x.GetAccumulator("unchanged").reload_count, 1)
+        self.assertEqual(x.GetAccumulator("remote").reload_count, 1)
+        x.Reload(changed_only=True)
+        self.assertEqual(x.GetAccumulator("changed").reload_count, 2)
+
 
 class EventMultiplexerWithRealAccumulatorTest(tf.test.TestCase):
     def testMultifileReload(self):
@@ -454,6 +547,26 @@ class EventMultiplexerWithRealAccumulatorTest(tf.test.TestCase):
         x.Reload()
         self.assertNotIn("run2", x.Runs().keys())
 
+    def testDeletingDirectoryForgetsReaderState(self):
+        state = reader_state.ReaderState(None)
+        x = event_multiplexer.EventMultiplexer(reader_state=state)
+        tmpdir = self.get_temp_dir()
+        self._add3RunsToMultiplexer(tmpdir, x)
+        for run in ("run1", "run2", "run3"):
+            with test_util.FileWriter(os.path.join(tmpdir, run)) as writer:
+                writer.add_test_summary("tag", step=1)
+        x.Reload()
+        run_dirs = {os.path.dirname(path) for path in state.Snapshot()}
+        self.assertIn(os.path.join(tmpdir, "run2"), run_dirs)
+
+        shutil.rmtree(os.path.join(tmpdir, "run2"))
+        x.Reload()
+        run_dirs = {os.path.dirname(path) for path in state.Snapshot()}
+        self.assertEqual(
+            run_dirs,
+            {os.path.join(tmpdir, "run1"), os.path.join(tmpdir, "run3")},
+        )
+
     def _add3RunsToMultiplexer(self, logdir, multiplexer):
         """Creates and adds 3 runs to the multiplexer."""
         run1_dir = os.path.join(logdir, "run1")
@@ -0,0 +1,276 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Selection of the plugins whose summary data is ingested.
+
+Events that only hold data for unwanted plugins can be recognized from
+their serialized bytes, by decoding just the tag and plugin name of each
+summary value, and dropped without parsing the rest of the event.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorboard.plugins.audio import metadata as audio_metadata
+from tensorboard.plugins.graph import metadata as graphs_metadata
+from tensorboard.plugins.histogram import metadata as histograms_metadata
+from tensorboard.plugins.image import metadata as images_metadata
+from tensorboard.plugins.scalar import metadata as scalars_metadata
+
+
+# Plugins that `data_compat` assigns to summary values of legacy types,
+# keyed by the name and by the field number of the `Summary.Value` field.
+_LEGACY_VALUE_PLUGINS = {
+    "simple_value": scalars_metadata.PLUGIN_NAME,
+    "image": images_metadata.PLUGIN_NAME,
+    "histo": histograms_metadata.PLUGIN_NAME,
+    "audio": audio_metadata.PLUGIN_NAME,
+}
+_LEGACY_VALUE_FIELD_PLUGINS = {
+    2: scalars_metadata.PLUGIN_NAME,
+    4: images_metadata.PLUGIN_NAME,
+    5: histograms_metadata.PLUGIN_NAME,
+    6: audio_metadata.PLUGIN_NAME,
+}
+
+# `Event` fields holding graph data, which the graphs plugin reads.
+_GRAPH_EVENT_FIELDS = ("graph_def", "meta_graph_def", "tagged_run_metadata")
+_GRAPH_EVENT_FIELD_NUMBERS = frozenset([4, 8, 9])
+
+# Field numbers used when decoding serialized protos.
+_EVENT_SUMMARY_FIELD = 5
+_SUMMARY_VALUE_FIELD = 1
+_VALUE_TAG_FIELD = 1
+_VALUE_METADATA_FIELD = 9
+_METADATA_PLUGIN_DATA_FIELD = 1
+_PLUGIN_DATA_PLUGIN_NAME_FIELD = 1
+
+_WIRETYPE_VARINT = 0
+_WIRETYPE_FIXED64 = 1
+_WIRETYPE_LENGTH_DELIMITED = 2
+_WIRETYPE_FIXED32 = 5
+
+
+class _DecodeError(Exception):
+    pass
+
+
+class PluginFilter(object):
+    """Decides which plugins' summary data to ingest.
+
+    Plugins are named as in the `plugin_data.plugin_name` field of
+    summary metadata (e.g., "scalars" or "images"), not as dashboards.
+
+    Values are attributed to plugins by their metadata, which writers
+    usually only attach to the first value of each tag; callers keep a
+    `tag_plugins` dict per event file, mapping tag name to plugin name,
+    that these methods update as they see metadata. Values whose plugin
+    is not known are always kept.
+    """
+
+    def __init__(self, load_plugins=None, skip_plugins=None):
+        """Constructs a `PluginFilter`.
+
+        Args:
+          load_plugins: Optional iterable of plugin names. If non-empty,
+            only data for these plugins is ingested.
+          skip_plugins: Optional iterable of plugin names whose data is not
+            ingested, even if listed in `load_plugins`.
+        """
+        self._load_plugins = frozenset(load_plugins or ())
+        self._skip_plugins = frozenset(skip_plugins or ())
+
+    def __repr__(self):
+        return "PluginFilter(load_plugins=%r, skip_plugins=%r)" % (
+            sorted(self._load_plugins),
+            sorted(self._skip_plugins),
+        )
+
+    def Wants(self, plugin_name):
+        """Returns whether data for the given plugin should be ingested."""
+        if plugin_name in self._skip_plugins:
+            return False
+        return not self._load_plugins or plugin_name in self._load_plugins
+
+    def WantsRecord(self, record, tag_plugins):
+        """Checks a serialized `Event` for data that should be ingested.
+
+        Only the fields needed to attribute the event's data to plugins
+        are decoded; large tensors and images are skipped over.
+
+        Args:
+          record: A serialized `Event` proto, as `bytes` or `memoryview`.
+          tag_plugins: Dict from tag name to plugin name for the event
+            file, updated with any metadata seen.
+
+        Returns:
+          False if the event only holds data for unwanted plugins, and so
+          can be dropped without being parsed; True otherwise.
+        """
+        try:
+            return self._WantsRecord(memoryview(record), tag_plugins)
+        except (_DecodeError, IndexError):
+            # Let the proto parser deal with malformed records.
+            return True
+
+    def _WantsRecord(self, buf, tag_plugins):
+        summary = None
+        for (field, wire_type, start, end) in _fields(buf, 0, len(buf)):
+            if field in _GRAPH_EVENT_FIELD_NUMBERS:
+                return self.Wants(graphs_metadata.PLUGIN_NAME)
+            if (
+                field == _EVENT_SUMMARY_FIELD
+                and wire_type == _WIRETYPE_LENGTH_DELIMITED
+            ):
+                summary = (start, end)
+        if summary is None:
+            return True
+        for (field, wire_type, start, end) in _fields(buf, *summary):
+            if (
+                field == _SUMMARY_VALUE_FIELD
+                and wire_type == _WIRETYPE_LENGTH_DELIMITED
+            ):
+                plugin_name = self._DecodeValuePlugin(
+                    buf, start, end, tag_plugins
+                )
+                if plugin_name is None or self.Wants(plugin_name):
+                    return True
+        return False
+
+    def _DecodeValuePlugin(self, buf, start, end, tag_plugins):
+        """Returns the plugin of a serialized `Summary.Value`, or `None`."""
+        tag = None
+        plugin_name = None
+        legacy_plugin_name = None
+        for (field, wire_type, fstart, fend) in _fields(buf, start, end):
+            if wire_type == _WIRETYPE_LENGTH_DELIMITED:
+                if field == _VALUE_TAG_FIELD:
+                    tag = buf[fstart:fend].tobytes().decode("utf-8", "replace")
+                    continue
+                if field == _VALUE_METADATA_FIELD:
+                    plugin_name = _decode_metadata_plugin(buf, fstart, fend)
+                    continue
+            if field in _LEGACY_VALUE_FIELD_PLUGINS:
+                legacy_plugin_name = _LEGACY_VALUE_FIELD_PLUGINS[field]
+        return _resolve(tag, plugin_name, legacy_plugin_name, tag_plugins)
+
+    def FilterEvent(self, event, tag_plugins):
+        """Removes data for unwanted plugins from a parsed `Event`.
+
+        Args:
+          event: An `Event` proto, which may be modified.
+          tag_plugins: Dict from tag name to plugin name for the event
+            file, updated with any metadata seen.
+
+        Returns:
+          False if nothing of interest remains in the event, so that it
+          should be dropped; True otherwise.
+        """
+        for field in _GRAPH_EVENT_FIELDS:
+            if event.HasField(field):
+                return self.Wants(graphs_metadata.PLUGIN_NAME)
+        if not event.HasField("summary"):
+            return True
+        values = event.summary.value
+        kept = []
+        for value in values:
+            plugin_name = None
+            if value.HasField("metadata"):
+                plugin_name = value.metadata.plugin_data.plugin_name
+            legacy_plugin_name = _LEGACY_VALUE_PLUGINS.get(
+                value.WhichOneof("value")
+            )
+            plugin_name = _resolve(
+                value.tag, plugin_name, legacy_plugin_name, tag_plugins
+            )
+            if plugin_name is None or self.Wants(plugin_name):
+                kept.append(value)
+        if len(kept) == len(values):
+            return True
+        if not kept:
+            return False
+        del values[:]
+        values.extend(kept)
+        return True
+
+
+def _resolve(tag, plugin_name, legacy_plugin_name, tag_plugins):
+    """Attributes a summary value to a plugin, or returns `None`."""
+    if plugin_name:
+        if tag is not None:
+            tag_plugins.setdefault(tag, plugin_name)
+        return plugin_name
+    if tag in tag_plugins:
+        return tag_plugins[tag]
+    return legacy_plugin_name
+
+
+def _decode_metadata_plugin(buf, start, end):
+    """Returns the plugin name in a serialized `SummaryMetadata`."""
+    plugin_name = None
+    for (field, wire_type, fstart, fend) in _fields(buf, start, end):
+        if (
+            field == _METADATA_PLUGIN_DATA_FIELD
+            and wire_type == _WIRETYPE_LENGTH_DELIMITED
+        ):
+            for (f, w, s, e) in _fields(buf, fstart, fend):
+                if (
+                    f == _PLUGIN_DATA_PLUGIN_NAME_FIELD
+                    and w == _WIRETYPE_LENGTH_DELIMITED
+                ):
+                    plugin_name = buf[s:e].tobytes().decode("utf-8", "replace")
+    return plugin_name
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (result, pos)
+        shift += 7
+        if shift >= 64:
+            raise _DecodeError("varint too long")
+
+
+def _fields(buf, pos, end):
+    """Yields the fields of a serialized message in `buf[pos:end]`.
+
+    Yields:
+      Tuples `(field_number, wire_type, start, end)`, where `start` and
+      `end` delimit the field's value: its payload for length-delimited
+      fields, and its encoding otherwise.
+    """
+    while pos < end:
+        (key, pos) = _read_varint(buf, pos)
+        wire_type = key & 0x7
+        start = pos
+        if wire_type == _WIRETYPE_VARINT:
+            (_, pos) = _read_varint(buf, pos)
+        elif wire_type == _WIRETYPE_FIXED64:
+            pos += 8
+        elif wire_type == _WIRETYPE_LENGTH_DELIMITED:
+            (length, start) = _read_varint(buf, pos)
+            pos = start + length
+        elif wire_type == _WIRETYPE_FIXED32:
+            pos += 4
+        else:
+            raise _DecodeError("unsupported wire type %d" % wire_type)
+        if pos > end:
+            raise _DecodeError("field overruns message")
+        yield (key >> 3, wire_type, start, pos)
@@ -0,0 +1,126 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for plugin_filter."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import plugin_filter
+from tensorboard.compat.proto import event_pb2
+from tensorboard.compat.proto import summary_pb2
+
+
+def _value(tag, plugin_name=None, **kwargs):
+    value = summary_pb2.Summary.Value(tag=tag, **kwargs)
+    if plugin_name is not None:
+        value.metadata.plugin_data.plugin_name = plugin_name
+        value.metadata.plugin_data.content = b"\x00" * 10
+    if not kwargs:
+        value.tensor.string_val.append(b"x" * 100)
+    return value
+
+
+def _event(*values):
+    event = event_pb2.Event(step=1, wall_time=123.0)
+    event.summary.value.extend(values)
+    return event
+
+
+class PluginFilterTest(tb_test.TestCase):
+    def _assert_wants(self, pf, event, expected, tag_plugins=None):
+        """Checks `WantsRecord` and `FilterEvent` against `expected`."""
+        wire_tag_plugins = dict(tag_plugins or {})
+        parsed_tag_plugins = dict(tag_plugins or {})
+        self.assertEqual(
+            pf.WantsRecord(event.SerializeToString(), wire_tag_plugins),
+            expected,
+        )
+        self.assertEqual(
+            pf.FilterEvent(
+                event_pb2.Event.FromString(event.SerializeToString()),
+                parsed_tag_plugins,
+            ),
+            expected,
+        )
+        self.assertEqual(wire_tag_plugins, parsed_tag_plugins)
+        return wire_tag_plugins
+
+    def test_wants(self):
+        pf = plugin_filter.PluginFilter(
+            load_plugins=["scalars", "images"], skip_plugins=["images"]
+        )
+        self.assertTrue(pf.Wants("scalars"))
+        self.assertFalse(pf.Wants("images"))
+        self.assertFalse(pf.Wants("text"))
+        pf = plugin_filter.PluginFilter(skip_plugins=["text"])
+        self.assertTrue(pf.Wants("scalars"))
+        self.assertFalse(pf.Wants("text"))
+
+    def test_plugin_metadata(self):
+        pf = plugin_filter.PluginFilter(skip_plugins=["images"])
+        self._assert_wants(pf, _event(_value("a", "images")), False)
+        self._assert_wants(pf, _event(_value("a", "scalars")), True)
+        self._assert_wants(
+            pf, _event(_value("a", "images"), _value("b", "scalars")), True
+        )
+
+    def test_tracks_tag_plugins(self):
+        pf = plugin_filter.PluginFilter(load_plugins=["scalars"])
+        tag_plugins = self._assert_wants(
+            pf, _event(_value("a", "images"), _value("b", "scalars")), True
+        )
+        self.assertEqual(tag_plugins, {"a": "images", "b": "scalars"})
+        # Later values without metadata are attributed by tag.
+        self._assert_wants(pf, _event(_value("a")), False, tag_plugins)
+        self._assert_wants(pf, _event(_value("b")), True, tag_plugins)
+        # Values of unknown tags are kept.
+        self._assert_wants(pf, _event(_value("c")), True, tag_plugins)
+
+    def test_legacy_values(self):
+        pf = plugin_filter.PluginFilter(skip_plugins=["histograms"])
+        histo = summary_pb2.HistogramProto(min=1.0, max=2.0)
+        self._assert_wants(pf, _event(_value("a", histo=histo)), False)
+        self._assert_wants(pf, _event(_value("a", simple_value=1.0)), True)
+
+    def test_graphs(self):
+        pf = plugin_filter.PluginFilter(skip_plugins=["graphs"])
+        event = event_pb2.Event(graph_def=b"\x00" * 100)
+        self._assert_wants(pf, event, False)
+        pf = plugin_filter.PluginFilter(load_plugins=["graphs"])
+        self._assert_wants(pf, event, True)
+
+    def test_events_without_summaries_are_kept(self):
+        pf = plugin_filter.PluginFilter(load_plugins=["scalars"])
+        self._assert_wants(
+            pf, event_pb2.Event(file_version="brain.Event:2"), True
+        )
+
+    def test_filter_event_removes_unwanted_values(self):
+        pf = plugin_filter.PluginFilter(skip_plugins=["images"])
+        event = _event(_value("a", "images"), _value("b", "scalars"))
+        self.assertTrue(pf.FilterEvent(event, {}))
+        self.assertEqual([v.tag for v in event.summary.value], ["b"])
+
+    def test_malformed_record_is_kept(self):
+        pf = plugin_filter.PluginFilter(skip_plugins=["images"])
+        record = _event(_value("a", "images")).SerializeToString()
+        self.assertTrue(pf.WantsRecord(record[:-5], {}))
+        self.assertTrue(pf.WantsRecord(b"\xff" * 20, {}))
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,261 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Persistent record of how far each event file has been read."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import base64
+import io
+import json
+import os
+import threading
+
+import six
+
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+_VERSION = 1
+
+# `os.replace` is atomic on all platforms, but only exists in Python 3.
+_replace = getattr(os, "replace", os.rename)
+
+
+class ReaderState(object):
+    """Records where reading of each event file should resume.
+
+    For each event file, this holds the byte offset just past the last
+    complete record loaded from it, and the initial `SummaryMetadata` of
+    each tag seen in it, since writers typically only attach metadata to
+    the first value of a tag and a resumed reader would otherwise never
+    see it. The state is kept in memory and written to a local JSON file
+    by `Save`, so that a later process constructed with the same path can
+    pick up where this one stopped.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, path):
+        """Constructs a `ReaderState`, loading any state saved at `path`.
+
+        Args:
+          path: Local path of the JSON state file. It need not exist yet.
+            If it exists but cannot be parsed, it is ignored and will be
+            overwritten on the next `Save`. If `None`, the state is only
+            kept in memory, e.g. to be persisted with `Snapshot` instead.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._files = self._Load()
+        self._dirty = False
+
+    def _Load(self):
+        if self._path is None:
+            return {}
+        try:
+            with io.open(self._path, "r", encoding="utf-8") as f:
+                contents = json.load(f)
+        except (IOError, OSError):
+            return {}
+        except ValueError as e:
+            logger.warning(
+                "Ignoring malformed reader state %s: %s", self._path, e
+            )
+            return {}
+        if (
+            not isinstance(contents, dict)
+            or contents.get("version") != _VERSION
+        ):
+            logger.warning(
+                "Ignoring reader state %s with unknown format", self._path
+            )
+            return {}
+        return _ParseFiles(contents.get("files", {}))
+
+    def Snapshot(self):
+        """Returns a JSON-serializable copy of the state, for `Restore`."""
+        with self._lock:
+            return {
+                file_path: {
+                    "offset": entry["offset"],
+                    "metadata": dict(entry["metadata"]),
+                }
+                for (file_path, entry) in six.iteritems(self._files)
+            }
+
+    def Restore(self, snapshot):
+        """Replaces the state with one returned by `Snapshot`.
+
+        Entries with invalid offsets are ignored, as on loading.
+        """
+        files = _ParseFiles(snapshot)
+        with self._lock:
+            self._files = files
+            self._dirty = True
+
+    def _Entry(self, file_path):
+        entry = self._files.get(file_path)
+        if entry is None:
+            entry = {"offset": 0, "metadata": {}}
+            self._files[file_path] = entry
+        return entry
+
+    def GetOffset(self, file_path):
+        """Returns the offset at which to resume reading `file_path`.
+
+        Args:
+          file_path: Path of an event file.
+
+        Returns:
+          A non-negative byte offset; 0 if the file has not been read.
+        """
+        with self._lock:
+            return self._files.get(file_path, {}).get("offset", 0)
+
+    def SetOffset(self, file_path, offset):
+        """Records that `file_path` has been read up to `offset`.
+
+        Args:
+          file_path: Path of an event file.
+          offset: Byte offset just past the last complete record loaded.
+        """
+        with self._lock:
+            entry = self._Entry(file_path)
+            if entry["offset"] != offset:
+                entry["offset"] = offset
+                self._dirty = True
+
+    def GetMetadata(self, file_path):
+        """Returns the recorded initial metadata of tags in `file_path`.
+
+        Args:
+          file_path: Path of an event file.
+
+        Returns:
+          A dict mapping tag name to serialized `SummaryMetadata` bytes.
+        """
+        with self._lock:
+            metadata = self._files.get(file_path, {}).get("metadata", {})
+            return {
+                tag: base64.b64decode(value)
+                for (tag, value) in six.iteritems(metadata)
+            }
+
+    def SetMetadata(self, file_path, tag, metadata):
+        """Records the initial metadata of a tag in `file_path`.
+
+        Args:
+          file_path: Path of an event file.
+          tag: Tag name.
+          metadata: Serialized `SummaryMetadata` bytes.
+        """
+        encoded = base64.b64encode(metadata).decode("ascii")
+        with self._lock:
+            entry = self._Entry(file_path)
+            if entry["metadata"].get(tag) != encoded:
+                entry["metadata"][tag] = encoded
+                self._dirty = True
+
+    def Forget(self, file_path):
+        """Drops the entry of an event file that no longer exists.
+
+        Args:
+          file_path: Path of an event file.
+        """
+        with self._lock:
+            if self._files.pop(file_path, None) is not None:
+                self._dirty = True
+
+    def ForgetDirectory(self, directory, keep=()):
+        """Drops the entries of the event files directly in a directory.
+
+        Args:
+          directory: Path of a directory, e.g. of a run that was removed.
+          keep: Paths of files in `directory` whose entries are kept, e.g.
+            those still listed in it.
+        """
+        keep = frozenset(keep)
+        with self._lock:
+            forgotten = [
+                file_path
+                for file_path in self._files
+                if file_path not in keep
+                and os.path.join(directory, os.path.basename(file_path))
+                == file_path
+            ]
+            for file_path in forgotten:
+                del self._files[file_path]
+            if forgotten:
+                self._dirty = True
+
+    def ForgetUnlisted(self, directory, paths, previous_paths=None):
+        """Drops the entries of event files no longer listed in a directory.
+
+        Args:
+          directory: Path of the directory listed.
+          paths: The event files now listed in `directory`.
+          previous_paths: The event files of the previous listing, whose
+            entries are dropped if no longer listed; or `None` for the
+            first listing, in which case all unlisted entries of files in
+            `directory` are dropped, e.g. those of files deleted while no
+            process was reading them.
+        """
+        if previous_paths is None:
+            self.ForgetDirectory(directory, keep=paths)
+            return
+        for file_path in frozenset(previous_paths).difference(paths):
+            self.Forget(file_path)
+
+    def Save(self):
+        """Writes the current state to disk, if it has changed.
+
+        The file is replaced atomically, so a crash mid-write leaves the
+        previous state intact. Failures are logged rather than raised.
+        """
+        if self._path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            contents = {"version": _VERSION, "files": self._files}
+            temp_path = "%s.tmp.%d" % (self._path, os.getpid())
+            try:
+                with io.open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(six.text_type(json.dumps(contents, sort_keys=True)))
+                _replace(temp_path, self._path)
+            except (IOError, OSError) as e:
+                logger.warning(
+                    "Failed to save reader state %s: %s", self._path, e
+                )
+                return
+            self._dirty = False
+
+
+def _ParseFiles(files):
+    """Parses the entries of a state file, dropping invalid ones."""
+    result = {}
+    for (file_path, entry) in six.iteritems(files):
+        offset = entry.get("offset", 0)
+        if not isinstance(offset, six.integer_types) or offset < 0:
+            continue
+        result[file_path] = {
+            "offset": offset,
+            "metadata": dict(entry.get("metadata", {})),
+        }
+    return result
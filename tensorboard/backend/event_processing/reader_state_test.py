@@ -0,0 +1,140 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for reader_state."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import reader_state
+
+
+class ReaderStateTest(tb_test.TestCase):
+    def _path(self):
+        return os.path.join(self.get_temp_dir(), "reader_state.json")
+
+    def testMissingFile(self):
+        state = reader_state.ReaderState(self._path())
+        self.assertEqual(state.GetOffset("/logs/events.1"), 0)
+
+    def testRoundTrip(self):
+        state = reader_state.ReaderState(self._path())
+        state.SetOffset("/logs/events.1", 123)
+        state.SetOffset("/logs/events.2", 45)
+        self.assertEqual(state.GetOffset("/logs/events.1"), 123)
+        self.assertFalse(os.path.exists(self._path()))
+        state.Save()
+        restored = reader_state.ReaderState(self._path())
+        self.assertEqual(restored.GetOffset("/logs/events.1"), 123)
+        self.assertEqual(restored.GetOffset("/logs/events.2"), 45)
+        self.assertEqual(restored.GetOffset("/logs/events.3"), 0)
+
+    def testMetadataRoundTrip(self):
+        state = reader_state.ReaderState(self._path())
+        self.assertEqual(state.GetMetadata("/logs/events.1"), {})
+        state.SetMetadata("/logs/events.1", "loss", b"\x00\xffmeta")
+        state.SetOffset("/logs/events.1", 99)
+        state.Save()
+        restored = reader_state.ReaderState(self._path())
+        self.assertEqual(
+            restored.GetMetadata("/logs/events.1"), {"loss": b"\x00\xffmeta"}
+        )
+        self.assertEqual(restored.GetOffset("/logs/events.1"), 99)
+        self.assertEqual(restored.GetMetadata("/logs/events.2"), {})
+
+    def testSnapshotRestore(self):
+        state = reader_state.ReaderState(None)
+        state.SetOffset("/logs/events.1", 123)
+        state.SetMetadata("/logs/events.1", "loss", b"\x00\xffmeta")
+        state.Save()
+        restored = reader_state.ReaderState(self._path())
+        restored.Restore(json.loads(json.dumps(state.Snapshot())))
+        self.assertEqual(restored.GetOffset("/logs/events.1"), 123)
+        self.assertEqual(
+            restored.GetMetadata("/logs/events.1"), {"loss": b"\x00\xffmeta"}
+        )
+        restored.Save()
+        self.assertTrue(os.path.exists(self._path()))
+
+    def testForget(self):
+        state = reader_state.ReaderState(self._path())
+        state.SetOffset("/logs/run/events.1", 10)
+        state.SetOffset("/logs/run/events.2", 20)
+        state.SetOffset("/logs/run/sub/events.3", 30)
+        state.SetOffset("/logs/other/events.4", 40)
+        state.Save()
+        state.Forget("/logs/run/events.1")
+        state.Forget("/logs/run/events.5")
+        self.assertEqual(state.GetOffset("/logs/run/events.1"), 0)
+        state.ForgetDirectory("/logs/run")
+        # Only files directly in the directory are forgotten.
+        self.assertEqual(
+            sorted(state.Snapshot()),
+            ["/logs/other/events.4", "/logs/run/sub/events.3"],
+        )
+        state.Save()
+        restored = reader_state.ReaderState(self._path())
+        self.assertEqual(restored.GetOffset("/logs/run/events.2"), 0)
+        self.assertEqual(restored.GetOffset("/logs/other/events.4"), 40)
+
+    def testForgetUnlisted(self):
+        state = reader_state.ReaderState(None)
+        for name in ("events.1", "events.2", "events.3"):
+            state.SetOffset(os.path.join("/logs", name), 10)
+        # The first listing drops all other files in the directory.
+        listed = ["/logs/events.2", "/logs/events.3"]
+        state.ForgetUnlisted("/logs", listed)
+        self.assertEqual(sorted(state.Snapshot()), listed)
+        state.SetOffset("/logs/events.4", 10)
+        # Later listings only drop the files that were listed before.
+        state.ForgetUnlisted("/logs", ["/logs/events.3"], listed)
+        self.assertEqual(
+            sorted(state.Snapshot()), ["/logs/events.3", "/logs/events.4"]
+        )
+
+    def testSaveWithoutChangesDoesNotWrite(self):
+        state = reader_state.ReaderState(self._path())
+        state.Save()
+        self.assertFalse(os.path.exists(self._path()))
+        state.SetOffset("/logs/events.1", 10)
+        state.Save()
+        os.remove(self._path())
+        state.SetOffset("/logs/events.1", 10)
+        state.Save()
+        self.assertFalse(os.path.exists(self._path()))
+
+    def testMalformedFileIsIgnored(self):
+        with open(self._path(), "w") as f:
+            f.write("{not json")
+        state = reader_state.ReaderState(self._path())
+        self.assertEqual(state.GetOffset("/logs/events.1"), 0)
+        state.SetOffset("/logs/events.1", 7)
+        state.Save()
+        restored = reader_state.ReaderState(self._path())
+        self.assertEqual(restored.GetOffset("/logs/events.1"), 7)
+
+    def testUnknownVersionIsIgnored(self):
+        with open(self._path(), "w") as f:
+            f.write('{"version": 999, "files": {"/logs/events.1": {}}}')
+        state = reader_state.ReaderState(self._path())
+        self.assertEqual(state.GetOffset("/logs/events.1"), 0)
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,117 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Scheduling of run reloads by how recently each run was active."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import time
+
+
+class ReloadScheduler(object):
+    """Chooses the runs to reload on each reload cycle.
+
+    A run that gained events on its last reload is reloaded on every cycle.
+    Each reload that finds no new events doubles the number of cycles that
+    the run then skips, up to `max_backoff_cycles`, so that runs that have
+    finished cost little. A run that was queried within the last
+    `query_window_secs` seconds is reloaded on every cycle regardless, and
+    before the other runs.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self, max_backoff_cycles=32, query_window_secs=60.0, clock=time.time
+    ):
+        """Constructs a `ReloadScheduler`.
+
+        Args:
+          max_backoff_cycles: The maximum number of consecutive reload
+            cycles that an idle run is skipped for.
+          query_window_secs: How long after a query a run is reloaded on
+            every cycle, in seconds.
+          clock: Function returning the current time in seconds.
+        """
+        self._max_backoff_cycles = max_backoff_cycles
+        self._query_window_secs = query_window_secs
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cycle = 0
+        # From run name to the cycle on which it is next due.
+        self._next_cycle = {}
+        # From run name to the number of skipped cycles after its last reload.
+        self._backoff = {}
+        # From run name to the time of its most recent query.
+        self._last_query = {}
+
+    def Schedule(self, names):
+        """Starts a reload cycle, choosing the runs to reload in it.
+
+        Args:
+          names: The names of all runs.
+
+        Returns:
+          The names of the runs to reload in this cycle, those that were
+          recently queried first.
+        """
+        now = self._clock()
+        with self._lock:
+            self._cycle += 1
+            queried = []
+            due = []
+            for name in names:
+                last_query = self._last_query.get(name)
+                if (
+                    last_query is not None
+                    and now - last_query < self._query_window_secs
+                ):
+                    queried.append(name)
+                elif self._next_cycle.get(name, 0) <= self._cycle:
+                    due.append(name)
+            return queried + due
+
+    def RecordReload(self, name, grew):
+        """Records that a run was reloaded in the current cycle.
+
+        Args:
+          name: The name of the run.
+          grew: Whether the reload found new events.
+        """
+        with self._lock:
+            if grew:
+                backoff = 0
+            else:
+                backoff = min(
+                    2 * self._backoff.get(name, 0) or 1,
+                    self._max_backoff_cycles,
+                )
+            self._backoff[name] = backoff
+            self._next_cycle[name] = self._cycle + backoff + 1
+
+    def RecordQuery(self, name):
+        """Records that the data of a run was queried."""
+        now = self._clock()
+        with self._lock:
+            self._last_query[name] = now
+
+    def Forget(self, name):
+        """Drops all state of a run, which is then due on the next cycle."""
+        with self._lock:
+            self._next_cycle.pop(name, None)
+            self._backoff.pop(name, None)
+            self._last_query.pop(name, None)
@@ -0,0 +1,90 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for reload_scheduler."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import reload_scheduler
+
+
+class ReloadSchedulerTest(tb_test.TestCase):
+    def setUp(self):
+        super(ReloadSchedulerTest, self).setUp()
+        self.now = 1000.0
+        self.scheduler = reload_scheduler.ReloadScheduler(
+            max_backoff_cycles=8, query_window_secs=30, clock=lambda: self.now,
+        )
+
+    def _Cycles(self, names, grew=()):
+        """Runs reload cycles, returning the runs reloaded in each."""
+        schedules = []
+        for _ in range(20):
+            schedule = self.scheduler.Schedule(names)
+            for name in schedule:
+                self.scheduler.RecordReload(name, name in grew)
+            schedules.append(schedule)
+        return schedules
+
+    def testNewRunsAreDue(self):
+        self.assertEqual(self.scheduler.Schedule(["a", "b"]), ["a", "b"])
+
+    def testActiveRunsAreAlwaysDue(self):
+        schedules = self._Cycles(["a"], grew=["a"])
+        self.assertEqual(schedules, [["a"]] * 20)
+
+    def testIdleRunsBackOff(self):
+        schedules = self._Cycles(["a"])
+        cycles = [i + 1 for (i, schedule) in enumerate(schedules) if schedule]
+        # Skips 1, 2, 4, 8 and then at most 8 cycles.
+        self.assertEqual(cycles, [1, 3, 6, 11, 20])
+
+    def testGrowthResetsBackoff(self):
+        self._Cycles(["a"])
+        # Due on cycle 29, 9 cycles after the last reload.
+        for _ in range(8):
+            self.assertEqual(self.scheduler.Schedule(["a"]), [])
+        self.assertEqual(self.scheduler.Schedule(["a"]), ["a"])
+        self.scheduler.RecordReload("a", True)
+        self.assertEqual(self.scheduler.Schedule(["a"]), ["a"])
+
+    def testQueriedRunsAreDueAndFirst(self):
+        self._Cycles(["a", "b"])
+        self.scheduler.RecordQuery("b")
+        self.assertEqual(self.scheduler.Schedule(["a", "b"]), ["b"])
+        self.now += 29
+        self.assertEqual(self.scheduler.Schedule(["a", "b"]), ["b"])
+        self.now += 1
+        self.assertEqual(self.scheduler.Schedule(["a", "b"]), [])
+
+    def testForget(self):
+        self._Cycles(["a"])
+        self.scheduler.RecordQuery("a")
+        self.scheduler.Forget("a")
+        self.assertEqual(self.scheduler.Schedule(["a"]), ["a"])
+        self.scheduler.RecordReload("a", False)
+        self.assertEqual(self.scheduler.Schedule(["a"]), [])
+
+    def testNoBackoff(self):
+        scheduler = reload_scheduler.ReloadScheduler(max_backoff_cycles=0)
+        for _ in range(5):
+            self.assertEqual(scheduler.Schedule(["a"]), ["a"])
+            scheduler.RecordReload("a", False)
+
+
+if __name__ == "__main__":
+    tb_test.main()
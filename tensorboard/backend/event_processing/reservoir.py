@@ -20,9 +20,60 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import itertools
 import random
 import threading
 
+from tensorboard.backend.event_processing import byte_budget as byte_budget_lib
+
+
+# The sampling state of a reservoir bucket, from which an equivalent bucket
+# can be restored: its kept items, the number of items it has seen, its
+# current size, and the state of its random number generator.
+ReservoirState = collections.namedtuple(
+    "ReservoirState", ["items", "num_items_seen", "max_size", "random_state"]
+)
+
+# Source of generation numbers; see `NewGeneration`. It starts at a random
+# value so that cursors handed out by another process are not mistaken
+# for ones of this process.
+_generations = itertools.count(random.SystemRandom().getrandbits(32) << 20)
+
+
+def NewGeneration():
+    """Returns a number not returned before in this process.
+
+    A container of items takes a new generation whenever its items change
+    other than by appending items or replacing the last one, so that a
+    cursor, a `(generation, length)` pair, tells which items were already
+    read; see `ResolveCursor`.
+    """
+    return next(_generations)
+
+
+def ResolveCursor(length, generation, cursor):
+    """Finds the items of a container appended since a cursor.
+
+    Args:
+      length: The current number of items of the container.
+      generation: The current generation of the container.
+      cursor: A cursor returned by a previous call for the container, or
+        `None`.
+
+    Returns:
+      A `(start, cursor)` pair. If `cursor` is still valid, `start` is the
+      position of the last item the cursor covers (or 0 if it covers
+      none), which may have been replaced since; otherwise, `start` is
+      `None`, and all items are to be read. The new cursor covers all
+      items.
+    """
+    new_cursor = (generation, length)
+    if cursor is not None:
+        (cursor_generation, cursor_length) = cursor
+        if cursor_generation == generation and cursor_length <= length:
+            return (max(0, cursor_length - 1), new_cursor)
+    return (None, new_cursor)
+
 
 class Reservoir(object):
     """A map-to-arrays container, with deterministic Reservoir Sampling.
@@ -59,7 +110,14 @@ class Reservoir(object):
       size: An integer of the maximum number of samples.
     """
 
-    def __init__(self, size, seed=0, always_keep_last=True):
+    def __init__(
+        self,
+        size,
+        seed=0,
+        always_keep_last=True,
+        byte_budget=None,
+        byte_size_fn=None,
+    ):
         """Creates a new reservoir.
 
         Args:
@@ -70,6 +128,13 @@ class Reservoir(object):
             input items.
           always_keep_last: Whether to always keep the latest seen item in the
             end of the reservoir. Defaults to True.
+          byte_budget: Optional `byte_budget.ByteBudget` to which the bytes of
+            the items kept under all keys are charged. While it or a parent
+            is exceeded, the buckets with the most bytes evict random older
+            items and lower their size accordingly, down to the most recent
+            item, until the budget has room for more items again.
+          byte_size_fn: Function giving the number of bytes of a (transformed)
+            item. Required if `byte_budget` is given.
 
         Raises:
           ValueError: If size is negative or not an integer.
@@ -78,7 +143,11 @@ class Reservoir(object):
             raise ValueError("size must be nonnegative integer, was %s" % size)
         self._buckets = collections.defaultdict(
             lambda: _ReservoirBucket(
-                size, random.Random(seed), always_keep_last
+                size,
+                random.Random(seed),
+                always_keep_last,
+                byte_budget=byte_budget,
+                byte_size_fn=byte_size_fn,
             )
         )
         # _mutex guards the keys - creating new keys, retrieving by key, etc
@@ -140,6 +209,65 @@ class Reservoir(object):
             bucket = self._buckets[key]
         bucket.AddItem(item, f)
 
+    def ItemsSince(self, key, cursor):
+        """Return the items associated with a key since a cursor.
+
+        A cursor stays valid while items are only appended or replace the
+        last item. Once an older item is replaced, evicted or filtered out,
+        all items are returned again.
+
+        Args:
+          key: The key for which we are finding associated items.
+          cursor: `None`, or a cursor returned by a previous call with the
+            same key.
+
+        Raises:
+          KeyError: If the key is not found in the reservoir.
+
+        Returns:
+          A `(items, cursor, incremental)` tuple. If `incremental`, `items`
+          are the items from the last one covered by the given cursor
+          (which replaces it) on; otherwise, they are all the items. The
+          returned cursor covers all items.
+        """
+        with self._mutex:
+            if key not in self._buckets:
+                raise KeyError("Key %s was not found in Reservoir" % key)
+            bucket = self._buckets[key]
+        return bucket.ItemsSince(cursor)
+
+    def GetState(self, key):
+        """Returns the sampling state of the items with the given key.
+
+        Args:
+          key: The key for which to get the state.
+
+        Raises:
+          KeyError: If the key is not found in the reservoir.
+
+        Returns:
+          A `ReservoirState`.
+        """
+        with self._mutex:
+            if key not in self._buckets:
+                raise KeyError("Key %s was not found in Reservoir" % key)
+            bucket = self._buckets[key]
+        return bucket.GetState()
+
+    def SetState(self, key, state):
+        """Replaces the items with the given key and their sampling state.
+
+        Items added afterwards are sampled as they would have been by the
+        reservoir from which `state` was taken.
+
+        Args:
+          key: The key under which to restore the items.
+          state: A `ReservoirState`, as returned by `GetState`.
+        """
+        with self._mutex:
+            bucket = self._buckets[key]
+        bucket.SetState(state)
+
     def FilterItems(self, filterFn, key=None):
         """Filter items within a Reservoir, using a filtering function.
 
@@ -170,7 +298,14 @@ class _ReservoirBucket(object):
     It always stores the most recent item as its final item.
     """
 
-    def __init__(self, _max_size, _random=None, always_keep_last=True):
+    def __init__(
+        self,
+        _max_size,
+        _random=None,
+        always_keep_last=True,
+        byte_budget=None,
+        byte_size_fn=None,
+    ):
         """Create the _ReservoirBucket.
 
         Args:
@@ -180,6 +315,9 @@ class _ReservoirBucket(object):
             random.Random(0).
           always_keep_last: Whether the latest seen item should always be included
             in the end of the bucket.
+          byte_budget: Optional `byte_budget.ByteBudget` under which the bytes
+            of the kept items are charged; see `Reservoir`.
+          byte_size_fn: Function giving the number of bytes of an item.
 
         Raises:
           ValueError: if the size is not a nonnegative integer.
@@ -199,6 +337,20 @@ class _ReservoirBucket(object):
         else:
             self._random = random.Random(0)
         self.always_keep_last = always_keep_last
+        self._byte_budget = None
+        if byte_budget is not None:
+            # The bytes of this bucket alone, so that evictions can be taken
+            # from the largest buckets under a shared budget.
+            self._byte_budget = byte_budget_lib.ByteBudget(
+                parent=byte_budget, evict_fn=self._EvictItem
+            )
+        self._byte_size_fn = byte_size_fn
+        # If there is a byte budget, the number of bytes of each item.
+        self._item_bytes = []
+        # While evictions keep the bucket smaller than `_max_size`, the
+        # number of items it is sampled down to; otherwise `None`.
+        self._size_limit = None
+        self._generation = NewGeneration()
 
     def AddItem(self, item, f=lambda x: x):
         """Add an item to the ReservoirBucket, replacing an old item if
@@ -219,18 +371,115 @@ class _ReservoirBucket(object):
           f: A function to transform item before addition, if it will be kept in
             the reservoir.
         """
+        if self._byte_budget is not None:
+            self._AddItemWithinBudget(item, f)
+            return
         with self._mutex:
             if len(self.items) < self._max_size or self._max_size == 0:
                 self.items.append(f(item))
             else:
                 r = self._random.randint(0, self._num_items_seen)
                 if r < self._max_size:
+                    if r < len(self.items) - 1:
+                        self._generation = NewGeneration()
                     self.items.pop(r)
                     self.items.append(f(item))
                 elif self.always_keep_last:
                     self.items[-1] = f(item)
             self._num_items_seen += 1
 
+    def _AddItemWithinBudget(self, item, f):
+        """Like `AddItem`, also keeping the bytes of the items in budget.
+
+        After evictions, the bucket samples items at its reduced size, so
+        that the items kept remain a uniform sample of those seen. It grows
+        by an item whenever its budget has room for an item of the average
+        size, e.g., once another bucket or run has released its bytes.
+        """
+        budget = self._byte_budget
+        with self._mutex:
+            size = self._max_size
+            if self._size_limit is not None:
+                average_bytes = budget.used_bytes // max(1, len(self.items))
+                if budget.HasRoom(average_bytes):
+                    self._size_limit = max(
+                        self._size_limit, len(self.items) + 1
+                    )
+                if size == 0 or self._size_limit < size:
+                    size = self._size_limit
+                else:
+                    self._size_limit = None
+            if len(self.items) < size or size == 0:
+                self._AppendItem(f(item))
+            else:
+                r = self._random.randint(0, self._num_items_seen)
+                if r < size:
+                    if r < len(self.items) - 1:
+                        self._generation = NewGeneration()
+                    self.items.pop(r)
+                    budget.Release(self._item_bytes.pop(r))
+                    self._AppendItem(f(item))
+                elif self.always_keep_last:
+                    self.items.pop()
+                    budget.Release(self._item_bytes.pop())
+                    self._AppendItem(f(item))
+            self._num_items_seen += 1
+        # Outside of the lock, as the largest bucket may be this one.
+        budget.Reclaim()
+
+    def _EvictItem(self):
+        """Evicts a random item other than the newest, for the byte budget.
+
+        Returns:
+          Whether an item was evicted.
+        """
+        with self._mutex:
+            if len(self.items) <= 1:
+                return False
+            num_candidates = len(self.items)
+            if self.always_keep_last:
+                num_candidates -= 1
+            r = self._random.randrange(num_candidates)
+            if r < len(self.items) - 1:
+                self._generation = NewGeneration()
+            self.items.pop(r)
+            self._byte_budget.Release(self._item_bytes.pop(r))
+            self._size_limit = len(self.items)
+            return True
+
+    def _AppendItem(self, item):
+        num_bytes = self._byte_size_fn(item)
+        self.items.append(item)
+        self._item_bytes.append(num_bytes)
+        self._byte_budget.Charge(num_bytes)
+
+    def GetState(self):
+        """Returns the sampling state of the bucket; see `Reservoir`."""
+        with self._mutex:
+            return ReservoirState(
+                items=list(self.items),
+                num_items_seen=self._num_items_seen,
+                max_size=self._max_size,
+                random_state=self._random.getstate(),
+            )
+
+    def SetState(self, state):
+        """Restores the sampling state of the bucket; see `Reservoir`."""
+        with self._mutex:
+            if self._byte_budget is None:
+                self.items = list(state.items)
+            else:
+                self._byte_budget.Release(sum(self._item_bytes))
+                self.items = []
+                self._item_bytes = []
+                for item in state.items:
+                    self._AppendItem(item)
+            self._num_items_seen = state.num_items_seen
+            self._max_size = state.max_size
+            self._size_limit = None
+            self._random.setstate(state.random_state)
+            self._generation = NewGeneration()
+
     def FilterItems(self, filterFn):
         """Filter items in a ReservoirBucket, using a filtering function.
 
@@ -252,8 +501,22 @@ class _ReservoirBucket(object):
         """
         with self._mutex:
             size_before = len(self.items)
-            self.items = list(filter(filterFn, self.items))
+            if self._byte_budget is None:
+                self.items = list(filter(filterFn, self.items))
+            else:
+                kept = [
+                    (item, num_bytes)
+                    for (item, num_bytes) in zip(self.items, self._item_bytes)
+                    if filterFn(item)
+                ]
+                self._byte_budget.Release(
+                    sum(self._item_bytes) - sum(n for (_, n) in kept)
+                )
+                self.items = [item for (item, _) in kept]
+                self._item_bytes = [num_bytes for (_, num_bytes) in kept]
             size_diff = size_before - len(self.items)
+            if size_diff:
+                self._generation = NewGeneration()
 
             # Estimate a correction the number of items seen
             prop_remaining = (
@@ -268,3 +531,13 @@ class _ReservoirBucket(object):
         """Get all the items in the bucket."""
         with self._mutex:
             return list(self.items)
+
+    def ItemsSince(self, cursor):
+        """Get the items since a cursor; see `Reservoir.ItemsSince`."""
+        with self._mutex:
+            (start, cursor) = ResolveCursor(
+                len(self.items), self._generation, cursor
+            )
+            if start is None:
+                return (list(self.items), cursor, False)
+            return (self.items[start:], cursor, True)
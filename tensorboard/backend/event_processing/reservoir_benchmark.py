@@ -0,0 +1,184 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Microbenchmarks for the reservoir implementations.
+
+Adds items to a single key of a `Reservoir` and of an `ArrayReservoir`,
+and filters them, and reports throughput in items per second for:
+
+    AddItem      one item at a time
+    AddItems     batches of `--batch_size` items (`ArrayReservoir` only)
+    FilterItems  half of `--num_items` kept items, by step
+
+Items are transformed on addition, like the accumulators transform
+events into their stored form. `Reservoir` filters with a function per
+item, and `ArrayReservoir` with a vectorized one.
+
+Usage:
+
+    bazel run //tensorboard/backend/event_processing:reservoir_benchmark
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+
+from tensorboard.backend.event_processing import array_reservoir
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_integer("num_items", 1000000, "Number of items to add.")
+flags.DEFINE_integer("size", 1000, "Size of the reservoirs.")
+flags.DEFINE_integer("batch_size", 1000, "Number of items per `AddItems`.")
+flags.DEFINE_integer("repeats", 3, "Repeats of each case; the best is kept.")
+
+
+_Item = collections.namedtuple("_Item", ["step", "wall_time", "value"])
+
+
+def _transform(item):
+    return _Item(item.step, item.wall_time, item.value * 0.5)
+
+
+def _add_item(reservoir_class):
+    def prepare(items):
+        r = reservoir_class(FLAGS.size)
+
+        def run():
+            for item in items:
+                r.AddItem("key", item, _transform)
+            return len(items)
+
+        return run
+
+    return prepare
+
+
+def _add_items(items):
+    r = array_reservoir.ArrayReservoir(FLAGS.size)
+    batch_size = FLAGS.batch_size
+
+    def run():
+        for start in range(0, len(items), batch_size):
+            r.AddItems("key", items[start : start + batch_size], _transform)
+        return len(items)
+
+    return run
+
+
+def _filter_items(reservoir_class):
+    def prepare(items):
+        r = reservoir_class(0)
+        for item in items:
+            r.AddItem("key", item)
+        num_kept = len(items) // 2
+
+        def run():
+            r.FilterItems(lambda x: x.step < num_kept)
+            return len(items)
+
+        return run
+
+    return prepare
+
+
+def _cases():
+    """Returns a list of `(reservoir, method, prepare)` tuples.
+
+    Each `prepare` function takes the items and returns a function that
+    runs the timed part of the case, returning the number of items added
+    or filtered.
+    """
+    return [
+        ("Reservoir", "AddItem", _add_item(reservoir.Reservoir)),
+        (
+            "ArrayReservoir",
+            "AddItem",
+            _add_item(array_reservoir.ArrayReservoir),
+        ),
+        ("ArrayReservoir", "AddItems", _add_items),
+        ("Reservoir", "FilterItems", _filter_items(reservoir.Reservoir)),
+        (
+            "ArrayReservoir",
+            "FilterItems",
+            _filter_items(array_reservoir.ArrayReservoir),
+        ),
+    ]
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+    items = [_Item(i, float(i), float(i)) for i in range(FLAGS.num_items)]
+    headers = (
+        "RESERVOIR",
+        "METHOD",
+        "ITEMS",
+        "SECONDS",
+        "ITEMS_PER_SEC",
+        "SPEEDUP",
+    )
+    logger.info(_format_line(headers, headers))
+    baseline = None
+    for (reservoir_name, method, prepare) in _cases():
+        seconds = float("inf")
+        for _ in range(FLAGS.repeats):
+            run = prepare(items)
+            start = time.time()
+            count = run()
+            seconds = min(seconds, time.time() - start)
+        rate = count / max(seconds, 1e-9)
+        # Each case is compared to the last `Reservoir` case before it.
+        if reservoir_name == "Reservoir":
+            baseline = rate
+        fields = (reservoir_name, method, count, seconds, rate, rate / baseline)
+        logger.info(_format_line(headers, fields))
+
+
+if __name__ == "__main__":
+    app.run(main)
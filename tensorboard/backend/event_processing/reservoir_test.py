@@ -20,6 +20,7 @@ from __future__ import print_function
 from six.moves import xrange  # pylint: disable=redefined-builtin
 import tensorflow as tf
 
+from tensorboard.backend.event_processing import byte_budget
 from tensorboard.backend.event_processing import reservoir
 
 
@@ -94,6 +95,59 @@ class ReservoirTest(tf.test.TestCase):
             r2.AddItem("key", i)
         self.assertNotEqual(r1.Items(key), r2.Items(key))
 
+    def testStateRoundTrip(self):
+        r1 = reservoir.Reservoir(10)
+        for i in xrange(100):
+            r1.AddItem("key", i)
+        r2 = reservoir.Reservoir(10)
+        r2.SetState("key", r1.GetState("key"))
+        self.assertEqual(r2.Items("key"), r1.Items("key"))
+        # Later additions are sampled identically.
+        for i in xrange(100, 200):
+            r1.AddItem("key", i)
+            r2.AddItem("key", i)
+        self.assertEqual(r2.Items("key"), r1.Items("key"))
+        with self.assertRaises(KeyError):
+            r1.GetState("missing key")
+
+    def testItemsSince(self):
+        r = reservoir.Reservoir(0)
+        r.AddItem("key", 0)
+        (items, cursor, incremental) = r.ItemsSince("key", None)
+        self.assertEqual(items, [0])
+        self.assertFalse(incremental)
+        r.AddItem("key", 1)
+        r.AddItem("key", 2)
+        # The last item read is sent again, as it may have been replaced.
+        (items, cursor, incremental) = r.ItemsSince("key", cursor)
+        self.assertEqual(items, [0, 1, 2])
+        self.assertTrue(incremental)
+        (items, cursor, incremental) = r.ItemsSince("key", cursor)
+        self.assertEqual(items, [2])
+        self.assertTrue(incremental)
+        r.FilterItems(lambda x: x != 1)
+        (items, _, incremental) = r.ItemsSince("key", cursor)
+        self.assertEqual(items, [0, 2])
+        self.assertFalse(incremental)
+        with self.assertRaises(KeyError):
+            r.ItemsSince("missing key", None)
+
+    def testItemsSinceTracksSampling(self):
+        r = reservoir.Reservoir(10)
+        (client_items, cursor) = ([], None)
+        num_incremental = 0
+        for i in xrange(300):
+            r.AddItem("key", i)
+            (items, cursor, incremental) = r.ItemsSince("key", cursor)
+            if incremental:
+                client_items = client_items[:-1] + items
+                num_incremental += 1
+            else:
+                client_items = items
+            self.assertEqual(client_items, r.Items("key"))
+        # Most additions to a full reservoir replace the last item.
+        self.assertGreater(num_incremental, 250)
+
     def testFilterItemsByKey(self):
         r = reservoir.Reservoir(100, seed=0)
         for i in xrange(10):
@@ -231,6 +285,84 @@ class ReservoirBucketTest(tf.test.TestCase):
         self.assertEqual(b.Items(), [x * 2 for x in xrange(99)] + [999 * 2])
 
 
+class ReservoirBucketByteBudgetTest(tf.test.TestCase):
+    def testEvictsToStayWithinBudget(self):
+        budget = byte_budget.ByteBudget(100)
+        b = reservoir._ReservoirBucket(50, byte_budget=budget, byte_size_fn=len)
+        for i in xrange(20):
+            b.AddItem("x" * 10 + str(i))
+        items = b.Items()
+        self.assertEqual(len(items), 8)
+        self.assertEqual(items[-1], "x" * 10 + "19")
+        self.assertEqual(budget.used_bytes, sum(len(x) for x in items))
+        self.assertLessEqual(budget.used_bytes, 100)
+        self.assertEqual(b._size_limit, 8)
+        self.assertEqual(b._max_size, 50)
+        self.assertEqual(b._num_items_seen, 20)
+
+    def testSizeRecoversWhenBudgetHasRoom(self):
+        budget = byte_budget.ByteBudget(100)
+        b = reservoir._ReservoirBucket(0, byte_budget=budget, byte_size_fn=len)
+        for i in xrange(100):
+            b.AddItem("%010d" % i)
+        self.assertLen(b.Items(), 10)
+        budget.max_bytes = 200
+        for i in xrange(100, 200):
+            b.AddItem("%010d" % i)
+        self.assertLen(b.Items(), 20)
+        self.assertEqual(budget.used_bytes, 200)
+        budget.max_bytes = 0
+        for i in xrange(200, 300):
+            b.AddItem("%010d" % i)
+        self.assertLen(b.Items(), 120)
+
+    def testKeepsLastItemOverBudget(self):
+        budget = byte_budget.ByteBudget(5)
+        b = reservoir._ReservoirBucket(0, byte_budget=budget, byte_size_fn=len)
+        b.AddItem("small")
+        b.AddItem("very large")
+        self.assertEqual(b.Items(), ["very large"])
+        self.assertEqual(budget.used_bytes, 10)
+
+    def testSharedBudgetEvictsFromLargest(self):
+        parent = byte_budget.ByteBudget(200)
+        r1 = reservoir.Reservoir(
+            0,
+            byte_budget=byte_budget.ByteBudget(parent=parent),
+            byte_size_fn=len,
+        )
+        r2 = reservoir.Reservoir(
+            0,
+            byte_budget=byte_budget.ByteBudget(parent=parent),
+            byte_size_fn=len,
+        )
+        for i in xrange(100):
+            r1.AddItem("key", "%010d" % i)
+        self.assertLen(r1.Items("key"), 20)
+        # The reservoir filled last still gets its share of the budget.
+        for i in xrange(100):
+            r2.AddItem("key", "%010d" % i)
+        self.assertLen(r1.Items("key"), 10)
+        self.assertLen(r2.Items("key"), 10)
+        self.assertEqual(parent.used_bytes, 200)
+
+    def testFilterReleasesBytes(self):
+        budget = byte_budget.ByteBudget()
+        r = reservoir.Reservoir(0, byte_budget=budget, byte_size_fn=len)
+        for item in ("a", "bb", "ccc"):
+            r.AddItem("key", item)
+        self.assertEqual(budget.used_bytes, 6)
+        self.assertEqual(r.FilterItems(lambda x: len(x) < 3), 1)
+        self.assertEqual(budget.used_bytes, 3)
+
+    def testReplacingItemsReleasesBytes(self):
+        budget = byte_budget.ByteBudget()
+        r = reservoir.Reservoir(3, byte_budget=budget, byte_size_fn=len)
+        for i in xrange(1000):
+            r.AddItem("key", "x" * (i % 7))
+        self.assertEqual(budget.used_bytes, sum(len(x) for x in r.Items("key")))
+
+
 class ReservoirBucketStatisticalDistributionTest(tf.test.TestCase):
     def setUp(self):
         self.total = 1000000
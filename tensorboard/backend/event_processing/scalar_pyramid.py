@@ -0,0 +1,173 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multi-resolution summaries of a series of scalars, for downsampling."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+class ScalarPyramid(object):
+    """Levels of detail of a series of scalar values.
+
+    Level `l` splits the series into buckets of `2**l` consecutive
+    scalars, and records the positions of the minimum and maximum value
+    of each bucket; the last position of each bucket is implicit. Each
+    level is computed from the one below it, so building all levels
+    takes time linear in the length of the series, and positions are
+    stored as int32, adding about 8 bytes per scalar.
+
+    The pyramid can be brought up to date after the series changes by
+    recomputing only the buckets at or after the first changed position.
+
+    This class is not thread-safe.
+    """
+
+    def __init__(self):
+        self._len = 0
+        self._values = np.zeros(0)
+        # `_lows[l - 1]` and `_highs[l - 1]` hold the positions of the
+        # minimum and maximum of each bucket of level `l`, for `l >= 1`.
+        self._lows = []
+        self._highs = []
+
+    def Update(self, values, valid_len):
+        """Brings the pyramid up to date with a changed series.
+
+        Args:
+          values: A 1-D array of the current values of the series. It
+            must not change until the next update.
+          valid_len: The number of leading values that are unchanged since
+            the last update, and were then part of the series.
+        """
+        n = len(values)
+        valid_len = min(valid_len, self._len, n)
+        if valid_len == n == self._len:
+            self._values = values
+            return
+        lows = []
+        highs = []
+        child_low = child_high = np.arange(n, dtype=np.int32)
+        level = 1
+        while len(child_low) > 1:
+            width = 2 ** level
+            first = valid_len // width
+            (low, high) = (child_low[2 * first :], child_high[2 * first :])
+            if len(low) % 2:
+                # Pair the last, incomplete bucket with itself.
+                low = np.append(low, low[-1])
+                high = np.append(high, high[-1])
+            (a_low, b_low) = (low[0::2], low[1::2])
+            (a_high, b_high) = (high[0::2], high[1::2])
+            # Ties resolve to the earliest position.
+            new_low = np.where(values[b_low] < values[a_low], b_low, a_low)
+            new_high = np.where(values[b_high] > values[a_high], b_high, a_high)
+            if level <= len(self._lows):
+                new_low = np.concatenate(
+                    [self._lows[level - 1][:first], new_low]
+                )
+                new_high = np.concatenate(
+                    [self._highs[level - 1][:first], new_high]
+                )
+            lows.append(new_low)
+            highs.append(new_high)
+            (child_low, child_high) = (new_low, new_high)
+            level += 1
+        self._len = n
+        self._values = values
+        self._lows = lows
+        self._highs = highs
+
+    def _Positions(self, level, start, end):
+        """Sorted positions selected by a level within `[start, end)`.
+
+        These are the positions of the minimum, maximum and last scalar of
+        each bucket of the level within the range. The parts of the range
+        not covered by such buckets are covered by the next finer level.
+        """
+        if start >= end:
+            return np.arange(0)
+        if level == 0:
+            return np.arange(start, end)
+        width = 2 ** level
+        first = -(-start // width)
+        stop = end // width
+        if first >= stop:
+            return self._Positions(level - 1, start, end)
+        return np.unique(
+            np.concatenate(
+                [
+                    self._Positions(level - 1, start, first * width),
+                    self._lows[level - 1][first:stop],
+                    self._highs[level - 1][first:stop],
+                    np.arange(first + 1, stop + 1) * width - 1,
+                    self._Positions(level - 1, stop * width, end),
+                ]
+            )
+        )
+
+    def _Candidates(self, start, end):
+        """Yields sets of positions within `[start, end)`, coarsest first.
+
+        Each set includes the previous ones. The first holds the overall
+        minimum, maximum and last scalar, and the last holds all positions.
+        """
+        top = self._Positions(len(self._lows), start, end)
+        top_values = self._values[top]
+        yield np.unique(
+            [top[np.argmin(top_values)], top[np.argmax(top_values)], end - 1]
+        )
+        for level in range(len(self._lows), -1, -1):
+            yield self._Positions(level, start, end)
+
+    def Downsample(self, k, start=0, end=None):
+        """Selects the positions of `k` scalars of a range, or all of them.
+
+        The positions are those of the minimum, maximum and last scalar of
+        each bucket at the finest level that has at most `k` of them. Any
+        remaining budget is spent on positions evenly spread among those of
+        the next finer level, so that spikes stay visible at every
+        resolution. The last scalar is always included (unless `k` is 0).
+
+        This takes time linear in `k`, not in the length of the series.
+
+        Args:
+          k: A non-negative integer.
+          start: The first position of the range.
+          end: The position after the last one of the range, or `None` for
+            the end of the series.
+
+        Returns:
+          A sorted array of `min(k, end - start)` distinct positions.
+        """
+        if end is None:
+            end = self._len
+        if k >= end - start:
+            return np.arange(start, max(start, end))
+        if k == 0:
+            return np.arange(0)
+        coarse = np.array([end - 1])
+        for fine in self._Candidates(start, end):
+            if len(fine) > k:
+                break
+            coarse = fine
+        num_extra = k - len(coarse)
+        if not num_extra:
+            return coarse
+        extra = np.setdiff1d(fine, coarse, assume_unique=True)
+        extra = extra[(np.arange(num_extra) * len(extra)) // num_extra]
+        return np.union1d(coarse, extra)
@@ -0,0 +1,91 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for scalar_pyramid."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import scalar_pyramid
+
+
+class ScalarPyramidTest(tb_test.TestCase):
+    def _Pyramid(self, values):
+        pyramid = scalar_pyramid.ScalarPyramid()
+        pyramid.Update(values, 0)
+        return pyramid
+
+    def testEmpty(self):
+        pyramid = self._Pyramid(np.zeros(0))
+        self.assertEqual(pyramid.Downsample(0).tolist(), [])
+        self.assertEqual(pyramid.Downsample(10).tolist(), [])
+
+    def testLengthAndLast(self):
+        values = np.random.RandomState(0).randn(100)
+        pyramid = self._Pyramid(values)
+        for k in range(0, 110):
+            positions = pyramid.Downsample(k).tolist()
+            self.assertLen(positions, min(k, 100))
+            self.assertEqual(positions, sorted(set(positions)))
+            if k:
+                self.assertEqual(positions[-1], 99)
+
+    def testKeepsSpikes(self):
+        values = np.zeros(10000)
+        values[1234] = 5.0
+        values[8765] = -5.0
+        positions = self._Pyramid(values).Downsample(10).tolist()
+        self.assertIn(1234, positions)
+        self.assertIn(8765, positions)
+        self.assertEqual(positions[-1], 9999)
+
+    def testRange(self):
+        values = np.zeros(10000)
+        values[1234] = 5.0
+        values[5678] = -5.0
+        pyramid = self._Pyramid(values)
+        positions = pyramid.Downsample(10, 1000, 6000).tolist()
+        self.assertLen(positions, 10)
+        self.assertIn(1234, positions)
+        self.assertIn(5678, positions)
+        self.assertEqual(positions[-1], 5999)
+        self.assertGreaterEqual(positions[0], 1000)
+        self.assertEqual(
+            pyramid.Downsample(100, 1000, 1050).tolist(),
+            list(range(1000, 1050)),
+        )
+
+    def testIncrementalUpdatesMatchRebuild(self):
+        rng = np.random.RandomState(0)
+        values = rng.randn(300)
+        pyramid = scalar_pyramid.ScalarPyramid()
+        for n in (1, 2, 3, 64, 65, 200, 300):
+            pyramid.Update(values[:n], n)
+        # Change a value in the middle, and shrink the series.
+        values[150] = 10.0
+        pyramid.Update(values, 150)
+        pyramid.Update(values[:250], 250)
+        expected = self._Pyramid(values[:250])
+        for k in (1, 3, 10, 50, 249):
+            self.assertEqual(
+                pyramid.Downsample(k).tolist(), expected.Downsample(k).tolist(),
+            )
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,399 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A reservoir of scalars stored in columns of NumPy arrays."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import random
+import threading
+
+import numpy as np
+
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_pyramid
+
+
+# The columns of a `ScalarReservoir`, as parallel arrays with one entry per
+# kept scalar, in order of addition.
+ScalarColumns = collections.namedtuple(
+    "ScalarColumns", ["step", "wall_time", "value"]
+)
+
+_INITIAL_CAPACITY = 16
+_GROWTH_FACTOR = 1.5
+
+_INT32_MIN = np.iinfo(np.int32).min
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+# The sampling state of a `ScalarReservoir`, from which an equivalent
+# reservoir can be restored: a `ScalarColumns` of the kept scalars, the
+# number of scalars seen, and the state of the random number generator.
+ScalarReservoirState = collections.namedtuple(
+    "ScalarReservoirState", ["columns", "num_items_seen", "random_state"]
+)
+
+
+class ScalarReservoir(object):
+    """A reservoir of scalars, sampled like a single `reservoir.Reservoir` key.
+
+    Each scalar is kept as one entry of three NumPy arrays rather than as
+    a Python object. Steps are stored as int32 until one does not fit,
+    and values in the given dtype, so that a kept scalar typically costs
+    16 bytes. Scalars are sampled exactly as a `reservoir.Reservoir` with
+    the same arguments would sample items added under a single key.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self, size, value_dtype=np.float64, seed=0, always_keep_last=True
+    ):
+        """Creates a new reservoir.
+
+        Args:
+          size: The number of scalars to keep. If 0, all scalars will be kept.
+          value_dtype: The NumPy dtype in which to store values.
+          seed: The seed of the random number generator to use when sampling.
+          always_keep_last: Whether to always keep the latest seen scalar in
+            the end of the reservoir. Defaults to True.
+
+        Raises:
+          ValueError: If size is negative or not an integer.
+        """
+        if size < 0 or size != round(size):
+            raise ValueError("size must be nonnegative integer, was %s" % size)
+        self.size = size
+        self.always_keep_last = always_keep_last
+        self._random = random.Random(seed)
+        self._mutex = threading.Lock()
+        self._num_items_seen = 0
+        self._len = 0
+        capacity = _INITIAL_CAPACITY
+        if size:
+            capacity = min(capacity, size)
+        self._columns = ScalarColumns(
+            step=np.empty(capacity, dtype=np.int32),
+            wall_time=np.empty(capacity, dtype=np.float64),
+            value=np.empty(capacity, dtype=value_dtype),
+        )
+        # Whether the kept steps and wall times are known to be in
+        # non-decreasing order, so that ranges of them can be found by
+        # binary search.
+        self._steps_sorted = True
+        self._wall_times_sorted = True
+        # Built on the first call to `Downsample`, and then kept up to date
+        # with the number of leading scalars it is still valid for.
+        self._pyramid = None
+        self._pyramid_valid_len = 0
+        # Changed whenever scalars are changed other than by appending or
+        # replacing the last one; see `reservoir.NewGeneration`.
+        self._generation = reservoir.NewGeneration()
+
+    def __len__(self):
+        with self._mutex:
+            return self._len
+
+    @property
+    def value_dtype(self):
+        """The NumPy dtype in which values are stored."""
+        return self._columns.value.dtype
+
+    def AddScalar(self, step, wall_time, value):
+        """Adds a scalar, replacing an old one if the reservoir is full.
+
+        See `reservoir._ReservoirBucket.AddItem` for the sampling.
+
+        Args:
+          step: The step of the scalar, as an `int`.
+          wall_time: The wall time of the scalar, as a `float`.
+          value: The value of the scalar, representable in `value_dtype`.
+        """
+        with self._mutex:
+            if self._columns.step.dtype == np.int32 and not (
+                _INT32_MIN <= step <= _INT32_MAX
+            ):
+                self._columns = self._columns._replace(
+                    step=self._columns.step.astype(np.int64)
+                )
+            if self._len < self.size or self.size == 0:
+                self._Grow()
+                self._Set(self._len, step, wall_time, value)
+                self._len += 1
+                self._CheckOrder(self._len - 1)
+            else:
+                r = self._random.randint(0, self._num_items_seen)
+                if r < self.size:
+                    last = self._len - 1
+                    if r < last:
+                        self._generation = reservoir.NewGeneration()
+                    for column in self._columns:
+                        column[r:last] = column[r + 1 : self._len]
+                    self._Set(last, step, wall_time, value)
+                    self._Invalidate(r)
+                    self._CheckOrder(last)
+                elif self.always_keep_last:
+                    self._Set(self._len - 1, step, wall_time, value)
+                    self._Invalidate(self._len - 1)
+                    self._CheckOrder(self._len - 1)
+            self._num_items_seen += 1
+
+    def _Grow(self):
+        capacity = len(self._columns.step)
+        if self._len < capacity:
+            return
+        capacity = int(capacity * _GROWTH_FACTOR) + 1
+        if self.size:
+            capacity = min(capacity, self.size)
+        columns = []
+        for column in self._columns:
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._len] = column[: self._len]
+            columns.append(grown)
+        self._columns = ScalarColumns(*columns)
+
+    def _CheckOrder(self, i):
+        """Records whether the scalar at position `i` is out of order."""
+        if i == 0:
+            return
+        if self._columns.step[i - 1] > self._columns.step[i]:
+            self._steps_sorted = False
+        if self._columns.wall_time[i - 1] > self._columns.wall_time[i]:
+            self._wall_times_sorted = False
+
+    def _Select(self, step_range, wall_time_range):
+        """Selects the kept scalars within inclusive step and time ranges.
+
+        Args:
+          step_range: `None`, or a `(min_step, max_step)` pair, where
+            either bound may be `None`.
+          wall_time_range: Likewise, for wall times.
+
+        Returns:
+          A `slice` of the selected positions if they are contiguous, or
+          else an array of them.
+        """
+        (start, end) = (0, self._len)
+        mask = None
+        for (column, is_sorted, bounds) in (
+            (self._columns.step, self._steps_sorted, step_range),
+            (self._columns.wall_time, self._wall_times_sorted, wall_time_range),
+        ):
+            if bounds is None:
+                continue
+            (low, high) = bounds
+            column = column[: self._len]
+            if is_sorted:
+                if low is not None:
+                    start = max(start, np.searchsorted(column, low, "left"))
+                if high is not None:
+                    end = min(end, np.searchsorted(column, high, "right"))
+                continue
+            within = np.ones(self._len, dtype=bool)
+            if low is not None:
+                within &= column >= low
+            if high is not None:
+                within &= column <= high
+            mask = within if mask is None else mask & within
+        end = max(start, end)
+        if mask is None:
+            return slice(int(start), int(end))
+        return np.flatnonzero(mask[start:end]) + start
+
+    def _Invalidate(self, i):
+        """Records that the scalars from position `i` on have changed."""
+        self._pyramid_valid_len = min(self._pyramid_valid_len, i)
+
+    def _Set(self, i, step, wall_time, value):
+        self._columns.step[i] = step
+        self._columns.wall_time[i] = wall_time
+        self._columns.value[i] = value
+
+    def Columns(self, step_range=None, wall_time_range=None):
+        """Returns copies of the kept scalars as a `ScalarColumns`.
+
+        Args:
+          step_range: Optional `(min_step, max_step)` pair. If given, only
+            scalars with steps in this inclusive range are returned. Either
+            bound may be `None`, for no limit.
+          wall_time_range: Likewise, for wall times.
+        """
+        with self._mutex:
+            selection = self._Select(step_range, wall_time_range)
+            return ScalarColumns(
+                *(
+                    column[: self._len][selection].copy()
+                    for column in self._columns
+                )
+            )
+
+    def Downsample(self, k, step_range=None, wall_time_range=None):
+        """Returns copies of `k` of the kept scalars, or all of them.
+
+        The minimum, maximum and last scalars of consecutive buckets are
+        selected, as described in `scalar_pyramid.ScalarPyramid.Downsample`,
+        rather than a random sample, so that spikes are not dropped. The
+        last scalar is always included (unless `k` is 0).
+
+        Args:
+          k: A non-negative integer.
+          step_range: Optional range of steps to select from; see `Columns`.
+          wall_time_range: Optional range of wall times to select from.
+
+        Returns:
+          A `ScalarColumns` of the selected scalars, in order of addition.
+        """
+        with self._mutex:
+            self._UpdatePyramid()
+            values = self._columns.value[: self._len]
+            selection = self._Select(step_range, wall_time_range)
+            if isinstance(selection, slice):
+                indices = self._pyramid.Downsample(
+                    k, selection.start, selection.stop
+                )
+            else:
+                # Out-of-order scalars within the ranges are downsampled on
+                # their own.
+                pyramid = scalar_pyramid.ScalarPyramid()
+                pyramid.Update(values[selection], 0)
+                indices = selection[pyramid.Downsample(k)]
+            return ScalarColumns(
+                *(column[: self._len][indices] for column in self._columns)
+            )
+
+    def Since(self, cursor, downsample=None):
+        """Returns copies of the scalars added since a cursor.
+
+        Cursors are handed out and invalidated as described in
+        `reservoir.Reservoir.ItemsSince`.
+
+        Args:
+          cursor: `None`, or a cursor returned by a previous call.
+          downsample: Optional number of scalars to return, selected as in
+            `Downsample` among those that would otherwise be returned.
+
+        Returns:
+          A `(columns, cursor, incremental)` tuple. If `incremental`,
+          `columns` is a `ScalarColumns` of the scalars from the last one
+          covered by the given cursor (which replaces it) on; otherwise, of
+          all the scalars. The returned cursor covers all scalars.
+        """
+        with self._mutex:
+            (start, cursor) = reservoir.ResolveCursor(
+                self._len, self._generation, cursor
+            )
+            incremental = start is not None
+            if not incremental:
+                start = 0
+            if downsample is None or downsample >= self._len - start:
+                indices = slice(start, self._len)
+            else:
+                self._UpdatePyramid()
+                indices = self._pyramid.Downsample(downsample, start)
+            columns = ScalarColumns(
+                *(
+                    column[: self._len][indices].copy()
+                    for column in self._columns
+                )
+            )
+            return (columns, cursor, incremental)
+
+    def _UpdatePyramid(self):
+        """Brings the pyramid up to date with the kept values."""
+        if self._pyramid is None:
+            self._pyramid = scalar_pyramid.ScalarPyramid()
+            self._pyramid_valid_len = 0
+        self._pyramid.Update(
+            self._columns.value[: self._len], self._pyramid_valid_len
+        )
+        self._pyramid_valid_len = self._len
+
+    def GetState(self):
+        """Returns the sampling state of the reservoir.
+
+        Returns:
+          A `ScalarReservoirState`, whose columns are copies.
+        """
+        with self._mutex:
+            return ScalarReservoirState(
+                columns=ScalarColumns(
+                    *(column[: self._len].copy() for column in self._columns)
+                ),
+                num_items_seen=self._num_items_seen,
+                random_state=self._random.getstate(),
+            )
+
+    def SetState(self, state):
+        """Replaces the kept scalars and their sampling state.
+
+        Scalars added afterwards are sampled as they would have been by
+        the reservoir from which `state` was taken.
+
+        Args:
+          state: A `ScalarReservoirState`, as returned by `GetState`. Its
+            values are converted to this reservoir's `value_dtype`.
+        """
+        value_dtype = self.value_dtype
+        with self._mutex:
+            self._columns = ScalarColumns(
+                step=np.array(state.columns.step),
+                wall_time=np.array(state.columns.wall_time, dtype=np.float64),
+                value=np.array(state.columns.value, dtype=value_dtype),
+            )
+            self._len = len(self._columns.step)
+            self._Invalidate(0)
+            self._generation = reservoir.NewGeneration()
+            self._steps_sorted = bool(np.all(np.diff(self._columns.step) >= 0))
+            self._wall_times_sorted = bool(
+                np.all(np.diff(self._columns.wall_time) >= 0)
+            )
+            self._num_items_seen = state.num_items_seen
+            self._random.setstate(state.random_state)
+
+    def FilterItems(self, filterFn):
+        """Filters the kept scalars, using a vectorized filtering function.
+
+        The number of scalars seen is rescaled like in
+        `reservoir._ReservoirBucket.FilterItems`.
+
+        Args:
+          filterFn: A function that takes a `ScalarColumns` of arrays and
+            returns a boolean array, true for the scalars to be kept.
+
+        Returns:
+          The number of scalars removed.
+        """
+        with self._mutex:
+            size_before = self._len
+            view = ScalarColumns(
+                *(column[:size_before] for column in self._columns)
+            )
+            keep = np.asarray(filterFn(view), dtype=bool)
+            if not keep.all():
+                self._Invalidate(int(np.argmin(keep)))
+                self._generation = reservoir.NewGeneration()
+            self._len = int(np.count_nonzero(keep))
+            for column in view:
+                column[: self._len] = column[keep]
+            prop_remaining = (
+                self._len / float(size_before) if size_before > 0 else 0
+            )
+            self._num_items_seen = int(
+                round(self._num_items_seen * prop_remaining)
+            )
+            return size_before - self._len
@@ -0,0 +1,189 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for scalar_reservoir."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorboard import test as tb_test
+from tensorboard.backend.event_processing import reservoir
+from tensorboard.backend.event_processing import scalar_reservoir
+
+
+class ScalarReservoirTest(tb_test.TestCase):
+    def _Add(self, r, steps):
+        for step in steps:
+            r.AddScalar(step, step * 10.0, step / 2.0)
+
+    def testEmpty(self):
+        r = scalar_reservoir.ScalarReservoir(10)
+        self.assertEqual(len(r), 0)
+        self.assertEqual(r.Columns().step.tolist(), [])
+
+    def testColumns(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, range(100))
+        columns = r.Columns()
+        self.assertEqual(columns.step.tolist(), list(range(100)))
+        self.assertEqual(
+            columns.wall_time.tolist(), [i * 10.0 for i in range(100)]
+        )
+        self.assertEqual(columns.value.tolist(), [i / 2.0 for i in range(100)])
+
+    def testDtypes(self):
+        r = scalar_reservoir.ScalarReservoir(0, value_dtype=np.float32)
+        r.AddScalar(1, 0.0, 0.5)
+        self.assertEqual(r.value_dtype, np.float32)
+        self.assertEqual(r.Columns().step.dtype, np.int32)
+        # Steps are widened as needed.
+        r.AddScalar(2 ** 40, 0.0, 0.25)
+        columns = r.Columns()
+        self.assertEqual(columns.step.tolist(), [1, 2 ** 40])
+        self.assertEqual(columns.value.tolist(), [0.5, 0.25])
+
+    def testExceptions(self):
+        with self.assertRaises(ValueError):
+            scalar_reservoir.ScalarReservoir(-1)
+        with self.assertRaises(ValueError):
+            scalar_reservoir.ScalarReservoir(13.3)
+
+    def testSamplesLikeReservoir(self):
+        for (size, always_keep_last) in ((1, True), (10, True), (10, False)):
+            r = scalar_reservoir.ScalarReservoir(
+                size, always_keep_last=always_keep_last
+            )
+            expected = reservoir.Reservoir(
+                size, always_keep_last=always_keep_last
+            )
+            for step in range(1000):
+                r.AddScalar(step, 0.0, 0.0)
+                expected.AddItem("key", step)
+            self.assertEqual(r.Columns().step.tolist(), expected.Items("key"))
+
+    def testFilterItemsLikeReservoir(self):
+        r = scalar_reservoir.ScalarReservoir(10)
+        expected = reservoir.Reservoir(10)
+        for step in range(100):
+            r.AddScalar(step, 0.0, 0.0)
+            expected.AddItem("key", step)
+        self.assertEqual(
+            r.FilterItems(lambda x: x.step < 50),
+            expected.FilterItems(lambda x: x < 50),
+        )
+        for step in range(50, 150):
+            r.AddScalar(step, 0.0, 0.0)
+            expected.AddItem("key", step)
+        self.assertEqual(r.Columns().step.tolist(), expected.Items("key"))
+
+    def testColumnsAreCopies(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, range(3))
+        columns = r.Columns()
+        r.FilterItems(lambda x: x.step > 0)
+        self.assertEqual(columns.step.tolist(), [0, 1, 2])
+        self.assertEqual(r.Columns().step.tolist(), [1, 2])
+
+    def testStateRoundTrip(self):
+        r1 = scalar_reservoir.ScalarReservoir(10, value_dtype=np.float32)
+        self._Add(r1, range(100))
+        r2 = scalar_reservoir.ScalarReservoir(10, value_dtype=np.float32)
+        r2.SetState(r1.GetState())
+        self.assertEqual(r2.Columns().step.tolist(), r1.Columns().step.tolist())
+        self.assertEqual(r2.Columns().value.dtype, np.float32)
+        self._Add(r1, range(100, 200))
+        self._Add(r2, range(100, 200))
+        self.assertEqual(r2.Columns().step.tolist(), r1.Columns().step.tolist())
+        self.assertEqual(
+            r2.Columns().value.tolist(), r1.Columns().value.tolist()
+        )
+
+    def testDownsample(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, range(1000))
+        columns = r.Downsample(10)
+        self.assertLen(columns.step, 10)
+        self.assertEqual(columns.step[-1], 999)
+        self.assertEqual(
+            columns.value.tolist(), [s / 2.0 for s in columns.step]
+        )
+        # The pyramid is kept up to date as scalars are added and filtered.
+        r.AddScalar(1000, 0.0, -1.0)
+        self.assertIn(1000, r.Downsample(10).step.tolist())
+        r.FilterItems(lambda x: x.step < 500)
+        self.assertEqual(r.Downsample(10).step[-1], 499)
+        self.assertLen(r.Downsample(1000).step, 500)
+
+    def testSince(self):
+        r = scalar_reservoir.ScalarReservoir(10)
+        (client_steps, cursor) = ([], None)
+        num_incremental = 0
+        for step in range(300):
+            r.AddScalar(step, 0.0, step)
+            (columns, cursor, incremental) = r.Since(cursor)
+            if incremental:
+                client_steps = client_steps[:-1] + columns.step.tolist()
+                num_incremental += 1
+            else:
+                client_steps = columns.step.tolist()
+            self.assertEqual(client_steps, r.Columns().step.tolist())
+        self.assertGreater(num_incremental, 250)
+        r.FilterItems(lambda x: x.step % 2 == 0)
+        (_, _, incremental) = r.Since(cursor)
+        self.assertFalse(incremental)
+
+    def testSinceDownsample(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, range(1000))
+        (columns, cursor, incremental) = r.Since(None, downsample=10)
+        self.assertLen(columns.step, 10)
+        self.assertFalse(incremental)
+        self._Add(r, range(1000, 1100))
+        (columns, cursor, incremental) = r.Since(cursor, downsample=10)
+        self.assertTrue(incremental)
+        self.assertLen(columns.step, 10)
+        self.assertGreaterEqual(columns.step[0], 999)
+        self.assertEqual(columns.step[-1], 1099)
+        (columns, _, incremental) = r.Since(cursor, downsample=10)
+        self.assertTrue(incremental)
+        self.assertEqual(columns.step.tolist(), [1099])
+
+    def testRanges(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, range(100))
+        columns = r.Columns(step_range=(10, 19))
+        self.assertEqual(columns.step.tolist(), list(range(10, 20)))
+        columns = r.Columns(step_range=(None, 4), wall_time_range=(20.0, None))
+        self.assertEqual(columns.step.tolist(), [2, 3, 4])
+        columns = r.Downsample(5, step_range=(10, 89))
+        self.assertLen(columns.step, 5)
+        self.assertEqual(columns.step[-1], 89)
+        self.assertGreaterEqual(columns.step[0], 10)
+        self.assertEqual(r.Columns(step_range=(200, None)).step.tolist(), [])
+
+    def testRangesOutOfOrder(self):
+        r = scalar_reservoir.ScalarReservoir(0)
+        self._Add(r, [5, 1, 4, 2, 3])
+        columns = r.Columns(step_range=(2, 4))
+        self.assertEqual(columns.step.tolist(), [4, 2, 3])
+        self.assertEqual(
+            r.Downsample(2, step_range=(2, 4)).step.tolist()[-1], 3
+        )
+
+
+if __name__ == "__main__":
+    tb_test.main()
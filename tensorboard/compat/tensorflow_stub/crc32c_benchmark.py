@@ -0,0 +1,209 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for the CRC-32C engines in the TensorFlow stub.
+
+Streams the records of a TFRecord file (or of a synthetic in-memory
+file) and checksums each record's length header and payload the same
+way `PyRecordReader_New` does, reporting throughput per engine:
+
+    bytewise  the original one-byte-per-step table loop
+    sliced    pure-Python slicing-by-8
+    python    slicing-by-8 for small records, NumPy lanes for large ones
+    native    the `crc32c` extension module, if installed
+
+Since the bytewise loop manages only a few MB/s, each engine stops after
+`--max_mb` megabytes; pass `--max_mb=0` to checksum the whole file.
+
+Usage:
+
+    bazel run //tensorboard/compat/tensorflow_stub:crc32c_benchmark -- \\
+        --event_file=/path/to/events.out.tfevents.123
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import os
+import struct
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+
+from tensorboard.compat.tensorflow_stub import pywrap_tensorflow
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_string(
+    "event_file",
+    None,
+    "TFRecord file to read records from. If unset, a synthetic file is "
+    "generated in memory.",
+)
+flags.DEFINE_integer(
+    "synthetic_mb", 64, "Size of the synthetic file, in megabytes."
+)
+flags.DEFINE_integer(
+    "synthetic_record_bytes",
+    64 * 1024,
+    "Payload size of each record in the synthetic file.",
+)
+flags.DEFINE_integer(
+    "max_mb",
+    32,
+    "Stop each engine after checksumming this many megabytes; 0 means "
+    "no limit.",
+)
+
+
+def _engines():
+    """Returns a list of `(name, crc_update)` pairs to benchmark."""
+    engines = [
+        ("bytewise", pywrap_tensorflow._crc_update_bytewise),
+        (
+            "sliced",
+            lambda crc, data: pywrap_tensorflow._crc_register_sliced(
+                crc ^ 0xFFFFFFFF, data
+            )
+            ^ 0xFFFFFFFF,
+        ),
+        ("python", pywrap_tensorflow._crc_update_python),
+    ]
+    if pywrap_tensorflow._native_crc32c is not None:
+        engines.append(("native", pywrap_tensorflow._crc_update_native))
+    return engines
+
+
+def _masked(crc):
+    crc &= 0xFFFFFFFF
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+def _synthetic_file():
+    """Builds an in-memory TFRecord file of random payloads."""
+    payload = os.urandom(FLAGS.synthetic_record_bytes)
+    record_count = max(
+        1, (FLAGS.synthetic_mb << 20) // FLAGS.synthetic_record_bytes
+    )
+    header = struct.pack("<Q", len(payload))
+    record = b"".join(
+        [
+            header,
+            struct.pack("<I", pywrap_tensorflow.masked_crc32c(header)),
+            payload,
+            struct.pack("<I", pywrap_tensorflow.masked_crc32c(payload)),
+        ]
+    )
+    return record * record_count
+
+
+def bench(open_file, crc_update, max_bytes):
+    """Checksums the records of a file with the given engine.
+
+    Args:
+      open_file: Nullary function returning a binary file-like object
+        positioned at the start of the record stream.
+      crc_update: A function with the contract of `crc_update`.
+      max_bytes: Stop after checksumming this many bytes, or `None`.
+
+    Returns:
+      A tuple `(num_bytes, seconds)` of data checksummed and time spent
+      in `crc_update` (excluding I/O).
+    """
+    num_bytes = 0
+    seconds = 0.0
+    with open_file() as f:
+        while max_bytes is None or num_bytes < max_bytes:
+            header = f.read(12)
+            if len(header) < 12:
+                break
+            (length,) = struct.unpack("<Q", header[:8])
+            data = f.read(length + 4)
+            if len(data) < length + 4:
+                break
+            start = time.time()
+            header_crc = crc_update(0, header[:8])
+            data_crc = crc_update(0, data[:length])
+            seconds += time.time() - start
+            if _masked(header_crc) != struct.unpack("<I", header[8:])[0]:
+                raise ValueError("header crc mismatch at byte %d" % num_bytes)
+            if _masked(data_crc) != struct.unpack("<I", data[length:])[0]:
+                raise ValueError("data crc mismatch at byte %d" % num_bytes)
+            num_bytes += 8 + length
+    return (num_bytes, seconds)
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+
+    if FLAGS.event_file:
+        path = FLAGS.event_file
+        open_file = lambda: open(path, "rb")
+    else:
+        logger.info("Generating synthetic records...")
+        contents = _synthetic_file()
+        open_file = lambda: io.BytesIO(contents)
+    max_bytes = (FLAGS.max_mb << 20) or None
+
+    headers = ("ENGINE", "MEGABYTES", "SECONDS", "MB_PER_SEC", "SPEEDUP")
+    logger.info(_format_line(headers, headers))
+    baseline = None
+    for (name, crc_update) in _engines():
+        (num_bytes, seconds) = bench(open_file, crc_update, max_bytes)
+        rate = (num_bytes / float(1 << 20)) / max(seconds, 1e-9)
+        if baseline is None:
+            baseline = rate
+        fields = (
+            name,
+            num_bytes >> 20,
+            seconds,
+            rate,
+            rate / max(baseline, 1e-9),
+        )
+        logger.info(_format_line(headers, fields))
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -23,15 +23,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 from collections import namedtuple
+from concurrent import futures
+import fnmatch
 import glob as py_glob
 import io
 import os
 import six
 import sys
 import tempfile
+import threading
+import time
 
 try:
+    import botocore.config
     import botocore.exceptions
     import boto3
 
@@ -51,6 +57,39 @@ from tensorboard.compat.tensorflow_stub import compat, errors
 # A somewhat conservative default chosen here.
 _DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
 
+# Read-ahead of binary files on filesystems with a `range_reader` method
+# (currently S3): reads start with chunks of `_READ_AHEAD_MIN_CHUNK_SIZE`
+# bytes, and each chunk consumed in full doubles the size of the next one,
+# up to `_READ_AHEAD_MAX_CHUNK_SIZE`, and adds one to the number of chunks
+# kept in flight, up to `_READ_AHEAD_MAX_IN_FLIGHT`.
+_READ_AHEAD_MIN_CHUNK_SIZE = 1024 * 1024
+_READ_AHEAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+_READ_AHEAD_MAX_IN_FLIGHT = 4
+# Threads shared by all files for read-ahead requests.
+_READ_AHEAD_THREADS = 16
+
+_read_ahead_executor = None
+_read_ahead_executor_lock = threading.Lock()
+
+
+def _get_read_ahead_executor():
+    global _read_ahead_executor
+    with _read_ahead_executor_lock:
+        if _read_ahead_executor is None:
+            _read_ahead_executor = futures.ThreadPoolExecutor(
+                max_workers=_READ_AHEAD_THREADS
+            )
+        return _read_ahead_executor
+
+
+# Default size of the connection pool of the S3 client shared by all
+# operations, which can be set with the `S3_MAX_POOL_CONNECTIONS`
+# environment variable. This also bounds the number of concurrent
+# listing requests.
+_S3_DEFAULT_MAX_POOL_CONNECTIONS = 32
+# Number of keys requested per page of S3 listings.
+_S3_LIST_PAGE_SIZE = 1000
+
 
 # Registry of filesystems by prefix.
 #
@@ -59,6 +98,11 @@ _DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
 _REGISTERED_FILESYSTEMS = {}
 
 
+# Cache of metadata query results shared by all filesystems, or `None`
+# if caching is disabled; see `enable_metadata_cache`.
+_metadata_cache = None
+
+
 def register_filesystem(prefix, filesystem):
     if ":" in prefix:
         raise ValueError("Filesystem prefix cannot contain a :")
@@ -82,6 +126,111 @@ def get_filesystem(filename):
 StatData = namedtuple("StatData", ["length"])
 
 
+class _MetadataCache(object):
+    """Caches results of filesystem metadata queries for a limited time.
+
+    Entries expire `ttl_secs` after they are computed. When the cache holds
+    more than `max_entries` entries, the least recently used are evicted.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, ttl_secs, max_entries):
+        self._ttl_secs = ttl_secs
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # From key to `(expiry_time, value)` pair, least recently used first.
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, compute):
+        """Returns the cached value for `key`, or caches `compute()`.
+
+        Exceptions raised by `compute` are propagated and not cached.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._entries[key] = entry
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        value = compute()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self._ttl_secs, value)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+            }
+
+
+def enable_metadata_cache(ttl_secs=5.0, max_entries=100000):
+    """Caches the results of metadata queries on all filesystems.
+
+    The results of `exists`, `glob`, `isdir`, `listdir` and `stat` are
+    reused for up to `ttl_secs` seconds, so changes made by other
+    processes may go unnoticed for that long. Writes and directory
+    creation through this module clear the cache. Replaces any cache
+    previously enabled.
+
+    Args:
+      ttl_secs: Seconds for which each result is reused.
+      max_entries: Maximum number of results to keep. The least recently
+        used are evicted first.
+    """
+    global _metadata_cache
+    _metadata_cache = _MetadataCache(ttl_secs, max_entries)
+
+
+def disable_metadata_cache():
+    """Stops caching metadata query results, and drops those cached."""
+    global _metadata_cache
+    _metadata_cache = None
+
+
+def get_metadata_cache_stats():
+    """Returns counters of the metadata cache.
+
+    Returns:
+      A dict with keys "hits", "misses", "evictions" (of least recently
+      used entries over the size limit) and "entries" (currently cached),
+      or `None` if caching is disabled.
+    """
+    cache = _metadata_cache
+    return cache.stats() if cache is not None else None
+
+
+def _cached(operation, path, compute):
+    """Returns `compute()`, through the metadata cache if enabled."""
+    cache = _metadata_cache
+    if cache is None:
+        return compute()
+    return cache.get((operation, compat.as_str_any(path)), compute)
+
+
+def _invalidate_metadata_cache():
+    cache = _metadata_cache
+    if cache is not None:
+        cache.clear()
+
+
 class LocalFileSystem(object):
     """Provides local fileystem access."""
 
@@ -105,6 +254,8 @@ class LocalFileSystem(object):
             continue_from: An opaque value returned from a prior invocation of
                 `read(...)` marking the last read position, so that reading
                 may continue from there.  Otherwise read from the beginning.
+                In binary mode, `{"byte_offset": n}` may also be passed to
+                start reading at byte `n`.
 
         Returns:
             A tuple of `(data, continuation_token)` where `data' provides either
@@ -122,6 +273,8 @@ class LocalFileSystem(object):
         offset = None
         if continue_from is not None:
             offset = continue_from.get("opaque_offset", None)
+            if offset is None and binary_mode:
+                offset = continue_from.get("byte_offset", None)
         with io.open(filename, mode, encoding=encoding) as f:
             if offset is not None:
                 f.seek(offset)
@@ -217,6 +370,39 @@ class S3FileSystem(object):
         if not boto3:
             raise ImportError("boto3 must be installed for S3 support.")
         self._s3_endpoint = os.environ.get("S3_ENDPOINT", None)
+        self._max_pool_connections = int(
+            os.environ.get(
+                "S3_MAX_POOL_CONNECTIONS", _S3_DEFAULT_MAX_POOL_CONNECTIONS
+            )
+        )
+        self._lock = threading.Lock()
+        self._client = None
+        self._executor = None
+
+    def _get_client(self):
+        """Returns the client shared by all operations.
+
+        Clients are thread-safe, but creating them is not, so the client is
+        created once, on first use.
+        """
+        with self._lock:
+            if self._client is None:
+                config = botocore.config.Config(
+                    max_pool_connections=self._max_pool_connections
+                )
+                self._client = boto3.client(
+                    "s3", endpoint_url=self._s3_endpoint, config=config
+                )
+            return self._client
+
+    def _get_executor(self):
+        """Returns the thread pool for concurrent listing requests."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    max_workers=self._max_pool_connections
+                )
+            return self._executor
 
     def bucket_and_path(self, url):
         """Split an S3-prefixed URL into bucket and path."""
@@ -230,7 +416,7 @@ class S3FileSystem(object):
 
     def exists(self, filename):
         """Determines whether a path exists or not."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(filename)
         r = client.list_objects(Bucket=bucket, Prefix=path, Delimiter="/")
         if r.get("Contents") or r.get("CommonPrefixes"):
@@ -261,7 +447,7 @@ class S3FileSystem(object):
             is an opaque value that can be passed to the next invocation of
             `read(...) ' in order to continue from the last read position.
         """
-        s3 = boto3.resource("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(filename)
         args = {}
 
@@ -283,13 +469,14 @@ class S3FileSystem(object):
             args["Range"] = "bytes={}-{}".format(offset, endpoint)
 
         try:
-            stream = s3.Object(bucket, path).get(**args)["Body"].read()
+            stream = client.get_object(Bucket=bucket, Key=path, **args)[
+                "Body"
+            ].read()
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] in ["416", "InvalidRange"]:
                 if size is not None:
                     # Asked for too much, so request just to the end. Do this
                     # in a second request so we don't check length in all cases.
-                    client = boto3.client("s3", endpoint_url=self._s3_endpoint)
                     obj = client.head_object(Bucket=bucket, Key=path)
                     content_length = obj["ContentLength"]
                     endpoint = min(content_length, offset + size)
@@ -298,7 +485,9 @@ class S3FileSystem(object):
                     stream = b""
                 else:
                     args["Range"] = "bytes={}-{}".format(offset, endpoint)
-                    stream = s3.Object(bucket, path).get(**args)["Body"].read()
+                    stream = client.get_object(Bucket=bucket, Key=path, **args)[
+                        "Body"
+                    ].read()
             else:
                 raise
         # `stream` should contain raw bytes here (i.e., there has been neither
@@ -310,6 +499,33 @@ class S3FileSystem(object):
         else:
             return (stream.decode("utf-8"), continuation_token)
 
+    def range_reader(self, filename):
+        """Returns a function that reads byte ranges of a file.
+
+        The returned function takes `(offset, size)` and returns the bytes
+        of the file in that range, which are fewer than `size` only if the
+        range extends past the end of the file. It may be called from
+        several threads at once.
+
+        Args:
+            filename: string, a path
+        """
+        client = self._get_client()
+        bucket, path = self.bucket_and_path(filename)
+
+        def read_range(offset, size):
+            byte_range = "bytes={}-{}".format(offset, offset + size - 1)
+            try:
+                r = client.get_object(Bucket=bucket, Key=path, Range=byte_range)
+            except botocore.exceptions.ClientError as exc:
+                if exc.response["Error"]["Code"] in ["416", "InvalidRange"]:
+                    # The range starts at or past the end of the file.
+                    return b""
+                raise
+            return r["Body"].read()
+
+        return read_range
+
     def write(self, filename, file_content, binary_mode=False):
         """Writes string file contents to a file.
 
@@ -318,7 +534,7 @@ class S3FileSystem(object):
             file_content: string, the contents
             binary_mode: bool, write as binary if True, otherwise text
         """
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(filename)
         # Always convert to bytes for writing
         if binary_mode:
@@ -345,20 +561,71 @@ class S3FileSystem(object):
             # filesystems in some way.
             return []
         filename = filename[:-1]
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(filename)
+        keys = []
+        for key in self._list_keys(bucket, path):
+            key = key[len(path) :]
+            if key:  # Skip the base dir, which would add an empty string
+                keys.append(filename + key)
+        return keys
+
+    def _list_keys(self, bucket, prefix):
+        """Lists all keys with the given prefix, using concurrent requests.
+
+        Listings are paginated, so a single listing of many keys takes
+        many sequential requests. Instead, the "subdirectories" of the
+        prefix are listed first, and the key space is split at some of
+        them into ranges that are listed concurrently.
+
+        Returns:
+            A list of keys, in lexicographic order.
+        """
+        (subdirs, _) = self._list_directory(bucket, prefix)
+        num_ranges = min(len(subdirs), self._max_pool_connections)
+        if num_ranges < 2:
+            return self._list_key_range(bucket, prefix, None, None)
+        # Start each range at a subdirectory, spreading them evenly.
+        starts = [None] + [
+            prefix + subdirs[i * len(subdirs) // num_ranges] + "/"
+            for i in range(1, num_ranges)
+        ]
+        ends = starts[1:] + [None]
+        results = self._get_executor().map(
+            lambda bounds: self._list_key_range(bucket, prefix, *bounds),
+            zip(starts, ends),
+        )
+        return [key for keys in results for key in keys]
+
+    def _list_key_range(self, bucket, prefix, start, end):
+        """Lists keys with the given prefix in the range `[start, end)`.
+
+        Either bound may be `None`, for an unbounded range.
+        """
+        client = self._get_client()
         p = client.get_paginator("list_objects")
+        kwargs = {}
+        if start is not None:
+            # Listing resumes after the marker. A proper prefix of `start`
+            # sorts before any key starting with `start` itself.
+            kwargs["Marker"] = start[:-1]
         keys = []
-        for r in p.paginate(Bucket=bucket, Prefix=path):
+        for r in p.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": _S3_LIST_PAGE_SIZE},
+            **kwargs
+        ):
             for o in r.get("Contents", []):
-                key = o["Key"][len(path) :]
-                if key:  # Skip the base dir, which would add an empty string
-                    keys.append(filename + key)
+                key = o["Key"]
+                if end is not None and key >= end:
+                    return keys
+                if start is None or key >= start:
+                    keys.append(key)
         return keys
 
     def isdir(self, dirname):
         """Returns whether the path is a directory or not."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(dirname)
         if not path.endswith("/"):
             path += "/"  # This will now only retrieve subdir content
@@ -369,21 +636,83 @@ class S3FileSystem(object):
 
     def listdir(self, dirname):
         """Returns a list of entries contained within a directory."""
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
         bucket, path = self.bucket_and_path(dirname)
-        p = client.get_paginator("list_objects")
         if not path.endswith("/"):
             path += "/"  # This will now only retrieve subdir content
-        keys = []
-        for r in p.paginate(Bucket=bucket, Prefix=path, Delimiter="/"):
-            keys.extend(
+        (subdirs, files) = self._list_directory(bucket, path)
+        return subdirs + files
+
+    def _list_directory(self, bucket, path):
+        """Lists the entries with the given prefix, up to the next slash.
+
+        Returns:
+            A pair of lists `(subdirs, files)` of entry names, relative to
+            `path`.
+        """
+        client = self._get_client()
+        p = client.get_paginator("list_objects")
+        subdirs = []
+        files = []
+        for r in p.paginate(
+            Bucket=bucket,
+            Prefix=path,
+            Delimiter="/",
+            PaginationConfig={"PageSize": _S3_LIST_PAGE_SIZE},
+        ):
+            subdirs.extend(
                 o["Prefix"][len(path) : -1] for o in r.get("CommonPrefixes", [])
             )
             for o in r.get("Contents", []):
                 key = o["Key"][len(path) :]
                 if key:  # Skip the base dir, which would add an empty string
-                    keys.append(key)
-        return keys
+                    files.append(key)
+        return (subdirs, files)
+
+    def walk(self, top, topdown=True, onerror=None):
+        """Recursive directory tree generator for directories.
+
+        Like the module-level `walk`, but each directory is listed with
+        one request (or one per page), rather than one per entry, and the
+        subdirectories of each directory are listed concurrently.
+        Directories that can't be listed are skipped, after passing the
+        error to `onerror`, if given.
+        """
+        bucket, path = self.bucket_and_path(top)
+        if path and not path.endswith("/"):
+            path += "/"
+        executor = self._get_executor()
+        future = executor.submit(self._list_directory, bucket, path)
+        return self._walk(top, bucket, path, future, topdown, onerror)
+
+    def _walk(self, top, bucket, path, future, topdown, onerror):
+        try:
+            (subdirs, files) = future.result()
+        except botocore.exceptions.ClientError as exc:
+            if onerror:
+                onerror(exc)
+            return
+        here = (top, subdirs, files)
+        if topdown:
+            yield here
+        # Read `subdirs` only now, so that callers may prune it.
+        executor = self._get_executor()
+        children = [
+            (
+                self.join(top, subdir),
+                path + subdir + "/",
+                executor.submit(
+                    self._list_directory, bucket, path + subdir + "/"
+                ),
+            )
+            for subdir in subdirs
+        ]
+        for (child_top, child_path, child_future) in children:
+            for item in self._walk(
+                child_top, bucket, child_path, child_future, topdown, onerror
+            ):
+                yield item
+        if not topdown:
+            yield here
 
     def makedirs(self, dirname):
         """Creates a directory and all parent/intermediate directories."""
@@ -391,7 +720,7 @@ class S3FileSystem(object):
             raise errors.AlreadyExistsError(
                 None, None, "Directory already exists"
             )
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(dirname)
         if not path.endswith("/"):
             path += "/"  # This will make sure we don't override a file
@@ -401,7 +730,7 @@ class S3FileSystem(object):
         """Returns file statistics for a given path."""
         # NOTE: Size of the file is given by ContentLength from S3,
         # but we convert to .length
-        client = boto3.client("s3", endpoint_url=self._s3_endpoint)
+        client = self._get_client()
         bucket, path = self.bucket_and_path(filename)
         try:
             obj = client.head_object(Bucket=bucket, Key=path)
@@ -413,9 +742,266 @@ class S3FileSystem(object):
                 raise
 
 
+class MemoryFileSystem(object):
+    """Provides access to files kept in memory, under "mem://" paths.
+
+    Calls can be delayed to simulate the latency and bandwidth of remote
+    storage, so that the performance of code that reads from it can be
+    measured without a network. Directories are created implicitly by
+    writing files in them, or explicitly by `makedirs`.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, latency_secs=0.0, bandwidth_bytes_per_sec=None):
+        """Constructs a `MemoryFileSystem`, initially empty.
+
+        Args:
+            latency_secs: Delay added to each call, in seconds.
+            bandwidth_bytes_per_sec: If set, calls that transfer file
+                contents are further delayed by their size divided by this.
+
+        Both are kept in attributes of the same names, which may be
+        changed at any time.
+        """
+        self.latency_secs = latency_secs
+        self.bandwidth_bytes_per_sec = bandwidth_bytes_per_sec
+        self._lock = threading.Lock()
+        # From normalized path to file contents, as a `bytearray`.
+        self._files = {}
+        # Normalized paths of all directories, including implicit ones.
+        self._dirs = set([""])
+        # Number of calls of each filesystem operation.
+        self.call_counts = collections.Counter()
+
+    def _simulate(self, operation, num_bytes=0):
+        """Counts a call of `operation`, and delays it as configured."""
+        with self._lock:
+            self.call_counts[operation] += 1
+        delay = self.latency_secs
+        if self.bandwidth_bytes_per_sec:
+            delay += num_bytes / float(self.bandwidth_bytes_per_sec)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _normalize(self, path):
+        path = compat.as_str_any(path)
+        if path.startswith("mem://"):
+            path = path[len("mem://") :]
+        return path.strip("/")
+
+    def _add_parent_dirs(self, path):
+        while path:
+            path = path.rpartition("/")[0]
+            self._dirs.add(path)
+
+    def exists(self, filename):
+        """Determines whether a path exists or not."""
+        self._simulate("exists")
+        path = self._normalize(filename)
+        with self._lock:
+            return path in self._files or path in self._dirs
+
+    def join(self, path, *paths):
+        """Join paths with a slash."""
+        return "/".join((path,) + paths)
+
+    def read(self, filename, binary_mode=False, size=None, continue_from=None):
+        """Reads contents of a file to a string.
+
+        Args:
+            filename: string, a path
+            binary_mode: bool, read as binary if True, otherwise text
+            size: int, number of bytes or characters to read, otherwise
+                read all the contents of the file (from the continuation
+                marker, if present).
+            continue_from: An opaque value returned from a prior invocation of
+                `read(...)` marking the last read position, so that reading
+                may continue from there.  Otherwise read from the beginning.
+
+        Returns:
+            A tuple of `(data, continuation_token)` where `data' provides either
+            bytes read from the file (if `binary_mode == true`) or the decoded
+            string representation thereof (otherwise), and `continuation_token`
+            is an opaque value that can be passed to the next invocation of
+            `read(...) ' in order to continue from the last read position.
+        """
+        offset = 0
+        if continue_from is not None:
+            offset = continue_from.get("byte_offset", 0)
+        path = self._normalize(filename)
+        with self._lock:
+            contents = self._files.get(path)
+            if contents is None:
+                data = None
+            elif binary_mode:
+                end = len(contents) if size is None else offset + size
+                data = bytes(contents[offset:end])
+            else:
+                data = contents[offset:].decode("utf-8")
+                if size is not None:
+                    data = data[:size]
+        if data is None:
+            self._simulate("read")
+            raise errors.NotFoundError(
+                None, None, "Not Found: " + compat.as_text(filename)
+            )
+        num_bytes = len(data) if binary_mode else len(data.encode("utf-8"))
+        self._simulate("read", num_bytes)
+        return (data, {"byte_offset": offset + num_bytes})
+
+    def range_reader(self, filename):
+        """Returns a function that reads byte ranges of a file.
+
+        The returned function takes `(offset, size)` and returns the bytes
+        of the file in that range, which are fewer than `size` only if the
+        range extends past the end of the file. It may be called from
+        several threads at once.
+
+        Args:
+            filename: string, a path
+        """
+        path = self._normalize(filename)
+
+        def read_range(offset, size):
+            with self._lock:
+                contents = self._files.get(path)
+                data = (
+                    None
+                    if contents is None
+                    else contents[offset : offset + size]
+                )
+            self._simulate("read", len(data or b""))
+            if data is None:
+                raise errors.NotFoundError(
+                    None, None, "Not Found: " + compat.as_text(filename)
+                )
+            return bytes(data)
+
+        return read_range
+
+    def write(self, filename, file_content, binary_mode=False):
+        """Writes string file contents to a file, overwriting any existing
+        contents.
+
+        Args:
+            filename: string, a path
+            file_content: string, the contents
+            binary_mode: bool, write as binary if True, otherwise text
+        """
+        self._write(filename, file_content, binary_mode, append=False)
+
+    def append(self, filename, file_content, binary_mode=False):
+        """Append string file contents to a file.
+
+        Args:
+            filename: string, a path
+            file_content: string, the contents to append
+            binary_mode: bool, write as binary if True, otherwise text
+        """
+        self._write(filename, file_content, binary_mode, append=True)
+
+    def _write(self, filename, file_content, binary_mode, append):
+        if binary_mode:
+            if not isinstance(file_content, (six.binary_type, bytearray)):
+                raise TypeError("File content type must be bytes")
+        else:
+            file_content = compat.as_bytes(file_content)
+        self._simulate("append" if append else "write", len(file_content))
+        path = self._normalize(filename)
+        with self._lock:
+            if path in self._dirs:
+                raise errors.FailedPreconditionError(
+                    None, None, "Is a directory: " + compat.as_text(filename)
+                )
+            if append and path in self._files:
+                self._files[path].extend(file_content)
+            else:
+                self._files[path] = bytearray(file_content)
+                self._add_parent_dirs(path)
+
+    def glob(self, filename):
+        """Returns a list of files that match the given pattern(s)."""
+        if isinstance(filename, six.string_types):
+            patterns = [filename]
+        else:
+            patterns = filename
+        self._simulate("glob")
+        with self._lock:
+            paths = sorted(self._files) + sorted(self._dirs)
+        result = []
+        for pattern in patterns:
+            pattern = compat.as_str_any(pattern)
+            prefix = "mem://" if pattern.startswith("mem://") else ""
+            parts = self._normalize(pattern).split("/")
+            for path in paths:
+                path_parts = path.split("/")
+                if (
+                    path
+                    and len(path_parts) == len(parts)
+                    and all(
+                        fnmatch.fnmatchcase(p, q)
+                        for (p, q) in zip(path_parts, parts)
+                    )
+                ):
+                    result.append(prefix + path)
+        return result
+
+    def isdir(self, dirname):
+        """Returns whether the path is a directory or not."""
+        self._simulate("isdir")
+        path = self._normalize(dirname)
+        with self._lock:
+            return path in self._dirs
+
+    def listdir(self, dirname):
+        """Returns a list of entries contained within a directory."""
+        self._simulate("listdir")
+        path = self._normalize(dirname)
+        with self._lock:
+            if path not in self._dirs:
+                raise errors.NotFoundError(
+                    None, None, "Could not find directory"
+                )
+            prefix = path + "/" if path else ""
+            return sorted(
+                entry[len(prefix) :]
+                for entries in (self._files, self._dirs)
+                for entry in entries
+                if entry.startswith(prefix)
+                and entry != path
+                and "/" not in entry[len(prefix) :]
+            )
+
+    def makedirs(self, path):
+        """Creates a directory and all parent/intermediate directories."""
+        self._simulate("makedirs")
+        path = self._normalize(path)
+        with self._lock:
+            if path in self._dirs:
+                raise errors.AlreadyExistsError(
+                    None, None, "Directory already exists"
+                )
+            if path in self._files:
+                raise errors.AlreadyExistsError(None, None, "File exists")
+            self._dirs.add(path)
+            self._add_parent_dirs(path)
+
+    def stat(self, filename):
+        """Returns file statistics for a given path."""
+        self._simulate("stat")
+        path = self._normalize(filename)
+        with self._lock:
+            contents = self._files.get(path)
+            if contents is None:
+                raise errors.NotFoundError(None, None, "Could not find file")
+            return StatData(len(contents))
+
+
 register_filesystem("", LocalFileSystem())
 if S3_ENABLED:
     register_filesystem("s3", S3FileSystem())
+register_filesystem("mem", MemoryFileSystem())
 
 
 class GFile(object):
@@ -429,18 +1015,23 @@ class GFile(object):
         self.filename = compat.as_bytes(filename)
         self.fs = get_filesystem(self.filename)
         self.fs_supports_append = hasattr(self.fs, "append")
+        self.fs_supports_read_ahead = hasattr(self.fs, "range_reader")
         self.buff = None
         # The buffer offset and the buffer chunk size are measured in the
         # natural units of the underlying stream, i.e. bytes for binary mode,
         # or characters in text mode.
         self.buff_chunk_size = _DEFAULT_BLOCK_SIZE
         self.buff_offset = 0
+        # Complete lines of the buffer after `buff_offset`, in reverse
+        # order, split ahead of time by `__next__`.
+        self.buff_lines = []
         self.continuation_token = None
         self.write_temp = None
         self.write_started = False
         self.binary_mode = "b" in mode
         self.write_mode = "w" in mode
         self.closed = False
+        self.read_ahead = None
 
     def __enter__(self):
         return self
@@ -449,12 +1040,49 @@ class GFile(object):
         self.close()
         self.buff = None
         self.buff_offset = 0
+        self.buff_lines = []
         self.continuation_token = None
 
+    def _stop_read_ahead(self):
+        if self.read_ahead is not None:
+            self.read_ahead.close()
+            self.read_ahead = None
+
+    def _read_from_fs(self, n):
+        """Replaces the buffer with the next contents of the file.
+
+        Args:
+            n: int, minimum number of bytes or characters to read unless
+                the end of the file is reached, otherwise read all the
+                remaining contents of the file.
+        """
+        self.buff_lines = []
+        if self.binary_mode and self.fs_supports_read_ahead:
+            if self.read_ahead is None:
+                offset = 0
+                if self.continuation_token is not None:
+                    offset = self.continuation_token.get("byte_offset", 0)
+                self.read_ahead = _ReadAhead(
+                    self.fs.range_reader(self.filename), offset
+                )
+            # Read-ahead sizes its own chunks.
+            self.buff = self.read_ahead.read(n)
+            self.continuation_token = {"byte_offset": self.read_ahead.offset}
+        else:
+            read_size = max(self.buff_chunk_size, n) if n is not None else None
+            (self.buff, self.continuation_token) = self.fs.read(
+                self.filename,
+                self.binary_mode,
+                read_size,
+                self.continuation_token,
+            )
+        self.buff_offset = 0
+
     def __iter__(self):
         return self
 
     def _read_buffer_to_offset(self, new_buff_offset):
+        self.buff_lines = []
         old_buff_offset = self.buff_offset
         read_size = min(len(self.buff), new_buff_offset) - old_buff_offset
         self.buff_offset += read_size
@@ -489,11 +1117,7 @@ class GFile(object):
                 result = self._read_buffer_to_offset(len(self.buff))
 
         # read from filesystem
-        read_size = max(self.buff_chunk_size, n) if n is not None else None
-        (self.buff, self.continuation_token) = self.fs.read(
-            self.filename, self.binary_mode, read_size, self.continuation_token
-        )
-        self.buff_offset = 0
+        self._read_from_fs(n)
 
         # add from filesystem
         if n is not None:
@@ -529,6 +1153,7 @@ class GFile(object):
             else:
                 # append the later chunks
                 self.fs.append(self.filename, file_content, self.binary_mode)
+            _invalidate_metadata_cache()
         else:
             # add to temp file, but wait for flush to write to final filesystem
             if self.write_temp is None:
@@ -539,34 +1164,74 @@ class GFile(object):
             self.write_temp.write(compatify(file_content))
 
     def __next__(self):
-        line = None
+        lines = self.buff_lines
+        if lines:
+            line = lines.pop()
+            self.buff_offset += len(line)
+            return line
+        return self._next_line()
+
+    def _next_line(self):
+        """Returns the next line, refilling the buffer as needed.
+
+        All complete lines remaining in the buffer are split at once and
+        kept in `buff_lines`, so that `__next__` can return them without
+        scanning the buffer again. A line that spans buffer refills is
+        collected in pieces and joined once.
+        """
+        if self.write_mode:
+            raise errors.PermissionDeniedError(
+                None, None, "File not opened in read mode"
+            )
+        newline = b"\n" if self.binary_mode else "\n"
+        pieces = []
         while True:
+            if self.buff and self.buff_offset < len(self.buff):
+                end = self.buff.rfind(newline, self.buff_offset)
+                if end != -1:
+                    lines = self.buff[self.buff_offset : end].split(newline)
+                    first = lines[0] + newline
+                    lines = [line + newline for line in lines[:0:-1]]
+                    self.buff_offset += len(first)
+                    self.buff_lines = lines
+                    if pieces:
+                        pieces.append(first)
+                        return newline[:0].join(pieces)
+                    return first
+                pieces.append(self._read_buffer_to_offset(len(self.buff)))
+            self._read_from_fs(1)
             if not self.buff:
-                # read one unit into the buffer
-                line = self.read(1)
-                if line and (line[-1] == "\n" or not self.buff):
-                    return line
-                if not self.buff:
-                    raise StopIteration()
-            else:
-                index = self.buff.find("\n", self.buff_offset)
-                if index != -1:
-                    # include line until now plus newline
-                    chunk = self.read(index + 1 - self.buff_offset)
-                    line = line + chunk if line else chunk
-                    return line
-
-                # read one unit past end of buffer
-                chunk = self.read(len(self.buff) + 1 - self.buff_offset)
-                line = line + chunk if line else chunk
-                if line and (line[-1] == "\n" or not self.buff):
-                    return line
-                if not self.buff:
-                    raise StopIteration()
+                if pieces:
+                    return newline[:0].join(pieces)
+                raise StopIteration()
 
     def next(self):
         return self.__next__()
 
+    def seek(self, offset):
+        """Moves the read position to the given byte offset.
+
+        Only supported for files opened in binary read mode, on
+        filesystems that accept `{"byte_offset": offset}` continuation
+        tokens in `read(...)`.
+
+        Args:
+            offset: int, the byte offset from the start of the file.
+        """
+        if self.write_mode:
+            raise errors.PermissionDeniedError(
+                None, None, "File not opened in read mode"
+            )
+        if not self.binary_mode:
+            raise errors.UnimplementedError(
+                None, None, "seek is only supported in binary mode"
+            )
+        self._stop_read_ahead()
+        self.buff = None
+        self.buff_offset = 0
+        self.buff_lines = []
+        self.continuation_token = {"byte_offset": offset}
+
     def flush(self):
         if self.closed:
             raise errors.FailedPreconditionError(
@@ -582,9 +1247,11 @@ class GFile(object):
                 if chunk is not None:
                     # write full contents and keep in temp file
                     self.fs.write(self.filename, chunk, self.binary_mode)
+                    _invalidate_metadata_cache()
                     self.write_temp.seek(len(chunk))
 
     def close(self):
+        self._stop_read_ahead()
         self.flush()
         if self.write_temp is not None:
             self.write_temp.close()
@@ -593,6 +1260,87 @@ class GFile(object):
         self.closed = True
 
 
+class _ReadAhead(object):
+    """Reads a file sequentially with several byte ranges in flight.
+
+    Ranges are fetched on a shared thread pool ahead of the reader, in
+    chunks that grow as the file is consumed. When a chunk comes back
+    short, the end of the file was reached: later chunks are discarded,
+    and only one request at a time is made until the file grows, so that
+    polling a file for appended data costs no more than without
+    read-ahead.
+    """
+
+    def __init__(self, read_range, offset):
+        """Constructs a `_ReadAhead`.
+
+        Args:
+            read_range: Function as returned by a filesystem's
+                `range_reader` method.
+            offset: Byte offset at which to start reading.
+        """
+        self._read_range = read_range
+        self.offset = offset  # of the next byte to return from `read`
+        self._next_request_offset = offset
+        self._chunk_size = _READ_AHEAD_MIN_CHUNK_SIZE
+        self._max_in_flight = 1
+        self._pending = collections.deque()  # of `(size, future)` pairs
+
+    def _fill(self):
+        executor = _get_read_ahead_executor()
+        while len(self._pending) < self._max_in_flight:
+            size = self._chunk_size
+            future = executor.submit(
+                self._read_range, self._next_request_offset, size
+            )
+            self._pending.append((size, future))
+            self._next_request_offset += size
+            self._chunk_size = min(2 * size, _READ_AHEAD_MAX_CHUNK_SIZE)
+
+    def _reset(self):
+        self.close()
+        self._next_request_offset = self.offset
+        self._chunk_size = _READ_AHEAD_MIN_CHUNK_SIZE
+        self._max_in_flight = 1
+
+    def read(self, min_size=None):
+        """Returns the next chunks of the file.
+
+        Args:
+            min_size: Minimum number of bytes to return, unless the end of
+                the file is reached first. If `None`, reads to the end.
+
+        Returns:
+            The bytes read, as a `bytes` object.
+        """
+        chunks = []
+        total = 0
+        while min_size is None or total < min_size:
+            self._fill()
+            (size, future) = self._pending.popleft()
+            try:
+                data = future.result()
+            except Exception:
+                self._reset()
+                raise
+            chunks.append(data)
+            total += len(data)
+            self.offset += len(data)
+            if len(data) < size:
+                self._reset()
+                break
+            self._max_in_flight = min(
+                self._max_in_flight + 1, _READ_AHEAD_MAX_IN_FLIGHT
+            )
+        return b"".join(chunks)
+
+    def close(self):
+        """Cancels any reads in flight."""
+        for (_, future) in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+
 def exists(filename):
     """Determines whether a path exists or not.
 
@@ -606,7 +1354,9 @@ def exists(filename):
     Raises:
       errors.OpError: Propagates any errors reported by the FileSystem API.
     """
-    return get_filesystem(filename).exists(filename)
+    return _cached(
+        "exists", filename, lambda: get_filesystem(filename).exists(filename)
+    )
 
 
 def glob(filename):
@@ -621,7 +1371,14 @@ def glob(filename):
     Raises:
       errors.OpError: If there are filesystem / directory listing errors.
     """
-    return get_filesystem(filename).glob(filename)
+    # Cache an immutable copy, since callers may modify the result.
+    return list(
+        _cached(
+            "glob",
+            filename,
+            lambda: tuple(get_filesystem(filename).glob(filename)),
+        )
+    )
 
 
 def isdir(dirname):
@@ -633,7 +1390,9 @@ def isdir(dirname):
     Returns:
       True, if the path is a directory; False otherwise
     """
-    return get_filesystem(dirname).isdir(dirname)
+    return _cached(
+        "isdir", dirname, lambda: get_filesystem(dirname).isdir(dirname)
+    )
 
 
 def listdir(dirname):
@@ -651,7 +1410,14 @@ def listdir(dirname):
     Raises:
       errors.NotFoundError if directory doesn't exist
     """
-    return get_filesystem(dirname).listdir(dirname)
+    # Cache an immutable copy, since callers may modify the result.
+    return list(
+        _cached(
+            "listdir",
+            dirname,
+            lambda: tuple(get_filesystem(dirname).listdir(dirname)),
+        )
+    )
 
 
 def makedirs(path):
@@ -666,7 +1432,10 @@ def makedirs(path):
       errors.AlreadyExistsError: If leaf directory already exists or
         cannot be created.
     """
-    return get_filesystem(path).makedirs(path)
+    try:
+        return get_filesystem(path).makedirs(path)
+    finally:
+        _invalidate_metadata_cache()
 
 
 def walk(top, topdown=True, onerror=None):
@@ -688,13 +1457,16 @@ def walk(top, topdown=True, onerror=None):
     """
     top = compat.as_str_any(top)
     fs = get_filesystem(top)
+    if hasattr(fs, "walk"):
+        for item in fs.walk(top, topdown, onerror=onerror):
+            yield item
+        return
     try:
         listing = listdir(top)
     except errors.NotFoundError as err:
         if onerror:
             onerror(err)
-        else:
-            return
+        return
 
     files = []
     subdirs = []
@@ -731,7 +1503,9 @@ def stat(filename):
     Raises:
       errors.OpError: If the operation fails.
     """
-    return get_filesystem(filename).stat(filename)
+    return _cached(
+        "stat", filename, lambda: get_filesystem(filename).stat(filename)
+    )
 
 
 # Used for tests only
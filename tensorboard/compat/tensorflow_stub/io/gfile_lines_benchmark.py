@@ -0,0 +1,195 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for iterating over the lines of a file with `GFile`.
+
+Writes two TSV files like those of the projector plugin, metadata with
+many short lines and tensors with few long ones, and reports throughput
+in lines per second for:
+
+    io.open    the built-in file object, for reference
+    unit_read  lines grown from `GFile.read` calls (the former behavior
+               of `GFile.__next__`)
+    gfile      `GFile` iteration
+
+The tensors file is read with a buffer of `--chunk_size` characters, so
+that its lines span many buffer refills.
+
+Usage:
+
+    bazel run //tensorboard/compat/tensorflow_stub:gfile_lines_benchmark -- \\
+        --num_lines=1000000
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+
+from tensorboard.compat.tensorflow_stub.io import gfile
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_integer(
+    "num_lines", 1000000, "Number of lines in the metadata file."
+)
+flags.DEFINE_integer(
+    "num_long_lines", 100, "Number of lines in the tensors file."
+)
+flags.DEFINE_integer(
+    "dimensions", 100000, "Number of values on each line of the tensors file."
+)
+flags.DEFINE_integer(
+    "chunk_size",
+    64 * 1024,
+    "Buffer size, in characters, for reading the tensors file.",
+)
+flags.DEFINE_integer(
+    "repeats", 3, "Number of times to run each case; the fastest is reported."
+)
+
+
+def _write_metadata(path):
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(u"Word\tFrequency\tClass\n")
+        for i in range(FLAGS.num_lines - 1):
+            f.write(u"word_%d\t%d\tclass_%d\n" % (i, i * 7919 % 10007, i % 10))
+
+
+def _write_tensors(path):
+    with io.open(path, "w", encoding="utf-8") as f:
+        for i in range(FLAGS.num_long_lines):
+            values = (
+                u"%.4f" % ((i * j % 1000) / 1000.0)
+                for j in range(FLAGS.dimensions)
+            )
+            f.write(u"\t".join(values) + u"\n")
+
+
+def _unit_read_lines(f):
+    """Yields lines as the former `GFile.__next__` did."""
+    while True:
+        line = None
+        while True:
+            if not f.buff:
+                line = f.read(1)
+                if line and (line[-1] == "\n" or not f.buff):
+                    break
+                if not f.buff:
+                    return
+            else:
+                index = f.buff.find("\n", f.buff_offset)
+                if index != -1:
+                    chunk = f.read(index + 1 - f.buff_offset)
+                    line = line + chunk if line else chunk
+                    break
+                chunk = f.read(len(f.buff) + 1 - f.buff_offset)
+                line = line + chunk if line else chunk
+                if line and (line[-1] == "\n" or not f.buff):
+                    break
+                if not f.buff:
+                    return
+        yield line
+
+
+def _count_io_open(path, chunk_size):
+    del chunk_size  # unused
+    with io.open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def _gfile_counter(lines):
+    def count(path, chunk_size):
+        with gfile.GFile(path, "r") as f:
+            if chunk_size is not None:
+                f.buff_chunk_size = chunk_size
+            return sum(1 for _ in lines(f))
+
+    return count
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        metadata_path = os.path.join(temp_dir, "metadata.tsv")
+        tensors_path = os.path.join(temp_dir, "tensors.tsv")
+        logger.info("Writing %d metadata lines...", FLAGS.num_lines)
+        _write_metadata(metadata_path)
+        logger.info("Writing %d tensor lines...", FLAGS.num_long_lines)
+        _write_tensors(tensors_path)
+
+        headers = ("FILE", "METHOD", "LINES", "SECONDS", "LINES_PER_SEC")
+        logger.info(_format_line(headers, headers))
+        cases = [
+            ("io.open", _count_io_open),
+            ("unit_read", _gfile_counter(_unit_read_lines)),
+            ("gfile", _gfile_counter(iter)),
+        ]
+        for (name, path, chunk_size) in [
+            ("metadata", metadata_path, None),
+            ("tensors", tensors_path, FLAGS.chunk_size),
+        ]:
+            for (method, count_lines) in cases:
+                seconds = float("inf")
+                for _ in range(FLAGS.repeats):
+                    start = time.time()
+                    count = count_lines(path, chunk_size)
+                    seconds = min(seconds, time.time() - start)
+                rate = count / max(seconds, 1e-9)
+                fields = (name, method, count, seconds, rate)
+                logger.info(_format_line(headers, fields))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    app.run(main)
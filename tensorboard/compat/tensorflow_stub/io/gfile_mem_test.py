@@ -0,0 +1,154 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the in-memory "mem://" filesystem of gfile."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import six
+
+from tensorboard import test as tb_test
+from tensorboard.compat.tensorflow_stub import errors
+from tensorboard.compat.tensorflow_stub.io import gfile
+
+
+class MemoryFileSystemTest(tb_test.TestCase):
+    def setUp(self):
+        super(MemoryFileSystemTest, self).setUp()
+        self.fs = gfile.MemoryFileSystem()
+        gfile.register_filesystem("mem", self.fs)
+        self.addCleanup(
+            gfile.register_filesystem, "mem", gfile.MemoryFileSystem()
+        )
+        self._CreateDeepStructure("mem://logs")
+
+    def testExists(self):
+        self.assertTrue(gfile.exists("mem://logs"))
+        self.assertTrue(gfile.exists("mem://logs/model.ckpt"))
+        self.assertTrue(gfile.exists("mem://logs/bar/baz/"))
+        self.assertFalse(gfile.exists("mem://logs/nope"))
+
+    def testGlob(self):
+        six.assertCountEqual(
+            self,
+            gfile.glob("mem://logs/*"),
+            [
+                "mem://logs/a.tfevents.1",
+                "mem://logs/model.ckpt",
+                "mem://logs/bar",
+                "mem://logs/quuz",
+                "mem://logs/waldo",
+            ],
+        )
+        six.assertCountEqual(
+            self,
+            gfile.glob("mem://logs/*/*.tfevents.*"),
+            ["mem://logs/bar/b.tfevents.1", "mem://logs/quuz/e.tfevents.1"],
+        )
+
+    def testIsdir(self):
+        self.assertTrue(gfile.isdir("mem://logs"))
+        self.assertTrue(gfile.isdir("mem://logs/waldo"))
+        self.assertFalse(gfile.isdir("mem://logs/model.ckpt"))
+
+    def testListdir(self):
+        six.assertCountEqual(
+            self,
+            gfile.listdir("mem://logs"),
+            ["a.tfevents.1", "model.ckpt", "bar", "quuz", "waldo"],
+        )
+        self.assertEqual(gfile.listdir("mem://logs/waldo"), [])
+        with self.assertRaises(errors.NotFoundError):
+            gfile.listdir("mem://logs/nope")
+
+    def testMakeDirsAlreadyExists(self):
+        with self.assertRaises(errors.AlreadyExistsError):
+            gfile.makedirs("mem://logs/bar")
+
+    def testWalk(self):
+        gotten = [
+            (top, sorted(subdirs), sorted(files))
+            for (top, subdirs, files) in gfile.walk("mem://logs")
+        ]
+        self.assertEqual(
+            gotten,
+            [
+                (
+                    "mem://logs",
+                    ["bar", "quuz", "waldo"],
+                    ["a.tfevents.1", "model.ckpt"],
+                ),
+                ("mem://logs/bar", ["baz"], ["b.tfevents.1"]),
+                ("mem://logs/bar/baz", [], ["c.tfevents.1"]),
+                ("mem://logs/quuz", [], ["e.tfevents.1"]),
+                ("mem://logs/waldo", [], []),
+            ],
+        )
+
+    def testReadWrite(self):
+        path = "mem://logs/text.txt"
+        with gfile.GFile(path, "w") as f:
+            f.write("hello\n")
+            f.write(u"wörld\n")
+        self.assertEqual(gfile.stat(path).length, 13)
+        with gfile.GFile(path, "r") as f:
+            self.assertEqual(list(f), ["hello\n", u"wörld\n"])
+        with gfile.GFile(path, "rb") as f:
+            self.assertEqual(f.read(3), b"hel")
+            f.seek(9)
+            self.assertEqual(f.read(), b"rld\n")
+
+    def testReadGrowingFile(self):
+        path = "mem://logs/growing"
+        with gfile.GFile(path, "wb") as f:
+            f.write(b"abc")
+        reader = gfile.GFile(path, "rb")
+        self.assertEqual(reader.read(), b"abc")
+        self.fs.append(path, b"def", binary_mode=True)
+        self.assertEqual(reader.read(), b"def")
+
+    def testReadMissingFile(self):
+        with self.assertRaises(errors.NotFoundError):
+            gfile.GFile("mem://logs/nope", "rb").read()
+        with self.assertRaises(errors.NotFoundError):
+            gfile.stat("mem://logs/nope")
+
+    def testSimulatesLatency(self):
+        fs = gfile.MemoryFileSystem(
+            latency_secs=0.01, bandwidth_bytes_per_sec=1000
+        )
+        start = time.time()
+        fs.write("mem://f", b"x" * 100, binary_mode=True)
+        fs.stat("mem://f")
+        self.assertGreaterEqual(time.time() - start, 0.12)
+        self.assertEqual(fs.call_counts, {"write": 1, "stat": 1})
+
+    def _CreateDeepStructure(self, top):
+        for name in (
+            "a.tfevents.1",
+            "model.ckpt",
+            "bar/b.tfevents.1",
+            "bar/baz/c.tfevents.1",
+            "quuz/e.tfevents.1",
+        ):
+            self.fs.write(top + "/" + name, b"")
+        gfile.makedirs(top + "/waldo")
+
+
+if __name__ == "__main__":
+    tb_test.main()
@@ -0,0 +1,203 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for sequential reads of S3 files through `GFile`.
+
+Reads an object from an in-process S3 stand-in, which answers requests
+of the boto3 client itself and simulates request latency and per-request
+bandwidth, and reports throughput for:
+
+    serial      one `S3FileSystem.read` range of `_DEFAULT_BLOCK_SIZE`
+                bytes at a time (the former behavior of `GFile.read`)
+    read_ahead  `GFile.read` in binary mode, with several ranges in
+                flight
+
+Usage:
+
+    bazel run //tensorboard/compat/tensorflow_stub:gfile_s3_benchmark -- \\
+        --file_size_mb=64 --latency_ms=50 --bandwidth_mbps=50
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import functools
+import io
+import os
+import re
+import time
+
+from absl import app
+from absl import flags
+from absl import logging
+import boto3
+from botocore import awsrequest
+
+from tensorboard.compat.tensorflow_stub import compat
+from tensorboard.compat.tensorflow_stub.io import gfile
+from tensorboard.util import tb_logging
+
+
+logger = tb_logging.get_logger()
+
+FLAGS = flags.FLAGS
+
+flags.DEFINE_integer("file_size_mb", 64, "Size of the file to read, in MiB.")
+flags.DEFINE_integer(
+    "read_size", 64 * 1024, "Bytes requested by each `GFile.read` call."
+)
+flags.DEFINE_float(
+    "latency_ms", 50.0, "Simulated latency of each S3 request, in ms."
+)
+flags.DEFINE_float(
+    "bandwidth_mbps",
+    50.0,
+    "Simulated bandwidth of each S3 request, in MiB per second.",
+)
+flags.DEFINE_integer(
+    "repeats", 3, "Number of times to run each case; the fastest is reported."
+)
+
+_BUCKET = "benchmark"
+_KEY = "events.out.tfevents.benchmark"
+_PATH = "s3://%s/%s" % (_BUCKET, _KEY)
+
+
+class _RawResponse(io.BytesIO):
+    """Response body in the form that botocore reads it."""
+
+    def stream(self, **kwargs):
+        del kwargs  # unused
+        contents = self.read()
+        while contents:
+            yield contents
+            contents = self.read()
+
+
+def _serve_request(request, contents, **kwargs):
+    """Answers an S3 request for the benchmark object.
+
+    Handles `HeadObject` and `GetObject` requests, delaying each by its
+    simulated transfer time.
+    """
+    del kwargs  # unused
+    size = len(contents)
+    status = 200
+    headers = {"Content-Length": str(size)}
+    body = b""
+    if request.method == "GET":
+        (start, end) = (0, size)
+        byte_range = compat.as_str_any(request.headers.get("Range", ""))
+        match = re.match(r"bytes=(\d+)-(\d*)", byte_range)
+        if match:
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)) + 1, size)
+            status = 206
+        if start >= size and match:
+            status = 416
+            body = b"<Error><Code>InvalidRange</Code></Error>"
+            headers = {}
+        else:
+            body = contents[start:end]
+            headers["Content-Length"] = str(len(body))
+        bandwidth = FLAGS.bandwidth_mbps * 1024 * 1024
+        time.sleep(FLAGS.latency_ms / 1000.0 + len(body) / bandwidth)
+    return awsrequest.AWSResponse(
+        request.url, status, headers, _RawResponse(body)
+    )
+
+
+def _read_serial(path):
+    fs = gfile.get_filesystem(path)
+    total = 0
+    continuation_token = None
+    while True:
+        (data, continuation_token) = fs.read(
+            path, True, gfile._DEFAULT_BLOCK_SIZE, continuation_token
+        )
+        if not data:
+            return total
+        total += len(data)
+
+
+def _read_ahead(path):
+    total = 0
+    with gfile.GFile(path, "rb") as f:
+        while True:
+            data = f.read(FLAGS.read_size)
+            if not data:
+                return total
+            total += len(data)
+
+
+def _format_line(headers, fields):
+    """Format a line of a table.
+
+    Arguments:
+      headers: A list of strings that are used as the table headers.
+      fields: A list of the same length as `headers` where `fields[i]` is
+        the entry for `headers[i]` in this row. Elements can be of
+        arbitrary types. Pass `headers` to print the header row.
+
+    Returns:
+      A pretty string.
+    """
+    assert len(fields) == len(headers), (fields, headers)
+    fields = [
+        "%2.4f" % field if isinstance(field, float) else str(field)
+        for field in fields
+    ]
+    return "  ".join(
+        " " * max(0, len(header) - len(field)) + field
+        for (header, field) in zip(headers, fields)
+    )
+
+
+def main(unused_argv):
+    logging.set_verbosity(logging.INFO)
+    # Placeholder credentials, so that no real keys are used.
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    contents = os.urandom(FLAGS.file_size_mb * 1024 * 1024)
+    boto3.setup_default_session(region_name="us-east-1")
+    for operation in ("GetObject", "HeadObject"):
+        boto3.DEFAULT_SESSION.events.register_first(
+            "before-send.s3.%s" % operation,
+            functools.partial(_serve_request, contents=contents),
+        )
+
+    headers = ("METHOD", "MIB", "SECONDS", "MIB_PER_SEC", "SPEEDUP")
+    logger.info(_format_line(headers, headers))
+    baseline = None
+    for (method, read) in [
+        ("serial", _read_serial),
+        ("read_ahead", _read_ahead),
+    ]:
+        seconds = float("inf")
+        for _ in range(FLAGS.repeats):
+            start = time.time()
+            size = read(_PATH)
+            seconds = min(seconds, time.time() - start)
+        mib = size / (1024.0 * 1024.0)
+        rate = mib / max(seconds, 1e-9)
+        baseline = baseline or rate
+        fields = (method, mib, seconds, rate, rate / baseline)
+        logger.info(_format_line(headers, fields))
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -18,11 +18,18 @@ from __future__ import division
 from __future__ import print_function
 
 import boto3
+import botocore.exceptions
 import os
 import six
 import unittest
 from moto import mock_s3
 
+try:
+    # python version >= 3.3
+    from unittest import mock
+except ImportError:
+    import mock  # pylint: disable=unused-import
+
 from tensorboard.compat.tensorflow_stub import errors
 from tensorboard.compat.tensorflow_stub.io import gfile
 
@@ -265,6 +272,145 @@ class GFileTest(unittest.TestCase):
             ckpt_read = f.read()
             self.assertEqual(ckpt_content, ckpt_read)
 
+    def _PatchReadAhead(self, min_chunk_size, max_chunk_size):
+        """Shrinks read-ahead chunks for the duration of the test."""
+        for (name, value) in [
+            ("_READ_AHEAD_MIN_CHUNK_SIZE", min_chunk_size),
+            ("_READ_AHEAD_MAX_CHUNK_SIZE", max_chunk_size),
+        ]:
+            patcher = mock.patch.object(gfile, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock_s3
+    def testReadAhead(self):
+        self._PatchReadAhead(3, 16)
+        temp_dir = self._CreateDeepS3Structure()
+        ckpt_path = self._PathJoin(temp_dir, "model.ckpt")
+        ckpt_content = bytes(bytearray(i % 251 for i in range(1000)))
+        with gfile.GFile(ckpt_path, "wb") as f:
+            f.write(ckpt_content)
+        with gfile.GFile(ckpt_path, "rb") as f:
+            self.assertEqual(f.read(1), ckpt_content[:1])
+            self.assertEqual(f.read(100), ckpt_content[1:101])
+            self.assertEqual(f.read(), ckpt_content[101:])
+            self.assertEqual(f.read(), b"")
+        with gfile.GFile(ckpt_path, "rb") as f:
+            f.seek(990)
+            self.assertEqual(f.read(5), ckpt_content[990:995])
+            f.seek(10)
+            self.assertEqual(f.read(20), ckpt_content[10:30])
+
+    @mock_s3
+    def testReadAheadGrowingFile(self):
+        self._PatchReadAhead(4, 8)
+        temp_dir = self._CreateDeepS3Structure()
+        ckpt_path = self._PathJoin(temp_dir, "model.ckpt")
+        with gfile.GFile(ckpt_path, "wb") as f:
+            f.write(b"0123456789")
+        with gfile.GFile(ckpt_path, "rb") as reader:
+            self.assertEqual(reader.read(100), b"0123456789")
+            self.assertEqual(reader.read(100), b"")
+            with gfile.GFile(ckpt_path, "wb") as f:
+                f.write(b"0123456789abcdefghijklmnopqrstuvwxyz")
+            self.assertEqual(reader.read(), b"abcdefghijklmnopqrstuvwxyz")
+
+    @mock_s3
+    def testRangeReader(self):
+        temp_dir = self._CreateDeepS3Structure(ckpt_content="0123456789")
+        ckpt_path = self._PathJoin(temp_dir, "model.ckpt")
+        read_range = gfile.get_filesystem(ckpt_path).range_reader(ckpt_path)
+        self.assertEqual(read_range(2, 3), b"234")
+        self.assertEqual(read_range(8, 5), b"89")
+        self.assertEqual(read_range(10, 5), b"")
+        self.assertEqual(read_range(20, 5), b"")
+
+    def _CreateManyRuns(self):
+        """Creates runs whose names share prefixes, listed in small pages."""
+        patcher = mock.patch.object(gfile, "_S3_LIST_PAGE_SIZE", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test")
+        files = ["a.txt", "z.txt"]
+        for i in range(20):
+            for run in ("run%d" % i, "run%d-b" % i, "run%d/c" % i):
+                files.append("%s/events.out.tfevents.%d" % (run, i))
+        for f in files:
+            client.put_object(Bucket="test", Key="logs/" + f, Body=b"")
+        return ("s3://test/logs", files)
+
+    @mock_s3
+    def testGlobManyRuns(self):
+        (top, files) = self._CreateManyRuns()
+        gotten_listing = gfile.glob(self._PathJoin(top, "*"))
+        self.assertEqual(
+            sorted(self._PathJoin(top, f) for f in files), gotten_listing
+        )
+
+    @mock_s3
+    def testWalkManyRuns(self):
+        (top, files) = self._CreateManyRuns()
+        gotten_files = []
+        for (dirname, subdirs, filenames) in gfile.walk(top):
+            gotten_files.extend(
+                self._PathJoin(dirname, f)[len(top) + 1 :] for f in filenames
+            )
+            if dirname == top:
+                self.assertEqual(len(subdirs), 40)
+                # Pruning subdirectories skips them.
+                subdirs[:] = [d for d in subdirs if not d.endswith("-b")]
+        self.assertEqual(
+            sorted(gotten_files), sorted(f for f in files if "-b/" not in f)
+        )
+
+    @mock_s3
+    def testWalkMissingBucket(self):
+        errors_seen = []
+        self.assertEqual(
+            list(gfile.walk("s3://missing/logs", onerror=errors_seen.append)),
+            [],
+        )
+        self.assertEqual(len(errors_seen), 1)
+        # Without `onerror`, the error is ignored, as by `os.walk`.
+        self.assertEqual(list(gfile.walk("s3://missing/logs")), [])
+
+    @mock_s3
+    def testWalkSkipsUnlistableDirectory(self):
+        (top, files) = self._CreateManyRuns()
+        fs = gfile.get_filesystem(top)
+        list_directory = fs._list_directory
+        error = botocore.exceptions.ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "ListObjects"
+        )
+
+        def fake_list_directory(bucket, path):
+            if path.endswith("-b/"):
+                raise error
+            return list_directory(bucket, path)
+
+        errors_seen = []
+        with mock.patch.object(
+            fs, "_list_directory", side_effect=fake_list_directory
+        ):
+            gotten_files = []
+            for (dirname, _, filenames) in gfile.walk(
+                top, onerror=errors_seen.append
+            ):
+                gotten_files.extend(
+                    self._PathJoin(dirname, f)[len(top) + 1 :]
+                    for f in filenames
+                )
+        self.assertEqual(
+            sorted(gotten_files), sorted(f for f in files if "-b/" not in f)
+        )
+        self.assertEqual(errors_seen, [error] * 20)
+
+    @mock_s3
+    def testSharedClient(self):
+        fs = gfile.get_filesystem("s3://test/")
+        self.assertIs(fs._get_client(), fs._get_client())
+
     def _PathJoin(self, *args):
         """Join directory and path with slash and not local separator."""
         return "/".join(args)
@@ -129,6 +129,73 @@ class GFileTest(tb_test.TestCase):
         with self.assertRaises(errors.NotFoundError):
             gfile.stat(bad_ckpt_path)
 
+    def testMetadataCache(self):
+        temp_dir = self.get_temp_dir()
+        self._CreateDeepDirectoryStructure(temp_dir)
+        ckpt_path = os.path.join(temp_dir, "model.ckpt")
+        self.assertIsNone(gfile.get_metadata_cache_stats())
+        gfile.enable_metadata_cache(ttl_secs=3600)
+        self.addCleanup(gfile.disable_metadata_cache)
+        self.assertEqual(gfile.stat(ckpt_path).length, 0)
+        listing = gfile.listdir(temp_dir)
+        listing.append("not_a_file")
+        with open(ckpt_path, "w") as f:
+            f.write("asdf")
+        os.mkdir(os.path.join(temp_dir, "new_dir"))
+        # Changes made outside of `gfile` go unnoticed...
+        self.assertEqual(gfile.stat(ckpt_path).length, 0)
+        self.assertNotIn("new_dir", gfile.listdir(temp_dir))
+        self.assertNotIn("not_a_file", gfile.listdir(temp_dir))
+        self.assertEqual(
+            gfile.get_metadata_cache_stats(),
+            {"hits": 3, "misses": 2, "evictions": 0, "entries": 2},
+        )
+        # ...until a write through `gfile` clears the cache.
+        with gfile.GFile(os.path.join(temp_dir, "other.txt"), "w") as f:
+            f.write("x")
+        self.assertEqual(gfile.stat(ckpt_path).length, 4)
+        self.assertIn("new_dir", gfile.listdir(temp_dir))
+
+    def testMetadataCacheExpiresEntries(self):
+        temp_dir = self.get_temp_dir()
+        gfile.enable_metadata_cache(ttl_secs=0)
+        self.addCleanup(gfile.disable_metadata_cache)
+        new_dir = os.path.join(temp_dir, "new_dir")
+        self.assertFalse(gfile.exists(new_dir))
+        os.mkdir(new_dir)
+        self.assertTrue(gfile.exists(new_dir))
+        stats = gfile.get_metadata_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 2))
+
+    def testMetadataCacheEvictsLeastRecentlyUsed(self):
+        temp_dir = self.get_temp_dir()
+        self._CreateDeepDirectoryStructure(temp_dir)
+        gfile.enable_metadata_cache(ttl_secs=3600, max_entries=2)
+        self.addCleanup(gfile.disable_metadata_cache)
+        (foo, bar, quuz) = (
+            os.path.join(temp_dir, name) for name in ("foo", "bar", "quuz")
+        )
+        gfile.isdir(foo)
+        gfile.isdir(bar)
+        gfile.isdir(foo)  # hit; `bar` is now least recently used
+        gfile.isdir(quuz)  # evicts `bar`
+        gfile.isdir(foo)  # hit
+        gfile.isdir(bar)  # miss
+        self.assertEqual(
+            gfile.get_metadata_cache_stats(),
+            {"hits": 2, "misses": 4, "evictions": 2, "entries": 2},
+        )
+
+    def testMetadataCacheDoesNotCacheErrors(self):
+        temp_dir = self.get_temp_dir()
+        gfile.enable_metadata_cache(ttl_secs=3600)
+        self.addCleanup(gfile.disable_metadata_cache)
+        path = os.path.join(temp_dir, "later.txt")
+        with self.assertRaises(errors.NotFoundError):
+            gfile.stat(path)
+        open(path, "w").close()
+        self.assertEqual(gfile.stat(path).length, 0)
+
     def testRead(self):
         temp_dir = self.get_temp_dir()
         self._CreateDeepDirectoryStructure(temp_dir)
@@ -166,6 +233,30 @@ class GFileTest(tb_test.TestCase):
             read_ckpt_lines = list(f)
             self.assertEqual(expected_ckpt_lines, read_ckpt_lines)
 
+    def testReadLinesBinary(self):
+        temp_dir = self.get_temp_dir()
+        ckpt_path = os.path.join(temp_dir, "model.ckpt")
+        # Lines longer than the buffer are joined across refills.
+        ckpt_lines = [b"\n", b"x" * 10 + b"\r\n", b"line\n", b"y" * 9]
+        with open(ckpt_path, "wb") as f:
+            f.write(b"".join(ckpt_lines))
+        with gfile.GFile(ckpt_path, "rb") as f:
+            f.buff_chunk_size = 4  # Test buffering by reducing chunk size
+            self.assertEqual(ckpt_lines, list(f))
+
+    def testReadLinesMixedWithRead(self):
+        temp_dir = self.get_temp_dir()
+        ckpt_path = os.path.join(temp_dir, "model.ckpt")
+        with open(ckpt_path, "w") as f:
+            f.write(u"one\ntwo\nthree\nfour\nfive\n")
+        with gfile.GFile(ckpt_path, "r") as f:
+            self.assertEqual(u"one\n", next(f))
+            self.assertEqual(u"tw", f.read(2))
+            self.assertEqual(u"o\n", next(f))
+            self.assertEqual(u"three\n", next(f))
+            self.assertEqual(u"four\nfive\n", f.read())
+            self.assertEqual([], list(f))
+
     def testReadWithOffset(self):
         temp_dir = self.get_temp_dir()
         self._CreateDeepDirectoryStructure(temp_dir)
@@ -190,6 +281,22 @@ class GFileTest(tb_test.TestCase):
             ckpt_read = f.read()
             self.assertEqual(ckpt_b_content, ckpt_read)
 
+    def testSeek(self):
+        temp_dir = self.get_temp_dir()
+        ckpt_path = os.path.join(temp_dir, "model.ckpt")
+        with open(ckpt_path, "wb") as f:
+            f.write(b"asdfasdfasdffoobarbuzz")
+        with gfile.GFile(ckpt_path, "rb") as f:
+            f.buff_chunk_size = 4  # Test buffering by reducing chunk size
+            self.assertEqual(b"asdf", f.read(4))
+            f.seek(12)
+            self.assertEqual(b"foobar", f.read(6))
+            f.seek(0)
+            self.assertEqual(b"asdfasdfasdffoobarbuzz", f.read())
+        with gfile.GFile(ckpt_path, "r") as f:
+            with self.assertRaises(errors.UnimplementedError):
+                f.seek(1)
+
     def testWrite(self):
         temp_dir = self.get_temp_dir()
         self._CreateDeepDirectoryStructure(temp_dir)
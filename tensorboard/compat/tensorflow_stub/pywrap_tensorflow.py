@@ -19,7 +19,12 @@ from __future__ import division
 from __future__ import print_function
 
 import array
+import mmap
+import os
 import struct
+import zlib
+
+import numpy as np
 
 from . import errors
 from .io import gfile
@@ -123,16 +128,61 @@ CRC_INIT = 0
 _MASK = 0xFFFFFFFF
 
 
-def crc_update(crc, data):
-    """Update CRC-32C checksum with data.
+def _make_slicing_tables(table, count):
+    """Derives the lookup tables for a slicing-by-`count` CRC.
 
-    Args:
-      crc: 32-bit checksum to update as long.
-      data: byte array, string or iterable over bytes.
-    Returns:
-      32-bit updated CRC-32C as long.
+    Table `k` maps a byte to its contribution to the CRC after it has
+    been followed by `k` further bytes, so that `count` bytes can be
+    folded into the checksum with `count` independent lookups.
     """
+    tables = [tuple(table)]
+    for _ in range(count - 1):
+        prev = tables[-1]
+        tables.append(
+            tuple((prev[i] >> 8) ^ table[prev[i] & 0xFF] for i in range(256))
+        )
+    return tuple(tables)
+
+
+_SLICING_TABLES = _make_slicing_tables(CRC_TABLE, 8)
+_NP_SLICING_TABLES = tuple(
+    np.array(table, dtype=np.uint32) for table in _SLICING_TABLES
+)
+
+# Inputs at least this long are checksummed in parallel lanes with NumPy;
+# below it, the per-call overhead of NumPy outweighs its throughput.
+_NUMPY_MIN_BYTES = 16 * 1024
+
+# Minimum length of each lane in the NumPy engine. Must be a multiple of 8.
+_NUMPY_MIN_LANE_BYTES = 64
+
+# Cache of `_zeros_operator(n)` results, keyed by `n`.
+_ZEROS_OPERATORS = {}
+
 
+def _as_buffer(data):
+    """Returns `data` as an object supporting the buffer protocol.
+
+    Byte-oriented buffers such as `bytes` and memoryviews of a memory
+    map are returned without copying.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return bytes(bytearray(data))
+    if view.itemsize == 1 and getattr(view, "contiguous", True):
+        return view
+    return view.tobytes()
+
+
+def _crc_update_bytewise(crc, data):
+    """Reference CRC-32C update that consumes one byte per step.
+
+    This is the original table-driven implementation. It is kept as a
+    correctness oracle and as the baseline for benchmarks.
+    """
     if type(data) != array.array or data.itemsize != 1:
         buf = array.array("B", data)
     else:
@@ -145,6 +195,172 @@ def crc_update(crc, data):
     return crc ^ _MASK
 
 
+def _crc_register_sliced(reg, buf):
+    """Advances a raw (uninverted) CRC-32C register over `buf`.
+
+    Consumes eight bytes per step using slicing-by-8 tables, with a
+    bytewise loop for any trailing bytes.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = _SLICING_TABLES
+    length = len(buf)
+    num_words = (length // 8) * 2
+    if num_words:
+        words = struct.unpack("<%dI" % num_words, buf[: num_words * 4])
+        for lo, hi in zip(words[0::2], words[1::2]):
+            reg ^= lo
+            reg = (
+                t7[reg & 0xFF]
+                ^ t6[(reg >> 8) & 0xFF]
+                ^ t5[(reg >> 16) & 0xFF]
+                ^ t4[reg >> 24]
+                ^ t3[hi & 0xFF]
+                ^ t2[(hi >> 8) & 0xFF]
+                ^ t1[(hi >> 16) & 0xFF]
+                ^ t0[hi >> 24]
+            )
+    for b in bytearray(buf[num_words * 4 :]):
+        reg = t0[(reg ^ b) & 0xFF] ^ (reg >> 8)
+    return reg
+
+
+def _crc_register_lanes(regs, lanes):
+    """Advances many raw CRC-32C registers in parallel with NumPy.
+
+    Args:
+      regs: `np.uint32` array of shape `[num_lanes]` of initial registers.
+      lanes: `np.uint8` array of shape `[num_lanes, lane_bytes]`, where
+        `lane_bytes` is a multiple of 8.
+
+    Returns:
+      An `np.uint32` array of shape `[num_lanes]` of final registers.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = _NP_SLICING_TABLES
+    # Transpose so that each step reads a contiguous row of words.
+    words = np.ascontiguousarray(
+        lanes.view("<u4").astype(np.uint32, copy=False).T
+    )
+    regs = regs.copy()
+    for i in range(0, words.shape[0], 2):
+        regs ^= words[i]
+        hi = words[i + 1]
+        regs = (
+            t7[regs & 0xFF]
+            ^ t6[(regs >> 8) & 0xFF]
+            ^ t5[(regs >> 16) & 0xFF]
+            ^ t4[regs >> 24]
+            ^ t3[hi & 0xFF]
+            ^ t2[(hi >> 8) & 0xFF]
+            ^ t1[(hi >> 16) & 0xFF]
+            ^ t0[hi >> 24]
+        )
+    return regs
+
+
+def _zeros_operator(n):
+    """Returns tables for the linear map "advance the register over n zeros".
+
+    A raw CRC register is a linear function over GF(2) of its initial
+    value and its input, so the register after `A + B` equals the
+    register after `len(B)` zero bytes starting from the register for
+    `A`, XORed with the register for `B` alone. The map is returned as
+    four byte-indexed tables whose entries XOR together to apply it.
+    """
+    operator = _ZEROS_OPERATORS.get(n)
+    if operator is not None:
+        return operator
+    # Column j of the map is its image of the basis vector 1 << j.
+    basis = np.array([1 << j for j in range(32)], dtype=np.uint32)
+    zeros = np.zeros((32, n), dtype=np.uint8)
+    columns = [int(c) for c in _crc_register_lanes(basis, zeros)]
+    operator = []
+    for byte_index in range(4):
+        cols = columns[8 * byte_index : 8 * byte_index + 8]
+        table = [0] * 256
+        for value in range(1, 256):
+            low_bit = value & -value
+            table[value] = (
+                table[value ^ low_bit] ^ cols[low_bit.bit_length() - 1]
+            )
+        operator.append(tuple(table))
+    operator = tuple(operator)
+    _ZEROS_OPERATORS[n] = operator
+    return operator
+
+
+def _crc_register_numpy(reg, buf):
+    """Advances a raw CRC-32C register over `buf` using parallel lanes.
+
+    The input is split into equal-length lanes whose registers are
+    computed independently with NumPy and then folded together using
+    `_zeros_operator`; any remainder is handled by the sliced engine.
+    """
+    # Per-step NumPy overhead grows with the lane length and the cost of
+    # folding lanes together grows with their count, so balance the two
+    # with lanes of about sqrt(n) / 2 bytes (rounded to a power of two to
+    # keep the `_zeros_operator` cache small).
+    lane_bytes = max(
+        _NUMPY_MIN_LANE_BYTES, 1 << (len(buf).bit_length() // 2 - 1)
+    )
+    num_lanes = len(buf) // lane_bytes
+    body = np.frombuffer(buf, dtype=np.uint8, count=num_lanes * lane_bytes)
+    lane_regs = _crc_register_lanes(
+        np.zeros(num_lanes, dtype=np.uint32),
+        body.reshape(num_lanes, lane_bytes),
+    )
+    a0, a1, a2, a3 = _zeros_operator(lane_bytes)
+    for lane_reg in lane_regs.tolist():
+        reg = (
+            a0[reg & 0xFF]
+            ^ a1[(reg >> 8) & 0xFF]
+            ^ a2[(reg >> 16) & 0xFF]
+            ^ a3[reg >> 24]
+            ^ lane_reg
+        )
+    return _crc_register_sliced(reg, buf[num_lanes * lane_bytes :])
+
+
+def _crc_update_python(crc, data):
+    """Update CRC-32C checksum with data, without native extensions."""
+    buf = _as_buffer(data)
+    reg = crc ^ _MASK
+    if len(buf) >= _NUMPY_MIN_BYTES:
+        reg = _crc_register_numpy(reg, buf)
+    else:
+        reg = _crc_register_sliced(reg, buf)
+    return reg ^ _MASK
+
+
+def _crc_update_native(crc, data):
+    """Update CRC-32C checksum with data, using the `crc32c` module."""
+    return _native_crc32c.crc32c(_as_buffer(data), crc)
+
+
+# Prefer a native CRC-32C implementation when one is installed. Its
+# `crc32c(data, value)` continues from a finalized checksum, matching
+# the contract of `crc_update` below.
+try:
+    import crc32c as _native_crc32c
+
+    if not hasattr(_native_crc32c, "crc32c"):
+        raise ImportError("crc32c module lacks a crc32c function")
+    _crc_update_impl = _crc_update_native
+except ImportError:
+    _native_crc32c = None
+    _crc_update_impl = _crc_update_python
+
+
+def crc_update(crc, data):
+    """Update CRC-32C checksum with data.
+
+    Args:
+      crc: 32-bit checksum to update as long.
+      data: byte array, string or iterable over bytes.
+    Returns:
+      32-bit updated CRC-32C as long.
+    """
+    return _crc_update_impl(crc, data)
+
+
 def crc_finalize(crc):
     """Finalize CRC-32C checksum.
 
@@ -170,8 +386,29 @@ def crc32c(data):
 
 class PyRecordReader_New:
     def __init__(
-        self, filename=None, start_offset=0, compression_type=None, status=None
+        self,
+        filename=None,
+        start_offset=0,
+        compression_type=None,
+        status=None,
+        use_mmap=None,
     ):
+        """Opens a reader over the TFRecords in a file.
+
+        Args:
+          filename: Path to the TFRecord file.
+          start_offset: Byte offset at which to start reading; this should
+            be the start of a record, such as a value of `offset()`.
+          compression_type: One of `""` (no compression), `"ZLIB"` or
+            `"GZIP"`, as `str` or `bytes`. Compressed files are decompressed
+            incrementally as they are read, and `start_offset` and
+            `offset()` then refer to positions in the decompressed stream.
+          status: Unused; present for compatibility with TensorFlow.
+          use_mmap: Whether to read the file through a memory map rather
+            than through `gfile.GFile`. Memory maps are only available for
+            files on the local filesystem. The default of `None` uses them
+            wherever they are available on POSIX systems.
+        """
         if filename is None:
             raise errors.NotFoundError(
                 None, None, "No filename provided, cannot read Events"
@@ -182,27 +419,59 @@ class PyRecordReader_New:
                 None,
                 "{} does not point to valid Events file".format(filename),
             )
-        if start_offset:
-            raise errors.UnimplementedError(
-                None, None, "start offset not supported by compat reader"
-            )
-        if compression_type:
-            # TODO: Handle gzip and zlib compressed files
-            raise errors.UnimplementedError(
-                None, None, "compression not supported by compat reader"
+        if isinstance(compression_type, bytes):
+            compression_type = compression_type.decode("ascii")
+        compression_type = compression_type or ""
+        if compression_type not in _COMPRESSION_WBITS:
+            raise errors.InvalidArgumentError(
+                None,
+                None,
+                "Unsupported compression type: {}".format(compression_type),
             )
         self.filename = filename
         self.start_offset = start_offset
         self.compression_type = compression_type
         self.status = status
         self.curr_event = None
-        self.file_handle = gfile.GFile(self.filename, "rb")
+        is_local = isinstance(
+            gfile.get_filesystem(filename), gfile.LocalFileSystem
+        )
+        if use_mmap is None:
+            use_mmap = is_local and os.name == "posix" and not compression_type
+        elif use_mmap and not is_local:
+            raise errors.UnimplementedError(
+                None, None, "{} is not a local file".format(filename)
+            )
+        elif use_mmap and compression_type:
+            raise errors.UnimplementedError(
+                None, None, "memory maps do not support compressed files"
+            )
+        if use_mmap:
+            self.file_handle = None
+            self._mapped_file = _MappedFile(filename)
+            self._mapped_file.pos = start_offset
+        elif compression_type:
+            self.file_handle = _DecompressingFile(
+                gfile.GFile(self.filename, "rb"),
+                _COMPRESSION_WBITS[compression_type],
+            )
+            self.file_handle.skip(start_offset)
+            self._mapped_file = None
+        else:
+            self.file_handle = gfile.GFile(self.filename, "rb")
+            if start_offset:
+                self.file_handle.seek(start_offset)
+            self._mapped_file = None
+        # Offset of the first byte after the last complete record read.
+        self._offset = start_offset
         # Maintain a buffer of partially read records, so we can recover from
         # truncated records upon a retry.
         self._buffer = b""
         self._buffer_pos = 0
 
     def GetNext(self):
+        if self._mapped_file is not None:
+            return self._get_next_mapped()
         # Each new read should start at the beginning of any partial record.
         self._buffer_pos = 0
         # Read the header
@@ -249,9 +518,140 @@ class PyRecordReader_New:
 
         # Set the current event to be read later by record() call
         self.curr_event = event_str
+        self._offset += self._buffer_pos
         # Clear the buffered partial record since we're done reading it.
         self._buffer = b""
 
+    def GetNextBatch(self, max_records, max_bytes=None, views=False):
+        """Reads up to `max_records` records at once.
+
+        This is equivalent to calling `GetNext` and `record()` repeatedly,
+        but with less overhead per record.
+
+        Args:
+          max_records: Maximum number of records to read.
+          max_bytes: If set, stop once the records read total at least this
+            many bytes.
+          views: If true, return records as from `record_view()` rather
+            than `record()`.
+
+        Returns:
+          A list of records, which is empty at the end of the file.
+
+        Raises:
+          DataLossError: If the next record is truncated or corrupt. If
+            some records were read before it, they are returned instead,
+            and the error is raised by the next call.
+        """
+        if self._mapped_file is not None:
+            return self._get_next_batch_mapped(max_records, max_bytes, views)
+        records = []
+        num_bytes = 0
+        while len(records) < max_records:
+            try:
+                self.GetNext()
+            except errors.OutOfRangeError:
+                break
+            except errors.DataLossError:
+                if records:
+                    break
+                raise
+            record = self.curr_event
+            if not views and isinstance(record, memoryview):
+                record = record.tobytes()
+            records.append(record)
+            num_bytes += len(record)
+            if max_bytes is not None and num_bytes >= max_bytes:
+                break
+        return records
+
+    def _get_next_batch_mapped(self, max_records, max_bytes, views):
+        """Implements `GetNextBatch` by framing records directly off the map.
+
+        Records that lie wholly within the current map are framed inline;
+        anything else (growth of the file, truncation, corruption) falls
+        back to `_get_next_mapped`, which handles it.
+        """
+        self.curr_event = None
+        mapped = self._mapped_file
+        view = mapped.view
+        end = len(view)
+        unpack_from = struct.unpack_from
+        records = []
+        num_bytes = 0
+        while len(records) < max_records and (
+            max_bytes is None or num_bytes < max_bytes
+        ):
+            pos = mapped.pos
+            if pos + 12 <= end:
+                (length, length_crc) = unpack_from("<QI", view, pos)
+                data_end = pos + 12 + length
+                if data_end + 4 <= end and (
+                    masked_crc32c(view[pos : pos + 8]) == length_crc
+                ):
+                    data = view[pos + 12 : data_end]
+                    (data_crc,) = unpack_from("<I", view, data_end)
+                    if masked_crc32c(data) == data_crc:
+                        mapped.pos = data_end + 4
+                        records.append(data if views else data.tobytes())
+                        num_bytes += length
+                        continue
+            try:
+                self._get_next_mapped()
+            except errors.OutOfRangeError:
+                break
+            except errors.DataLossError:
+                if records:
+                    break
+                raise
+            record = self.curr_event
+            records.append(record if views else record.tobytes())
+            num_bytes += len(record)
+            view = mapped.view
+            end = len(view)
+        self._offset = mapped.pos
+        return records
+
+    def _get_next_mapped(self):
+        """Implements `GetNext` by framing records directly off the map.
+
+        The read position only advances past complete, valid records, so
+        a truncated record is retried from its start on the next call.
+        """
+        self.curr_event = None
+        mapped = self._mapped_file
+        pos = mapped.pos
+        if not mapped.ensure(pos + 1):
+            raise errors.OutOfRangeError(None, None, "No more events to read")
+        if not mapped.ensure(pos + 8):
+            raise self._truncation_error("header")
+        if not mapped.ensure(pos + 12):
+            raise self._truncation_error("header crc")
+        view = mapped.view
+        header_crc_calc = masked_crc32c(view[pos : pos + 8])
+        (header_len, crc_header) = struct.unpack_from("<QI", view, pos)
+        if header_crc_calc != crc_header:
+            raise errors.DataLossError(
+                None, None, "{} failed header crc32 check".format(self.filename)
+            )
+        data_start = pos + 12
+        data_end = data_start + header_len
+        if not mapped.ensure(data_end):
+            raise self._truncation_error("data")
+        if not mapped.ensure(data_end + 4):
+            raise self._truncation_error("data crc")
+        # `ensure` may have remapped the file, so refresh the view.
+        view = mapped.view
+        event_view = view[data_start:data_end]
+        (crc_event,) = struct.unpack_from("<I", view, data_end)
+        if masked_crc32c(event_view) != crc_event:
+            raise errors.DataLossError(
+                None, None, "{} failed event crc32 check".format(self.filename),
+            )
+        self.curr_event = event_view
+        mapped.pos = data_end + 4
+        self._offset = mapped.pos
+
     def _read(self, n):
         """Read up to n bytes from the underlying file, with buffering.
 
@@ -285,4 +685,142 @@ class PyRecordReader_New:
         )
 
     def record(self):
+        """Returns the current record as `bytes`."""
+        if isinstance(self.curr_event, memoryview):
+            return self.curr_event.tobytes()
+        return self.curr_event
+
+    def record_view(self):
+        """Returns the current record without copying it, if possible.
+
+        When reading through a memory map, this is a `memoryview` into the
+        map, which stays valid for as long as the caller holds it but
+        should not be retained longer than needed (e.g., beyond parsing
+        it), since it keeps the mapping alive. Otherwise, this is the
+        same `bytes` object returned by `record()`.
+        """
         return self.curr_event
+
+    def offset(self):
+        """Returns the byte offset just past the last record read."""
+        return self._offset
+
+    def close(self):
+        """Releases the underlying file."""
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+        if self.file_handle is not None:
+            self.file_handle.close()
+
+
+# zlib `wbits` for each supported compression type: a zlib header for
+# "ZLIB" and a gzip header for "GZIP", as written by TensorFlow.
+_COMPRESSION_WBITS = {
+    "": None,
+    "ZLIB": zlib.MAX_WBITS,
+    "GZIP": 16 + zlib.MAX_WBITS,
+}
+
+
+class _DecompressingFile(object):
+    """Reads the decompressed contents of a file that may still be growing.
+
+    Wraps a binary file object whose `read` returns whatever data is
+    currently available, and decompresses it incrementally; a later
+    `read` picks up any data appended in the meantime. Concatenated
+    gzip members or zlib streams are read as one stream.
+    """
+
+    # Compressed bytes to read from the underlying file at a time.
+    _CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, f, wbits):
+        self._file = f
+        self._wbits = wbits
+        self._decompressor = zlib.decompressobj(wbits)
+        self._buffer = bytearray()
+        self._skip = 0
+
+    def skip(self, n):
+        """Discards the next `n` decompressed bytes, as they become available."""
+        self._skip += n
+
+    def read(self, n):
+        """Reads up to `n` decompressed bytes."""
+        while self._skip or len(self._buffer) < n:
+            if self._skip:
+                skipped = min(self._skip, len(self._buffer))
+                del self._buffer[:skipped]
+                self._skip -= skipped
+                if self._skip == 0:
+                    continue
+            if not self._fill():
+                break
+        if self._skip:
+            return b""
+        result = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return result
+
+    def _fill(self):
+        """Decompresses another chunk; returns whether any was available."""
+        chunk = self._file.read(self._CHUNK_SIZE)
+        if not chunk:
+            return False
+        try:
+            while chunk:
+                if self._decompressor.eof:
+                    self._decompressor = zlib.decompressobj(self._wbits)
+                self._buffer += self._decompressor.decompress(chunk)
+                chunk = self._decompressor.unused_data
+        except zlib.error as e:
+            raise errors.DataLossError(
+                None, None, "failed to decompress: {}".format(e)
+            )
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+class _MappedFile(object):
+    """A read-only memory map of a local file that may still be growing."""
+
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        self._map = None
+        self.view = memoryview(b"")
+        # Offset of the next unread record.
+        self.pos = 0
+
+    def ensure(self, end):
+        """Ensures that the first `end` bytes of the file are mapped.
+
+        Remaps the file if it has grown since it was last mapped.
+
+        Returns:
+          Whether at least `end` bytes are now mapped.
+        """
+        if end <= len(self.view):
+            return True
+        size = os.fstat(self._file.fileno()).st_size
+        if size > len(self.view):
+            # Views handed out by earlier calls may still reference the old
+            # map, so let it close once those are released rather than
+            # closing it here.
+            self._map = mmap.mmap(
+                self._file.fileno(), size, access=mmap.ACCESS_READ
+            )
+            self.view = memoryview(self._map)
+        return end <= len(self.view)
+
+    def close(self):
+        self._file.close()
+        self._map = None
+        self.view = memoryview(b"")
+
+    def __del__(self):
+        # Readers are commonly dropped without an explicit `close()`.
+        f = getattr(self, "_file", None)
+        if f is not None:
+            f.close()
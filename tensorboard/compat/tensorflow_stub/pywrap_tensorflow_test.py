@@ -0,0 +1,306 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import array
+import os
+import random
+import struct
+import zlib
+
+from tensorboard import test as tb_test
+from tensorboard.compat.tensorflow_stub import errors
+from tensorboard.compat.tensorflow_stub import pywrap_tensorflow
+
+
+def _random_bytes(rng, n):
+    return bytes(bytearray(rng.getrandbits(8) for _ in range(n)))
+
+
+def _encode_record(data):
+    header = struct.pack("<Q", len(data))
+    return b"".join(
+        [
+            header,
+            struct.pack("<I", pywrap_tensorflow.masked_crc32c(header)),
+            data,
+            struct.pack("<I", pywrap_tensorflow.masked_crc32c(data)),
+        ]
+    )
+
+
+class Crc32cTest(tb_test.TestCase):
+    def test_known_values(self):
+        # Check values from RFC 3720, section B.4.
+        self.assertEqual(pywrap_tensorflow.crc32c(b""), 0)
+        self.assertEqual(pywrap_tensorflow.crc32c(b"123456789"), 0xE3069283)
+        self.assertEqual(pywrap_tensorflow.crc32c(b"\x00" * 32), 0x8A9136AA)
+        self.assertEqual(pywrap_tensorflow.crc32c(b"\xff" * 32), 0x62A8AB43)
+        self.assertEqual(
+            pywrap_tensorflow.crc32c(bytes(bytearray(range(32)))), 0x46DD794E
+        )
+
+    def test_python_engine_matches_bytewise(self):
+        rng = random.Random(0)
+        lengths = [0, 1, 7, 8, 9, 63, 64, 1000]
+        lengths += [
+            pywrap_tensorflow._NUMPY_MIN_BYTES - 1,
+            pywrap_tensorflow._NUMPY_MIN_BYTES,
+            3 * pywrap_tensorflow._NUMPY_MIN_BYTES + 13,
+        ]
+        for length in lengths:
+            data = _random_bytes(rng, length)
+            for crc in (0, 0xDEADBEEF):
+                self.assertEqual(
+                    pywrap_tensorflow._crc_update_python(crc, data),
+                    pywrap_tensorflow._crc_update_bytewise(crc, data),
+                    "length %d, initial crc %#x" % (length, crc),
+                )
+
+    def test_update_continues_checksum(self):
+        data = _random_bytes(random.Random(1), 50000)
+        whole = pywrap_tensorflow.crc32c(data)
+        for split in (0, 5, 17, 20000, len(data)):
+            partial = pywrap_tensorflow.crc_update(0, data[:split])
+            self.assertEqual(
+                pywrap_tensorflow.crc_update(partial, data[split:]), whole
+            )
+
+    def test_accepts_buffer_types(self):
+        data = b"hello world"
+        expected = pywrap_tensorflow._crc_update_bytewise(0, data)
+        for value in (
+            data,
+            bytearray(data),
+            memoryview(data),
+            array.array("B", data),
+            list(bytearray(data)),
+        ):
+            self.assertEqual(pywrap_tensorflow.crc32c(value), expected)
+
+    def test_native_engine_matches_python(self):
+        if pywrap_tensorflow._native_crc32c is None:
+            self.skipTest("crc32c module not installed")
+        data = _random_bytes(random.Random(2), 70000)
+        self.assertEqual(
+            pywrap_tensorflow._crc_update_native(123, data),
+            pywrap_tensorflow._crc_update_python(123, data),
+        )
+
+
+class PyRecordReaderTest(tb_test.TestCase):
+    def _path(self):
+        return os.path.join(self.get_temp_dir(), "records")
+
+    def _append(self, data):
+        with open(self._path(), "ab") as f:
+            f.write(data)
+
+    def _read_all(self, reader):
+        records = []
+        while True:
+            try:
+                reader.GetNext()
+            except errors.OutOfRangeError:
+                return records
+            records.append(reader.record())
+
+    def _test_growing_file(self, use_mmap):
+        self._append(b"")
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), use_mmap=use_mmap
+        )
+        self.assertEqual(self._read_all(reader), [])
+        self._append(_encode_record(b"one") + _encode_record(b""))
+        self.assertEqual(self._read_all(reader), [b"one", b""])
+        record = _encode_record(b"three" * 1000)
+        # Write the record in pieces that end in each section of it.
+        split_points = [0, 3, 10, 15, len(record) - 1, len(record)]
+        for (start, end) in zip(split_points[:-2], split_points[1:-1]):
+            self._append(record[start:end])
+            with self.assertRaisesRegex(errors.DataLossError, "truncated"):
+                reader.GetNext()
+        self._append(record[split_points[-2] :])
+        self.assertEqual(self._read_all(reader), [b"three" * 1000])
+        reader.close()
+
+    def test_growing_file_mmap(self):
+        self._test_growing_file(use_mmap=True)
+
+    def test_growing_file_gfile(self):
+        self._test_growing_file(use_mmap=False)
+
+    def test_mmap_record_view(self):
+        self._append(_encode_record(b"foo") + _encode_record(b"bar"))
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), use_mmap=True
+        )
+        reader.GetNext()
+        first = reader.record_view()
+        self.assertIsInstance(first, memoryview)
+        self.assertIsInstance(reader.record(), bytes)
+        # Remapping after growth must not invalidate outstanding views.
+        self._append(_encode_record(b"baz"))
+        self.assertEqual(self._read_all(reader), [b"bar", b"baz"])
+        self.assertEqual(first.tobytes(), b"foo")
+        reader.close()
+
+    def _test_get_next_batch(self, use_mmap):
+        records = [b"a" * 10, b"b" * 10, b"c" * 10, b"d" * 10]
+        self._append(b"".join(_encode_record(r) for r in records))
+        self._append(_encode_record(b"truncated")[:-1])
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), use_mmap=use_mmap
+        )
+        self.assertEqual(reader.GetNextBatch(2), records[:2])
+        self.assertEqual(reader.GetNextBatch(10, max_bytes=5), records[2:3])
+        # The truncated record ends the batch; the next call reports it.
+        self.assertEqual(reader.GetNextBatch(10), records[3:])
+        with self.assertRaisesRegex(errors.DataLossError, "truncated"):
+            reader.GetNextBatch(10)
+        self._append(_encode_record(b"truncated")[-1:])
+        self.assertEqual(reader.GetNextBatch(10), [b"truncated"])
+        self.assertEqual(reader.GetNextBatch(10), [])
+        reader.close()
+
+    def test_get_next_batch_mmap(self):
+        self._test_get_next_batch(use_mmap=True)
+
+    def test_get_next_batch_gfile(self):
+        self._test_get_next_batch(use_mmap=False)
+
+    def test_get_next_batch_views(self):
+        self._append(_encode_record(b"foo"))
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), use_mmap=True
+        )
+        [view] = reader.GetNextBatch(10, views=True)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tobytes(), b"foo")
+        reader.close()
+
+    def _test_start_offset(self, use_mmap):
+        first = _encode_record(b"first")
+        self._append(first + _encode_record(b"second"))
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), start_offset=len(first), use_mmap=use_mmap
+        )
+        self.assertEqual(reader.offset(), len(first))
+        self.assertEqual(self._read_all(reader), [b"second"])
+        self.assertEqual(reader.offset(), os.path.getsize(self._path()))
+        self._append(b"\x00")  # truncated record does not advance offset
+        with self.assertRaises(errors.DataLossError):
+            reader.GetNext()
+        self.assertEqual(reader.offset(), os.path.getsize(self._path()) - 1)
+        reader.close()
+
+    def test_start_offset_mmap(self):
+        self._test_start_offset(use_mmap=True)
+
+    def test_start_offset_gfile(self):
+        self._test_start_offset(use_mmap=False)
+
+    def _compressor(self, compression_type):
+        wbits = {"ZLIB": zlib.MAX_WBITS, "GZIP": 16 + zlib.MAX_WBITS}
+        return zlib.compressobj(9, zlib.DEFLATED, wbits[compression_type])
+
+    def _test_compressed_growing_file(self, compression_type):
+        compressor = self._compressor(compression_type)
+        self._append(b"")
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), compression_type=compression_type
+        )
+        self.assertEqual(self._read_all(reader), [])
+        self._append(compressor.compress(_encode_record(b"one")))
+        self._append(compressor.flush(zlib.Z_SYNC_FLUSH))
+        self.assertEqual(self._read_all(reader), [b"one"])
+        record = _encode_record(b"two" * 1000)
+        self._append(compressor.compress(record[:20]))
+        self._append(compressor.flush(zlib.Z_SYNC_FLUSH))
+        with self.assertRaisesRegex(errors.DataLossError, "truncated"):
+            reader.GetNext()
+        self._append(compressor.compress(record[20:]))
+        self._append(compressor.flush())
+        self.assertEqual(self._read_all(reader), [b"two" * 1000])
+        self.assertEqual(
+            reader.offset(), len(_encode_record(b"one")) + len(record)
+        )
+        reader.close()
+
+    def test_zlib_growing_file(self):
+        self._test_compressed_growing_file("ZLIB")
+
+    def test_gzip_growing_file(self):
+        self._test_compressed_growing_file("GZIP")
+
+    def test_gzip_concatenated_members(self):
+        records = [_encode_record(b"first"), _encode_record(b"second")]
+        for record in records:
+            compressor = self._compressor("GZIP")
+            self._append(compressor.compress(record) + compressor.flush())
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), compression_type=b"GZIP"
+        )
+        self.assertEqual(self._read_all(reader), [b"first", b"second"])
+        reader.close()
+
+    def test_compressed_start_offset(self):
+        first = _encode_record(b"first")
+        compressor = self._compressor("ZLIB")
+        self._append(compressor.compress(first + _encode_record(b"second")))
+        self._append(compressor.flush())
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), start_offset=len(first), compression_type="ZLIB"
+        )
+        self.assertEqual(self._read_all(reader), [b"second"])
+        reader.close()
+
+    def test_compressed_corrupt_data(self):
+        self._append(b"\x78\x9c" + b"\xff" * 20)
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), compression_type="ZLIB"
+        )
+        with self.assertRaisesRegex(errors.DataLossError, "decompress"):
+            reader.GetNext()
+        reader.close()
+
+    def test_unsupported_compression(self):
+        self._append(b"")
+        with self.assertRaises(errors.InvalidArgumentError):
+            pywrap_tensorflow.PyRecordReader_New(
+                self._path(), compression_type="LZ4"
+            )
+        with self.assertRaises(errors.UnimplementedError):
+            pywrap_tensorflow.PyRecordReader_New(
+                self._path(), compression_type="GZIP", use_mmap=True
+            )
+
+    def test_mmap_corrupt_record(self):
+        record = bytearray(_encode_record(b"data"))
+        record[-1] ^= 0xFF
+        self._append(bytes(record))
+        reader = pywrap_tensorflow.PyRecordReader_New(
+            self._path(), use_mmap=True
+        )
+        with self.assertRaisesRegex(errors.DataLossError, "crc32"):
+            reader.GetNext()
+        reader.close()
+
+
+if __name__ == "__main__":
+    tb_test.main()
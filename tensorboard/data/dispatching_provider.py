@@ -108,8 +108,10 @@ class DispatchingDataProvider(provider.DataProvider):
     list_runs = _simple_delegate(lambda p: p.list_runs)
     list_scalars = _simple_delegate(lambda p: p.list_scalars)
     read_scalars = _simple_delegate(lambda p: p.read_scalars)
+    read_scalars_since = _simple_delegate(lambda p: p.read_scalars_since)
     list_tensors = _simple_delegate(lambda p: p.list_tensors)
     read_tensors = _simple_delegate(lambda p: p.read_tensors)
+    read_tensors_since = _simple_delegate(lambda p: p.read_tensors_since)
     list_blob_sequences = _simple_delegate(lambda p: p.list_blob_sequences)
 
     def read_blob_sequences(self, *args, experiment_id, **kwargs):
@@ -255,6 +255,27 @@ class DispatchingDataProviderTest(tb_test.TestCase):
         self.assertNotEmpty(expected_reading)
         self.assertEqual(reading, expected_reading)
 
+        # Without incremental reads, updates hold whole time series.
+        updates = self.with_unpfx.read_scalars_since(
+            _ctx(),
+            experiment_id="foo:123",
+            plugin_name="scalars",
+            downsample=1000,
+            cursors={"123/train": {"loss.scalars": "hmm"}},
+        )
+        self.assertEqual(
+            updates,
+            {
+                "123/train": {
+                    "loss.scalars": provider.TimeSeriesUpdate(
+                        data=expected_reading["123/train"]["loss.scalars"],
+                        cursor=None,
+                        incremental=False,
+                    )
+                }
+            },
+        )
+
     def _get_blobs(self, data_provider, experiment_id):
         """Read and fetch all blobs for an experiment."""
         reading = data_provider.read_blob_sequences(
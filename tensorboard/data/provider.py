@@ -211,7 +211,9 @@ class DataProvider(object):
         experiment_id,
         plugin_name,
         downsample=None,
-        run_tag_filter=None
+        run_tag_filter=None,
+        step_range=None,
+        wall_time_range=None
     ):
         """Read values from scalar time series.
 
@@ -227,6 +229,13 @@ class DataProvider(object):
             series will only be included in the result if its run and tag
             both pass this filter. If `None`, all time series will be
             included.
+          step_range: Optional `(min_step, max_step)` pair. If provided,
+            only points with `min_step <= step <= max_step` will be
+            included, and downsampling applies to those points only, so
+            that narrow ranges are read at full resolution. Either bound
+            may be `None`, for no limit.
+          wall_time_range: Optional `(min_wall_time, max_wall_time)` pair,
+            which restricts wall times like `step_range` restricts steps.
 
         The result will only contain keys for run-tag combinations that
         actually exist, which may not include all entries in the
@@ -241,6 +250,51 @@ class DataProvider(object):
         """
         pass
 
+    def read_scalars_since(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        cursors=None
+    ):
+        """Read the values of scalar time series added since cursors.
+
+        This lets clients that poll for new data avoid reading whole time
+        series again. The default implementation reads them in full, like
+        `read_scalars`, and hands out no cursors.
+
+        Args:
+          ctx: A TensorBoard `RequestContext` value.
+          experiment_id: ID of enclosing experiment.
+          plugin_name: String name of the TensorBoard plugin that created
+            the data to be queried. Required.
+          downsample: Integer number of steps to which to downsample the
+            results, or the data added since a cursor. Required.
+          run_tag_filter: Optional `RunTagFilter` value; see `read_scalars`.
+          cursors: Optional nested map `c` such that `c[run][tag]` is the
+            `cursor` of a `TimeSeriesUpdate` previously returned for that
+            time series. Time series without a cursor are read in full.
+
+        Returns:
+          A nested map `d` such that `d[run][tag]` is a `TimeSeriesUpdate`
+          whose `data` is a list of `ScalarDatum` values.
+
+        Raises:
+          tensorboard.errors.PublicError: See `DataProvider` class docstring.
+        """
+        return _full_updates(
+            self.read_scalars(
+                ctx,
+                experiment_id=experiment_id,
+                plugin_name=plugin_name,
+                downsample=downsample,
+                run_tag_filter=run_tag_filter,
+            )
+        )
+
     def list_tensors(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
     ):
@@ -274,7 +328,9 @@ class DataProvider(object):
         experiment_id,
         plugin_name,
         downsample=None,
-        run_tag_filter=None
+        run_tag_filter=None,
+        step_range=None,
+        wall_time_range=None
     ):
         """Read values from tensor time series.
 
@@ -290,6 +346,13 @@ class DataProvider(object):
             series will only be included in the result if its run and tag
             both pass this filter. If `None`, all time series will be
             included.
+          step_range: Optional `(min_step, max_step)` pair. If provided,
+            only points with `min_step <= step <= max_step` will be
+            included, and downsampling applies to those points only, so
+            that narrow ranges are read at full resolution. Either bound
+            may be `None`, for no limit.
+          wall_time_range: Optional `(min_wall_time, max_wall_time)` pair,
+            which restricts wall times like `step_range` restricts steps.
 
         The result will only contain keys for run-tag combinations that
         actually exist, which may not include all entries in the
@@ -304,6 +367,47 @@ class DataProvider(object):
         """
         pass
 
+    def read_tensors_since(
+        self,
+        ctx=None,
+        *,
+        experiment_id,
+        plugin_name,
+        downsample=None,
+        run_tag_filter=None,
+        cursors=None
+    ):
+        """Read the values of tensor time series added since cursors.
+
+        Like `read_scalars_since`, for tensor time series.
+
+        Args:
+          ctx: A TensorBoard `RequestContext` value.
+          experiment_id: ID of enclosing experiment.
+          plugin_name: String name of the TensorBoard plugin that created
+            the data to be queried. Required.
+          downsample: Integer number of steps to which to downsample the
+            results, or the data added since a cursor. Required.
+          run_tag_filter: Optional `RunTagFilter` value; see `read_tensors`.
+          cursors: Optional nested map of cursors; see `read_scalars_since`.
+
+        Returns:
+          A nested map `d` such that `d[run][tag]` is a `TimeSeriesUpdate`
+          whose `data` is a list of `TensorDatum` values.
+
+        Raises:
+          tensorboard.errors.PublicError: See `DataProvider` class docstring.
+        """
+        return _full_updates(
+            self.read_tensors(
+                ctx,
+                experiment_id=experiment_id,
+                plugin_name=plugin_name,
+                downsample=downsample,
+                run_tag_filter=run_tag_filter,
+            )
+        )
+
     def list_blob_sequences(
         self, ctx=None, *, experiment_id, plugin_name, run_tag_filter=None
     ):
@@ -622,6 +726,79 @@ class ScalarDatum(object):
         )
 
 
+class TimeSeriesUpdate(object):
+    """The data of a time series since a cursor, as read by a client.
+
+    A cursor stands for the data of a time series read so far. While a
+    time series is only appended to, or has its latest datum replaced,
+    an update is *incremental*: its data replaces the latest datum that
+    the cursor stands for, if any, and follows the data read before it.
+    Otherwise, the update holds the data of the whole time series, as if
+    read without a cursor.
+
+    Attributes:
+      data: A list of data of the time series, like `ScalarDatum` or
+        `TensorDatum` values.
+      cursor: An opaque text string standing for the data read up to and
+        including this update, to pass to the next read, or `None` if the
+        data provider does not support incremental reads of the series.
+      incremental: Whether `data` follows the data read before, as above.
+    """
+
+    __slots__ = ("_data", "_cursor", "_incremental")
+
+    def __init__(self, data, cursor, incremental):
+        self._data = data
+        self._cursor = cursor
+        self._incremental = incremental
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    @property
+    def incremental(self):
+        return self._incremental
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeSeriesUpdate):
+            return False
+        if self._data != other._data:
+            return False
+        if self._cursor != other._cursor:
+            return False
+        if self._incremental != other._incremental:
+            return False
+        return True
+
+    # Unhashable type: the data is a mutable list.
+    __hash__ = None
+
+    def __repr__(self):
+        return "TimeSeriesUpdate(%s)" % ", ".join(
+            (
+                "data=%r" % (self._data,),
+                "cursor=%r" % (self._cursor,),
+                "incremental=%r" % (self._incremental,),
+            )
+        )
+
+
+def _full_updates(run_to_tag_to_data):
+    """Wraps the data of whole time series as non-incremental updates."""
+    return {
+        run: {
+            tag: TimeSeriesUpdate(data=data, cursor=None, incremental=False)
+            for (tag, data) in six.iteritems(tag_to_data)
+        }
+        for (run, tag_to_data) in six.iteritems(run_to_tag_to_data)
+    }
+
+
 class TensorTimeSeries(_TimeSeries):
     """Metadata about a tensor time series for a particular run and tag.
 
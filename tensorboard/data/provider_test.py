@@ -224,6 +224,32 @@ class TensorDatumTest(tb_test.TestCase):
             hash(x)
 
 
+class TimeSeriesUpdateTest(tb_test.TestCase):
+    def _update(self, step=1, cursor="abc", incremental=True):
+        datum = provider.ScalarDatum(step=step, wall_time=0.5, value=2.0)
+        return provider.TimeSeriesUpdate(
+            data=[datum], cursor=cursor, incremental=incremental
+        )
+
+    def test_repr(self):
+        x = self._update()
+        repr_ = repr(x)
+        self.assertIn(repr(x.data), repr_)
+        self.assertIn(repr(x.cursor), repr_)
+        self.assertIn(repr(x.incremental), repr_)
+
+    def test_eq(self):
+        self.assertEqual(self._update(), self._update())
+        self.assertNotEqual(self._update(), self._update(step=2))
+        self.assertNotEqual(self._update(), self._update(cursor=None))
+        self.assertNotEqual(self._update(), self._update(incremental=False))
+        self.assertNotEqual(self._update(), object())
+
+    def test_hash(self):
+        with six.assertRaisesRegex(self, TypeError, "unhashable type"):
+            hash(self._update())
+
+
 class BlobSequenceTimeSeriesTest(tb_test.TestCase):
     def _blob_sequence_time_series(
         self,
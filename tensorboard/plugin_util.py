@@ -28,6 +28,7 @@ import markdown
 import six
 
 from tensorboard import context as _context
+from tensorboard import errors
 from tensorboard.backend import experiment_id as _experiment_id
 
 
@@ -175,3 +176,73 @@ def experiment_id(environ):
       A experiment ID, as a possibly-empty `str`.
     """
     return environ.get(_experiment_id.WSGI_ENVIRON_KEY, "")
+
+
+def ranges(args):
+    """Parse the step and wall time range query parameters of a request.
+
+    The optional query parameters `min_step`, `max_step`, `min_wall_time`
+    and `max_wall_time` give inclusive bounds on the steps and wall times
+    of the data to read.
+
+    Args:
+      args: The query parameters of a request, as a mapping from name to
+        string value. For a Werkzeug request, this is `request.args`.
+
+    Returns:
+      A `(step_range, wall_time_range)` pair, to be passed to
+      `DataProvider.read_scalars` or `DataProvider.read_tensors`. Each
+      range is `None` if neither of its bounds is given.
+
+    Raises:
+      errors.InvalidArgumentError: If a bound is not a number.
+    """
+
+    def parse(name, convert):
+        value = args.get(name)
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except ValueError:
+            raise errors.InvalidArgumentError(
+                "%s must be a number, but got %r" % (name, value)
+            )
+
+    step_range = (parse("min_step", int), parse("max_step", int))
+    wall_time_range = (
+        parse("min_wall_time", float),
+        parse("max_wall_time", float),
+    )
+    if step_range == (None, None):
+        step_range = None
+    if wall_time_range == (None, None):
+        wall_time_range = None
+    return (step_range, wall_time_range)
+
+
+def since(args):
+    """Parse the `since` query parameter of a request.
+
+    A request with `since` asks for the data of a time series added since
+    the read that returned that cursor, as by
+    `DataProvider.read_scalars_since`. An empty value asks for all data,
+    along with a cursor for the next read.
+
+    Args:
+      args: The query parameters of a request; see `ranges`.
+
+    Returns:
+      The cursor, as a possibly-empty `str`, or `None` if `since` is not
+      given.
+
+    Raises:
+      errors.InvalidArgumentError: If `since` is given along with a step
+        or wall time range, which incremental reads do not support.
+    """
+    cursor = args.get("since")
+    if cursor is not None and ranges(args) != (None, None):
+        raise errors.InvalidArgumentError(
+            "since cannot be combined with step or wall time ranges"
+        )
+    return cursor
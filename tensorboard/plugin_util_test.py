@@ -21,6 +21,7 @@ import textwrap
 import six
 
 from tensorboard import context
+from tensorboard import errors
 from tensorboard import plugin_util
 from tensorboard import test as tb_test
 from tensorboard.backend import experiment_id
@@ -188,5 +189,35 @@ class ExperimentIdTest(tb_test.TestCase):
         self.assertEqual(plugin_util.experiment_id(environ), "123")
 
 
+class RangesTest(tb_test.TestCase):
+    """Tests for `plugin_util.ranges`."""
+
+    def test_none(self):
+        self.assertEqual(plugin_util.ranges({}), (None, None))
+
+    def test_present(self):
+        args = {"min_step": "10", "max_wall_time": "123.5"}
+        self.assertEqual(plugin_util.ranges(args), ((10, None), (None, 123.5)))
+
+    def test_malformed(self):
+        with self.assertRaises(errors.InvalidArgumentError):
+            plugin_util.ranges({"max_step": "1.5"})
+
+
+class SinceTest(tb_test.TestCase):
+    """Tests for `plugin_util.since`."""
+
+    def test_none(self):
+        self.assertIsNone(plugin_util.since({}))
+
+    def test_present(self):
+        self.assertEqual(plugin_util.since({"since": "12.34"}), "12.34")
+        self.assertEqual(plugin_util.since({"since": ""}), "")
+
+    def test_with_range(self):
+        with self.assertRaises(errors.InvalidArgumentError):
+            plugin_util.since({"since": "12.34", "min_step": "10"})
+
+
 if __name__ == "__main__":
     tb_test.main()
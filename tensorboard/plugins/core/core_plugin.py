@@ -21,6 +21,7 @@ from __future__ import print_function
 import functools
 import gzip
 import mimetypes
+import re
 import zipfile
 
 import six
@@ -77,6 +78,7 @@ class CorePlugin(base_plugin.TBPlugin):
             "/data/runs": self._serve_runs,
             "/data/experiments": self._serve_experiments,
             "/data/experiment_runs": self._serve_experiment_runs,
+            "/data/ingestion_stats": self._serve_ingestion_stats,
             "/data/window_properties": self._serve_window_properties,
             "/events": self._redirect_to_index,
             "/favicon.ico": self._send_404_without_logging,
@@ -165,6 +167,30 @@ class CorePlugin(base_plugin.TBPlugin):
             request, {"logdir": self._logdir}, "application/json"
         )
 
+    @wrappers.Request.application
+    def _serve_ingestion_stats(self, request):
+        """Serve counters describing the ingestion of each run.
+
+        The counters are served as JSON, or in the Prometheus text format
+        if the `format` query parameter is "prometheus". Responds with a
+        404 if this TensorBoard does not ingest data from a logdir.
+        """
+        stats = None
+        if self._multiplexer is not None:
+            stats = self._multiplexer.IngestionStats()
+        if stats is None:
+            return http_util.Respond(
+                request,
+                "Ingestion statistics are not available",
+                "text/plain",
+                code=404,
+            )
+        if request.args.get("format") == "prometheus":
+            return http_util.Respond(
+                request, stats.AsPrometheusText(), "text/plain; version=0.0.4",
+            )
+        return http_util.Respond(request, stats.AsDict(), "application/json")
+
     @wrappers.Request.application
     def _serve_window_properties(self, request):
         """Serve a JSON object containing this TensorBoard's window
@@ -435,6 +461,20 @@ relevant for db read-only mode. Each thread reloads one run at a time.
 """,
         )
 
+        parser.add_argument(
+            "--max_walk_threads",
+            metavar="COUNT",
+            type=int,
+            default=1,
+            help="""\
+[experimental] The max number of directories that TensorBoard lists at
+once when searching the logdir for runs. If greater than 1, runs are
+added as they are found, and logdirs on GCS or S3 are searched by
+listing directories rather than by globbing, which takes one request
+per entry. (default: %(default)s)\
+""",
+        )
+
         parser.add_argument(
             "--reload_interval",
             metavar="SECONDS",
@@ -480,6 +520,36 @@ of running out of memory if the logdir contains many active event files.
 """,
         )
 
+        parser.add_argument(
+            "--reload_on_change",
+            metavar="BOOL",
+            # Custom str-to-bool converter since regular bool() doesn't work.
+            type=lambda v: {"true": True, "false": False}.get(v.lower(), v),
+            choices=[True, False],
+            default=False,
+            help="""\
+[experimental] If true, local run directories are watched for changes with
+inotify (on Linux), and only runs whose directories changed are reloaded.
+Between the reloads every --reload_interval, runs that change are reloaded
+as the changes are seen, and the logdir is walked for new runs only when
+directories or event files are added to it. Remote directories, and any
+that cannot be watched, are polled as usual. (default: false)\
+""",
+        )
+
+        parser.add_argument(
+            "--max_reload_backoff",
+            metavar="COUNT",
+            type=int,
+            default=0,
+            help="""\
+[experimental] If positive, runs that had no new data when last reloaded
+are skipped for a number of reload cycles that doubles after each such
+reload, up to this many. Runs with new data, and runs recently queried
+by the frontend, are reloaded on every cycle. (default: disabled)\
+""",
+        )
+
         parser.add_argument(
             "--reload_multifile_inactive_secs",
             metavar="SECONDS",
@@ -497,6 +567,90 @@ it receives new data at least once per 24 hour period)\
 """,
         )
 
+        parser.add_argument(
+            "--reader_state_file",
+            metavar="PATH",
+            type=str,
+            default="",
+            help="""\
+[experimental] Path to a local file in which to record how far each event
+file has been read. If set, a restarted TensorBoard resumes reading each
+event file where the previous one stopped rather than from the beginning.
+Data before the recorded offsets is not reloaded after a restart, so only
+data read since then is shown. (default: disabled)\
+""",
+        )
+
+        parser.add_argument(
+            "--discovery_index_file",
+            metavar="PATH",
+            type=str,
+            default="",
+            help="""\
+[experimental] Path to a local file in which to save the index of logdir
+directories used to find runs. If set, a restarted TensorBoard finds the
+runs of a large logdir without listing every unchanged directory again.
+(default: disabled)\
+""",
+        )
+
+        parser.add_argument(
+            "--ingest_cache_dir",
+            metavar="PATH",
+            type=str,
+            default="",
+            help="""\
+[experimental] Path to a local directory in which to save a snapshot of the
+data loaded for each run, along with how far each of its event files has
+been read. If set, a restarted TensorBoard restores each run from its
+snapshot and serves it immediately, only reading the events written since.
+A snapshot is not used if its event files were modified other than by
+being appended to, or if the flags controlling sampling have changed.
+Cannot be combined with --reader_state_file. (default: disabled)\
+""",
+        )
+
+        parser.add_argument(
+            "--metadata_cache_secs",
+            metavar="SECONDS",
+            type=float,
+            default=0,
+            help="""\
+[experimental] Number of seconds for which the results of filesystem
+metadata queries (existence, directory listings and file sizes) are reused,
+which saves round trips to remote filesystems. New runs and event file
+growth may be noticed up to this much later. Only applies when TensorFlow
+is not installed. (default: %(default)s, disabled)\
+""",
+        )
+
+        parser.add_argument(
+            "--load_plugins",
+            metavar="NAMES",
+            type=_parse_plugin_names,
+            default="",
+            help="""\
+[experimental] An optional comma separated list of data plugin names,
+such as "scalars,histograms". If set, only summary data for these plugins
+is loaded; events holding only other data are dropped as event files are
+read, which reduces loading time and memory use. Names are those of the
+plugins that write the data (the `plugin_name` in summary metadata), which
+may differ from dashboard names. (default: load all plugins)\
+""",
+        )
+
+        parser.add_argument(
+            "--skip_plugins",
+            metavar="NAMES",
+            type=_parse_plugin_names,
+            default="",
+            help="""\
+[experimental] An optional comma separated list of data plugin names whose
+summary data is not loaded, such as "images,audio". Takes precedence over
+--load_plugins. (default: none)\
+""",
+        )
+
         parser.add_argument(
             "--generic_data",
             metavar="TYPE",
@@ -526,6 +680,63 @@ jobs. This flag allows fine control over that downsampling. Note that 0
 means keep all samples of that type. For instance "scalars=500,images=0"
 keeps 500 scalars and all images. Most users should not need to set this
 flag.\
+""",
+        )
+
+        parser.add_argument(
+            "--bytes_per_plugin",
+            type=_parse_bytes_per_plugin,
+            default="",
+            help="""\
+[experimental] An optional comma separated list of plugin_name=size pairs
+limiting the memory used by the samples kept per tag for that plugin, in
+addition to --samples_per_plugin. Sizes are numbers of bytes, optionally
+with a suffix such as KB, MB or GB (powers of 1000) or KiB, MiB or GiB
+(powers of 1024). For instance "images=100MB,audio=1GiB". Once a limit is
+reached, older samples of the tag are evicted at random and fewer are kept.
+Scalar data is stored compactly and not limited. (default: no limits)\
+""",
+        )
+
+        parser.add_argument(
+            "--max_bytes_per_run",
+            metavar="SIZE",
+            type=_parse_byte_size,
+            default="0",
+            help="""\
+[experimental] Limit on the memory used by the non-scalar samples kept for
+each run, with the size syntax of --bytes_per_plugin. Once it is reached,
+the tags of the run holding the most bytes evict older samples. (default:
+0, no limit)\
+""",
+        )
+
+        parser.add_argument(
+            "--max_total_bytes",
+            metavar="SIZE",
+            type=_parse_byte_size,
+            default="0",
+            help="""\
+[experimental] Limit on the memory used by the non-scalar samples kept for
+all runs together, with the size syntax of --bytes_per_plugin. Once it is
+reached, the runs holding the most bytes evict older samples, so that runs
+loaded later get their share. (default: 0, no limit)\
+""",
+        )
+
+        parser.add_argument(
+            "--blobs_on_disk",
+            metavar="BOOL",
+            # Custom str-to-bool converter since regular bool() doesn't work.
+            type=lambda v: {"true": True, "false": False}.get(v.lower(), v),
+            choices=[True, False],
+            default=False,
+            help="""\
+[experimental] If true, images, audio, graphs and other binary data are not
+kept in memory: only their locations in the event files are, and they are
+read back from disk as they are requested. This greatly reduces the memory
+used for runs with many images, at the cost of a disk read per request.
+Data in compressed event files is always kept in memory. (default: false)\
 """,
         )
 
@@ -559,6 +770,11 @@ flag.\
         elif flags.host is not None and flags.bind_all:
             raise FlagsError("Must not specify both --host and --bind_all.")
 
+        if flags.ingest_cache_dir and flags.reader_state_file:
+            raise FlagsError(
+                "May not specify both --ingest_cache_dir and --reader_state_file"
+            )
+
         flags.path_prefix = flags.path_prefix.rstrip("/")
         if flags.path_prefix and not flags.path_prefix.startswith("/"):
             raise FlagsError(
@@ -587,3 +803,42 @@ def _parse_samples_per_plugin(value):
             k, v = token.strip().split("=")
             result[k] = int(v)
     return result
+
+
+_BYTE_SIZE_SUFFIXES = {
+    "": 1,
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000 ** 2,
+    "GB": 1000 ** 3,
+    "TB": 1000 ** 4,
+    "KIB": 1024,
+    "MIB": 1024 ** 2,
+    "GIB": 1024 ** 3,
+    "TIB": 1024 ** 4,
+}
+
+
+def _parse_byte_size(value):
+    """Parses `value` as a number of bytes, such as `123`, `4MB` or `2GiB`."""
+    match = re.match(r"^\s*([0-9]*\.?[0-9]+)\s*([A-Za-z]*)\s*$", value)
+    if not match or match.group(2).upper() not in _BYTE_SIZE_SUFFIXES:
+        raise ValueError("Invalid byte size: %r" % value)
+    return int(
+        float(match.group(1)) * _BYTE_SIZE_SUFFIXES[match.group(2).upper()]
+    )
+
+
+def _parse_bytes_per_plugin(value):
+    """Parses `value` as a string-to-byte-size dict, like `foo=1MB,bar=12`."""
+    result = {}
+    for token in value.split(","):
+        if token:
+            k, v = token.strip().split("=")
+            result[k] = _parse_byte_size(v)
+    return result
+
+
+def _parse_plugin_names(value):
+    """Parses `value` as a list of names in the form `foo,bar`."""
+    return [token.strip() for token in value.split(",") if token.strip()]
@@ -37,6 +37,7 @@ from werkzeug import test as werkzeug_test
 from werkzeug import wrappers
 
 from tensorboard.backend import application
+from tensorboard.backend.event_processing import ingestion_stats
 from tensorboard.backend.event_processing import (
     plugin_event_multiplexer as event_multiplexer,
 )
@@ -61,6 +62,8 @@ class FakeFlags(object):
         db="",
         path_prefix="",
         generic_data="true",
+        reader_state_file="",
+        ingest_cache_dir="",
     ):
         self.bind_all = bind_all
         self.host = host
@@ -72,6 +75,8 @@ class FakeFlags(object):
         self.db = db
         self.path_prefix = path_prefix
         self.generic_data = generic_data
+        self.reader_state_file = reader_state_file
+        self.ingest_cache_dir = ingest_cache_dir
 
 
 class CorePluginFlagsTest(tf.test.TestCase):
@@ -132,6 +137,38 @@ class CorePluginFlagsTest(tf.test.TestCase):
         self.assertIn("must start with slash", msg)
         self.assertIn(repr("noslash"), msg)
 
+    def testIngestCacheDir_excludesReaderStateFile(self):
+        loader = core_plugin.CorePluginLoader()
+        loader.fix_flags(
+            FakeFlags(logdir="/tmp", ingest_cache_dir="/tmp/cache")
+        )
+        flag = FakeFlags(
+            logdir="/tmp",
+            ingest_cache_dir="/tmp/cache",
+            reader_state_file="/tmp/state",
+        )
+        with self.assertRaises(base_plugin.FlagsError) as cm:
+            loader.fix_flags(flag)
+        self.assertIn("--ingest_cache_dir", str(cm.exception))
+
+    def testParseBytesPerPlugin(self):
+        self.assertEqual(
+            core_plugin._parse_bytes_per_plugin(
+                "images=100MB, audio=2GiB,text=1.5kb,histograms=123"
+            ),
+            {
+                "images": 100 * 1000 ** 2,
+                "audio": 2 * 1024 ** 3,
+                "text": 1500,
+                "histograms": 123,
+            },
+        )
+        self.assertEqual(core_plugin._parse_bytes_per_plugin(""), {})
+        with self.assertRaises(ValueError):
+            core_plugin._parse_bytes_per_plugin("images=100XB")
+        with self.assertRaises(ValueError):
+            core_plugin._parse_byte_size("-1")
+
 
 class CorePluginNoDataTest(tf.test.TestCase):
     def setUp(self):
@@ -371,6 +408,79 @@ class CorePluginTestBase(object):
             )
 
 
+class CorePluginIngestionStatsTest(tf.test.TestCase):
+    def setUp(self):
+        super(CorePluginIngestionStatsTest, self).setUp()
+        self.logdir = self.get_temp_dir()
+        self.multiplexer = event_multiplexer.EventMultiplexer(
+            ingestion_stats=ingestion_stats.IngestionStats()
+        )
+        context = base_plugin.TBContext(
+            assets_zip_provider=get_test_assets_zip_provider(),
+            logdir=self.logdir,
+            multiplexer=self.multiplexer,
+        )
+        self.plugin = core_plugin.CorePlugin(context)
+        app = application.TensorBoardWSGI([self.plugin])
+        self.server = werkzeug_test.Client(app, wrappers.BaseResponse)
+
+    def _add_run(self, run_name):
+        run_path = os.path.join(self.logdir, run_name)
+        with test_util.FileWriter(run_path) as writer:
+            writer.add_test_summary("foo")
+        self.multiplexer.AddRunsFromDirectory(self.logdir)
+        self.multiplexer.Reload()
+
+    def testJson(self):
+        self._add_run("run1")
+        response = self.server.get("/data/ingestion_stats")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            "application/json", response.headers.get("Content-Type")
+        )
+        stats = json.loads(response.get_data().decode("utf-8"))
+        self.assertEqual(list(stats["runs"]), ["run1"])
+        run_stats = stats["runs"]["run1"]
+        self.assertEqual(run_stats["reloads"], 1)
+        # The file version event and the summary.
+        self.assertEqual(run_stats["records_read"], 2)
+        self.assertEqual(run_stats["events_loaded"], 2)
+        self.assertGreater(run_stats["bytes_read"], 0)
+        self.assertEqual(run_stats["data_loss_errors"], 0)
+        self.assertEqual(run_stats["truncated_reads"], 0)
+        self.assertEqual(stats["cycles"]["count"], 1)
+        self.assertEqual(stats["cycles"]["last"]["runs_reloaded"], 1)
+        self.assertEqual(
+            stats["cycles"]["last"]["bytes_read"], run_stats["bytes_read"]
+        )
+
+    def testPrometheus(self):
+        self._add_run("run1")
+        response = self.server.get("/data/ingestion_stats?format=prometheus")
+        self.assertEqual(200, response.status_code)
+        self.assertStartsWith(
+            response.headers.get("Content-Type"), "text/plain; version=0.0.4"
+        )
+        lines = response.get_data().decode("utf-8").splitlines()
+        self.assertIn(
+            'tensorboard_ingestion_run_reloads_total{run="run1"} 1', lines
+        )
+        self.assertIn("tensorboard_ingestion_cycles_total 1", lines)
+
+    def testNotAvailable(self):
+        context = base_plugin.TBContext(
+            assets_zip_provider=get_test_assets_zip_provider(),
+            logdir=self.logdir,
+            multiplexer=event_multiplexer.EventMultiplexer(),
+        )
+        plugin = core_plugin.CorePlugin(context)
+        server = werkzeug_test.Client(
+            application.TensorBoardWSGI([plugin]), wrappers.BaseResponse
+        )
+        response = server.get("/data/ingestion_stats")
+        self.assertEqual(404, response.status_code)
+
+
 def get_test_assets_zip_provider():
     memfile = six.BytesIO()
     with zipfile.ZipFile(
@@ -515,9 +515,12 @@ class LocalDebuggerV2DataProvider(provider.DataProvider):
         experiment_id,
         plugin_name,
         downsample=None,
-        run_tag_filter=None
+        run_tag_filter=None,
+        step_range=None,
+        wall_time_range=None
     ):
         del experiment_id, plugin_name, downsample, run_tag_filter
+        del step_range, wall_time_range
         raise TypeError("Debugger V2 DataProvider doesn't support scalars.")
 
     def list_blob_sequences(
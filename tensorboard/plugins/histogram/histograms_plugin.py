@@ -132,11 +132,22 @@ class HistogramsPlugin(base_plugin.TBPlugin):
             element_name="tf-histogram-dashboard"
         )
 
-    def histograms_impl(self, ctx, tag, run, experiment, downsample_to=None):
+    def histograms_impl(
+        self,
+        ctx,
+        tag,
+        run,
+        experiment,
+        downsample_to=None,
+        step_range=None,
+        wall_time_range=None,
+    ):
         """Result of the form `(body, mime_type)`.
 
         At most `downsample_to` events will be returned. If this value is
-        `None`, then default downsampling will be performed.
+        `None`, then default downsampling will be performed. Only events
+        within the optional `step_range` and `wall_time_range`, as accepted
+        by `DataProvider.read_tensors`, are considered.
 
         Raises:
           tensorboard.errors.PublicError: On invalid request.
@@ -153,6 +164,8 @@ class HistogramsPlugin(base_plugin.TBPlugin):
                 plugin_name=metadata.PLUGIN_NAME,
                 downsample=sample_count,
                 run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+                step_range=step_range,
+                wall_time_range=wall_time_range,
             )
             histograms = all_histograms.get(run, {}).get(tag, None)
             if histograms is None:
@@ -176,6 +189,12 @@ class HistogramsPlugin(base_plugin.TBPlugin):
                 raise errors.NotFoundError(
                     "No histogram tag %r for run %r" % (tag, run)
                 )
+            tensor_events = [
+                e
+                for e in tensor_events
+                if _in_range(e.step, step_range)
+                and _in_range(e.wall_time, wall_time_range)
+            ]
             if downsample_to is not None:
                 rng = random.Random(0)
                 tensor_events = _downsample(rng, tensor_events, downsample_to)
@@ -189,6 +208,55 @@ class HistogramsPlugin(base_plugin.TBPlugin):
             ]
         return (events, "application/json")
 
+    def histograms_since_impl(
+        self, ctx, tag, run, experiment, since, downsample_to=None
+    ):
+        """Result of the form `(body, mime_type)`, for a read since a cursor.
+
+        The body holds the `data`, in the format of `histograms_impl`, the
+        `cursor` for the next read, and whether the read is `incremental`;
+        see `DataProvider.read_tensors_since`. At most `downsample_to`
+        events are returned per read. Without a data provider, all events
+        are returned, with no cursor.
+
+        Raises:
+          tensorboard.errors.PublicError: On invalid request.
+        """
+        if not self._data_provider:
+            (events, mime_type) = self.histograms_impl(
+                ctx, tag, run, experiment, downsample_to=downsample_to
+            )
+            body = {"data": events, "cursor": None, "incremental": False}
+            return (body, mime_type)
+        sample_count = (
+            downsample_to if downsample_to is not None else self._downsample_to
+        )
+        all_updates = self._data_provider.read_tensors_since(
+            ctx,
+            experiment_id=experiment,
+            plugin_name=metadata.PLUGIN_NAME,
+            downsample=sample_count,
+            run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+            cursors={run: {tag: since}},
+        )
+        update = all_updates.get(run, {}).get(tag, None)
+        if update is None:
+            raise errors.NotFoundError(
+                "No histogram tag %r for run %r" % (tag, run)
+            )
+        histograms = update.data
+        if downsample_to is not None:
+            rng = random.Random(0)
+            histograms = _downsample(rng, histograms, downsample_to)
+        body = {
+            "data": [
+                (e.wall_time, e.step, e.numpy.tolist()) for e in histograms
+            ],
+            "cursor": update.cursor,
+            "incremental": update.incremental,
+        }
+        return (body, "application/json")
+
     @wrappers.Request.application
     def tags_route(self, request):
         ctx = plugin_util.context(request.environ)
@@ -203,8 +271,26 @@ class HistogramsPlugin(base_plugin.TBPlugin):
         experiment = plugin_util.experiment_id(request.environ)
         tag = request.args.get("tag")
         run = request.args.get("run")
+        since = plugin_util.since(request.args)
+        if since is not None:
+            (body, mime_type) = self.histograms_since_impl(
+                ctx,
+                tag,
+                run,
+                experiment,
+                since,
+                downsample_to=self.SAMPLE_SIZE,
+            )
+            return http_util.Respond(request, body, mime_type)
+        (step_range, wall_time_range) = plugin_util.ranges(request.args)
         (body, mime_type) = self.histograms_impl(
-            ctx, tag, run, experiment=experiment, downsample_to=self.SAMPLE_SIZE
+            ctx,
+            tag,
+            run,
+            experiment=experiment,
+            downsample_to=self.SAMPLE_SIZE,
+            step_range=step_range,
+            wall_time_range=wall_time_range,
         )
         return http_util.Respond(request, body, mime_type)
 
@@ -233,3 +319,11 @@ def _downsample(rng, xs, k):
     indices = rng.sample(six.moves.xrange(len(xs)), k)
     indices.sort()
     return [xs[i] for i in indices]
+
+
+def _in_range(value, bounds):
+    """Whether `value` is within an optional inclusive `(min, max)` pair."""
+    if bounds is None:
+        return True
+    (low, high) = bounds
+    return (low is None or value >= low) and (high is None or value <= high)
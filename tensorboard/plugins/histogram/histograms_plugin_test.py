@@ -238,6 +238,42 @@ class HistogramsPluginTest(tf.test.TestCase):
                 sum(bucket[2] for bucket in buckets),
             )
 
+    @with_runs([_RUN_WITH_HISTOGRAM])
+    def test_histograms_with_step_range(self, plugin):
+        (data, _) = plugin.histograms_impl(
+            context.RequestContext(),
+            "%s/histogram_summary" % self._HISTOGRAM_TAG,
+            self._RUN_WITH_HISTOGRAM,
+            experiment="exp",
+            downsample_to=50,
+            step_range=(10, 19),
+        )
+        self.assertEqual([step for (_, step, _) in data], list(range(10, 20)))
+
+    @with_runs([_RUN_WITH_HISTOGRAM])
+    def test_histograms_since(self, plugin):
+        args = (
+            context.RequestContext(),
+            "%s/histogram_summary" % self._HISTOGRAM_TAG,
+            self._RUN_WITH_HISTOGRAM,
+            "exp",
+        )
+        (body, _) = plugin.histograms_since_impl(
+            *args, since="", downsample_to=50
+        )
+        self.assertFalse(body["incremental"])
+        self.assertLen(body["data"], 50)
+        if body["cursor"] is None:
+            # Without a data provider, reads are never incremental.
+            return
+        (body, _) = plugin.histograms_since_impl(
+            *args, since=body["cursor"], downsample_to=50
+        )
+        self.assertTrue(body["incremental"])
+        self.assertEqual(
+            [step for (_, step, _) in body["data"]], [self._STEPS - 1]
+        )
+
     def test_histograms_with_scalars(self):
         self._test_histograms(
             self._RUN_WITH_SCALARS, self._HISTOGRAM_TAG, should_work=False
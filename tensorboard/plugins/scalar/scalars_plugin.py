@@ -91,14 +91,29 @@ class ScalarsPlugin(base_plugin.TBPlugin):
                 }
         return result
 
-    def scalars_impl(self, ctx, tag, run, experiment, output_format):
-        """Result of the form `(body, mime_type)`."""
+    def scalars_impl(
+        self,
+        ctx,
+        tag,
+        run,
+        experiment,
+        output_format,
+        step_range=None,
+        wall_time_range=None,
+    ):
+        """Result of the form `(body, mime_type)`.
+
+        The optional `step_range` and `wall_time_range` are as accepted by
+        `DataProvider.read_scalars`.
+        """
         all_scalars = self._data_provider.read_scalars(
             ctx,
             experiment_id=experiment,
             plugin_name=metadata.PLUGIN_NAME,
             downsample=self._downsample_to,
             run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+            step_range=step_range,
+            wall_time_range=wall_time_range,
         )
         scalars = all_scalars.get(run, {}).get(tag, None)
         if scalars is None:
@@ -115,6 +130,33 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         else:
             return (values, "application/json")
 
+    def scalars_since_impl(self, ctx, tag, run, experiment, since):
+        """Result of the form `(body, mime_type)`, for a read since a cursor.
+
+        The body holds the `data`, in the JSON format of `scalars_impl`,
+        the `cursor` for the next read, and whether the read is
+        `incremental`; see `DataProvider.read_scalars_since`.
+        """
+        all_updates = self._data_provider.read_scalars_since(
+            ctx,
+            experiment_id=experiment,
+            plugin_name=metadata.PLUGIN_NAME,
+            downsample=self._downsample_to,
+            run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+            cursors={run: {tag: since}},
+        )
+        update = all_updates.get(run, {}).get(tag, None)
+        if update is None:
+            raise errors.NotFoundError(
+                "No scalar data for run=%r, tag=%r" % (run, tag)
+            )
+        body = {
+            "data": [(x.wall_time, x.step, x.value) for x in update.data],
+            "cursor": update.cursor,
+            "incremental": update.incremental,
+        }
+        return (body, "application/json")
+
     @wrappers.Request.application
     def tags_route(self, request):
         ctx = plugin_util.context(request.environ)
@@ -136,7 +178,24 @@ class ScalarsPlugin(base_plugin.TBPlugin):
         ctx = plugin_util.context(request.environ)
         experiment = plugin_util.experiment_id(request.environ)
         output_format = request.args.get("format")
+        since = plugin_util.since(request.args)
+        if since is not None:
+            if output_format == OutputFormat.CSV:
+                raise errors.InvalidArgumentError(
+                    "since is not supported for CSV output"
+                )
+            (body, mime_type) = self.scalars_since_impl(
+                ctx, tag, run, experiment, since
+            )
+            return http_util.Respond(request, body, mime_type)
+        (step_range, wall_time_range) = plugin_util.ranges(request.args)
         (body, mime_type) = self.scalars_impl(
-            ctx, tag, run, experiment, output_format
+            ctx,
+            tag,
+            run,
+            experiment,
+            output_format,
+            step_range=step_range,
+            wall_time_range=wall_time_range,
         )
         return http_util.Respond(request, body, mime_type)
@@ -164,6 +164,64 @@ class ScalarsPluginTest(tf.test.TestCase):
         self.assertEqual("application/json", response.headers["Content-Type"])
         self.assertEqual(self._STEPS, len(json.loads(response.get_data())))
 
+    def test_scalars_with_step_range(self):
+        server = self.load_server([self._RUN_WITH_SCALARS])
+        response = server.get(
+            "/data/plugin/scalars/scalars",
+            query_string={
+                "run": self._RUN_WITH_SCALARS,
+                "tag": "%s/scalar_summary" % self._SCALAR_TAG,
+                "min_step": "2",
+                "max_step": "5",
+            },
+        )
+        self.assertEqual(200, response.status_code)
+        steps = [step for (_, step, _) in json.loads(response.get_data())]
+        self.assertEqual(steps, [2, 3, 4, 5])
+
+    def test_scalars_with_malformed_step_range(self):
+        server = self.load_server([self._RUN_WITH_SCALARS])
+        response = server.get(
+            "/data/plugin/scalars/scalars",
+            query_string={
+                "run": self._RUN_WITH_SCALARS,
+                "tag": "%s/scalar_summary" % self._SCALAR_TAG,
+                "min_step": "two",
+            },
+        )
+        self.assertEqual(400, response.status_code)
+
+    def test_scalars_since(self):
+        server = self.load_server([self._RUN_WITH_SCALARS])
+        query_string = {
+            "run": self._RUN_WITH_SCALARS,
+            "tag": "%s/scalar_summary" % self._SCALAR_TAG,
+            "since": "",
+        }
+        response = server.get(
+            "/data/plugin/scalars/scalars", query_string=query_string
+        )
+        self.assertEqual(200, response.status_code)
+        body = json.loads(response.get_data())
+        self.assertFalse(body["incremental"])
+        self.assertLen(body["data"], self._STEPS)
+        query_string["since"] = body["cursor"]
+        response = server.get(
+            "/data/plugin/scalars/scalars", query_string=query_string
+        )
+        self.assertEqual(200, response.status_code)
+        body = json.loads(response.get_data())
+        self.assertTrue(body["incremental"])
+        # Only the last datum, read again.
+        self.assertEqual(
+            [step for (_, step, _) in body["data"]], [self._STEPS - 1]
+        )
+        query_string["min_step"] = "2"
+        response = server.get(
+            "/data/plugin/scalars/scalars", query_string=query_string
+        )
+        self.assertEqual(400, response.status_code)
+
     def test_scalars_with_scalars_unspecified_run(self):
         server = self.load_server([self._RUN_WITH_SCALARS])
         response = server.get(
@@ -284,12 +284,46 @@ class TextPlugin(base_plugin.TBPlugin):
             for e in text_events
         ]
 
+    def text_since_impl(self, ctx, run, tag, experiment, since):
+        """Returns the text of a run and tag since a cursor.
+
+        The result holds the `data`, in the format of `text_impl`, the
+        `cursor` for the next read, and whether the read is `incremental`;
+        see `DataProvider.read_tensors_since`. Without a data provider,
+        all text is returned, with no cursor.
+        """
+        if not self._data_provider:
+            data = self.text_impl(ctx, run, tag, experiment)
+            return {"data": data, "cursor": None, "incremental": False}
+        all_updates = self._data_provider.read_tensors_since(
+            ctx,
+            experiment_id=experiment,
+            plugin_name=metadata.PLUGIN_NAME,
+            downsample=self._downsample_to,
+            run_tag_filter=provider.RunTagFilter(runs=[run], tags=[tag]),
+            cursors={run: {tag: since}},
+        )
+        update = all_updates.get(run, {}).get(tag, None)
+        if update is None:
+            return {"data": [], "cursor": None, "incremental": False}
+        return {
+            "data": [
+                process_event(d.wall_time, d.step, d.numpy) for d in update.data
+            ],
+            "cursor": update.cursor,
+            "incremental": update.incremental,
+        }
+
     @wrappers.Request.application
     def text_route(self, request):
         ctx = plugin_util.context(request.environ)
         experiment = plugin_util.experiment_id(request.environ)
         run = request.args.get("run")
         tag = request.args.get("tag")
+        since = plugin_util.since(request.args)
+        if since is not None:
+            response = self.text_since_impl(ctx, run, tag, experiment, since)
+            return http_util.Respond(request, response, "application/json")
         response = self.text_impl(ctx, run, tag, experiment)
         return http_util.Respond(request, response, "application/json")
 
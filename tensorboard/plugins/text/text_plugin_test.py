@@ -173,6 +173,21 @@ class TextPluginTest(tf.test.TestCase):
             ),
         )
 
+    @with_plugin()
+    def testTextSince(self, plugin):
+        ctx = context.RequestContext()
+        result = plugin.text_since_impl(ctx, "fry", "message", "123", "")
+        self.assertFalse(result["incremental"])
+        self.assertEqual([d["step"] for d in result["data"]], [0, 1, 2, 3])
+        if result["cursor"] is None:
+            # Without a data provider, reads are never incremental.
+            return
+        result = plugin.text_since_impl(
+            ctx, "fry", "message", "123", result["cursor"]
+        )
+        self.assertTrue(result["incremental"])
+        self.assertEqual([d["step"] for d in result["data"]], [3])
+
     def testTableGeneration(self):
         array2d = np.array([["one", "two"], ["three", "four"]])
         expected_table = textwrap.dedent(